@@ -8,6 +8,7 @@ Required environment variables:
 Optional:
   KALSHI_DEMO=true    – Use demo environment (safe for testing)
   KALSHI_DRY_RUN=true – Simulate orders without submitting
+  KALSHI_ASYNC=true   – Run the asyncio bot (concurrent REST I/O per tick)
 
 Example (demo dry-run):
   KALSHI_DEMO=true KALSHI_DRY_RUN=true python -m kalshi_bot --budget 1000
@@ -38,6 +39,13 @@ def _positive_int(value: str) -> int:
     return ival
 
 
+def _non_negative_float(value: str) -> float:
+    fval = float(value)
+    if fval < 0:
+        raise argparse.ArgumentTypeError(f"{value} must not be negative")
+    return fval
+
+
 def _fraction(value: str) -> float:
     fval = float(value)
     if not (0.0 <= fval <= 1.0):
@@ -71,6 +79,25 @@ def _parse_args() -> argparse.Namespace:
                    choices=["DEBUG", "INFO", "WARNING", "ERROR"])
     p.add_argument("--scan-interval", type=_positive_int, default=60,
                    help="Seconds between market scans (default: 60)")
+    p.add_argument("--batch-orders", action="store_true",
+                   help="Place/cancel each tick's orders via the batched endpoints")
+    p.add_argument("--event-driven", action="store_true",
+                   help="Advance positions from WebSocket fill/order events")
+    p.add_argument("--reconcile-interval", type=_positive_int, default=600,
+                   help="Seconds between REST reconciliation sweeps in event-driven mode "
+                        "(default: 600)")
+    p.add_argument("--ws-order-books", action="store_true",
+                   help="Maintain order books from the WebSocket instead of REST polling")
+    p.add_argument("--async", dest="async_io", action="store_true",
+                   help="Run the asyncio bot: each tick's REST calls run concurrently")
+    p.add_argument("--max-connections", type=_positive_int, default=32,
+                   help="Keep-alive HTTP connections for --async (default: 32)")
+    p.add_argument("--vol-cache-ttl", type=_positive_int, default=60,
+                   help="Seconds to reuse cached realized vols; match the collector "
+                        "--interval (default: 60)")
+    p.add_argument("--state-journal-days", type=_non_negative_float, default=30.0,
+                   help="Days of position events kept in the state DB journal; "
+                        "0 keeps all (default: 30)")
 
     # Budget / risk
     p.add_argument("--budget", type=_positive_float, default=None,
@@ -96,6 +123,9 @@ def _parse_args() -> argparse.Namespace:
     # Persistence
     p.add_argument("--state-db", type=str, default=None, metavar="PATH",
                    help="SQLite file for position persistence (enables crash recovery)")
+    p.add_argument("--fill-model", type=str, default=None, metavar="PATH",
+                   help="Learn fill probabilities online from live quotes, "
+                        "checkpointed to this JSON file")
 
     # Diagnostics
     p.add_argument("--check-positions", action="store_true",
@@ -140,6 +170,15 @@ def main() -> None:
         dry_run=args.dry_run or os.getenv("KALSHI_DRY_RUN", "false").lower() == "true",
         demo=args.demo or os.getenv("KALSHI_DEMO", "false").lower() == "true",
         scan_interval=args.scan_interval,
+        batch_orders=args.batch_orders or os.getenv("KALSHI_BATCH_ORDERS", "false").lower() == "true",
+        event_driven=args.event_driven or os.getenv("KALSHI_EVENT_DRIVEN", "false").lower() == "true",
+        reconcile_interval=args.reconcile_interval,
+        ws_order_books=args.ws_order_books or os.getenv("KALSHI_WS_ORDER_BOOKS", "false").lower() == "true",
+        async_io=args.async_io or os.getenv("KALSHI_ASYNC", "false").lower() == "true",
+        max_connections=args.max_connections,
+        vol_cache_ttl=args.vol_cache_ttl,
+        state_journal_days=args.state_journal_days,
+        fill_model_path=args.fill_model,
         risk=risk,
         scoring=scoring,
         market_filter=filt,
@@ -179,7 +218,11 @@ def main() -> None:
                  cash, total_cost, cash + total_cost)
         return
 
-    bot = KalshiBot(config, state_db=args.state_db)
+    if config.async_io:
+        from .async_bot import AsyncKalshiBot
+        bot = AsyncKalshiBot(config, state_db=args.state_db)
+    else:
+        bot = KalshiBot(config, state_db=args.state_db)
     bot.run()
 
 
@@ -0,0 +1,169 @@
+"""
+Asyncio variant of KalshiBot.
+
+Same strategy, same tick — only the I/O pattern differs.  KalshiBot makes
+its REST calls one after another, so a tick's latency grows with every
+quoting position and candidate market.  AsyncKalshiBot issues them through
+an AsyncKalshiClient and gathers them:
+
+  1. Refresh  – open orders, order books and market statuses for every
+                position concurrently, then status checks for all vanished
+                orders concurrently (OrderManager.refresh_all_async).
+  2. Release  – unchanged (no I/O).
+  3. Balance  – cash and portfolio positions fetched together.
+  4. Open     – order books for all candidate markets concurrently, then
+                every leg (or batch chunk) placed concurrently.
+
+The async client shares the sync client's rate-limit buckets and key, so
+WebSocket-thread hedges and the async tick draw on one request budget.
+Enable with --async / KALSHI_ASYNC=true.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+import time
+from typing import Optional
+
+from .async_client import AsyncKalshiClient
+from .bot import KalshiBot
+from .client import OrderBook
+from .config import BotConfig
+from .order_manager import PositionState
+
+logger = logging.getLogger(__name__)
+
+
+class AsyncKalshiBot(KalshiBot):
+    """
+    KalshiBot whose tick runs on an asyncio event loop.
+
+    Instantiate with a BotConfig, then call .run() (or await .run_async()).
+    """
+
+    def __init__(
+        self,
+        config: BotConfig,
+        state_db: Optional[str] = None,
+        data_db: Optional[str] = None,
+    ) -> None:
+        super().__init__(config, state_db=state_db, data_db=data_db)
+        self.aclient = AsyncKalshiClient(
+            config, max_connections=config.max_connections, share_limits=self.client,
+        )
+
+    # ------------------------------------------------------------------
+    # Main loop
+    # ------------------------------------------------------------------
+
+    def run(self) -> None:
+        """Start the bot. Blocks until interrupted."""
+        asyncio.run(self.run_async())
+
+    async def run_async(self) -> None:
+        env_label = "DEMO" if self.cfg.demo else "LIVE"
+        logger.info(
+            "Starting Kalshi Market-Making Bot (async, %d connections) | env=%s | "
+            "budget=$%.2f | dry_run=%s",
+            self.cfg.max_connections, env_label, self.cfg.risk.total_budget, self.cfg.dry_run,
+        )
+        self._install_signal_handlers()
+        self._running = True
+        if self._ws is not None:
+            self._ws.start()
+
+        last_report = 0.0
+        try:
+            while self._running:
+                tick_start = time.time()
+                self._tick_count += 1
+
+                try:
+                    await self._tick_async()
+                except Exception as exc:
+                    logger.error(
+                        "Unhandled error in tick %d: %s",
+                        self._tick_count, exc, exc_info=True,
+                    )
+
+                if self._store is not None:
+                    self._store.commit()
+
+                if time.time() - last_report >= self.cfg.report_interval:
+                    self._log_report()
+                    last_report = time.time()
+
+                elapsed = time.time() - tick_start
+                sleep_for = max(0.0, self.cfg.scan_interval - elapsed)
+                if sleep_for > 0 and self._running:
+                    await asyncio.sleep(sleep_for)
+        finally:
+            if self._ws is not None:
+                self._ws.stop()
+            if self._store is not None:
+                self._store.close()
+            if self.fill_model is not None:
+                self.fill_model.save()
+            await self.aclient.close()
+        logger.info("Bot stopped gracefully.")
+
+    # ------------------------------------------------------------------
+    # Single tick
+    # ------------------------------------------------------------------
+
+    async def _tick_async(self) -> None:
+        logger.debug("--- Tick %d (async) ---", self._tick_count)
+
+        # 1. Refresh positions
+        reconcile = self._reconcile_due()
+        if reconcile:
+            self._last_reconcile = time.time()
+        await self.order_mgr.refresh_all_async(self.aclient, reconcile=reconcile)
+
+        # 2. Release budget for resolved/idle positions
+        self._release_closed()
+
+        # 3. Sync live balance (skipped in dry-run, as in KalshiBot)
+        if not self.cfg.dry_run:
+            cash, positions = await asyncio.gather(
+                self.aclient.get_balance(), self.aclient.get_portfolio_positions(),
+            )
+            if cash > 0:   # API error – don't corrupt the tracker
+                self._apply_portfolio_balance(cash, positions)
+
+        # 4. Open new positions
+        if self.budget.available >= 5.0:
+            await self._open_new_positions_async()
+
+    async def _open_new_positions_async(self) -> None:
+        # Cursor pages are sequential; keep the scan off the event loop.
+        loop = asyncio.get_running_loop()
+        markets = await loop.run_in_executor(None, self._scan_markets)
+        if not markets:
+            return
+
+        order_books: Optional[dict[str, Optional[OrderBook]]] = None
+        if not self.cfg.dry_run:
+            active = {
+                ticker for ticker, pos in self.order_mgr.positions.items()
+                if pos.state not in (PositionState.IDLE, PositionState.RESOLVED)
+            }
+            order_books = {}
+            missing: list[str] = []
+            for market in markets:
+                if market.ticker in active:
+                    continue
+                book = self.book_cache.get(market.ticker) if self.book_cache is not None else None
+                if book is None:
+                    missing.append(market.ticker)
+                else:
+                    order_books[market.ticker] = book
+            order_books.update(await self.aclient.get_order_books(missing))
+
+        opened, batch = self._quote_markets(markets, defer=True, order_books=order_books)
+        if batch:
+            positions = await self.order_mgr.open_positions_async(self.aclient, batch)
+            opened += self._settle_opened(positions)
+        if opened:
+            logger.info("Opened %d new position(s). %s", opened, self.budget.summary())
@@ -0,0 +1,391 @@
+"""
+Asyncio front-end to the Kalshi Trade API v2.
+
+KalshiClient blocks its caller for every round trip, so a tick that needs
+order books for thirty markets, a status check per vanished order and a
+dozen placements pays for each request in turn.  AsyncKalshiClient exposes
+the same methods as coroutines so callers can asyncio.gather them.
+
+Transport:
+  The project depends on `requests` only, so requests run on one pooled
+  requests.Session (`max_connections` keep-alive connections, same retry
+  policy as KalshiClient) from a thread pool of the same size.  Each worker
+  signs its request immediately before sending it: RSA-PSS signing of one
+  request overlaps the network wait of the others, and a request that sat
+  in the queue never goes out with a stale timestamp.
+
+Rate limits:
+  Pass `share_limits=client` to draw from an existing KalshiClient's token
+  buckets (and reuse its loaded key), so WebSocket-thread hedges and the
+  async tick count against one budget.  Tokens are awaited with
+  asyncio.sleep, never blocking the event loop.
+
+Responses are parsed by the same helpers as KalshiClient, and dry-run /
+error behaviour matches method for method.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Optional
+from urllib.parse import urlparse
+
+from .client import (
+    _BATCH_LIMIT,
+    _MARKETS_PAGE_LIMIT,
+    KalshiClient,
+    Order,
+    OrderBook,
+    OrderIntent,
+    PageStats,
+    _cancelled_flags,
+    _make_session,
+    _parse_order,
+    _parse_order_book,
+    _placed_ids,
+    _RateLimiter,
+    _Signer,
+)
+from .config import BotConfig
+
+logger = logging.getLogger(__name__)
+
+
+class AsyncKalshiClient:
+    """
+    Coroutine version of KalshiClient.
+
+    Use as `async with AsyncKalshiClient(cfg) as client:` or call close()
+    when done.  All prices are probability floats (0.0–1.0), as in
+    KalshiClient.
+    """
+
+    def __init__(
+        self,
+        config: BotConfig,
+        max_connections: int = 32,
+        share_limits: Optional[KalshiClient] = None,
+    ) -> None:
+        self.cfg = config
+        self._base = config.api_base
+        self._base_path = urlparse(self._base).path
+        self._session = _make_session(pool_size=max_connections)
+        self._pool = ThreadPoolExecutor(
+            max_workers=max_connections, thread_name_prefix="kalshi-http",
+        )
+        self.last_market_fetch: Optional[PageStats] = None
+
+        self._signer: Optional[_Signer] = None
+        if share_limits is not None:
+            self._read_limiter = share_limits._read_limiter
+            self._write_limiter = share_limits._write_limiter
+            self._signer = share_limits._signer
+        else:
+            # Same 80 % of the Basic-tier limits as KalshiClient
+            self._read_limiter = _RateLimiter(rate=16)
+            self._write_limiter = _RateLimiter(rate=8)
+
+        if self._signer is None and not config.dry_run:
+            try:
+                self._signer = _Signer(config.load_private_key(), config.api_key_id)
+            except Exception as exc:
+                logger.error("Failed to load private key: %s", exc)
+                raise
+
+    async def __aenter__(self) -> "AsyncKalshiClient":
+        return self
+
+    async def __aexit__(self, *exc) -> None:
+        await self.close()
+
+    async def close(self) -> None:
+        self._pool.shutdown(wait=False)
+        self._session.close()
+
+    # ------------------------------------------------------------------
+    # Transport
+    # ------------------------------------------------------------------
+
+    async def _request(
+        self,
+        method: str,
+        path: str,
+        params: dict | None = None,
+        body: dict | None = None,
+        auth: bool = True,
+    ) -> Any:
+        limiter = self._read_limiter if method == "GET" else self._write_limiter
+        await limiter.acquire_async()
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(
+            self._pool, self._send, method, path, params, body, auth,
+        )
+
+    def _send(
+        self, method: str, path: str, params: dict | None, body: dict | None, auth: bool,
+    ) -> Any:
+        """Runs on a pool thread: sign, send, decode."""
+        headers = {}
+        if auth and self._signer is not None:
+            headers = self._signer.headers(method, self._base_path + path)
+        resp = self._session.request(
+            method, self._base + path, headers=headers, params=params, json=body, timeout=15,
+        )
+        resp.raise_for_status()
+        return resp.json()
+
+    # ------------------------------------------------------------------
+    # Market data
+    # ------------------------------------------------------------------
+
+    async def _walk_markets(
+        self, params: dict, stats: PageStats, limit: Optional[int],
+    ) -> list[dict]:
+        """Follow one /markets cursor chain (pages are inherently sequential)."""
+        query = {**params, "limit": _MARKETS_PAGE_LIMIT}
+        markets: list[dict] = []
+        cursor = None
+        while True:
+            if cursor:
+                query["cursor"] = cursor
+            t0 = time.monotonic()
+            data = await self._request("GET", "/markets", params=dict(query), auth=False)
+            page = data.get("markets", [])
+            stats.record(time.monotonic() - t0, len(page))
+            markets.extend(page)
+            cursor = data.get("cursor")
+            if not cursor or not page or (limit is not None and len(markets) >= limit):
+                return markets
+
+    async def get_active_markets(
+        self,
+        limit: Optional[int] = None,
+        partitions: list[dict] | None = None,
+    ) -> list[dict]:
+        """
+        Return raw market dicts for every open market (or the first `limit`).
+
+        Each entry of `partitions` (extra query params, e.g. series_ticker)
+        is an independent cursor chain; chains are walked concurrently and
+        tickers seen in more than one are returned once.
+        """
+        stats = PageStats()
+        base = {"status": "open"}
+        try:
+            chains = await asyncio.gather(*(
+                self._walk_markets({**base, **part}, stats, limit)
+                for part in partitions or [{}]
+            ))
+        finally:
+            stats.finished = time.monotonic()
+
+        seen: set[str] = set()
+        markets: list[dict] = []
+        for chain in chains:
+            for raw in chain:
+                ticker = raw.get("ticker")
+                if ticker is not None:
+                    if ticker in seen:
+                        continue
+                    seen.add(ticker)
+                markets.append(raw)
+        self.last_market_fetch = stats
+        logger.info("Fetched open markets: %s", stats.summary())
+        return markets[:limit] if limit is not None else markets
+
+    async def get_market(self, ticker: str) -> dict:
+        """Fetch a single market by ticker."""
+        data = await self._request("GET", f"/markets/{ticker}", auth=False)
+        return data.get("market", data)
+
+    async def get_order_book(self, ticker: str) -> OrderBook:
+        """Fetch the live order book for a market (raises on error)."""
+        data = await self._request("GET", f"/markets/{ticker}/orderbook", auth=False)
+        return _parse_order_book(ticker, data)
+
+    async def get_order_books(self, tickers: list[str]) -> dict[str, Optional[OrderBook]]:
+        """Fetch several order books concurrently; None for any that failed."""
+        results = await asyncio.gather(
+            *(self.get_order_book(t) for t in tickers), return_exceptions=True,
+        )
+        books: dict[str, Optional[OrderBook]] = {}
+        for ticker, result in zip(tickers, results):
+            if isinstance(result, BaseException):
+                logger.debug("get_order_book(%s): %s", ticker, result)
+                result = None
+            books[ticker] = result
+        return books
+
+    # ------------------------------------------------------------------
+    # Account
+    # ------------------------------------------------------------------
+
+    async def get_balance(self) -> float:
+        """Return available USD balance."""
+        if self.cfg.dry_run:
+            return self.cfg.risk.total_budget
+
+        try:
+            data = await self._request("GET", "/portfolio/balance")
+            # Kalshi returns balance in cents
+            return float(data.get("balance", 0)) / 100.0
+        except Exception as exc:
+            logger.error("get_balance error: %s", exc)
+            return 0.0
+
+    async def get_portfolio_positions(self) -> list[dict]:
+        """Return all current contract positions (raw market_position dicts)."""
+        if self.cfg.dry_run:
+            return []
+
+        try:
+            data = await self._request("GET", "/portfolio/positions")
+            return data.get("market_positions", [])
+        except Exception as exc:
+            logger.error("get_portfolio_positions error: %s", exc)
+            return []
+
+    # ------------------------------------------------------------------
+    # Order management
+    # ------------------------------------------------------------------
+
+    async def place_limit_order(
+        self,
+        ticker: str,
+        side: str,        # "yes" | "no"
+        action: str,      # "buy" | "sell"
+        price: float,     # probability 0-1
+        count: int,       # number of contracts
+    ) -> Optional[str]:
+        """Submit a GTC limit order. Returns order_id on success, None on failure."""
+        if self.cfg.dry_run:
+            logger.info(
+                "[DRY-RUN] Would place %s %s %s @ %.4f × %d contracts",
+                action.upper(), side.upper(), ticker, price, count,
+            )
+            return f"dry-{ticker[:12]}-{side}-{action}-{int(time.time())}"
+
+        try:
+            body = KalshiClient._order_body(OrderIntent(ticker, side, action, price, count))
+            resp = await self._request("POST", "/portfolio/orders", body=body)
+            order = resp.get("order", resp)
+            order_id = order.get("order_id", "")
+            logger.info(
+                "Order placed: %s %s %s @ %.4f ×%d → id=%s",
+                action.upper(), side.upper(), ticker, price, count, order_id,
+            )
+            return order_id
+        except Exception as exc:
+            logger.error("place_limit_order error: %s", exc)
+            return None
+
+    async def place_orders_batch(self, intents: list[OrderIntent]) -> list[Optional[str]]:
+        """
+        Submit limit orders through the batched endpoint.  The _BATCH_LIMIT
+        chunks go out concurrently; returns one order_id (or None) per intent,
+        in input order.
+        """
+        if self.cfg.dry_run:
+            now = int(time.time())
+            for it in intents:
+                logger.info(
+                    "[DRY-RUN] Would place %s %s %s @ %.4f × %d contracts (batch)",
+                    it.action.upper(), it.side.upper(), it.ticker, it.price, it.count,
+                )
+            return [f"dry-{it.ticker[:12]}-{it.side}-{it.action}-{now}" for it in intents]
+
+        async def chunk_ids(chunk: list[OrderIntent]) -> list[Optional[str]]:
+            try:
+                resp = await self._request(
+                    "POST", "/portfolio/orders/batched",
+                    body={"orders": [KalshiClient._order_body(it) for it in chunk]},
+                )
+                results = resp.get("orders", [])
+            except Exception as exc:
+                logger.error("place_orders_batch error (%d orders): %s", len(chunk), exc)
+                results = []
+            return _placed_ids(chunk, results)
+
+        chunks = [intents[i:i + _BATCH_LIMIT] for i in range(0, len(intents), _BATCH_LIMIT)]
+        per_chunk = await asyncio.gather(*(chunk_ids(c) for c in chunks))
+        return [order_id for ids in per_chunk for order_id in ids]
+
+    async def cancel_order(self, order_id: str) -> bool:
+        """Cancel a single open order. Returns True on success."""
+        if self.cfg.dry_run:
+            logger.info("[DRY-RUN] Would cancel order %s", order_id)
+            return True
+
+        try:
+            await self._request("DELETE", f"/portfolio/orders/{order_id}")
+            logger.info("Cancelled order %s", order_id)
+            return True
+        except Exception as exc:
+            logger.error("cancel_order(%s) error: %s", order_id, exc)
+            return False
+
+    async def cancel_orders_batch(self, order_ids: list[str]) -> list[bool]:
+        """
+        Cancel orders through the batched endpoint, chunks concurrently.
+        Returns one success flag per order_id, in input order.
+        """
+        if self.cfg.dry_run:
+            for order_id in order_ids:
+                logger.info("[DRY-RUN] Would cancel order %s (batch)", order_id)
+            return [True] * len(order_ids)
+
+        async def chunk_flags(chunk: list[str]) -> list[bool]:
+            try:
+                resp = await self._request(
+                    "DELETE", "/portfolio/orders/batched", body={"ids": chunk},
+                )
+            except Exception as exc:
+                logger.error("cancel_orders_batch error (%d orders): %s", len(chunk), exc)
+                return [False] * len(chunk)
+            return _cancelled_flags(chunk, resp)
+
+        chunks = [order_ids[i:i + _BATCH_LIMIT] for i in range(0, len(order_ids), _BATCH_LIMIT)]
+        per_chunk = await asyncio.gather(*(chunk_flags(c) for c in chunks))
+        return [ok for flags in per_chunk for ok in flags]
+
+    async def get_open_orders(self) -> list[Order]:
+        """Return list of currently resting orders for this account."""
+        if self.cfg.dry_run:
+            return []
+
+        try:
+            data = await self._request("GET", "/portfolio/orders", params={"status": "resting"})
+            return [_parse_order(o, status="resting") for o in data.get("orders", [])]
+        except Exception as exc:
+            logger.error("get_open_orders error: %s", exc)
+            return []
+
+    async def get_fills(self, ticker: Optional[str] = None, limit: int = 50) -> list[dict]:
+        """Fetch recent fills (trades)."""
+        if self.cfg.dry_run:
+            return []
+
+        try:
+            params: dict = {"limit": limit}
+            if ticker:
+                params["ticker"] = ticker
+            data = await self._request("GET", "/portfolio/fills", params=params)
+            return data.get("fills", [])
+        except Exception as exc:
+            logger.error("get_fills error: %s", exc)
+            return []
+
+    async def get_order_status(self, order_id: str) -> Optional[Order]:
+        """Fetch a single order by ID. Returns None on error."""
+        if self.cfg.dry_run:
+            return None
+
+        try:
+            data = await self._request("GET", f"/portfolio/orders/{order_id}")
+            return _parse_order(data.get("order", data), order_id=order_id)
+        except Exception as exc:
+            logger.error("get_order_status(%s) error: %s", order_id, exc)
+            return None
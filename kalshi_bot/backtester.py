@@ -23,15 +23,16 @@ import logging
 import random
 from dataclasses import dataclass, field
 from enum import Enum, auto
-from typing import Optional
+from typing import Optional, Sequence
 
 from .config import BotConfig, MarketFilter
 from .fill_model import FillModel, DEFAULT_FILL_MODEL
+from .path_cache import PathSource
 from .position_sizer import BudgetTracker, size_position
 from .rewards import compute_scenario_pnl
 from .stats import TTestResult, pnl_ttest_from_results
-from .synthetic_data import MarketSnapshot, PricePath, Scenario
-from .vol_estimator import realized_vol
+from .synthetic_data import MarketSnapshot, Scenario
+from .vol_estimator import RollingVol
 
 logger = logging.getLogger("kalshi_bot.backtester")
 
@@ -137,9 +138,12 @@ class Backtester:
         self,
         config: BotConfig,
         fill_model: FillModel | None = None,
+        path_cache: PathSource | None = None,
     ) -> None:
         self.cfg = config
         self.fill_model = fill_model or DEFAULT_FILL_MODEL
+        # Shared read-only scenario paths (run_scenario regenerates without one)
+        self.path_cache = path_cache
         self.budget = BudgetTracker(config.risk.total_budget)
         self._order_seq = 0
 
@@ -270,7 +274,7 @@ class Backtester:
 
     def run_market(
         self,
-        snapshots: list[MarketSnapshot],
+        snapshots: Sequence[MarketSnapshot],
         seed_offset: int = 0,
     ) -> MarketResult:
         ticker = snapshots[0].ticker if snapshots else "UNKNOWN"
@@ -281,7 +285,6 @@ class Backtester:
         peak_budget = self.budget.available
         max_dd = 0.0
         gross_pnl = 0.0
-        unrealised_pnl = 0.0
         yes_orders_placed = 0
         yes_orders_filled = 0
         no_orders_placed = 0
@@ -291,7 +294,7 @@ class Backtester:
         # Rolling window of mid-prices for realized-vol estimation.
         # 24 snapshots = 24 hours of hourly data (matches PricePath dt=1/24 default).
         _vol_window_size = 24
-        _mid_window: list[float] = []
+        _vols = RollingVol.bars(_vol_window_size, dt_hours=1.0)
 
         for snap in snapshots:
             # ── Check existing position ──────────────────────────────────
@@ -424,9 +427,7 @@ class Backtester:
                         active_pos = None
 
             # ── Maintain rolling mid-price window for vol estimation ─────
-            _mid_window.append(snap.mid)
-            if len(_mid_window) > _vol_window_size:
-                _mid_window.pop(0)
+            _vols.update(snap.mid)
 
             # ── Open a new position if none active ───────────────────────
             if (active_pos is None or active_pos.state == PosState.RESOLVED) \
@@ -434,7 +435,7 @@ class Backtester:
                     and self._passes_filter(snap):
 
                 # Rolling realized vol: dt = 1h (PricePath default step size)
-                rv = realized_vol(_mid_window, dt_hours=1.0)
+                rv = _vols.vol()
                 vol_for_sizing = max(rv, self.cfg.scoring.default_v) if rv else None
 
                 # Simple sizing from the real bot's logic
@@ -496,8 +497,34 @@ class Backtester:
             if dd > max_dd:
                 max_dd = dd
 
+        return self._finish_market(
+            ticker, len(snapshots), snapshots[-1] if snapshots else None,
+            positions, gross_pnl, max_dd, hold_days,
+            yes_orders_placed, yes_orders_filled, no_orders_placed, no_orders_filled,
+        )
+
+    def _finish_market(
+        self,
+        ticker: str,
+        n_snapshots: int,
+        final_snap: Optional[MarketSnapshot],
+        positions: list[SimPosition],
+        gross_pnl: float,
+        max_dd: float,
+        hold_days: list[float],
+        yes_orders_placed: int,
+        yes_orders_filled: int,
+        no_orders_placed: int,
+        no_orders_filled: int,
+    ) -> MarketResult:
+        """
+        Resolve positions still open at the end of the path and build the
+        MarketResult.  Shared by the loop engine and the array engine so both
+        categorise positions identically.
+        """
+        unrealised_pnl = 0.0
+
         # ── Resolve all open positions at end of path ────────────────────
-        final_snap = snapshots[-1] if snapshots else None
         if final_snap:
             resolution = self._resolve(final_snap)
             for pos in positions:
@@ -543,7 +570,7 @@ class Backtester:
 
         return MarketResult(
             ticker=ticker,
-            snapshots=len(snapshots),
+            snapshots=n_snapshots,
             positions_opened=len(positions),
             positions_both_filled=both_filled,
             positions_one_filled=one_filled,
@@ -572,18 +599,14 @@ class Backtester:
 
         for i, mkt_kwargs in enumerate(scenario.markets):
             ticker = mkt_kwargs.get("ticker", f"MKT-{i}")
-            path = PricePath(seed=seed + i * 1000, **mkt_kwargs)
-            snapshots = path.generate(scenario.days)
-
-            # Black-swan scenario: inject a late price shock
-            if scenario.name == "black_swan" and snapshots:
-                shock_idx = int(len(snapshots) * 0.75)
-                shock_mid = 0.02 if i == 0 else 0.98
-                for snap in snapshots[shock_idx:]:
-                    snap.yes_bid = round(max(shock_mid - 0.01, 0.01), 2)
-                    snap.yes_ask = round(min(shock_mid + 0.01, 0.99), 2)
-                    snap.mid = shock_mid
-                    snap.spread = 0.02
+            if self.path_cache is not None:
+                snapshots = self.path_cache.get(scenario, i, seed)
+            else:
+                snapshots = scenario.market_snapshots(i, seed)
+
+            # Black-swan scenario: a late price shock is baked into the path
+            shock_idx = scenario.shock_index(len(snapshots))
+            if shock_idx is not None:
                 events.append(f"{ticker}: black-swan shock at t≈{snapshots[shock_idx].t:.1f}d")
 
             result = self.run_market(snapshots, seed_offset=i)
@@ -0,0 +1,194 @@
+"""
+In-memory Kalshi order books maintained from the WebSocket orderbook channel.
+
+refresh_all and the market scan used to GET /markets/{ticker}/orderbook for
+every quoting position and every candidate market on every tick.  With
+KalshiWebSocket subscribed to "orderbook_delta" for the tickers we track,
+this cache holds a live book per ticker and readers only fall back to REST
+for tickers it does not (yet) have.
+
+Kalshi WS v2 order-book messages:
+  Snapshot : {"type": "orderbook_snapshot", "sid": 3, "seq": 1,
+              "msg": {"market_ticker": "...", "yes": [[48, 100], ...], "no": [[50, 20], ...]}}
+  Delta    : {"type": "orderbook_delta", "sid": 3, "seq": 2,
+              "msg": {"market_ticker": "...", "price": 48, "delta": -10, "side": "yes"}}
+
+Prices are integer cents; both sides are bids (a NO bid at c is a YES ask at
+100 - c).  `seq` increases by one per message within a subscription (`sid`);
+a skipped number means a lost delta, so every book on that subscription is
+dropped until a fresh snapshot arrives (the WS client resubscribes).
+
+Each side is kept as two parallel lists sorted by price — levels are inserted
+and removed with bisect — so building an OrderBook is a reversed slice
+rather than a sort.
+"""
+
+from __future__ import annotations
+
+import bisect
+import logging
+import threading
+import time
+from typing import Optional
+
+from .client import OrderBook
+
+logger = logging.getLogger(__name__)
+
+
+class _BookSide:
+    """Bid levels for one side: ascending cents with resting quantity."""
+
+    __slots__ = ("prices", "sizes")
+
+    def __init__(self, levels: list[list[int]] | None = None) -> None:
+        merged: dict[int, int] = {}
+        for price, size in levels or []:
+            merged[int(price)] = merged.get(int(price), 0) + int(size)
+        self.prices = sorted(p for p, q in merged.items() if q > 0)
+        self.sizes = [merged[p] for p in self.prices]
+
+    def apply(self, price: int, delta: int) -> None:
+        i = bisect.bisect_left(self.prices, price)
+        if i < len(self.prices) and self.prices[i] == price:
+            size = self.sizes[i] + delta
+            if size > 0:
+                self.sizes[i] = size
+            else:
+                del self.prices[i]
+                del self.sizes[i]
+        elif delta > 0:
+            self.prices.insert(i, price)
+            self.sizes.insert(i, delta)
+
+
+class _Book:
+    __slots__ = ("yes", "no", "sid", "updated")
+
+    def __init__(self, sid: int, yes: _BookSide, no: _BookSide) -> None:
+        self.yes = yes
+        self.no = no
+        self.sid = sid
+        self.updated = time.monotonic()
+
+
+class OrderBookCache:
+    """
+    Thread-safe ticker → order book store fed by KalshiWebSocket.
+
+    get() returns the same OrderBook shape as KalshiClient.get_order_book
+    (YES bids best-first, YES asks derived from NO bids, best-first), or None
+    when the ticker has no valid book — callers then fall back to REST.
+    """
+
+    def __init__(self, max_age: Optional[float] = None) -> None:
+        self.max_age = max_age            # seconds without updates before a book is unusable
+        self._books: dict[str, _Book] = {}
+        self._seq: dict[int, int] = {}    # sid → last sequence number applied
+        self._lock = threading.Lock()
+        self.resyncs = 0
+
+    # ------------------------------------------------------------------
+    # Writers (WebSocket thread)
+    # ------------------------------------------------------------------
+
+    def apply_snapshot(
+        self, ticker: str, sid: int, seq: int, yes: list, no: list,
+    ) -> None:
+        with self._lock:
+            self._books[ticker] = _Book(sid, _BookSide(yes), _BookSide(no))
+            self._seq[sid] = seq
+
+    def apply_delta(
+        self, ticker: str, sid: int, seq: int, side: str, price: int, delta: int,
+    ) -> list[str]:
+        """
+        Apply one delta.  Returns [] normally; on a sequence gap, drops every
+        book on the subscription and returns their tickers for resubscription.
+        """
+        with self._lock:
+            last = self._seq.get(sid)
+            if last is not None and seq != last + 1:
+                logger.warning(
+                    "Order-book sequence gap on sid=%d (%d → %d) – resyncing.", sid, last, seq,
+                )
+                self.resyncs += 1
+                return self._drop_sid(sid)
+            self._seq[sid] = seq
+
+            book = self._books.get(ticker)
+            if book is None or book.sid != sid:
+                return []   # delta before its snapshot (or after a drop) – ignore
+            (book.yes if side == "yes" else book.no).apply(int(price), int(delta))
+            book.updated = time.monotonic()
+            return []
+
+    def _drop_sid(self, sid: int) -> list[str]:
+        tickers = [t for t, b in self._books.items() if b.sid == sid]
+        for t in tickers:
+            del self._books[t]
+        self._seq.pop(sid, None)
+        return tickers
+
+    def drop_subscription(self, sid: int) -> list[str]:
+        """Forget every book on a subscription (e.g. after unsubscribing)."""
+        with self._lock:
+            return self._drop_sid(sid)
+
+    def drop_tickers(self, tickers) -> dict[int, list[str]]:
+        """
+        Forget these tickers' books.  Returns the dropped tickers grouped by
+        subscription sid, for removing them from their subscriptions.
+        """
+        dropped: dict[int, list[str]] = {}
+        with self._lock:
+            for ticker in tickers:
+                book = self._books.pop(ticker, None)
+                if book is not None:
+                    dropped.setdefault(book.sid, []).append(ticker)
+        return dropped
+
+    def clear(self) -> None:
+        """Drop everything (connection lost: deltas can no longer be trusted)."""
+        with self._lock:
+            self._books.clear()
+            self._seq.clear()
+
+    # ------------------------------------------------------------------
+    # Readers
+    # ------------------------------------------------------------------
+
+    def __contains__(self, ticker: str) -> bool:
+        return self.get(ticker) is not None
+
+    def tickers(self) -> list[str]:
+        with self._lock:
+            return list(self._books)
+
+    def get(self, ticker: str) -> Optional[OrderBook]:
+        with self._lock:
+            book = self._books.get(ticker)
+            if book is None:
+                return None
+            if self.max_age is not None and time.monotonic() - book.updated > self.max_age:
+                return None
+            yes_prices, yes_sizes = book.yes.prices, book.yes.sizes
+            no_prices, no_sizes = book.no.prices, book.no.sizes
+            yes_bids = [
+                (yes_prices[i] / 100.0, yes_sizes[i]) for i in range(len(yes_prices) - 1, -1, -1)
+            ]
+            # Highest NO bid = lowest YES ask
+            yes_asks = [
+                ((100 - no_prices[i]) / 100.0, no_sizes[i])
+                for i in range(len(no_prices) - 1, -1, -1)
+            ]
+
+        best_bid = yes_bids[0][0] if yes_bids else 0.0
+        best_ask = yes_asks[0][0] if yes_asks else 1.0
+        return OrderBook(
+            ticker=ticker,
+            yes_bids=yes_bids,
+            yes_asks=yes_asks,
+            mid=(best_bid + best_ask) / 2,
+            spread=best_ask - best_bid,
+        )
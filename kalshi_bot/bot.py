@@ -2,7 +2,10 @@
 Main bot orchestrator for Kalshi market-making.
 
 Loop cadence (every `scan_interval` seconds):
-  1. Refresh all open positions (detect fills, trigger hedges, re-quote stale orders)
+  1. Refresh all open positions (detect fills, trigger hedges, re-quote stale orders).
+     In event-driven mode fills arrive over the WebSocket and this step only
+     runs a full REST reconciliation every `reconcile_interval` seconds (or
+     whenever the WebSocket is down).
   2. Check USD balance and available budget
   3. Scan for new markets that meet selection criteria
   4. Open new positions on the best markets within budget
@@ -18,14 +21,16 @@ import signal
 import time
 from typing import Optional
 
-from .client import KalshiClient
+from .book_cache import OrderBookCache
+from .client import KalshiClient, MarketInfo, OrderBook
 from .config import BotConfig
+from .fill_model import OnlineFillModel
 from .market_selector import select_markets, title_short
-from .order_manager import OrderManager, PositionState
+from .order_manager import MarketPosition, OrderManager, PositionState, QuoteRequest
 from .position_sizer import BudgetTracker, size_position
 from .rewards import compute_scenario_pnl
 from .state_store import StateStore
-from .vol_estimator import vol_ratio
+from .vol_estimator import VolTracker
 from .ws_client import KalshiWebSocket
 
 logger = logging.getLogger(__name__)
@@ -47,13 +52,34 @@ class KalshiBot:
         config.validate()
         self.cfg = config
         self._data_db = data_db   # market_data.db for realized-vol lookups
+        # Rolling per-ticker vols, read incrementally from market_data.db
+        self.vols: Optional[VolTracker] = (
+            VolTracker(data_db, ttl=config.vol_cache_ttl) if data_db else None
+        )
         self.client = KalshiClient(config)
 
+        # Write-behind: positions are written in one batch per tick (see state_store.py)
         store: Optional[StateStore] = None
         if state_db:
-            store = StateStore(state_db)
-
-        self.order_mgr = OrderManager(self.client, config, store=store)
+            store = StateStore(state_db, journal_days=config.state_journal_days or None)
+        self._store = store
+
+        # Live order books from the WS orderbook channel (needs the WS, so not in dry_run)
+        self.book_cache: Optional[OrderBookCache] = None
+        if config.ws_order_books and not config.dry_run:
+            self.book_cache = OrderBookCache()
+
+        # Online fill model: learns from each quote's outcome (see fill_model.py)
+        self.fill_model: Optional[OnlineFillModel] = None
+        if config.fill_model_path:
+            self.fill_model = OnlineFillModel(checkpoint_path=config.fill_model_path)
+            if self.fill_model.n_obs == 0 and state_db and data_db:
+                self.fill_model.fit_from_db(state_db, data_db)   # warm start
+
+        self.order_mgr = OrderManager(
+            self.client, config, store=store, book_cache=self.book_cache,
+            fill_model=self.fill_model,
+        )
         self.budget = BudgetTracker(config.risk.total_budget)
         self._running = False
         self._tick_count = 0
@@ -63,8 +89,14 @@ class KalshiBot:
         self._ws: Optional[KalshiWebSocket] = None
         if not config.dry_run:
             self._ws = KalshiWebSocket(
-                config, on_fill=self.order_mgr.handle_ws_fill
+                config,
+                on_fill=self.order_mgr.handle_ws_fill,
+                on_order_update=(
+                    self.order_mgr.handle_ws_order_update if config.event_driven else None
+                ),
+                book_cache=self.book_cache,
             )
+        self._last_reconcile = 0.0
 
         # Restore any live positions that survived a restart
         if store:
@@ -80,6 +112,8 @@ class KalshiBot:
                     "Restored %d position(s) from %s. %s",
                     len(restored), state_db, self.budget.summary(),
                 )
+                if self._ws is not None:
+                    self._ws.track_tickers(restored)
 
     # ------------------------------------------------------------------
     # Main loop
@@ -111,6 +145,9 @@ class KalshiBot:
                     self._tick_count, exc, exc_info=True,
                 )
 
+            if self._store is not None:
+                self._store.commit()
+
             if time.time() - last_report >= self.cfg.report_interval:
                 self._log_report()
                 last_report = time.time()
@@ -122,6 +159,10 @@ class KalshiBot:
 
         if self._ws is not None:
             self._ws.stop()
+        if self._store is not None:
+            self._store.close()
+        if self.fill_model is not None:
+            self.fill_model.save()
         logger.info("Bot stopped gracefully.")
 
     def stop(self) -> None:
@@ -136,9 +177,25 @@ class KalshiBot:
         logger.debug("--- Tick %d ---", self._tick_count)
 
         # 1. Refresh positions
-        self.order_mgr.refresh_all()
+        reconcile = self._reconcile_due()
+        if reconcile:
+            self._last_reconcile = time.time()
+        self.order_mgr.refresh_all(reconcile=reconcile)
 
         # 2. Release budget for resolved/idle positions
+        self._release_closed()
+
+        # 3. Sync live balance using actual portfolio data (cash + positions).
+        #    Skip in dry-run: API calls return constants that corrupt the tracker.
+        if not self.cfg.dry_run:
+            self._sync_portfolio_balance()
+
+        # 4. Open new positions
+        if self.budget.available >= 5.0:
+            self._open_new_positions()
+
+    def _release_closed(self) -> None:
+        """Release budget held by resolved / idle positions."""
         for ticker, pos in list(self.order_mgr.positions.items()):
             if pos.state in (PositionState.RESOLVED, PositionState.IDLE):
                 released = self.budget.deployed_in(ticker)
@@ -149,14 +206,11 @@ class KalshiBot:
                         released, title_short(pos.title),
                     )
 
-        # 3. Sync live balance using actual portfolio data (cash + positions).
-        #    Skip in dry-run: API calls return constants that corrupt the tracker.
-        if not self.cfg.dry_run:
-            self._sync_portfolio_balance()
-
-        # 4. Open new positions
-        if self.budget.available >= 5.0:
-            self._open_new_positions()
+    def _reconcile_due(self) -> bool:
+        """Full REST refresh unless WS events are live and the sweep is not due."""
+        if not self.cfg.event_driven or self._ws is None or not self._ws.connected:
+            return True
+        return time.time() - self._last_reconcile >= self.cfg.reconcile_interval
 
     # ------------------------------------------------------------------
     # Portfolio balance sync
@@ -176,8 +230,9 @@ class KalshiBot:
         cash = self.client.get_balance()
         if cash <= 0:
             return  # API error – don't corrupt the tracker
+        self._apply_portfolio_balance(cash, self.client.get_portfolio_positions())
 
-        positions = self.client.get_portfolio_positions()
+    def _apply_portfolio_balance(self, cash: float, positions: list[dict]) -> None:
         non_zero = [p for p in positions if p.get("position", 0) != 0]
         zero_net  = [p for p in positions if p.get("position", 0) == 0]
         # total_cost is in cents; sum absolute values (long YES or long NO both positive cost)
@@ -211,11 +266,17 @@ class KalshiBot:
     # ------------------------------------------------------------------
 
     def _open_new_positions(self) -> None:
-        already_active = {
-            ticker for ticker, pos in self.order_mgr.positions.items()
-            if pos.state not in (PositionState.IDLE, PositionState.RESOLVED)
-        }
+        markets = self._scan_markets()
+        if not markets:
+            return
+        opened, batch = self._quote_markets(markets, defer=self.cfg.batch_orders)
+        if batch:
+            opened += self._settle_opened(self.order_mgr.open_positions(batch))
+        if opened:
+            logger.info("Opened %d new position(s). %s", opened, self.budget.summary())
 
+    def _scan_markets(self) -> list[MarketInfo]:
+        """Selected candidate markets (tracked on the WS), [] on error."""
         try:
             markets = select_markets(
                 self.client,
@@ -224,9 +285,49 @@ class KalshiBot:
             )
         except Exception as exc:
             logger.error("select_markets error: %s", exc)
-            return
+            return []
+
+        # Candidates plus every live position; books and vols for the rest are dropped
+        keep = {m.ticker for m in markets} | self._active_tickers()
+        if self._ws is not None:
+            self._ws.track_tickers(keep)
+        if self.vols is not None:
+            self.vols.retain(keep)
+        return markets
+
+    def _active_tickers(self) -> set[str]:
+        """Tickers of positions not yet idle / resolved."""
+        return {
+            ticker for ticker, pos in self.order_mgr.positions.items()
+            if pos.state not in (PositionState.IDLE, PositionState.RESOLVED)
+        }
+
+    def _quote_markets(
+        self,
+        markets: list[MarketInfo],
+        defer: bool,
+        order_books: Optional[dict[str, Optional[OrderBook]]] = None,
+    ) -> tuple[int, list[QuoteRequest]]:
+        """
+        Size and vet a quote for each candidate market.
+
+        Positions are opened one at a time unless `defer`, in which case the
+        quotes are returned for a single placement call (budget reserved up
+        front; see _settle_opened).  `order_books` holds books already
+        fetched for these markets.  Returns (opened, deferred quotes).
+        """
+        already_active = self._active_tickers()
+
+        # Vol-spike filter inputs for every candidate, synced in one read.
+        min_ratio = self.cfg.scoring.min_vol_ratio
+        ratios: dict[str, Optional[float]] = {}
+        if min_ratio > 0 and self.vols is not None:
+            ratios = self.vols.vol_ratios(
+                m.ticker for m in markets if m.ticker not in already_active
+            )
 
         opened = 0
+        batch: list[QuoteRequest] = []
         for market in markets:
             if not self._running:
                 break
@@ -238,9 +339,8 @@ class KalshiBot:
             # Vol-spike filter: only enter when short-term realized vol is
             # sufficiently elevated vs the 7-day baseline (min_vol_ratio > 0).
             # This is the core condition for the pre-resolution hypothesis.
-            min_ratio = self.cfg.scoring.min_vol_ratio
-            if min_ratio > 0 and self._data_db:
-                ratio = vol_ratio(market.ticker, self._data_db)
+            if min_ratio > 0 and self.vols is not None:
+                ratio = ratios.get(market.ticker)
                 if ratio is None:
                     logger.debug(
                         "[%s] vol_ratio unavailable (insufficient history) – skipping.",
@@ -258,19 +358,19 @@ class KalshiBot:
                     market.ticker, ratio, min_ratio,
                 )
 
-            # Fetch order book for order-flow-aware quote adjustment.
+            # Order book for order-flow-aware quote adjustment (WS cache, else REST).
             # Best-effort: if it fails, size_position falls back to mid ± depth.
             order_book = None
-            if not self.cfg.dry_run:
-                try:
-                    order_book = self.client.get_order_book(market.ticker)
-                except Exception:
-                    pass
+            if order_books is not None and market.ticker in order_books:
+                order_book = order_books[market.ticker]
+            elif not self.cfg.dry_run:
+                order_book = self.order_mgr.get_order_book(market.ticker)
 
             sizing = size_position(
                 market, self.budget.available, self.cfg,
                 data_db=self._data_db,
                 order_book=order_book,
+                vol_tracker=self.vols,
             )
 
             # Guard: spread must be profitable
@@ -292,6 +392,20 @@ class KalshiBot:
                 logger.debug("Skip %s – insufficient budget for min contracts", market.ticker)
                 continue
 
+            self.order_mgr.note_market(market)
+            if defer:
+                # Reserve budget now so later candidates are sized against it;
+                # released again in _settle_opened if placement fails.
+                self.budget.allocate(market.ticker, sizing.budget_allocated)
+                batch.append(QuoteRequest(
+                    ticker=market.ticker,
+                    title=market.title,
+                    yes_price=sizing.yes_price,
+                    no_price=sizing.no_price,
+                    contracts=sizing.contracts_per_level,
+                ))
+                continue
+
             pos = self.order_mgr.open_position(
                 ticker=market.ticker,
                 title=market.title,
@@ -304,8 +418,17 @@ class KalshiBot:
                 self.budget.allocate(market.ticker, sizing.budget_allocated)
                 opened += 1
 
-        if opened:
-            logger.info("Opened %d new position(s). %s", opened, self.budget.summary())
+        return opened, batch
+
+    def _settle_opened(self, positions: list[MarketPosition]) -> int:
+        """Count deferred positions that opened; release the rest's budget."""
+        opened = 0
+        for pos in positions:
+            if pos.state == PositionState.QUOTING:
+                opened += 1
+            else:
+                self.budget.release(pos.ticker)
+        return opened
 
     # ------------------------------------------------------------------
     # Reporting
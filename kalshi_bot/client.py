@@ -22,13 +22,17 @@ Contract count:
 
 from __future__ import annotations
 
+import asyncio
 import base64
 import hashlib
+import itertools
 import logging
+import queue
 import threading
 import time
-from dataclasses import dataclass
-from typing import Any, Optional
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from typing import Any, Iterator, Optional
 
 import requests
 from requests.adapters import HTTPAdapter, Retry
@@ -37,6 +41,12 @@ from .config import BotConfig
 
 logger = logging.getLogger(__name__)
 
+# Largest page the /markets endpoint will return.
+_MARKETS_PAGE_LIMIT = 1000
+
+# Most orders (or cancels) the batched order endpoints accept per request.
+_BATCH_LIMIT = 20
+
 
 # ---------------------------------------------------------------------------
 # Token-bucket rate limiter
@@ -48,7 +58,9 @@ class _RateLimiter:
 
     Allows bursting up to `rate` tokens but averages out at `rate` per second.
     Shared across the read or write path so the WebSocket thread and main loop
-    both count against the same bucket.
+    both count against the same bucket — and AsyncKalshiClient can share it
+    too, since a caller reserves a token and then waits on its own terms
+    (time.sleep or asyncio.sleep).
     """
 
     def __init__(self, rate: float) -> None:
@@ -57,8 +69,8 @@ class _RateLimiter:
         self._last = time.monotonic()
         self._lock = threading.Lock()
 
-    def acquire(self) -> None:
-        """Block until a token is available."""
+    def reserve(self) -> float:
+        """Take a token; return how many seconds to wait before using it."""
         with self._lock:
             now = time.monotonic()
             self._tokens = min(
@@ -66,13 +78,21 @@ class _RateLimiter:
                 self._tokens + (now - self._last) * self._rate,
             )
             self._last = now
-            if self._tokens >= 1.0:
-                self._tokens -= 1.0
-                return
-            wait = (1.0 - self._tokens) / self._rate
-        time.sleep(wait)
-        with self._lock:
-            self._tokens = 0.0
+            # A negative balance is the queue of callers already waiting.
+            self._tokens -= 1.0
+            return max(0.0, -self._tokens / self._rate)
+
+    def acquire(self) -> None:
+        """Block until a token is available."""
+        wait = self.reserve()
+        if wait > 0:
+            time.sleep(wait)
+
+    async def acquire_async(self) -> None:
+        """Await a token without blocking the event loop."""
+        wait = self.reserve()
+        if wait > 0:
+            await asyncio.sleep(wait)
 
 
 # ---------------------------------------------------------------------------
@@ -117,11 +137,57 @@ class Order:
     created_time: str = ""
 
 
+@dataclass
+class PageStats:
+    """Page count and latency of a paginated fetch (updated as pages arrive)."""
+    pages: int = 0
+    items: int = 0
+    total_latency: float = 0.0   # seconds spent waiting on page responses
+    max_latency: float = 0.0
+    started: float = field(default_factory=time.monotonic)
+    finished: Optional[float] = None
+    _lock: threading.Lock = field(default_factory=threading.Lock, repr=False, compare=False)
+
+    def record(self, latency: float, n_items: int) -> None:
+        with self._lock:
+            self.pages += 1
+            self.items += n_items
+            self.total_latency += latency
+            self.max_latency = max(self.max_latency, latency)
+
+    @property
+    def mean_latency(self) -> float:
+        return self.total_latency / self.pages if self.pages else 0.0
+
+    @property
+    def elapsed(self) -> float:
+        return (self.finished or time.monotonic()) - self.started
+
+    def summary(self) -> str:
+        return (
+            f"{self.items} items in {self.pages} pages, {self.elapsed:.2f}s "
+            f"(latency mean {self.mean_latency * 1000:.0f}ms, "
+            f"max {self.max_latency * 1000:.0f}ms)"
+        )
+
+
+@dataclass
+class OrderIntent:
+    """A limit order to submit, e.g. one leg of a batch."""
+    ticker: str
+    side: str             # "yes" | "no"
+    action: str           # "buy" | "sell"
+    price: float          # probability 0-1
+    count: int            # number of contracts
+
+
 # ---------------------------------------------------------------------------
 # HTTP session with retry
 # ---------------------------------------------------------------------------
 
-def _make_session(retries: int = 4, backoff: float = 1.0) -> requests.Session:
+def _make_session(
+    retries: int = 4, backoff: float = 1.0, pool_size: int = 10,
+) -> requests.Session:
     session = requests.Session()
     retry = Retry(
         total=retries,
@@ -129,7 +195,9 @@ def _make_session(retries: int = 4, backoff: float = 1.0) -> requests.Session:
         status_forcelist=[429, 500, 502, 503, 504],
         allowed_methods=["GET", "POST", "DELETE"],
     )
-    adapter = HTTPAdapter(max_retries=retry)
+    # pool_size keep-alive connections per host; callers issuing requests
+    # from more threads than that would otherwise churn connections.
+    adapter = HTTPAdapter(max_retries=retry, pool_connections=pool_size, pool_maxsize=pool_size)
     session.mount("https://", adapter)
     session.mount("http://", adapter)
     return session
@@ -163,6 +231,136 @@ def _sign_request(private_key, method: str, path: str) -> tuple[str, str]:
     return ts_ms, base64.b64encode(signature).decode("utf-8")
 
 
+class _Signer:
+    """
+    Kalshi auth-header factory for one key.
+
+    The PSS padding and hash objects are built once instead of per request;
+    only the timestamp and signature are computed per call.  Thread-safe.
+    """
+
+    def __init__(self, private_key, key_id: str) -> None:
+        from cryptography.hazmat.primitives import hashes
+        from cryptography.hazmat.primitives.asymmetric import padding
+
+        self._key = private_key
+        self._key_id = key_id
+        self._padding = padding.PSS(
+            mgf=padding.MGF1(hashes.SHA256()),
+            salt_length=padding.PSS.DIGEST_LENGTH,
+        )
+        self._hash = hashes.SHA256()
+
+    def headers(self, method: str, full_path: str) -> dict:
+        ts_ms = str(int(time.time() * 1000))
+        msg = (ts_ms + method.upper() + full_path).encode("utf-8")
+        signature = self._key.sign(msg, self._padding, self._hash)
+        return {
+            "KALSHI-ACCESS-KEY": self._key_id,
+            "KALSHI-ACCESS-TIMESTAMP": ts_ms,
+            "KALSHI-ACCESS-SIGNATURE": base64.b64encode(signature).decode("utf-8"),
+            "Content-Type": "application/json",
+        }
+
+
+# ---------------------------------------------------------------------------
+# Response parsing (shared with AsyncKalshiClient)
+# ---------------------------------------------------------------------------
+
+def _to_prob(cents: int | float) -> float:
+    return float(cents) / 100.0
+
+
+def _parse_order_book(ticker: str, data: dict) -> OrderBook:
+    """
+    Build an OrderBook from a /markets/{ticker}/orderbook response.
+
+    Kalshi only returns YES bids. YES asks are derived from NO bids:
+      yes_ask_price = 1 - no_bid_price
+    """
+    book = data.get("orderbook", data)
+
+    yes_bids_raw = book.get("yes") or []   # [[price_cents, count], ...]
+    no_bids_raw = book.get("no") or []
+
+    # YES bids: descending
+    yes_bids = [(_to_prob(row[0]), int(row[1])) for row in yes_bids_raw]
+    # YES asks derived from NO bids (ascending = lowest ask first)
+    yes_asks = sorted(
+        [(_to_prob(100 - row[0]), int(row[1])) for row in no_bids_raw],
+        key=lambda x: x[0],
+    )
+
+    best_bid = yes_bids[0][0] if yes_bids else 0.0
+    best_ask = yes_asks[0][0] if yes_asks else 1.0
+    return OrderBook(
+        ticker=ticker,
+        yes_bids=yes_bids,
+        yes_asks=yes_asks,
+        mid=(best_bid + best_ask) / 2,
+        spread=best_ask - best_bid,
+    )
+
+
+def _placed_ids(chunk: list[OrderIntent], results: list[dict]) -> list[Optional[str]]:
+    """Per-intent order ids from one batched-create response (None = rejected)."""
+    ids: list[Optional[str]] = []
+    for i, it in enumerate(chunk):
+        item = results[i] if i < len(results) else {}
+        order = item.get("order") or {}
+        order_id = order.get("order_id") if not item.get("error") else None
+        if order_id:
+            logger.info(
+                "Order placed: %s %s %s @ %.4f ×%d → id=%s",
+                it.action.upper(), it.side.upper(), it.ticker, it.price, it.count, order_id,
+            )
+        elif item:
+            logger.error(
+                "Batch order %s %s %s rejected: %s",
+                it.action.upper(), it.side.upper(), it.ticker, item.get("error"),
+            )
+        ids.append(order_id or None)
+    return ids
+
+
+def _cancelled_flags(chunk: list[str], resp: dict) -> list[bool]:
+    """Per-order success flags from one batched-cancel response."""
+    errors = {item.get("order_id"): item.get("error") for item in resp.get("orders", [])}
+    ok: list[bool] = []
+    for order_id in chunk:
+        if order_id in errors and not errors[order_id]:
+            logger.info("Cancelled order %s", order_id)
+            ok.append(True)
+        else:
+            logger.error(
+                "cancel_orders_batch(%s) error: %s",
+                order_id, errors.get(order_id, "missing from response"),
+            )
+            ok.append(False)
+    return ok
+
+
+def _parse_order(o: dict, order_id: str = "", status: str = "") -> Order:
+    """Build an Order from a raw Kalshi order dict (yes_price in cents)."""
+    # yes_price is always present; no_price = 100 - yes_price
+    yes_price_cents = o.get("yes_price", 50)
+    side = o.get("side", "yes").lower()
+    price_prob = (
+        _to_prob(yes_price_cents) if side == "yes" else _to_prob(100 - yes_price_cents)
+    )
+    return Order(
+        order_id=o.get("order_id", order_id),
+        ticker=o.get("ticker", ""),
+        side=side,
+        action=o.get("action", "buy").lower(),
+        price=price_prob,
+        count=int(o.get("count", 0)),
+        status=o.get("status", status).lower(),
+        filled_count=int(o.get("filled_count", 0)),
+        created_time=o.get("created_time", ""),
+    )
+
+
 # ---------------------------------------------------------------------------
 # Kalshi client
 # ---------------------------------------------------------------------------
@@ -180,6 +378,8 @@ class KalshiClient:
         self._session = _make_session()
         self._base = config.api_base
         self._private_key = None
+        self._signer: Optional[_Signer] = None
+        self.last_market_fetch: Optional[PageStats] = None
 
         # Kalshi Basic tier: 20 reads/sec, 10 writes/sec.
         # Use 80 % of the limit to leave headroom and avoid 429/401 bursts.
@@ -189,6 +389,7 @@ class KalshiClient:
         if not config.dry_run:
             try:
                 self._private_key = config.load_private_key()
+                self._signer = _Signer(self._private_key, config.api_key_id)
                 logger.info("Kalshi RSA key loaded (key_id=%s).", config.api_key_id)
             except Exception as exc:
                 logger.error("Failed to load private key: %s", exc)
@@ -200,21 +401,14 @@ class KalshiClient:
 
     def _auth_headers(self, method: str, path: str) -> dict:
         """Return the three Kalshi auth headers for a signed request."""
-        if self._private_key is None:
+        if self._signer is None:
             return {}
-        ts, sig = _sign_request(self._private_key, method, path)
-        return {
-            "KALSHI-ACCESS-KEY": self.cfg.api_key_id,
-            "KALSHI-ACCESS-TIMESTAMP": ts,
-            "KALSHI-ACCESS-SIGNATURE": sig,
-            "Content-Type": "application/json",
-        }
+        return self._signer.headers(method, path)
 
     def _full_path(self, path: str) -> str:
         """Return the full API path used in signing (e.g. /trade-api/v2/portfolio/balance)."""
         from urllib.parse import urlparse
-        parsed = urlparse(self._base)
-        return parsed.path + path
+        return urlparse(self._base).path + path
 
     def _get(self, path: str, params: dict | None = None, auth: bool = True) -> Any:
         self._read_limiter.acquire()
@@ -232,11 +426,11 @@ class KalshiClient:
         resp.raise_for_status()
         return resp.json()
 
-    def _delete(self, path: str) -> Any:
+    def _delete(self, path: str, body: dict | None = None) -> Any:
         self._write_limiter.acquire()
         url = self._base + path
         headers = self._auth_headers("DELETE", self._full_path(path))
-        resp = self._session.delete(url, headers=headers, timeout=15)
+        resp = self._session.delete(url, headers=headers, json=body, timeout=15)
         resp.raise_for_status()
         return resp.json()
 
@@ -258,11 +452,124 @@ class KalshiClient:
     # Market data
     # ------------------------------------------------------------------
 
-    def get_active_markets(self, limit: int = 100) -> list[dict]:
-        """Return raw market dicts from the Kalshi markets endpoint."""
-        params = {"status": "open", "limit": min(limit, 200)}
-        data = self._get("/markets", params=params, auth=False)
-        return data.get("markets", [])
+    def iter_markets(
+        self,
+        params: dict | None = None,
+        page_size: int = _MARKETS_PAGE_LIMIT,
+        stats: Optional[PageStats] = None,
+        stop: Optional[threading.Event] = None,
+    ) -> Iterator[list[dict]]:
+        """
+        Follow the /markets cursor and yield one page of raw market dicts at a
+        time.  Each page request goes through the shared read rate limiter.
+        `stop` ends the walk before the next request is issued.
+        """
+        query = {**(params or {}), "limit": min(page_size, _MARKETS_PAGE_LIMIT)}
+        cursor = None
+        while stop is None or not stop.is_set():
+            if cursor:
+                query["cursor"] = cursor
+            t0 = time.monotonic()
+            data = self._get("/markets", params=dict(query), auth=False)
+            page = data.get("markets", [])
+            if stats is not None:
+                stats.record(time.monotonic() - t0, len(page))
+            yield page
+            cursor = data.get("cursor")
+            if not cursor or not page:
+                return
+
+    def iter_active_markets(
+        self,
+        partitions: list[dict] | None = None,
+        max_workers: int = 4,
+        stats: Optional[PageStats] = None,
+    ) -> Iterator[dict]:
+        """
+        Stream every open market, following the response cursor to the end.
+
+        Cursor pages are inherently sequential, so concurrency comes from
+        `partitions`: extra query params (e.g. {"series_ticker": ...}) that
+        split the universe into independent cursor chains.  Those chains are
+        walked on up to `max_workers` threads — all drawing from the same read
+        limiter — and markets are yielded as soon as any page lands.  Tickers
+        seen in more than one partition are yielded once.
+
+        Closing the iterator early stops the workers after their in-flight
+        request.
+        """
+        base = {"status": "open"}
+        seen: set[str] = set()
+
+        def fresh(page: list[dict]) -> Iterator[dict]:
+            for raw in page:
+                ticker = raw.get("ticker")
+                if ticker is not None:
+                    if ticker in seen:
+                        continue
+                    seen.add(ticker)
+                yield raw
+
+        try:
+            if not partitions or max_workers <= 1:
+                for part in partitions or [{}]:
+                    for page in self.iter_markets({**base, **part}, stats=stats):
+                        yield from fresh(page)
+                return
+
+            pages: queue.Queue = queue.Queue()
+            stop = threading.Event()
+            done = object()
+
+            def walk(part: dict) -> None:
+                try:
+                    for page in self.iter_markets({**base, **part}, stats=stats, stop=stop):
+                        pages.put(page)
+                except Exception as exc:  # surfaced to the consumer below
+                    pages.put(exc)
+                finally:
+                    pages.put(done)
+
+            pool = ThreadPoolExecutor(max_workers=min(max_workers, len(partitions)))
+            try:
+                for part in partitions:
+                    pool.submit(walk, part)
+                remaining = len(partitions)
+                while remaining:
+                    item = pages.get()
+                    if item is done:
+                        remaining -= 1
+                    elif isinstance(item, Exception):
+                        raise item
+                    else:
+                        yield from fresh(item)
+            finally:
+                stop.set()
+                pool.shutdown(wait=True)
+        finally:
+            if stats is not None:
+                stats.finished = time.monotonic()
+
+    def get_active_markets(
+        self,
+        limit: Optional[int] = None,
+        partitions: list[dict] | None = None,
+        max_workers: int = 4,
+    ) -> list[dict]:
+        """
+        Return raw market dicts for every open market (or the first `limit`).
+
+        Page count and latency of the fetch are kept on last_market_fetch.
+        """
+        stats = PageStats()
+        stream = self.iter_active_markets(partitions, max_workers, stats)
+        try:
+            markets = list(itertools.islice(stream, limit))
+        finally:
+            stream.close()
+        self.last_market_fetch = stats
+        logger.info("Fetched open markets: %s", stats.summary())
+        return markets
 
     def get_market(self, ticker: str) -> dict:
         """Fetch a single market by ticker."""
@@ -277,34 +584,7 @@ class KalshiClient:
           yes_ask_price = 1 - no_bid_price
         """
         data = self._get(f"/markets/{ticker}/orderbook", auth=False)
-        book = data.get("orderbook", data)
-
-        yes_bids_raw = book.get("yes", [])   # [[price_cents, count], ...]
-        no_bids_raw = book.get("no", [])
-
-        # YES bids: descending
-        yes_bids = [
-            (self._to_prob(row[0]), int(row[1]))
-            for row in yes_bids_raw
-        ]
-        # YES asks derived from NO bids (ascending = lowest ask first)
-        yes_asks = sorted(
-            [(self._to_prob(100 - row[0]), int(row[1])) for row in no_bids_raw],
-            key=lambda x: x[0],
-        )
-
-        best_bid = yes_bids[0][0] if yes_bids else 0.0
-        best_ask = yes_asks[0][0] if yes_asks else 1.0
-        mid = (best_bid + best_ask) / 2
-        spread = best_ask - best_bid
-
-        return OrderBook(
-            ticker=ticker,
-            yes_bids=yes_bids,
-            yes_asks=yes_asks,
-            mid=mid,
-            spread=spread,
-        )
+        return _parse_order_book(ticker, data)
 
     # ------------------------------------------------------------------
     # Account
@@ -347,14 +627,7 @@ class KalshiClient:
             return f"dry-{ticker[:12]}-{side}-{action}-{int(time.time())}"
 
         try:
-            body = {
-                "ticker": ticker,
-                "action": action,
-                "side": side,
-                "type": "limit",
-                "yes_price": self._to_cents(price) if side == "yes" else 100 - self._to_cents(price),
-                "count": count,
-            }
+            body = self._order_body(OrderIntent(ticker, side, action, price, count))
             resp = self._post("/portfolio/orders", body)
             order = resp.get("order", resp)
             order_id = order.get("order_id", "")
@@ -367,6 +640,72 @@ class KalshiClient:
             logger.error("place_limit_order error: %s", exc)
             return None
 
+    @staticmethod
+    def _order_body(intent: OrderIntent) -> dict:
+        """Kalshi JSON body for a GTC limit order."""
+        cents = KalshiClient._to_cents(intent.price)
+        return {
+            "ticker": intent.ticker,
+            "action": intent.action,
+            "side": intent.side,
+            "type": "limit",
+            "yes_price": cents if intent.side == "yes" else 100 - cents,
+            "count": intent.count,
+        }
+
+    def place_orders_batch(self, intents: list[OrderIntent]) -> list[Optional[str]]:
+        """
+        Submit limit orders through the batched endpoint, _BATCH_LIMIT per
+        signed request.  Returns one order_id (or None on failure) per intent,
+        in input order.
+        """
+        if self.cfg.dry_run:
+            now = int(time.time())
+            for it in intents:
+                logger.info(
+                    "[DRY-RUN] Would place %s %s %s @ %.4f × %d contracts (batch)",
+                    it.action.upper(), it.side.upper(), it.ticker, it.price, it.count,
+                )
+            return [f"dry-{it.ticker[:12]}-{it.side}-{it.action}-{now}" for it in intents]
+
+        ids: list[Optional[str]] = []
+        for start in range(0, len(intents), _BATCH_LIMIT):
+            chunk = intents[start:start + _BATCH_LIMIT]
+            try:
+                resp = self._post(
+                    "/portfolio/orders/batched",
+                    {"orders": [self._order_body(it) for it in chunk]},
+                )
+                results = resp.get("orders", [])
+            except Exception as exc:
+                logger.error("place_orders_batch error (%d orders): %s", len(chunk), exc)
+                results = []
+
+            ids.extend(_placed_ids(chunk, results))
+        return ids
+
+    def cancel_orders_batch(self, order_ids: list[str]) -> list[bool]:
+        """
+        Cancel orders through the batched endpoint, _BATCH_LIMIT per signed
+        request.  Returns one success flag per order_id, in input order.
+        """
+        if self.cfg.dry_run:
+            for order_id in order_ids:
+                logger.info("[DRY-RUN] Would cancel order %s (batch)", order_id)
+            return [True] * len(order_ids)
+
+        ok: list[bool] = []
+        for start in range(0, len(order_ids), _BATCH_LIMIT):
+            chunk = order_ids[start:start + _BATCH_LIMIT]
+            try:
+                resp = self._delete("/portfolio/orders/batched", {"ids": chunk})
+            except Exception as exc:
+                logger.error("cancel_orders_batch error (%d orders): %s", len(chunk), exc)
+                ok.extend([False] * len(chunk))
+                continue
+            ok.extend(_cancelled_flags(chunk, resp))
+        return ok
+
     def cancel_order(self, order_id: str) -> bool:
         """Cancel a single open order. Returns True on success."""
         if self.cfg.dry_run:
@@ -388,29 +727,7 @@ class KalshiClient:
 
         try:
             data = self._get("/portfolio/orders", params={"status": "resting"})
-            raw_orders = data.get("orders", [])
-            orders = []
-            for o in raw_orders:
-                # yes_price is always present; no_price = 100 - yes_price
-                yes_price_cents = o.get("yes_price", 50)
-                side = o.get("side", "yes").lower()
-                if side == "yes":
-                    price_prob = self._to_prob(yes_price_cents)
-                else:
-                    price_prob = self._to_prob(100 - yes_price_cents)
-
-                orders.append(Order(
-                    order_id=o.get("order_id", ""),
-                    ticker=o.get("ticker", ""),
-                    side=side,
-                    action=o.get("action", "buy").lower(),
-                    price=price_prob,
-                    count=int(o.get("count", 0)),
-                    status=o.get("status", "resting").lower(),
-                    filled_count=int(o.get("filled_count", 0)),
-                    created_time=o.get("created_time", ""),
-                ))
-            return orders
+            return [_parse_order(o, status="resting") for o in data.get("orders", [])]
         except Exception as exc:
             logger.error("get_open_orders error: %s", exc)
             return []
@@ -441,25 +758,7 @@ class KalshiClient:
 
         try:
             data = self._get(f"/portfolio/orders/{order_id}")
-            o = data.get("order", data)
-            yes_price_cents = o.get("yes_price", 50)
-            side = o.get("side", "yes").lower()
-            price_prob = (
-                self._to_prob(yes_price_cents)
-                if side == "yes"
-                else self._to_prob(100 - yes_price_cents)
-            )
-            return Order(
-                order_id=o.get("order_id", order_id),
-                ticker=o.get("ticker", ""),
-                side=side,
-                action=o.get("action", "buy").lower(),
-                price=price_prob,
-                count=int(o.get("count", 0)),
-                status=o.get("status", "").lower(),
-                filled_count=int(o.get("filled_count", 0)),
-                created_time=o.get("created_time", ""),
-            )
+            return _parse_order(data.get("order", data), order_id=order_id)
         except Exception as exc:
             logger.error("get_order_status(%s) error: %s", order_id, exc)
             return None
@@ -10,6 +10,7 @@ Environment variables (set in .env or shell):
 from __future__ import annotations
 import os
 from dataclasses import dataclass, field
+from typing import Optional
 
 
 # ---------------------------------------------------------------------------
@@ -173,6 +174,41 @@ class BotConfig:
         default_factory=lambda: os.getenv("KALSHI_DRY_RUN", "false").lower() == "true"
     )
 
+    # Submit each tick's new orders / cancels through the batched endpoints
+    batch_orders: bool = field(
+        default_factory=lambda: os.getenv("KALSHI_BATCH_ORDERS", "false").lower() == "true"
+    )
+
+    # Drive position state from WebSocket fill / order events; REST polling
+    # becomes a reconciliation sweep every reconcile_interval seconds
+    event_driven: bool = field(
+        default_factory=lambda: os.getenv("KALSHI_EVENT_DRIVEN", "false").lower() == "true"
+    )
+    reconcile_interval: int = 600
+
+    # Keep live order books for tracked tickers from the WebSocket
+    # orderbook_delta channel instead of GET /orderbook every tick
+    ws_order_books: bool = field(
+        default_factory=lambda: os.getenv("KALSHI_WS_ORDER_BOOKS", "false").lower() == "true"
+    )
+
+    # Run the bot loop on asyncio (AsyncKalshiBot): each tick's REST reads
+    # and placements go out concurrently over up to max_connections
+    # keep-alive connections
+    async_io: bool = field(
+        default_factory=lambda: os.getenv("KALSHI_ASYNC", "false").lower() == "true"
+    )
+    max_connections: int = 32
+
+    # Seconds a ticker's realized vol is served from memory before
+    # market_data.db is read again; match the data collector's --interval
+    vol_cache_ttl: int = 60
+    # Days of position events kept in bot_state.db's journal before they are
+    # folded into its snapshot (0 = keep every event)
+    state_journal_days: float = 30.0
+    # JSON checkpoint for the online fill model; None = no live learning
+    fill_model_path: Optional[str] = None
+
     @property
     def api_base(self) -> str:
         return KALSHI_DEMO_BASE if self.demo else KALSHI_API_BASE
@@ -185,6 +221,8 @@ class BotConfig:
             raise ValueError("Kelly multiplier must be between 0.0 and 1.0")
         if self.risk.order_levels < 1:
             raise ValueError("Order levels must be at least 1")
+        if self.max_connections < 1:
+            raise ValueError("max_connections must be at least 1")
         if self.dry_run:
             return
         missing = []
@@ -4,23 +4,53 @@ Market data collector for the Kalshi market-making bot.
 Polls the Kalshi REST API on a fixed interval and stores order-book
 snapshots in a local SQLite database for later replay / backtesting.
 
+Writes go through a SnapshotWriter: one long-lived connection in WAL mode
+(so VolTracker / replay readers never block the writer or each other),
+synchronous=NORMAL, and a background thread that commits each poll's rows
+in a single executemany transaction — polling never waits on disk.  Only
+the (ticker, ts) index is maintained; every reader filters by ticker.  The
+same transaction folds the rows into minute / hour OHLC bars (rollups.py).
+
+--change-only stores a market's row only when its quote moves (plus a
+keyframe every --keyframe-interval seconds) and records the poll grid so
+readers forward-fill it back (see snapshot_grid.py).
+
+--stream switches to StreamingCollector: one REST snapshot, then a row per
+WebSocket ticker update (sub-second timestamps) instead of a REST poll
+every interval.
+
+Old rows are moved out of the hot database by retention.py (partitions,
+downsampling, cold storage for closed markets); --stats counts both.
+
 Usage (from repo root):
     python -m kalshi_bot.data_collector --db market_data.db
     python -m kalshi_bot.data_collector --db market_data.db --interval 60
+    python -m kalshi_bot.data_collector --db market_data.db --stream
     python -m kalshi_bot.data_collector --db market_data.db --stats
+    python -m kalshi_bot.data_collector --db market_data.db --rebuild-rollups
+    python -m kalshi_bot.data_collector --bench
 """
 
 from __future__ import annotations
 
 import argparse
 import logging
+import os
+import queue
 import sqlite3
+import tempfile
+import threading
 import time
 from datetime import datetime, timezone
+from typing import Optional, Sequence, Union
 
 from .client import KalshiClient
 from .config import BotConfig
+from . import rollups
 from .market_selector import _parse_market
+from .retention import archived_summary
+from .snapshot_grid import GRID_KEY, KEYFRAME_KEY
+from .ws_client import KalshiWebSocket
 
 logger = logging.getLogger(__name__)
 
@@ -37,34 +67,208 @@ CREATE TABLE IF NOT EXISTS market_snapshots (
     spread        REAL,
     status        TEXT
 );
-CREATE INDEX IF NOT EXISTS idx_ts        ON market_snapshots(ts);
-CREATE INDEX IF NOT EXISTS idx_ticker    ON market_snapshots(ticker);
 CREATE INDEX IF NOT EXISTS idx_ticker_ts ON market_snapshots(ticker, ts);
+CREATE TABLE IF NOT EXISTS collector_meta (
+    key   TEXT PRIMARY KEY,
+    value TEXT NOT NULL
+);
 """
 
+# idx_ticker is a prefix of idx_ticker_ts and no reader filters on ts alone;
+# both only cost write amplification on every insert.
+_DROPPED_INDEXES = ("idx_ts", "idx_ticker")
+
+_INSERT = """INSERT INTO market_snapshots
+   (ts, ticker, yes_bid, yes_ask, volume_24h, open_interest, mid, spread, status)
+   VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)"""
+
+Row = tuple   # (ts, ticker, yes_bid, yes_ask, volume_24h, open_interest, mid, spread, status)
+
+
+def open_writer_db(db_path: str) -> sqlite3.Connection:
+    """
+    Open (creating if needed) market_data.db tuned for append-heavy writes.
+
+    page_size only takes effect on a new file, so it is set before the
+    schema; WAL + synchronous=NORMAL trades durability of the last few
+    commits on power loss (never corruption) for no fsync per commit.
+    """
+    conn = sqlite3.connect(db_path, timeout=30.0, check_same_thread=False)
+    conn.execute("PRAGMA page_size = 8192")
+    conn.execute("PRAGMA journal_mode = WAL")
+    conn.execute("PRAGMA synchronous = NORMAL")
+    conn.execute("PRAGMA temp_store = MEMORY")
+    conn.execute("PRAGMA cache_size = -65536")   # 64 MiB
+    conn.executescript(_SCHEMA)
+    for name in _DROPPED_INDEXES:
+        conn.execute(f"DROP INDEX IF EXISTS {name}")
+    rollups.init(conn)
+    conn.commit()
+    return conn
+
+
+# ---------------------------------------------------------------------------
+# Background writer
+# ---------------------------------------------------------------------------
+
+class SnapshotWriter:
+    """
+    Owns the collector's single write connection on a daemon thread.
+
+    submit() only enqueues; the thread drains whatever batches are waiting
+    and commits them together in one transaction, so a slow disk delays
+    rows reaching the DB but never the next poll.  flush() blocks until
+    everything submitted so far is committed; close() flushes and stops.
+    """
+
+    _STOP = object()
+
+    def __init__(self, db_path: str) -> None:
+        self.db_path = db_path
+        self.rows_written = 0
+        self._queue: queue.Queue = queue.Queue()
+        self._conn = open_writer_db(db_path)
+        self._thread = threading.Thread(target=self._run, name="snapshot-writer", daemon=True)
+        self._thread.start()
+
+    def submit(self, rows: Sequence[Row]) -> None:
+        if rows:
+            self._queue.put(rows)
+
+    def set_meta(self, **values: object) -> None:
+        """Upsert collector_meta keys (applied in order with submitted rows)."""
+        self._queue.put({k: str(v) for k, v in values.items()})
+
+    def flush(self) -> None:
+        self._queue.join()
+
+    def close(self) -> None:
+        if self._thread.is_alive():
+            self._queue.put(self._STOP)
+            self._thread.join()
+        self._conn.close()
+
+    def _run(self) -> None:
+        while True:
+            items = [self._queue.get()]
+            while True:   # coalesce everything already waiting
+                try:
+                    items.append(self._queue.get_nowait())
+                except queue.Empty:
+                    break
+            stop = any(item is self._STOP for item in items)
+            batches = [item for item in items if item is not self._STOP]
+            try:
+                if batches:
+                    self._write(batches)
+            finally:
+                for _ in items:
+                    self._queue.task_done()
+            if stop:
+                return
+
+    def _write(self, batches: list[Union[Sequence[Row], dict]]) -> None:
+        n = sum(len(b) for b in batches if not isinstance(b, dict))
+        try:
+            with self._conn:   # one transaction for all pending batches
+                for batch in batches:
+                    if isinstance(batch, dict):
+                        self._conn.executemany(
+                            "INSERT OR REPLACE INTO collector_meta (key, value) VALUES (?, ?)",
+                            batch.items(),
+                        )
+                    else:
+                        self._conn.executemany(_INSERT, batch)
+                        rollups.upsert(self._conn, batch)
+        except Exception:   # never let one bad batch kill the writer thread
+            logger.exception("Snapshot write failed (%d rows dropped)", n)
+            return
+        self.rows_written += n
+
+
+class _ChangeFilter:
+    """
+    Pass a row only if its quote moved or its ticker is due a keyframe.
+
+    The newest suppressed row per ticker is held back; release_held() (on
+    shutdown) stores them so readers know each quote lasted until the
+    collector stopped, rather than guessing across the downtime.
+    """
+
+    def __init__(self, keyframe_seconds: float) -> None:
+        self.keyframe = keyframe_seconds
+        self._last: dict[str, tuple[tuple, float]] = {}   # ticker -> (quote, stored ts)
+        self._held: dict[str, Row] = {}
+
+    def changed(self, row: Row) -> bool:
+        quote = (row[2], row[3], row[8])   # yes_bid, yes_ask, status
+        prev = self._last.get(row[1])
+        if prev is not None and prev[0] == quote and row[0] - prev[1] < self.keyframe:
+            self._held[row[1]] = row
+            return False
+        self._last[row[1]] = (quote, row[0])
+        self._held.pop(row[1], None)
+        return True
+
+    def filter(self, rows: list[Row]) -> list[Row]:
+        return [row for row in rows if self.changed(row)]
+
+    def release_held(self) -> list[Row]:
+        held, self._held = list(self._held.values()), {}
+        for row in held:
+            self._last[row[1]] = ((row[2], row[3], row[8]), row[0])
+        return held
+
 
 class DataCollector:
-    """Poll the Kalshi API and persist market snapshots to SQLite."""
+    """
+    Poll the Kalshi API and persist market snapshots to SQLite.
+
+    With change_only, a market's row is stored only when yes_bid / yes_ask /
+    status differ from its last stored row, or keyframe_interval seconds
+    have passed since it.
+    """
 
-    def __init__(self, db_path: str, config: BotConfig) -> None:
+    def __init__(
+        self,
+        db_path: str,
+        config: BotConfig,
+        change_only: bool = False,
+        keyframe_interval: int = 900,
+    ) -> None:
         self.db_path = db_path
         self.client = KalshiClient(config)
-        self._init_db()
-
-    def _init_db(self) -> None:
-        with sqlite3.connect(self.db_path) as conn:
-            conn.executescript(_SCHEMA)
+        self.writer = SnapshotWriter(db_path)
+        self.keyframe_interval = keyframe_interval
+        self._changes = _ChangeFilter(keyframe_interval) if change_only else None
         logger.info("Database ready: %s", self.db_path)
 
-    def collect_once(self) -> int:
-        """Single poll: fetch all open markets and store snapshots. Returns row count."""
+    def close(self) -> None:
+        """Flush pending snapshots and close the write connection."""
+        if self._changes is not None:
+            self.writer.submit(self._changes.release_held())
+        self.writer.close()
+
+    def collect_once(self, ts: Optional[int] = None) -> int:
+        """
+        Single poll: fetch all open markets and queue their snapshots (stamped
+        `ts`, default now) for the writer thread.  Returns rows stored (call
+        writer.flush() to wait for them to be committed).
+        """
+        rows = self._poll_rows(int(time.time()) if ts is None else ts)
+        if self._changes is not None:
+            rows = self._changes.filter(rows)
+        self.writer.submit(rows)
+        return len(rows)
+
+    def _poll_rows(self, ts: float) -> list[Row]:
+        """Fetch all open markets over REST as snapshot rows stamped `ts`."""
         try:
             raw_markets = self.client.get_active_markets()
         except Exception as exc:
             logger.error("API fetch failed: %s", exc)
-            return 0
+            return []
 
-        ts = int(time.time())
         rows = []
         for raw in raw_markets:
             m = _parse_market(raw)
@@ -81,29 +285,151 @@ class DataCollector:
                 m.spread,
                 m.status,
             ))
-        if not rows:
-            return 0
-
-        with sqlite3.connect(self.db_path) as conn:
-            conn.executemany(
-                """INSERT INTO market_snapshots
-                   (ts, ticker, yes_bid, yes_ask, volume_24h, open_interest, mid, spread, status)
-                   VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)""",
-                rows,
-            )
+        return rows
+
+    def run(self, interval: int = 60) -> None:
+        """
+        Run collection loop indefinitely (Ctrl-C to stop).
+
+        Polls are scheduled on a fixed grid (start + k·interval, skipping any
+        a slow poll overran) and stamped with their grid time, so change-only
+        rows can be forward-filled back onto it.
+        """
+        logger.info(
+            "Collector started — interval=%ds  change_only=%s  db=%s",
+            interval, self._changes is not None, self.db_path,
+        )
+        if self._changes is not None:
+            self.writer.set_meta(**{GRID_KEY: interval, KEYFRAME_KEY: self.keyframe_interval})
+        tick = int(time.time())
+        try:
+            while True:
+                n = self.collect_once(tick)
+                logger.info(
+                    "[%s] Stored %d snapshots",
+                    datetime.now(tz=timezone.utc).strftime("%H:%M:%S"),
+                    n,
+                )
+                tick += interval
+                now = time.time()
+                while tick <= now:
+                    tick += interval
+                time.sleep(max(0.0, tick - now))
+        finally:
+            self.close()
+
+
+# ---------------------------------------------------------------------------
+# Streaming collector
+# ---------------------------------------------------------------------------
+
+class StreamingCollector(DataCollector):
+    """
+    Record a snapshot row for every WebSocket ticker update.
+
+    One REST pass at start-up (and every `resync_interval` seconds) stores
+    a full snapshot and seeds the fields the ticker channel doesn't carry
+    (status, 24h volume).  After that the "ticker" channel pushes each
+    market's top of book as it changes; updates are buffered in memory and
+    handed to the writer thread every `flush_interval` seconds.
+
+    Streamed rows are stamped with the receive time to the millisecond, so
+    their ts is fractional (stored as REAL in the INTEGER-affinity column;
+    every reader only does arithmetic and ordering on ts).  change_only
+    drops updates that leave the quote unchanged (e.g. open-interest only).
+    """
+
+    def __init__(
+        self,
+        db_path: str,
+        config: BotConfig,
+        flush_interval: float = 1.0,
+        resync_interval: float = 3600.0,
+        change_only: bool = False,
+        keyframe_interval: int = 900,
+    ) -> None:
+        super().__init__(db_path, config, change_only, keyframe_interval)
+        self.flush_interval = flush_interval
+        self.resync_interval = resync_interval
+        self.updates = 0
+        self._state: dict[str, list] = {}   # ticker -> mutable Row fields (ts excluded)
+        self._buffer: list[Row] = []
+        self._lock = threading.Lock()
+        self.ws = KalshiWebSocket(config, on_fill=None, on_ticker=self.handle_ticker)
+
+    def resync(self) -> int:
+        """Full REST snapshot; refreshes per-ticker status / 24h volume."""
+        rows = self._poll_rows(int(time.time()))
+        with self._lock:
+            for row in rows:
+                self._state[row[1]] = list(row[1:])
+            if self._changes is not None:
+                rows = self._changes.filter(rows)
+        self.writer.submit(rows)
         return len(rows)
 
+    def handle_ticker(self, msg: dict) -> None:
+        """Apply one ticker-channel message and buffer the resulting row."""
+        ticker = msg["market_ticker"]
+        ts = round(time.time(), 3)
+        with self._lock:
+            state = self._state.get(ticker)
+            if state is None:
+                # ticker, yes_bid, yes_ask, volume_24h, open_interest, mid, spread, status
+                state = self._state[ticker] = [ticker, None, None, None, None, None, None, None]
+            if msg.get("yes_bid") is not None:
+                state[1] = msg["yes_bid"] / 100.0
+            if msg.get("yes_ask") is not None:
+                state[2] = msg["yes_ask"] / 100.0
+            if msg.get("open_interest") is not None:
+                state[4] = float(msg["open_interest"])
+            if state[1] is not None and state[2] is not None:
+                state[5] = (state[1] + state[2]) / 2
+                state[6] = state[2] - state[1]
+            self.updates += 1
+            row = (ts, *state)
+            if self._changes is None or self._changes.changed(row):
+                self._buffer.append(row)
+
+    def flush(self) -> int:
+        """Hand buffered rows to the writer. Returns row count."""
+        with self._lock:
+            rows, self._buffer = self._buffer, []
+        self.writer.submit(rows)
+        return len(rows)
+
+    def close(self) -> None:
+        self.ws.stop()
+        self.flush()
+        super().close()
+
     def run(self, interval: int = 60) -> None:
-        """Run collection loop indefinitely (Ctrl-C to stop)."""
-        logger.info("Collector started — interval=%ds  db=%s", interval, self.db_path)
-        while True:
-            n = self.collect_once()
-            logger.info(
-                "[%s] Stored %d snapshots",
-                datetime.now(tz=timezone.utc).strftime("%H:%M:%S"),
-                n,
-            )
-            time.sleep(interval)
+        """Stream until interrupted, logging a summary every `interval` seconds."""
+        logger.info(
+            "Streaming collector started — flush=%.1fs  resync=%.0fs  db=%s",
+            self.flush_interval, self.resync_interval, self.db_path,
+        )
+        self.resync()
+        self.ws.start()
+        last_resync = last_report = time.time()
+        stored = 0
+        try:
+            while True:
+                time.sleep(self.flush_interval)
+                stored += self.flush()
+                now = time.time()
+                if now - last_resync >= self.resync_interval:
+                    stored += self.resync()
+                    last_resync = now
+                if now - last_report >= interval:
+                    logger.info(
+                        "[%s] Stored %d snapshots (ws %s, %d markets)",
+                        datetime.now(tz=timezone.utc).strftime("%H:%M:%S"),
+                        stored, "up" if self.ws.connected else "down", len(self._state),
+                    )
+                    stored, last_report = 0, now
+        finally:
+            self.close()
 
 
 def _print_stats(db_path: str) -> None:
@@ -113,6 +439,7 @@ def _print_stats(db_path: str) -> None:
         tickers,= conn.execute("SELECT COUNT(DISTINCT ticker) FROM market_snapshots").fetchone()
         row = conn.execute("SELECT MIN(ts), MAX(ts) FROM market_snapshots").fetchone()
         first, last = row if row else (None, None)
+        archived = archived_summary(conn)
 
     span_h = (last - first) / 3600.0 if first and last else 0.0
     fmt = lambda ts: datetime.fromtimestamp(ts, tz=timezone.utc).strftime("%Y-%m-%d %H:%M UTC")
@@ -122,7 +449,81 @@ def _print_stats(db_path: str) -> None:
     print(f"  Tickers      : {tickers:,}")
     print(f"  Span         : {span_h:.1f} hours")
     print(f"  First sample : {fmt(first) if first else 'n/a'}")
-    print(f"  Last sample  : {fmt(last)  if last  else 'n/a'}\n")
+    print(f"  Last sample  : {fmt(last)  if last  else 'n/a'}")
+    if archived:
+        print(f"  Archived     : {sum(a[1] for a in archived):,} rows, {len(archived):,} tickers, "
+              f"from {fmt(min(a[2] for a in archived))}")
+    print()
+
+
+def _benchmark(markets: int = 2000, polls: int = 50) -> None:
+    """
+    Insert `polls` polls of `markets` rows two ways and print rows/second:
+
+      legacy – connect per poll, rollback journal, three indexes
+      writer – SnapshotWriter (persistent WAL connection, one index)
+
+    Both runs use a scratch file and append to a table that already holds
+    `polls` polls, so index depth is closer to a live DB.
+    """
+    with tempfile.TemporaryDirectory() as tmp:
+        _run_benchmark(os.path.join(tmp, "bench.db"), markets, polls)
+
+
+def _run_benchmark(db_path: str, markets: int, polls: int) -> None:
+    legacy_schema = _SCHEMA + (
+        "CREATE INDEX IF NOT EXISTS idx_ts     ON market_snapshots(ts);\n"
+        "CREATE INDEX IF NOT EXISTS idx_ticker ON market_snapshots(ticker);\n"
+    )
+    t0 = 1_760_000_000
+
+    def poll_rows(k: int) -> list[Row]:
+        return [
+            (t0 + k * 60, f"KXBENCH-{i:05d}", 0.40, 0.50, 1000.0, 500.0, 0.45, 0.10, "active")
+            for i in range(markets)
+        ]
+
+    def fresh() -> None:
+        for suffix in ("", "-wal", "-shm", "-journal"):
+            if os.path.exists(db_path + suffix):
+                os.remove(db_path + suffix)
+
+    def seed(conn: sqlite3.Connection) -> None:
+        with conn:
+            for k in range(polls):
+                conn.executemany(_INSERT, poll_rows(k))
+
+    batches = [poll_rows(k) for k in range(polls, 2 * polls)]
+
+    fresh()
+    with sqlite3.connect(db_path) as conn:
+        conn.executescript(legacy_schema)
+        seed(conn)
+    conn.close()
+    start = time.perf_counter()
+    for rows in batches:
+        with sqlite3.connect(db_path) as conn:
+            conn.executemany(_INSERT, rows)
+        conn.close()
+    legacy = polls * markets / (time.perf_counter() - start)
+
+    fresh()
+    conn = open_writer_db(db_path)
+    seed(conn)
+    conn.close()
+    writer = SnapshotWriter(db_path)
+    start = time.perf_counter()
+    for rows in batches:
+        writer.submit(rows)
+    submitted = time.perf_counter() - start
+    writer.close()
+    fast = polls * markets / (time.perf_counter() - start)
+    fresh()
+
+    print(f"\n  {polls} polls × {markets} markets")
+    print(f"  legacy : {legacy:>12,.0f} rows/s")
+    print(f"  writer : {fast:>12,.0f} rows/s  ({fast / legacy:.1f}×)")
+    print(f"  poll loop blocked for {submitted * 1000 / polls:.2f} ms/poll on submit\n")
 
 
 if __name__ == "__main__":
@@ -135,7 +536,20 @@ if __name__ == "__main__":
     parser = argparse.ArgumentParser(description="Kalshi market data collector")
     parser.add_argument("--db",       default="market_data.db", help="SQLite database path")
     parser.add_argument("--interval", type=int, default=60,    help="Poll interval (seconds)")
+    parser.add_argument("--change-only", action="store_true",
+                        help="Store a market's row only when its quote changes")
+    parser.add_argument("--keyframe-interval", type=int, default=900,
+                        help="--change-only: store every market at least this often "
+                             "(seconds, default: 900)")
+    parser.add_argument("--stream",   action="store_true",
+                        help="Record WebSocket ticker updates instead of polling REST")
+    parser.add_argument("--flush-interval", type=float, default=1.0,
+                        help="--stream: seconds between batched writes (default: 1.0)")
     parser.add_argument("--stats",    action="store_true",      help="Print DB stats and exit")
+    parser.add_argument("--rebuild-rollups", action="store_true",
+                        help="Recompute the minute/hour bar tables from all snapshots and exit")
+    parser.add_argument("--bench",    action="store_true",
+                        help="Benchmark insert throughput on a scratch DB and exit")
     parser.add_argument("--log-level", default="INFO",
                         choices=["DEBUG", "INFO", "WARNING"])
     args = parser.parse_args()
@@ -148,6 +562,21 @@ if __name__ == "__main__":
 
     if args.stats:
         _print_stats(args.db)
+    elif args.bench:
+        _benchmark()
+    elif args.rebuild_rollups:
+        conn = open_writer_db(args.db)
+        n = rollups.rebuild(conn)
+        conn.close()
+        print(f"Rebuilt rollups from {n:,} snapshots")
+    elif args.stream:
+        cfg = BotConfig()
+        StreamingCollector(
+            args.db, cfg, flush_interval=args.flush_interval,
+            change_only=args.change_only, keyframe_interval=args.keyframe_interval,
+        ).run(interval=args.interval)
     else:
         cfg = BotConfig()
-        DataCollector(args.db, cfg).run(interval=args.interval)
+        DataCollector(
+            args.db, cfg, change_only=args.change_only, keyframe_interval=args.keyframe_interval,
+        ).run(interval=args.interval)
@@ -17,6 +17,10 @@ Student-t distribution, applied to binary (fill/no-fill) outcomes:
 
     θ̂_MLE = argmax Σᵢ [ yᵢ·ln(p̂ᵢ) + (1-yᵢ)·ln(1-p̂ᵢ) ]
 
+solved by Newton's method / IRLS in NumPy (typically < 10 iterations, so a
+refit on a few hundred thousand quotes takes milliseconds), with optional
+L2 regularisation and standard errors from the inverse Hessian.
+
 Two operating modes
 ────────────────────
 1. Calibrated (historical data available):
@@ -26,6 +30,14 @@ Two operating modes
 2. Fallback (no data):
    Uses the original heuristic so the backtester always works out of the box.
 
+3. Online (live bot, --fill-model PATH):
+   OnlineFillModel.observe() folds each quote outcome reported by the
+   OrderManager (leg filled, or cancelled as stale, after so many hours
+   resting) into the fit with a recursive Newton update, checkpointed to
+   PATH — no full refits.
+   FillModel.load(PATH) reads the checkpoint back for the backtesters
+   (historical_replay.py / stress_test.py --fill-model PATH).
+
 Fitting from market_data.db
 ────────────────────────────
 When fills are logged in state_store.db we can extract:
@@ -39,12 +51,20 @@ See FillModel.fit_from_db() for the full pipeline.
 
 from __future__ import annotations
 
+import itertools
+import json
 import logging
 import math
+import os
 import sqlite3
+import threading
 from dataclasses import dataclass, field
 from typing import Optional
 
+import numpy as np
+
+from .snapshot_grid import forward_fill, read_grid
+
 logger = logging.getLogger(__name__)
 
 
@@ -60,60 +80,102 @@ def _sigmoid(x: float) -> float:
     return e / (1.0 + e)
 
 
-def _log_loss(y: float, p_hat: float) -> float:
-    """Binary cross-entropy for one observation."""
-    p_hat = max(min(p_hat, 1 - 1e-9), 1e-9)
-    return -(y * math.log(p_hat) + (1 - y) * math.log(1 - p_hat))
+def _expit(z: np.ndarray) -> np.ndarray:
+    """Vectorised numerically stable sigmoid."""
+    return np.exp(-np.logaddexp(0.0, -z))
 
 
 # ---------------------------------------------------------------------------
-# MLE logistic regression (pure Python, no numpy/sklearn)
+# MLE logistic regression (Newton / IRLS, NumPy)
 # ---------------------------------------------------------------------------
 
-def _fit_logistic(
-    X: list[list[float]],    # n × k feature matrix (include bias column)
-    y: list[float],          # n binary labels
-    lr: float = 0.05,
-    max_iter: int = 1000,
-    tol: float = 1e-6,
-) -> list[float]:
-    """
-    Fit logistic regression by gradient descent on log-likelihood.
+@dataclass
+class FitDiagnostics:
+    """Convergence report and standard errors from one _fit_logistic call."""
+    iterations: int
+    converged: bool
+    log_likelihood: float            # at β̂ (unpenalised)
+    grad_norm: float                 # max |∂ℓ_pen/∂β| at β̂
+    std_errors: tuple[float, ...]    # sqrt(diag(H⁻¹)), same order as β
+    l2: float = 0.0
 
-    This maximizes:
-        ℓ(β) = Σᵢ [ yᵢ·ln(σ(Xᵢβ)) + (1-yᵢ)·ln(1-σ(Xᵢβ)) ]
 
-    Returns coefficient vector β of length k.
+def _fit_logistic(
+    X: np.ndarray,           # n × k feature matrix (include bias column)
+    y: np.ndarray,           # n binary labels
+    l2: float = 0.0,
+    max_iter: int = 50,
+    tol: float = 1e-8,
+) -> tuple[np.ndarray, FitDiagnostics]:
     """
-    n = len(y)
-    k = len(X[0])
-    beta = [0.0] * k
-    prev_loss = float("inf")
+    Fit logistic regression by Newton's method (iteratively reweighted
+    least squares) on the log-likelihood.
 
-    for _ in range(max_iter):
-        # Forward pass: compute predictions
-        preds = [_sigmoid(sum(X[i][j] * beta[j] for j in range(k))) for i in range(n)]
+    This maximizes:
+        ℓ(β) = Σᵢ [ yᵢ·ln(σ(Xᵢβ)) + (1-yᵢ)·ln(1-σ(Xᵢβ)) ] − (l2/2)·Σⱼ₌₁ βⱼ²
 
-        # Loss (negative log-likelihood)
-        loss = sum(_log_loss(y[i], preds[i]) for i in range(n)) / n
+    (the bias column 0 is not penalised).  Each step solves
+        (XᵀWX + l2·I) Δ = Xᵀ(y − p̂) − l2·β,   W = diag(p̂(1−p̂))
+    and halves it until the objective improves, so separable data stops
+    at max_iter instead of diverging.  Converges when max |Δ| < tol.
 
-        if abs(prev_loss - loss) < tol:
+    Returns (β, diagnostics); standard errors come from the inverse
+    (penalised) Hessian at β̂.
+    """
+    X = np.asarray(X, dtype=float)
+    y = np.asarray(y, dtype=float)
+    k = X.shape[1]
+    penalty = np.full(k, float(l2))
+    penalty[0] = 0.0
+
+    def objective(beta: np.ndarray) -> float:
+        z = X @ beta
+        # log σ(z) = −log(1+e^−z); log(1−σ(z)) = −log(1+e^z)
+        ll = -(y * np.logaddexp(0.0, -z) + (1 - y) * np.logaddexp(0.0, z)).sum()
+        return float(ll) - 0.5 * float(penalty @ (beta * beta))
+
+    beta = np.zeros(k)
+    obj = objective(beta)
+    converged = False
+    it = 0
+    for it in range(1, max_iter + 1):
+        p_hat = _expit(X @ beta)
+        grad = X.T @ (y - p_hat) - penalty * beta
+        hess = (X * (p_hat * (1 - p_hat))[:, None]).T @ X + np.diag(penalty)
+        try:
+            step = np.linalg.solve(hess, grad)
+        except np.linalg.LinAlgError:
+            step = np.linalg.lstsq(hess, grad, rcond=None)[0]
+
+        t = 1.0
+        new_obj = objective(beta + step)
+        while new_obj < obj - 1e-12 and t > 1e-10:
+            t /= 2
+            new_obj = objective(beta + t * step)
+        if new_obj < obj - 1e-12:
+            break   # no improving step left at float precision
+        beta = beta + t * step
+        obj = new_obj
+        if np.max(np.abs(t * step)) < tol:
+            converged = True
             break
-        prev_loss = loss
 
-        # Gradient: ∂ℓ/∂β = Xᵀ(y - p̂) / n
-        grad = [0.0] * k
-        for i in range(n):
-            residual = y[i] - preds[i]
-            for j in range(k):
-                grad[j] += X[i][j] * residual
-        for j in range(k):
-            grad[j] /= n
+    p_hat = _expit(X @ beta)
+    grad = X.T @ (y - p_hat) - penalty * beta
+    hess = (X * (p_hat * (1 - p_hat))[:, None]).T @ X + np.diag(penalty)
+    try:
+        std_errors = np.sqrt(np.clip(np.diag(np.linalg.inv(hess)), 0.0, None))
+    except np.linalg.LinAlgError:
+        std_errors = np.full(k, np.inf)
 
-        # Gradient ascent (maximizing log-likelihood)
-        beta = [beta[j] + lr * grad[j] for j in range(k)]
-
-    return beta
+    return beta, FitDiagnostics(
+        iterations=it,
+        converged=converged,
+        log_likelihood=obj + 0.5 * float(penalty @ (beta * beta)),
+        grad_norm=float(np.max(np.abs(grad))),
+        std_errors=tuple(float(se) for se in std_errors),
+        l2=float(l2),
+    )
 
 
 # ---------------------------------------------------------------------------
@@ -154,6 +216,17 @@ class FillModel:
 
     def __init__(self, params: Optional[FillModelParams] = None) -> None:
         self.params = params or FillModelParams()
+        self.diagnostics: Optional[FitDiagnostics] = None   # set by fit()
+
+    @classmethod
+    def load(cls, path: str) -> "FillModel":
+        """
+        Model with the coefficients of an OnlineFillModel checkpoint — what
+        the live bot has learned so far, frozen for a backtest.  Raises
+        OSError / ValueError if the file is missing or unreadable.
+        """
+        beta, _, _ = _read_checkpoint(path)
+        return cls(FillModelParams(*beta, fitted=True))
 
     def predict(
         self,
@@ -176,14 +249,21 @@ class FillModel:
     # Fitting
     # ------------------------------------------------------------------
 
-    def fit(self, records: list[tuple[float, float, float, float]]) -> None:
+    def fit(
+        self,
+        records: list[tuple[float, float, float, float]],
+        l2: float = 0.0,
+    ) -> None:
         """
         Fit model from a list of (depth, volume_usd, spread, filled) tuples.
 
         filled = 1.0 if the order was eventually filled, 0.0 otherwise.
+        l2 > 0 adds a ridge penalty on the non-intercept coefficients
+        (keeps the fit finite when fills are separable by depth).
 
         Minimum 20 observations with at least one fill and one non-fill.
         Prints a warning and keeps default params if data is insufficient.
+        Convergence and standard errors are left in self.diagnostics.
         """
         if len(records) < 20:
             logger.warning(
@@ -192,7 +272,8 @@ class FillModel:
             )
             return
 
-        fills = sum(1 for *_, f in records if f > 0.5)
+        data = np.asarray(records, dtype=float)
+        fills = int((data[:, 3] > 0.5).sum())
         if fills == 0 or fills == len(records):
             logger.warning(
                 "FillModel.fit: all labels are %s – keeping defaults.",
@@ -201,24 +282,31 @@ class FillModel:
             return
 
         # Build feature matrix (bias, depth, log_vol, spread)
-        X, y = [], []
-        for depth, vol, spread, filled in records:
-            log_vol = math.log1p(max(vol, 0.0))
-            X.append([1.0, depth, log_vol, spread])
-            y.append(float(filled))
-
-        beta = _fit_logistic(X, y)
+        X = np.column_stack([
+            np.ones(len(data)),
+            data[:, 0],
+            np.log1p(np.maximum(data[:, 1], 0.0)),
+            data[:, 2],
+        ])
+        beta, diag = _fit_logistic(X, data[:, 3], l2=l2)
+        self.diagnostics = diag
+        if not diag.converged:
+            logger.warning(
+                "FillModel.fit: not converged after %d iterations (max|grad|=%.2g) "
+                "– consider l2 > 0.", diag.iterations, diag.grad_norm,
+            )
         self.params = FillModelParams(
-            intercept=beta[0],
-            coef_depth=beta[1],
-            coef_log_vol=beta[2],
-            coef_spread=beta[3],
+            intercept=float(beta[0]),
+            coef_depth=float(beta[1]),
+            coef_log_vol=float(beta[2]),
+            coef_spread=float(beta[3]),
             fitted=True,
         )
         logger.info(
-            "FillModel fitted: intercept=%.3f depth=%.3f log_vol=%.3f spread=%.3f  "
-            "(n=%d, fill_rate=%.1f%%)",
-            *beta, len(records), fills / len(records) * 100,
+            "FillModel fitted: intercept=%.3f±%.3f depth=%.3f±%.3f log_vol=%.3f±%.3f "
+            "spread=%.3f±%.3f  (n=%d, fill_rate=%.1f%%, %d Newton steps)",
+            *(v for pair in zip(beta, diag.std_errors) for v in pair),
+            len(records), fills / len(records) * 100, diag.iterations,
         )
 
     def fit_from_db(self, state_db: str, market_db: str) -> None:
@@ -245,10 +333,177 @@ class FillModel:
             logger.info("fit_from_db: no matching records found – using defaults.")
 
 
+# ---------------------------------------------------------------------------
+# Online model (live fills)
+# ---------------------------------------------------------------------------
+
+class OnlineFillModel(FillModel):
+    """
+    FillModel updated one labelled quote at a time from the live bot.
+
+    Each observe() is a recursive Newton step on the log-likelihood: with
+    x = (1, depth, log_vol, spread), p̂ = σ(xβ), w = p̂(1−p̂),
+
+        P ← P − w·Pxxᵀ P / (1 + w·xᵀPx)      (Sherman–Morrison on the
+        β ← β + P·x·(y − p̂)                   inverse information)
+
+    starting from the current params (defaults or a batch fit) with P =
+    prior_var·I.  A quote's outcome is "filled before it went stale", so
+    it is folded in as a discrete-time hazard, matching predict()'s
+    per-hour probability: each hour the quote rested unfilled counts as a
+    y=0 observation (one weighted step, fractional hours included), and
+    the hour it filled in as a y=1.  forgetting < 1 inflates P by 1/forgetting per update, so
+    old quotes are discounted and the model keeps tracking drift instead
+    of freezing as observations accumulate.
+
+    The state (β, P, n_obs) is checkpointed as JSON to checkpoint_path
+    every checkpoint_every observations and on save(), and reloaded on
+    construction, so learning resumes across restarts.  Thread-safe: the
+    WS fill thread and the main loop both report outcomes (and may both
+    trigger a save()).
+    """
+
+    def __init__(
+        self,
+        params: Optional[FillModelParams] = None,
+        checkpoint_path: Optional[str] = None,
+        prior_var: float = 1.0,
+        forgetting: float = 0.999,
+        checkpoint_every: int = 50,
+    ) -> None:
+        super().__init__(params)
+        self.checkpoint_path = checkpoint_path
+        self.forgetting = forgetting
+        self.checkpoint_every = checkpoint_every
+        self.n_obs = 0
+        self._cov = np.eye(4) * prior_var
+        self._lock = threading.Lock()
+        self._save_lock = threading.Lock()   # one writer of checkpoint_path.tmp at a time
+        if checkpoint_path and os.path.exists(checkpoint_path):
+            self._restore(checkpoint_path)
+
+    def _beta(self) -> np.ndarray:
+        p = self.params
+        return np.array([p.intercept, p.coef_depth, p.coef_log_vol, p.coef_spread])
+
+    def observe(
+        self,
+        depth: float,
+        volume_usd: float,
+        spread: float,
+        filled: bool,
+        hours: float = 1.0,
+    ) -> None:
+        """
+        Fold one quote outcome into the fit: filled after resting `hours`,
+        or cancelled unfilled after `hours`.
+        """
+        x = np.array([1.0, depth, math.log1p(max(volume_usd, 0.0)), spread])
+        hours = max(hours, 0.0)
+        unfilled_hours = max(hours - 1.0, 0.0) if filled else hours
+        with self._lock:
+            beta = self._beta()
+            cov = self._cov / self.forgetting
+            if unfilled_hours > 0:
+                beta, cov = _newton_step(beta, cov, x, 0.0, unfilled_hours)
+            if filled:
+                beta, cov = _newton_step(beta, cov, x, 1.0, 1.0)
+            self._cov = cov
+            self.params = FillModelParams(
+                intercept=float(beta[0]),
+                coef_depth=float(beta[1]),
+                coef_log_vol=float(beta[2]),
+                coef_spread=float(beta[3]),
+                fitted=True,
+            )
+            self.n_obs += 1
+            due = self.checkpoint_every > 0 and self.n_obs % self.checkpoint_every == 0
+        if due:
+            self.save()
+
+    def save(self) -> None:
+        """Write the checkpoint (atomic replace); no-op without checkpoint_path."""
+        if not self.checkpoint_path:
+            return
+        # The state is read under the save lock too, so a slower save can
+        # never replace the checkpoint with an older state.
+        with self._save_lock:
+            with self._lock:
+                state = {
+                    "beta": self._beta().tolist(),
+                    "cov": self._cov.tolist(),
+                    "n_obs": self.n_obs,
+                }
+            tmp = self.checkpoint_path + ".tmp"
+            try:
+                with open(tmp, "w") as fh:
+                    json.dump(state, fh)
+                os.replace(tmp, self.checkpoint_path)
+            except OSError as exc:
+                logger.error("OnlineFillModel.save(%s): %s", self.checkpoint_path, exc)
+
+    def _restore(self, path: str) -> None:
+        try:
+            beta, cov, n_obs = _read_checkpoint(path)
+        except (OSError, ValueError) as exc:
+            logger.warning("OnlineFillModel: unreadable checkpoint %s (%s) – starting fresh.",
+                           path, exc)
+            return
+        self.params = FillModelParams(*beta, fitted=True)
+        self._cov = cov
+        self.n_obs = n_obs
+        logger.info("OnlineFillModel: resumed from %s (%d observations).", path, self.n_obs)
+
+
+def _newton_step(
+    beta: np.ndarray, cov: np.ndarray, x: np.ndarray, y: float, weight: float,
+) -> tuple[np.ndarray, np.ndarray]:
+    """One recursive Newton update for `weight` identical observations (x, y)."""
+    p_hat = _sigmoid(float(x @ beta))
+    w = weight * max(p_hat * (1 - p_hat), 1e-12)
+    px = cov @ x
+    cov = cov - w * np.outer(px, px) / (1 + w * float(x @ px))
+    return beta + cov @ x * weight * (y - p_hat), cov
+
+
+def _read_checkpoint(path: str) -> tuple[list[float], np.ndarray, int]:
+    """(β, P, n_obs) from an OnlineFillModel checkpoint (ValueError if malformed)."""
+    with open(path) as fh:
+        state = json.load(fh)
+    try:
+        beta = [float(b) for b in state["beta"]]
+        cov = np.array(state["cov"], dtype=float).reshape(4, 4)
+        n_obs = int(state.get("n_obs", 0))
+    except (KeyError, TypeError) as exc:
+        raise ValueError(f"malformed checkpoint: {exc!r}") from exc
+    if len(beta) != 4:
+        raise ValueError(f"expected 4 coefficients, got {len(beta)}")
+    return beta, cov, n_obs
+
+
 # ---------------------------------------------------------------------------
 # DB extraction helper
 # ---------------------------------------------------------------------------
 
+_ASOF_WINDOW = 300   # max seconds between quote time and the snapshot used
+
+_FILLED_STATES = ("YES_FILLED", "NO_FILLED", "BOTH_FILLED", "ONE_SIDE_HEDGED", "RESOLVED")
+
+
+def _asof_nearest(ts: np.ndarray, qt: np.ndarray) -> np.ndarray:
+    """
+    Index into sorted `ts` of the nearest timestamp to each of `qt` (the
+    earlier one on a tie), or -1 where none is within _ASOF_WINDOW.
+    """
+    if len(ts) == 0:
+        return np.full(len(qt), -1)
+    right = np.searchsorted(ts, qt, side="left").clip(0, len(ts) - 1)
+    left = (right - 1).clip(0, None)
+    use_left = np.abs(ts[left] - qt) <= np.abs(ts[right] - qt)
+    idx = np.where(use_left, left, right)
+    return np.where(np.abs(ts[idx] - qt) < _ASOF_WINDOW, idx, -1)
+
+
 def _extract_fill_records(
     state_db: str, market_db: str
 ) -> list[tuple[float, float, float, float]]:
@@ -261,40 +516,46 @@ def _extract_fill_records(
       - spread = spread at quote time
       - filled = 1 if state in (YES_FILLED, NO_FILLED, BOTH_FILLED, ONE_SIDE_HEDGED, RESOLVED)
                  0 if state = IDLE (stale cancel, never filled)
+
+    One pass: positions are grouped by ticker, each ticker's snapshots
+    spanning its quote times are read once in (ticker, ts) index order, and
+    every quote is matched to its nearest snapshot within 5 minutes by
+    searchsorted — O((positions + snapshots) log) rather than a scan per
+    position.  Change-only data is forward-filled onto the poll grid first.
     """
     records: list[tuple[float, float, float, float]] = []
 
     with sqlite3.connect(state_db) as sconn, sqlite3.connect(market_db) as mconn:
         positions = sconn.execute(
             """SELECT ticker, yes_price, no_price, last_quote_time, state
-               FROM positions"""
+               FROM positions
+               WHERE yes_price IS NOT NULL AND no_price IS NOT NULL
+                 AND last_quote_time IS NOT NULL
+               ORDER BY ticker"""
         ).fetchall()
-
-        for ticker, yes_price, no_price, qt, state in positions:
-            if yes_price is None or no_price is None or qt is None:
-                continue
-
-            # Look up the nearest market snapshot
-            snap = mconn.execute(
-                """SELECT mid, volume_24h, spread
+        grid = read_grid(mconn)
+        lead = grid.max_gap if grid is not None else 0.0
+
+        for ticker, group in itertools.groupby(positions, key=lambda row: row[0]):
+            group = list(group)
+            qt = np.array([int(row[3]) for row in group], dtype=float)
+            snaps = mconn.execute(
+                """SELECT ts, mid, volume_24h, spread
                    FROM market_snapshots
-                   WHERE ticker = ? AND ABS(ts - ?) < 300
-                   ORDER BY ABS(ts - ?) ASC
-                   LIMIT 1""",
-                (ticker, int(qt), int(qt)),
-            ).fetchone()
-
-            if snap is None:
-                continue
-
-            mid, volume, spread = snap
-            depth = abs(yes_price - mid)
-            filled = 1.0 if state in (
-                "YES_FILLED", "NO_FILLED", "BOTH_FILLED",
-                "ONE_SIDE_HEDGED", "RESOLVED",
-            ) else 0.0
-
-            records.append((depth, volume or 0.0, spread or 0.0, filled))
+                   WHERE ticker = ? AND ts > ? AND ts < ? AND mid IS NOT NULL
+                   ORDER BY ts""",
+                (ticker, qt.min() - _ASOF_WINDOW - lead, qt.max() + _ASOF_WINDOW),
+            ).fetchall()
+            snaps = forward_fill(snaps, grid)
+            ts = np.array([row[0] for row in snaps], dtype=float)
+
+            for (_, yes_price, _, _, state), i in zip(group, _asof_nearest(ts, qt)):
+                if i < 0:
+                    continue
+                _, mid, volume, spread = snaps[i]
+                depth = abs(yes_price - mid)
+                filled = 1.0 if state in _FILLED_STATES else 0.0
+                records.append((depth, volume or 0.0, spread or 0.0, filled))
 
     return records
 
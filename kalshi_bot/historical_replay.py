@@ -14,19 +14,37 @@ Usage (from repo root):
 
     # With custom budget / fee settings
     python -m kalshi_bot.historical_replay --db market_data.db --budget 2000 --fee-rate 0.05
+
+    # Hourly strategy: replay hourly rollup bars instead of every poll
+    python -m kalshi_bot.historical_replay --db market_data.db --resolution 1h
+
+    # Replay from a compacted, memory-mapped store (see snapshot_store.py)
+    python -m kalshi_bot.snapshot_store --db market_data.db --out market_data.store
+    python -m kalshi_bot.historical_replay --store market_data.store
+
+    # Simulate fills with what the live bot's online fill model has learned
+    python -m kalshi_bot.historical_replay --db market_data.db --fill-model fill_model.json
 """
 
 from __future__ import annotations
 
 import argparse
+import itertools
 import logging
 import sqlite3
 from datetime import datetime, timezone
+from typing import Optional
 
 from .backtester import Backtester, MarketResult
 from .stats import newey_west_ttest
 from .config import BotConfig, MarketFilter, RiskParams, ScoringParams
+from .fill_model import FillModel
+from .retention import archived_rows, archived_summary, merge_rows
+from .rollups import RESOLUTIONS, read_bars
+from .snapshot_grid import fill_bars, forward_fill, read_grid
+from .snapshot_store import SnapshotStore
 from .synthetic_data import MarketSnapshot
+from .vector_backtester import VectorizedBacktester
 
 logger = logging.getLogger(__name__)
 
@@ -35,21 +53,51 @@ logger = logging.getLogger(__name__)
 # Data loading
 # ---------------------------------------------------------------------------
 
-def load_snapshots(db_path: str, ticker: str) -> list[MarketSnapshot]:
+_REPLAY_COLUMNS = ("ts", "yes_bid", "yes_ask", "volume_24h", "open_interest", "mid", "spread")
+
+
+def load_snapshots(
+    db_path: str,
+    ticker: str,
+    resolution: Optional[str] = None,
+) -> list[MarketSnapshot]:
     """
     Load all stored snapshots for a ticker sorted by timestamp and convert
     to the MarketSnapshot objects the Backtester expects.
 
-    Time is expressed in days from the first snapshot (t=0).
+    Time is expressed in days from the first snapshot (t=0).  Rows moved
+    out by retention.py are read back from the archive, and change-only
+    data is forward-filled back onto the collector's poll grid.
+
+    resolution="1m" / "1h" replays the collector's rollup bars instead of
+    raw polls: one snapshot per bar at its close, with bid/ask at close ∓
+    spread/2 (see rollups.py; run --rebuild-rollups for older data).
     """
     with sqlite3.connect(db_path) as conn:
-        rows = conn.execute(
-            """SELECT ts, yes_bid, yes_ask, volume_24h, open_interest, mid, spread
-               FROM market_snapshots
-               WHERE ticker = ?
-               ORDER BY ts ASC""",
-            (ticker,),
-        ).fetchall()
+        grid = read_grid(conn)
+        if resolution is None:
+            rows = conn.execute(
+                """SELECT ts, yes_bid, yes_ask, volume_24h, open_interest, mid, spread
+                   FROM market_snapshots
+                   WHERE ticker = ?
+                   ORDER BY ts ASC""",
+                (ticker,),
+            ).fetchall()
+            rows = merge_rows(rows, archived_rows(conn, ticker, _REPLAY_COLUMNS))
+            rows = forward_fill(rows, grid)
+        else:
+            rows = fill_bars(
+                [
+                    (bucket, close - spread / 2, close + spread / 2, vol, oi, close, spread,
+                     first_ts, last_ts)
+                    for bucket, close, spread, vol, oi, first_ts, last_ts in read_bars(
+                        conn, ticker, resolution,
+                        columns="bucket, close, COALESCE(spread, 0), volume_24h, open_interest, "
+                                "first_ts, last_ts",
+                    )
+                ],
+                RESOLUTIONS[resolution], grid,
+            )
 
     if not rows:
         return []
@@ -78,17 +126,44 @@ def list_tickers(
 ) -> list[tuple[str, int, int, int]]:
     """
     Return (ticker, snapshot_count, first_ts, last_ts) for tickers that have
-    at least min_snapshots rows, sorted by count descending.
+    at least min_snapshots rows, sorted by count descending.  Archived rows
+    (see retention.py) are included.  For change-only data the count is of
+    forward-filled snapshots, as load_snapshots returns.
     """
     with sqlite3.connect(db_path) as conn:
-        return conn.execute(
-            """SELECT ticker, COUNT(*) AS cnt, MIN(ts), MAX(ts)
-               FROM market_snapshots
-               GROUP BY ticker
-               HAVING cnt >= ?
-               ORDER BY cnt DESC""",
-            (min_snapshots,),
-        ).fetchall()
+        grid = read_grid(conn)
+        archived = {row[0]: row[1:] for row in archived_summary(conn)}
+        if grid is None:
+            stats = {
+                ticker: (cnt, lo, hi) for ticker, cnt, lo, hi in conn.execute(
+                    "SELECT ticker, COUNT(*), MIN(ts), MAX(ts) FROM market_snapshots GROUP BY ticker"
+                )
+            }
+            for ticker, (cnt, lo, hi) in archived.items():
+                if ticker in stats:
+                    n, a, b = stats[ticker]
+                    cnt, lo, hi = cnt + n, min(lo, a), max(hi, b)
+                stats[ticker] = (cnt, lo, hi)
+            out = [(t, cnt, lo, hi) for t, (cnt, lo, hi) in stats.items() if cnt >= min_snapshots]
+            return sorted(out, key=lambda row: row[1], reverse=True)
+        cursor = conn.execute("SELECT ticker, ts FROM market_snapshots ORDER BY ticker, ts")
+        groups = itertools.chain(
+            ((ticker, [row[1:] for row in group])
+             for ticker, group in itertools.groupby(cursor, key=lambda row: row[0])),
+            ((ticker, []) for ticker in archived),
+        )
+        seen: set[str] = set()
+        out = []
+        for ticker, rows in groups:
+            if ticker in seen:
+                continue
+            seen.add(ticker)
+            if ticker in archived:
+                rows = merge_rows(rows, archived_rows(conn, ticker, ("ts",)))
+            ts = forward_fill(rows, grid)
+            if len(ts) >= min_snapshots:
+                out.append((ticker, len(ts), ts[0][0], ts[-1][0]))
+    return sorted(out, key=lambda row: row[1], reverse=True)
 
 
 # ---------------------------------------------------------------------------
@@ -121,11 +196,32 @@ def run_replay(
     db_path: str,
     config: BotConfig,
     min_snapshots: int = 50,
+    store_dir: Optional[str] = None,
+    resolution: Optional[str] = None,
+    fill_model: Optional[FillModel] = None,
 ) -> None:
-    """Replay all tickers with sufficient data and print a results table."""
-    tickers = list_tickers(db_path, min_snapshots)
+    """
+    Replay all tickers with sufficient data and print a results table.
+
+    With store_dir, tickers are read from a compacted SnapshotStore and
+    replayed on memory-mapped columns with the VectorizedBacktester instead
+    of querying db_path row by row.  With resolution ("1m" / "1h"), db_path
+    tickers are replayed from rollup bars (see load_snapshots).  fill_model
+    replaces the default fill heuristic (e.g. FillModel.load of the live
+    bot's --fill-model checkpoint).
+    """
+    if store_dir:
+        store = SnapshotStore(store_dir)
+        tickers = store.list_tickers(min_snapshots)
+        bt: Backtester = VectorizedBacktester(config, fill_model)
+        load = store.arrays
+    else:
+        tickers = list_tickers(db_path, min_snapshots)
+        bt = Backtester(config, fill_model)
+        load = lambda ticker: load_snapshots(db_path, ticker, resolution)
+
     if not tickers:
-        print(f"\nNo tickers with ≥{min_snapshots} snapshots in {db_path}")
+        print(f"\nNo tickers with ≥{min_snapshots} snapshots in {store_dir or db_path}")
         print("Run the data collector first:")
         print("  python -m kalshi_bot.data_collector --db market_data.db")
         return
@@ -143,12 +239,11 @@ def run_replay(
     )
     print("  " + "-" * 76)
 
-    bt = Backtester(config)
     total_pnl = 0.0
     results: list[tuple[str, int, float, MarketResult]] = []
 
     for ticker, count, ts_min, ts_max in tickers:
-        snaps = load_snapshots(db_path, ticker)
+        snaps = load(ticker)
         if len(snaps) < min_snapshots:
             continue
         result = bt.run_market(snaps)
@@ -203,11 +298,18 @@ def run_replay(
 if __name__ == "__main__":
     parser = argparse.ArgumentParser(description="Replay historical Kalshi market data")
     parser.add_argument("--db",            default="market_data.db")
+    parser.add_argument("--store",         default=None,
+                        help="Read from a compacted snapshot store instead of --db")
     parser.add_argument("--budget",        type=float, default=1_000.0)
     parser.add_argument("--fee-rate",      type=float, default=0.07,
                         help="Kalshi fee as fraction of cost per fill (default 0.07 = 7%%)")
     parser.add_argument("--min-snapshots", type=int,   default=50,
                         help="Minimum snapshot count to include a market (default 50)")
+    parser.add_argument("--resolution",    default=None, choices=sorted(RESOLUTIONS),
+                        help="Replay --db from minute/hour rollup bars instead of raw polls")
+    parser.add_argument("--fill-model",    default=None, metavar="PATH",
+                        help="Simulate fills with an online fill-model checkpoint "
+                             "(the live bot's --fill-model file)")
     parser.add_argument("--ticker",        default=None,
                         help="Replay a single ticker only")
     parser.add_argument("--list",          action="store_true",
@@ -219,8 +321,10 @@ if __name__ == "__main__":
     logging.basicConfig(level=getattr(logging, args.log_level),
                         format="%(levelname)s %(message)s")
 
+    store = SnapshotStore(args.store) if args.store else None
+
     if args.list:
-        rows = list_tickers(args.db, min_snapshots=1)
+        rows = store.list_tickers(1) if store else list_tickers(args.db, min_snapshots=1)
         if not rows:
             print("No data found.")
         else:
@@ -232,14 +336,25 @@ if __name__ == "__main__":
         raise SystemExit(0)
 
     config = _make_replay_config(args.budget, args.fee_rate)
+    fill_model = None
+    if args.fill_model:
+        try:
+            fill_model = FillModel.load(args.fill_model)
+        except (OSError, ValueError) as exc:
+            parser.error(f"--fill-model: {exc}")
 
     if args.ticker:
-        snaps = load_snapshots(args.db, args.ticker)
-        if not snaps:
-            print(f"No data for {args.ticker}")
-            raise SystemExit(1)
-        bt = Backtester(config)
-        result = bt.run_market(snaps)
+        if store:
+            if args.ticker not in store:
+                print(f"No data for {args.ticker}")
+                raise SystemExit(1)
+            result = VectorizedBacktester(config, fill_model).run_market(store.arrays(args.ticker))
+        else:
+            snaps = load_snapshots(args.db, args.ticker, args.resolution)
+            if not snaps:
+                print(f"No data for {args.ticker}")
+                raise SystemExit(1)
+            result = Backtester(config, fill_model).run_market(snaps)
         sign = "+" if result.total_pnl >= 0 else ""
         print(
             f"\n{args.ticker}: P&L {sign}${result.total_pnl:.2f}  "
@@ -248,4 +363,7 @@ if __name__ == "__main__":
             f"fillY={result.fill_rate_yes:.0%}  fillN={result.fill_rate_no:.0%}"
         )
     else:
-        run_replay(args.db, config, min_snapshots=args.min_snapshots)
+        run_replay(
+            args.db, config, min_snapshots=args.min_snapshots,
+            store_dir=args.store, resolution=args.resolution, fill_model=fill_model,
+        )
@@ -185,7 +185,7 @@ def select_markets(
       2. Fee-profitability gate: spread must cover Kalshi trading fees
     """
     logger.info("Fetching open Kalshi markets…")
-    raw_markets = client.get_active_markets(limit=200)
+    raw_markets = client.get_active_markets()
     logger.info("  → %d markets fetched", len(raw_markets))
 
     # Compute minimum spread needed to turn a profit after fees
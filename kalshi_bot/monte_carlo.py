@@ -0,0 +1,214 @@
+"""
+Multi-seed Monte Carlo evaluation of a bot config over synthetic scenarios.
+
+Backtester.run_scenario simulates each scenario for one seed, so a config
+that wins a one-seed sweep may just have drawn a lucky path.  run_monte_carlo
+runs every scenario for many seeds, fanning seed chunks out over worker
+processes.  Each worker returns only a small (seeds × scenarios × metrics)
+float array instead of full ScenarioResult objects, and the chunks are
+written into one MonteCarloResult as they finish.
+
+MonteCarloResult.summary() reports, per scenario and for the scenario sum:
+  - mean P&L with a normal-approximation confidence interval of the mean
+  - P&L quantile band (e.g. 5th / 50th / 95th percentile across seeds)
+  - mean / upper-quantile max drawdown
+  - win rate (fraction of seeds with positive P&L)
+
+By default every seed replays exactly the paths run_scenario(scenario, seed)
+simulates.  batched=True instead draws each chunk's paths for a market in
+one NumPy generate_batch call (see path_cache.BatchPaths): much cheaper path
+generation over many seeds, statistically equivalent, but not draw-for-draw
+identical to run_scenario — so use one mode consistently when comparing
+configs.
+
+Usage:
+    seeds = [42 + i * 137 for i in range(300)]
+    mc = run_monte_carlo(cfg, SCENARIOS, seeds, engine=VectorizedBacktester, workers=8)
+    for s in mc.summary(confidence=0.95):
+        print(s.scenario_name, s.pnl.mean, s.pnl.ci_low, s.pnl.ci_high)
+"""
+
+from __future__ import annotations
+
+import math
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+from functools import partial
+from statistics import NormalDist
+from typing import Callable, Optional, Sequence
+
+import numpy as np
+
+from .backtester import Backtester, ScenarioResult
+from .config import BotConfig
+from .path_cache import BatchPaths, process_cache
+from .synthetic_data import Scenario
+
+# Per-seed, per-scenario values kept from each ScenarioResult
+METRICS = ("net_pnl", "max_drawdown", "return_pct", "positions_opened")
+
+TOTAL = "TOTAL"   # summary row for the per-seed sum over scenarios
+
+
+# ---------------------------------------------------------------------------
+# Results
+# ---------------------------------------------------------------------------
+
+@dataclass
+class MetricSummary:
+    """Distribution of one metric across seeds."""
+    mean: float
+    ci_low: float     # confidence interval of the mean
+    ci_high: float
+    q_low: float      # quantile band across seeds
+    median: float
+    q_high: float
+
+    @classmethod
+    def of(cls, values: np.ndarray, confidence: float) -> "MetricSummary":
+        n = len(values)
+        mean = float(values.mean())
+        half = 0.0
+        if n > 1:
+            z = NormalDist().inv_cdf(0.5 + confidence / 2)
+            half = z * float(values.std(ddof=1)) / math.sqrt(n)
+        tail = (1 - confidence) / 2
+        q_low, median, q_high = np.quantile(values, [tail, 0.5, 1 - tail])
+        return cls(mean, mean - half, mean + half, float(q_low), float(median), float(q_high))
+
+
+@dataclass
+class ScenarioSummary:
+    scenario_name: str
+    n_seeds: int
+    pnl: MetricSummary
+    drawdown: MetricSummary
+    win_rate: float
+
+
+@dataclass
+class MonteCarloResult:
+    """
+    Per-seed scenario metrics as compact arrays.
+
+    values has shape (len(seeds), len(scenario_names), len(METRICS)).
+    """
+    scenario_names: list[str]
+    seeds: np.ndarray
+    values: np.ndarray
+
+    def metric(self, name: str) -> np.ndarray:
+        """(seeds × scenarios) array of one metric."""
+        return self.values[:, :, METRICS.index(name)]
+
+    @property
+    def total_pnl(self) -> np.ndarray:
+        """P&L summed over scenarios, one value per seed."""
+        return self.metric("net_pnl").sum(axis=1)
+
+    def summary(self, confidence: float = 0.95) -> list[ScenarioSummary]:
+        """One ScenarioSummary per scenario, then one for the TOTAL."""
+        if not 0 < confidence < 1:
+            raise ValueError("confidence must be between 0 and 1")
+        pnl, dd = self.metric("net_pnl"), self.metric("max_drawdown")
+        columns = [(name, pnl[:, j], dd[:, j]) for j, name in enumerate(self.scenario_names)]
+        columns.append((TOTAL, self.total_pnl, dd.max(axis=1)))
+        return [
+            ScenarioSummary(
+                scenario_name=name,
+                n_seeds=len(self.seeds),
+                pnl=MetricSummary.of(p, confidence),
+                drawdown=MetricSummary.of(d, confidence),
+                win_rate=float((p > 0).mean()),
+            )
+            for name, p, d in columns
+        ]
+
+
+# ---------------------------------------------------------------------------
+# Runner
+# ---------------------------------------------------------------------------
+
+def _result_row(result: ScenarioResult) -> tuple[float, ...]:
+    return (
+        result.net_pnl,
+        result.max_portfolio_drawdown,
+        result.return_pct,
+        sum(m.positions_opened for m in result.markets),
+    )
+
+
+def _run_seed_chunk(
+    seeds: list[int],
+    config: BotConfig,
+    scenarios: list[Scenario],
+    engine: type[Backtester],
+    cache_dir: Optional[str] = None,
+    batched: bool = False,
+) -> np.ndarray:
+    """Simulate every scenario for each seed (runs in a worker process)."""
+    if batched:
+        paths = BatchPaths(seeds)
+    else:
+        paths = process_cache(cache_dir) if cache_dir else None
+    out = np.empty((len(seeds), len(scenarios), len(METRICS)))
+    for i, seed in enumerate(seeds):
+        for j, scenario in enumerate(scenarios):
+            result = engine(config, path_cache=paths).run_scenario(scenario, seed=seed)
+            out[i, j] = _result_row(result)
+    return out
+
+
+def run_monte_carlo(
+    config: BotConfig,
+    scenarios: Sequence[Scenario],
+    seeds: Sequence[int],
+    engine: type[Backtester] = Backtester,
+    workers: int = 1,
+    chunk_size: Optional[int] = None,
+    cache_dir: Optional[str] = None,
+    progress: Optional[Callable[[int, int], None]] = None,
+    batched: bool = False,
+) -> MonteCarloResult:
+    """
+    Evaluate `config` on every scenario for every seed.
+
+    With workers > 1 the seeds are split into chunks of `chunk_size`
+    (default: ~4 chunks per worker) and run in a process pool.  Each seed is
+    simulated exactly as run_scenario(scenario, seed) would, so the result
+    does not depend on the worker count.  `progress(done, total)` is called
+    after each chunk lands; `cache_dir` persists the synthetic paths so later
+    runs over the same seeds (e.g. other configs) skip path generation.
+
+    batched=True generates each chunk's paths with NumPy instead (see the
+    module docstring); every path still has its own seed-derived stream,
+    so the result stays independent of the worker count and chunking.
+    """
+    scenarios, seeds = list(scenarios), list(seeds)
+    if not seeds:
+        raise ValueError("need at least one seed")
+    if batched and cache_dir:
+        raise ValueError("batched paths are not cached; drop cache_dir")
+    workers = max(1, workers)
+    if chunk_size is None:
+        chunk_size = max(1, math.ceil(len(seeds) / (workers * 4)))
+    starts = range(0, len(seeds), chunk_size)
+    run_chunk = partial(
+        _run_seed_chunk, config=config, scenarios=scenarios, engine=engine, cache_dir=cache_dir,
+        batched=batched,
+    )
+
+    values = np.empty((len(seeds), len(scenarios), len(METRICS)))
+    pool = ProcessPoolExecutor(max_workers=workers) if workers > 1 else None
+    try:
+        chunks = [seeds[s:s + chunk_size] for s in starts]
+        outcomes = pool.map(run_chunk, chunks) if pool else map(run_chunk, chunks)
+        for start, block in zip(starts, outcomes):
+            values[start:start + len(block)] = block
+            if progress:
+                progress(min(start + chunk_size, len(seeds)), len(seeds))
+    finally:
+        if pool:
+            pool.shutdown()
+
+    return MonteCarloResult([s.name for s in scenarios], np.array(seeds), values)
@@ -25,21 +25,52 @@ State machine per market position:
 P&L accounting (all paths subtract Kalshi fee_rate per fill):
   BOTH_FILLED   : (1 - yes_price - no_price) × contracts - fee_YES - fee_NO
   Stop-loss exit: (current_bid - leg_price)  × contracts - fee_leg
+
+Batch mode (config.batch_orders):
+  open_positions() submits the YES/NO legs of every new position in one
+  batched request per 20 orders, and cancels issued during refresh_all() /
+  close_position() are collected and sent through the batched cancel
+  endpoint.  Hedges are still placed immediately — they are latency-critical.
+
+Event-driven mode (config.event_driven):
+  WebSocket fill and order-update events drive the state machine directly:
+  an order reported fully filled or cancelled leaves the local open-order
+  view and the position advances at once (e.g. the hedge goes out on the WS
+  thread).  Between reconciliation sweeps refresh_all(reconcile=False) works
+  from that local view — no GET /portfolio/orders, order-status or market
+  calls — and the bot runs a full REST sweep every reconcile_interval.
+
+Order books come from the WebSocket-fed OrderBookCache when one is attached
+(config.ws_order_books), falling back to GET /orderbook for uncached tickers.
+
+Async I/O (AsyncKalshiBot):
+  refresh_all_async() fetches every REST read a refresh_all pass needs —
+  open orders, order books, market statuses, then the status of each
+  vanished order — concurrently through an AsyncKalshiClient, and runs the
+  same pass on the results (RefreshInputs).  open_positions_async() places
+  all legs concurrently.  The state lock is only taken to apply results,
+  never across an await, so WS events are not held up by REST latency.  Hedges and cancels triggered inside the state
+  machine still use the sync client, which the WS thread shares.
 """
 
 from __future__ import annotations
 
+import asyncio
 import logging
+import threading
 import time
 from dataclasses import dataclass, field
 from enum import Enum, auto
 from typing import Optional, TYPE_CHECKING
 
-from .client import KalshiClient, Order, OrderBook
+from .client import KalshiClient, MarketInfo, Order, OrderBook, OrderIntent
 from .config import BotConfig
 from .rewards import compute_scenario_pnl, format_scenario_summary
 
 if TYPE_CHECKING:
+    from .async_client import AsyncKalshiClient
+    from .book_cache import OrderBookCache
+    from .fill_model import OnlineFillModel
     from .state_store import StateStore
 
 logger = logging.getLogger(__name__)
@@ -62,6 +93,10 @@ class PositionState(Enum):
 # Market statuses Kalshi returns when a market has finished paying out
 _RESOLVED_STATUSES = frozenset({"settled", "finalized", "closed", "resolved"})
 
+# Order statuses that take an order off the book (WS "executed" → "filled")
+_TERMINAL_ORDER_STATUSES = frozenset({"filled", "canceled", "expired"})
+_ORDER_STATUS_ALIASES = {"executed": "filled", "cancelled": "canceled"}
+
 
 @dataclass
 class MarketPosition:
@@ -95,6 +130,46 @@ class MarketPosition:
     last_quote_time: float = field(default_factory=time.time)
 
 
+@dataclass
+class QuoteRequest:
+    """A position to open: YES-BUY and NO-BUY legs of `contracts` each."""
+    ticker: str
+    title: str
+    yes_price: float
+    no_price: float
+    contracts: int
+
+
+@dataclass
+class RefreshInputs:
+    """
+    REST reads for one refresh_all pass, fetched ahead of time.
+
+    A ticker / order id present in a dict is never fetched again by the pass
+    — a None value means the prefetch failed and is treated like a failed
+    read (state left unchanged until the next tick).
+
+    The reads are made without the state lock, so orders placed after the
+    open-order request went out (a WS-thread hedge, say) are missing from
+    open_orders; known_orders lets the pass tell those from vanished ones.
+    """
+    open_orders: Optional[dict[str, Order]] = None        # reconcile passes only
+    known_orders: Optional[set[str]] = None               # tracked when open_orders was requested
+    order_books: dict[str, Optional[OrderBook]] = field(default_factory=dict)
+    market_status: dict[str, Optional[str]] = field(default_factory=dict)
+    order_status: dict[str, Optional[str]] = field(default_factory=dict)
+
+
+class _RefreshPass(threading.local):
+    """
+    Per-thread state of a refresh_all pass.  Transitions the WS thread makes
+    mid-pass see neither the main loop's prefetched reads nor its cancel
+    queue, so their cancels go out immediately.
+    """
+    inputs: Optional[RefreshInputs] = None
+    pending_cancels: Optional[list[str]] = None   # batched pass only (None = cancel now)
+
+
 # ---------------------------------------------------------------------------
 # Order manager
 # ---------------------------------------------------------------------------
@@ -107,11 +182,27 @@ class OrderManager:
         client: KalshiClient,
         config: BotConfig,
         store: Optional["StateStore"] = None,
+        book_cache: Optional["OrderBookCache"] = None,
+        fill_model: Optional["OnlineFillModel"] = None,
     ) -> None:
         self.client = client
         self.cfg = config
         self._store = store
+        self.book_cache = book_cache
+        # Learns from each quoted leg: filled → 1, cancelled as stale → 0
+        self.fill_model = fill_model
+        self._market_context: dict[str, tuple[float, float, float]] = {}   # ticker → (mid, vol, spread)
+        self._quote_features: dict[str, dict[str, tuple[float, float, float]]] = {}
         self.positions: dict[str, MarketPosition] = {}  # ticker → position
+        self.batch_orders = config.batch_orders
+        # The refresh_all pass in progress on the calling thread
+        self._pass = _RefreshPass()
+
+        self.event_driven = config.event_driven
+        # Serialises state transitions between the main loop and the WS thread
+        self._lock = threading.RLock()
+        self._order_events: dict[str, str] = {}   # order_id → terminal status seen
+        self._ws_fills: dict[str, int] = {}       # order_id → contracts filled (WS)
 
     # ------------------------------------------------------------------
     # Opening a position
@@ -130,6 +221,141 @@ class OrderManager:
 
         yes_price + no_price must be < max_fill_cost (spread profit).
         """
+        with self._lock:
+            pos, ready = self._new_position(ticker, title, yes_price, no_price, contracts)
+            if not ready:
+                return pos
+
+            yes_id = self.client.place_limit_order(
+                ticker=ticker, side="yes", action="buy",
+                price=yes_price, count=contracts,
+            )
+            if yes_id is None:
+                logger.error("[%s] YES order placement failed – aborting.", ticker)
+                pos.state = PositionState.IDLE
+                self.positions[ticker] = pos
+                return pos
+
+            no_id = self.client.place_limit_order(
+                ticker=ticker, side="no", action="buy",
+                price=no_price, count=contracts,
+            )
+            if no_id is None:
+                logger.error("[%s] NO order placement failed – cancelling YES.", ticker)
+                self.client.cancel_order(yes_id)
+                pos.state = PositionState.IDLE
+                self.positions[ticker] = pos
+                return pos
+
+            self._activate(pos, yes_id, no_id)
+            return pos
+
+    def open_positions(self, requests: list[QuoteRequest]) -> list[MarketPosition]:
+        """
+        Open several positions with one batched order submission.
+
+        Both legs of every position go into the same batch (adjacent, so a
+        20-order chunk never splits a pair), which keeps YES and NO placement
+        near-simultaneous.  A position whose either leg is rejected goes IDLE
+        and its surviving leg is cancelled.  Returns one position per request.
+        """
+        with self._lock:
+            out, ready = self._prepare_batch(requests)
+            if not ready:
+                return out
+            ids = self.client.place_orders_batch(self._leg_intents(ready))
+            orphans = self._activate_pairs(ready, ids)
+            if orphans:
+                self.client.cancel_orders_batch(orphans)
+            return out
+
+    async def open_positions_async(
+        self, aclient: "AsyncKalshiClient", requests: list[QuoteRequest],
+    ) -> list[MarketPosition]:
+        """
+        open_positions() through an AsyncKalshiClient.
+
+        In batch mode the batch chunks go out concurrently; otherwise every
+        leg of every position is its own concurrent POST.  The state lock is
+        taken to validate the requests and to record the placed ids, not
+        while the POSTs are in flight.  A WS fill that lands before its
+        position is recorded is ignored as untracked; the next reconcile
+        sweep picks the fill up over REST.
+        """
+        with self._lock:
+            out, ready = self._prepare_batch(requests)
+        if not ready:
+            return out
+        intents = self._leg_intents(ready)
+        if self.batch_orders:
+            ids = await aclient.place_orders_batch(intents)
+        else:
+            ids = await asyncio.gather(*(
+                aclient.place_limit_order(it.ticker, it.side, it.action, it.price, it.count)
+                for it in intents
+            ))
+        with self._lock:
+            orphans = self._activate_pairs(ready, list(ids))
+        if orphans:
+            if self.batch_orders:
+                await aclient.cancel_orders_batch(orphans)
+            else:
+                await asyncio.gather(*(aclient.cancel_order(oid) for oid in orphans))
+        return out
+
+    def _prepare_batch(
+        self, requests: list[QuoteRequest],
+    ) -> tuple[list[MarketPosition], list[MarketPosition]]:
+        """Validate requests: (one position per request, those ready to place)."""
+        by_ticker: dict[str, MarketPosition] = {}
+        ready: list[MarketPosition] = []
+        for r in requests:
+            if r.ticker in by_ticker:
+                continue   # duplicate request in the same batch
+            pos, ok = self._new_position(r.ticker, r.title, r.yes_price, r.no_price, r.contracts)
+            by_ticker[r.ticker] = pos
+            if ok:
+                ready.append(pos)
+        return [by_ticker[r.ticker] for r in requests], ready
+
+    @staticmethod
+    def _leg_intents(ready: list[MarketPosition]) -> list[OrderIntent]:
+        """YES and NO legs of each position, adjacent."""
+        intents: list[OrderIntent] = []
+        for pos in ready:
+            intents.append(OrderIntent(pos.ticker, "yes", "buy", pos.yes_price, pos.contracts))
+            intents.append(OrderIntent(pos.ticker, "no", "buy", pos.no_price, pos.contracts))
+        return intents
+
+    def _activate_pairs(
+        self, ready: list[MarketPosition], ids: list[Optional[str]],
+    ) -> list[str]:
+        """Activate positions whose legs both placed; return the orphaned legs."""
+        orphans: list[str] = []
+        for pos, yes_id, no_id in zip(ready, ids[0::2], ids[1::2]):
+            if yes_id and no_id:
+                self._activate(pos, yes_id, no_id)
+                continue
+            failed = "YES" if not yes_id else "NO"
+            logger.error("[%s] %s order placement failed – aborting.", pos.ticker, failed)
+            orphans.extend(oid for oid in (yes_id, no_id) if oid)
+            pos.state = PositionState.IDLE
+            self.positions[pos.ticker] = pos
+        return orphans
+
+    def _new_position(
+        self,
+        ticker: str,
+        title: str,
+        yes_price: float,
+        no_price: float,
+        contracts: int,
+    ) -> tuple[MarketPosition, bool]:
+        """
+        Validate an open request.  Returns (position, ready): when ready is
+        False the returned position is the existing / skipped one and no
+        orders should be placed.
+        """
         if ticker in self.positions:
             pos = self.positions[ticker]
             if pos.state not in (PositionState.IDLE, PositionState.RESOLVED):
@@ -137,7 +363,7 @@ class OrderManager:
                     "Position %s already open (state=%s) – skipping.",
                     ticker, pos.state.name,
                 )
-                return pos
+                return pos, False
 
         combined = yes_price + no_price
         max_cost = self.cfg.risk.max_fill_cost
@@ -149,7 +375,7 @@ class OrderManager:
             )
             pos = MarketPosition(ticker=ticker, title=title, state=PositionState.IDLE)
             self.positions[ticker] = pos
-            return pos
+            return pos, False
 
         # mid ≈ mean of our YES ask and NO ask (both from the taker's perspective)
         original_mid = (yes_price + (1.0 - no_price)) / 2.0
@@ -162,51 +388,69 @@ class OrderManager:
             original_mid=original_mid,
             contracts=contracts,
         )
+        return pos, True
 
-        yes_id = self.client.place_limit_order(
-            ticker=ticker, side="yes", action="buy",
-            price=yes_price, count=contracts,
-        )
-        if yes_id is None:
-            logger.error("[%s] YES order placement failed – aborting.", ticker)
-            pos.state = PositionState.IDLE
-            self.positions[ticker] = pos
-            return pos
-
-        no_id = self.client.place_limit_order(
-            ticker=ticker, side="no", action="buy",
-            price=no_price, count=contracts,
-        )
-        if no_id is None:
-            logger.error("[%s] NO order placement failed – cancelling YES.", ticker)
-            self.client.cancel_order(yes_id)
-            pos.state = PositionState.IDLE
-            self.positions[ticker] = pos
-            return pos
-
+    def _activate(self, pos: MarketPosition, yes_id: str, no_id: str) -> None:
+        """Both legs are resting: record the position as QUOTING."""
         pos.yes_order_id = yes_id
         pos.no_order_id = no_id
         pos.state = PositionState.QUOTING
         pos.last_quote_time = time.time()
 
-        self.positions[ticker] = pos
-        self._save(pos)
+        self.positions[pos.ticker] = pos
+        self._save(pos, "quote")
+        self._track_quote(pos)
 
-        pnl = compute_scenario_pnl(yes_price, no_price, max_cost)
+        pnl = compute_scenario_pnl(pos.yes_price, pos.no_price, self.cfg.risk.max_fill_cost)
         logger.info(
             "Opened position %s\n%s",
-            title[:60],
-            format_scenario_summary(pnl, yes_price, no_price),
+            pos.title[:60],
+            format_scenario_summary(pnl, pos.yes_price, pos.no_price),
         )
-        return pos
 
     # ------------------------------------------------------------------
     # Refresh loop
     # ------------------------------------------------------------------
 
-    def refresh_all(self) -> None:
-        """Poll open orders and advance the state machine for all positions."""
-        open_orders = {o.order_id: o for o in self.client.get_open_orders()}
+    def refresh_all(
+        self, reconcile: bool = True, inputs: Optional[RefreshInputs] = None,
+    ) -> None:
+        """
+        Poll open orders and advance the state machine for all positions.
+
+        reconcile=False (event-driven mode, between sweeps) takes open orders
+        from WS events instead of REST and skips market-status polling.
+
+        The REST reads are made up front without the state lock (or taken
+        from `inputs`, prefetched by refresh_all_async); the lock is held
+        only while each position's refresh is applied, so WS fills are never
+        queued behind the sweep.
+        """
+        if inputs is None:
+            inputs = self._fetch_inputs(reconcile)
+        self._pass.inputs = inputs
+        try:
+            if self.batch_orders:
+                self._pass.pending_cancels = []
+                try:
+                    self._refresh_all(reconcile)
+                finally:
+                    pending, self._pass.pending_cancels = self._pass.pending_cancels, None
+                    self._cancel_orders(pending)
+            else:
+                self._refresh_all(reconcile)
+        finally:
+            self._pass.inputs = None
+
+    def _refresh_all(self, reconcile: bool = True) -> None:
+        inputs = self._pass.inputs
+        if reconcile:
+            if inputs is not None and inputs.open_orders is not None:
+                open_orders = self._prefetched_open_orders(inputs)
+            else:
+                open_orders = {o.order_id: o for o in self.client.get_open_orders()}
+            with self._lock:
+                self._prune_order_events()
 
         for ticker, pos in list(self.positions.items()):
             # Fetch live market data for positions that need price / status checks
@@ -215,23 +459,132 @@ class OrderManager:
 
             if not self.cfg.dry_run:
                 if pos.state in (PositionState.QUOTING, PositionState.ONE_SIDE_HEDGED):
-                    try:
-                        order_book = self.client.get_order_book(ticker)
-                    except Exception as exc:
-                        logger.debug("get_order_book(%s): %s", ticker, exc)
-
-                if pos.state == PositionState.BOTH_FILLED:
-                    try:
-                        raw = self.client.get_market(ticker)
-                        market_status = raw.get("status", "open").lower()
-                    except Exception as exc:
-                        logger.debug("get_market(%s): %s", ticker, exc)
+                    order_book = self.get_order_book(ticker)
+
+                if pos.state == PositionState.BOTH_FILLED and reconcile:
+                    if inputs is not None and ticker in inputs.market_status:
+                        market_status = inputs.market_status[ticker]
+                    else:
+                        market_status = self._market_status(ticker)
 
             try:
-                self._refresh_position(pos, open_orders, order_book, market_status)
+                with self._lock:
+                    if not reconcile:
+                        open_orders = self._local_open_orders()
+                    self._refresh_position(pos, open_orders, order_book, market_status)
             except Exception as exc:
                 logger.error("refresh_position(%s): %s", ticker, exc, exc_info=True)
 
+    async def refresh_all_async(
+        self, aclient: "AsyncKalshiClient", reconcile: bool = True,
+    ) -> None:
+        """
+        refresh_all() with its REST reads prefetched concurrently.
+
+        The reads are awaited without the state lock; only the synchronous
+        refresh_all pass over the results takes it, so WS fills are never
+        queued behind the network.
+        """
+        inputs = await self._prefetch(aclient, reconcile)
+        self.refresh_all(reconcile, inputs)
+
+    async def _prefetch(self, aclient: "AsyncKalshiClient", reconcile: bool) -> RefreshInputs:
+        with self._lock:
+            book_tickers, market_tickers = self._refresh_reads(reconcile)
+            known = set(self._local_open_orders()) if reconcile else None
+
+        async def market_status(ticker: str) -> Optional[str]:
+            try:
+                raw = await aclient.get_market(ticker)
+                return raw.get("status", "open").lower()
+            except Exception as exc:
+                logger.debug("get_market(%s): %s", ticker, exc)
+                return None
+
+        async def no_orders() -> None:
+            return None
+
+        open_orders, books, statuses = await asyncio.gather(
+            aclient.get_open_orders() if reconcile else no_orders(),
+            aclient.get_order_books(book_tickers),
+            asyncio.gather(*(market_status(t) for t in market_tickers)),
+        )
+        inputs = RefreshInputs(
+            order_books=books, market_status=dict(zip(market_tickers, statuses)),
+            known_orders=known,
+        )
+        if reconcile:
+            inputs.open_orders = {o.order_id: o for o in open_orders}
+            order_ids = self._unresolved_orders(self._prefetched_open_orders(inputs))
+            orders = await asyncio.gather(*(aclient.get_order_status(oid) for oid in order_ids))
+            inputs.order_status = {
+                oid: (o.status if o is not None else None) for oid, o in zip(order_ids, orders)
+            }
+        return inputs
+
+    def _fetch_inputs(self, reconcile: bool) -> RefreshInputs:
+        """refresh_all's REST reads, made one by one without the state lock."""
+        with self._lock:
+            book_tickers, market_tickers = self._refresh_reads(reconcile)
+            known = set(self._local_open_orders()) if reconcile else None
+        inputs = RefreshInputs(known_orders=known)
+        for ticker in book_tickers:
+            inputs.order_books[ticker] = self.get_order_book(ticker)
+        for ticker in market_tickers:
+            inputs.market_status[ticker] = self._market_status(ticker)
+        if reconcile:
+            inputs.open_orders = {o.order_id: o for o in self.client.get_open_orders()}
+            for oid in self._unresolved_orders(self._prefetched_open_orders(inputs)):
+                order = self.client.get_order_status(oid)
+                inputs.order_status[oid] = order.status if order is not None else None
+        return inputs
+
+    def _refresh_reads(self, reconcile: bool = True) -> tuple[list[str], list[str]]:
+        """
+        (order-book tickers, market-status tickers) that a refresh_all pass
+        would fetch over REST.  Books held by the WS cache are left out.
+        """
+        if self.cfg.dry_run:
+            return [], []
+        books: list[str] = []
+        markets: list[str] = []
+        for ticker, pos in list(self.positions.items()):
+            if pos.state in (PositionState.QUOTING, PositionState.ONE_SIDE_HEDGED):
+                if self.book_cache is None or self.book_cache.get(ticker) is None:
+                    books.append(ticker)
+            elif pos.state == PositionState.BOTH_FILLED and reconcile:
+                markets.append(ticker)
+        return books, markets
+
+    def _prefetched_open_orders(self, inputs: RefreshInputs) -> dict[str, Order]:
+        """
+        inputs.open_orders plus the tracked orders placed after it was
+        requested, which the snapshot cannot contain and must not read as
+        vanished.
+        """
+        open_orders = dict(inputs.open_orders or {})
+        if inputs.known_orders is not None:
+            with self._lock:
+                for oid, order in self._local_open_orders().items():
+                    if oid not in inputs.known_orders:
+                        open_orders.setdefault(oid, order)
+        return open_orders
+
+    def _unresolved_orders(self, open_orders: dict[str, Order]) -> list[str]:
+        """
+        Quoting legs missing from `open_orders` with no WS status yet — the
+        orders a reconcile pass would GET one by one to tell fill from cancel.
+        """
+        with self._lock:
+            ids: list[str] = []
+            for pos in self.positions.values():
+                if pos.state != PositionState.QUOTING:
+                    continue
+                for oid in (pos.yes_order_id, pos.no_order_id):
+                    if oid and oid not in open_orders and oid not in self._order_events:
+                        ids.append(oid)
+            return ids
+
     def _refresh_position(
         self,
         pos: MarketPosition,
@@ -256,36 +609,38 @@ class OrderManager:
             no_filled  = False
 
             if yes_gone:
-                order = self.client.get_order_status(pos.yes_order_id)
-                if order is None:
+                status = self._order_status(pos.yes_order_id)
+                if status is None:
                     pass  # API error – leave state unchanged, retry next tick
-                elif order.status == "filled":
+                elif status == "filled":
                     yes_filled = True
+                    self._observe_quote(pos, pos.yes_order_id, filled=True)
                 else:
                     logger.info(
                         "[%s] YES order %s (status=%s) – going IDLE.",
-                        pos.ticker, pos.yes_order_id, order.status,
+                        pos.ticker, pos.yes_order_id, status,
                     )
                     pos.state = PositionState.IDLE
-                    self._save(pos)
+                    self._save(pos, "order_gone")
                     return
 
             if no_gone:
-                order = self.client.get_order_status(pos.no_order_id)
-                if order is None:
+                status = self._order_status(pos.no_order_id)
+                if status is None:
                     pass  # API error – leave state unchanged, retry next tick
-                elif order.status == "filled":
+                elif status == "filled":
                     no_filled = True
+                    self._observe_quote(pos, pos.no_order_id, filled=True)
                 else:
                     logger.info(
                         "[%s] NO order %s (status=%s) – going IDLE.",
-                        pos.ticker, pos.no_order_id, order.status,
+                        pos.ticker, pos.no_order_id, status,
                     )
                     # Cancel the other side if it's still live
                     if yes_live and pos.yes_order_id:
-                        self.client.cancel_order(pos.yes_order_id)
+                        self._cancel_orders([pos.yes_order_id])
                     pos.state = PositionState.IDLE
-                    self._save(pos)
+                    self._save(pos, "order_gone")
                     return
 
             if yes_filled and no_filled:
@@ -312,11 +667,12 @@ class OrderManager:
                             "[%s] Mid drifted %.4f (limit %.4f) – cancelling orders.",
                             pos.ticker, drift, self.cfg.risk.cancel_if_mid_drift,
                         )
-                        for oid in [pos.yes_order_id, pos.no_order_id]:
-                            if oid and oid in open_orders:
-                                self.client.cancel_order(oid)
+                        self._cancel_orders([
+                            oid for oid in (pos.yes_order_id, pos.no_order_id)
+                            if oid and oid in open_orders
+                        ])
                         pos.state = PositionState.IDLE
-                        self._save(pos)
+                        self._save(pos, "drift_cancel")
                         return
 
                 self._maybe_requote(pos, open_orders)
@@ -337,7 +693,7 @@ class OrderManager:
         elif pos.state == PositionState.BOTH_FILLED:
             if market_status in _RESOLVED_STATUSES:
                 pos.state = PositionState.RESOLVED
-                self._save(pos)
+                self._save(pos, "resolved")
                 logger.info(
                     "[%s] Market resolved (%s) – releasing. total_pnl=$%.4f",
                     pos.ticker, market_status, pos.realised_pnl,
@@ -356,7 +712,7 @@ class OrderManager:
         pnl = (1.0 - pos.yes_price - pos.no_price) * pos.contracts - fee
         pos.realised_pnl += pnl
         pos.state = PositionState.BOTH_FILLED
-        self._save(pos)
+        self._save(pos, "both_filled")
         logger.info(
             "[%s] BOTH filled – spread=$%.4f fee=$%.4f net=$%.4f",
             pos.ticker,
@@ -374,7 +730,7 @@ class OrderManager:
         pnl = (1.0 - leg1_price - leg2_price) * pos.contracts - fee
         pos.realised_pnl += pnl
         pos.state = PositionState.BOTH_FILLED
-        self._save(pos)
+        self._save(pos, "hedge_filled")
         logger.info(
             "[%s] Hedge filled – spread=$%.4f fee=$%.4f net=$%.4f",
             pos.ticker,
@@ -392,7 +748,7 @@ class OrderManager:
         if max_no_price <= 0:
             logger.error("[%s] No headroom for profitable NO hedge.", pos.ticker)
             pos.state = PositionState.ONE_SIDE_HEDGED
-            self._save(pos)
+            self._save(pos, "hedge_skipped")
             return
 
         hedge_price = min(max_no_price, 0.99)
@@ -403,7 +759,7 @@ class OrderManager:
         pos.hedge_order_id = hedge_id
         pos.hedge_price = hedge_price
         pos.state = PositionState.ONE_SIDE_HEDGED
-        self._save(pos)
+        self._save(pos, "hedge")
         logger.info(
             "[%s] NO hedge placed @ %.4f (YES paid %.4f, combined=%.4f)",
             pos.ticker, hedge_price, pos.yes_price, pos.yes_price + hedge_price,
@@ -415,7 +771,7 @@ class OrderManager:
         if max_yes_price <= 0:
             logger.error("[%s] No headroom for profitable YES hedge.", pos.ticker)
             pos.state = PositionState.ONE_SIDE_HEDGED
-            self._save(pos)
+            self._save(pos, "hedge_skipped")
             return
 
         hedge_price = min(max_yes_price, 0.99)
@@ -426,7 +782,7 @@ class OrderManager:
         pos.hedge_order_id = hedge_id
         pos.hedge_price = hedge_price
         pos.state = PositionState.ONE_SIDE_HEDGED
-        self._save(pos)
+        self._save(pos, "hedge")
         logger.info(
             "[%s] YES hedge placed @ %.4f (NO paid %.4f, combined=%.4f)",
             pos.ticker, hedge_price, pos.no_price, pos.no_price + hedge_price,
@@ -477,10 +833,10 @@ class OrderManager:
     ) -> None:
         """Cancel the hedge and record a MTM stop-loss exit."""
         if pos.hedge_order_id and pos.hedge_order_id in open_orders:
-            self.client.cancel_order(pos.hedge_order_id)
+            self._cancel_orders([pos.hedge_order_id])
         pos.realised_pnl += mtm_pnl
         pos.state = PositionState.RESOLVED
-        self._save(pos)
+        self._save(pos, "cut")
         logger.warning(
             "[%s] %s – mtm=$%.4f total_pnl=$%.4f",
             pos.ticker, reason, mtm_pnl, pos.realised_pnl,
@@ -503,12 +859,15 @@ class OrderManager:
             "[%s] Orders stale (%.0fs) – cancelling and re-quoting.",
             pos.ticker, age,
         )
-        for oid in [pos.yes_order_id, pos.no_order_id]:
-            if oid and oid in open_orders:
-                self.client.cancel_order(oid)
+        self._cancel_orders([
+            oid for oid in (pos.yes_order_id, pos.no_order_id)
+            if oid and oid in open_orders
+        ])
+        for oid in (pos.yes_order_id, pos.no_order_id):
+            self._observe_quote(pos, oid, filled=False)
 
         pos.state = PositionState.IDLE
-        self._save(pos)
+        self._save(pos, "requote")
 
     # ------------------------------------------------------------------
     # Lifecycle
@@ -518,19 +877,168 @@ class OrderManager:
         pos = self.positions.get(ticker)
         if not pos:
             return
-        for oid in [pos.yes_order_id, pos.no_order_id, pos.hedge_order_id]:
-            if oid:
-                self.client.cancel_order(oid)
+        self._cancel_orders([
+            oid for oid in (pos.yes_order_id, pos.no_order_id, pos.hedge_order_id) if oid
+        ])
         pos.state = PositionState.RESOLVED
-        self._save(pos)
+        self._save(pos, "closed")
+
+    def _cancel_orders(self, order_ids: list[str]) -> None:
+        """
+        Cancel orders now, or queue them while a batched refresh_all is
+        running on this thread.  In batch mode several cancels share one batched request.
+        """
+        if not order_ids:
+            return
+        for oid in order_ids:
+            self._order_events[oid] = "canceled"
+        pending = self._pass.pending_cancels
+        if pending is not None:
+            pending.extend(order_ids)
+        elif self.batch_orders and len(order_ids) > 1:
+            self.client.cancel_orders_batch(order_ids)
+        else:
+            for oid in order_ids:
+                self.client.cancel_order(oid)
+
+    # ------------------------------------------------------------------
+    # Online fill model
+    # ------------------------------------------------------------------
+
+    def note_market(self, market: MarketInfo) -> None:
+        """Record the market conditions a quote about to be opened sees."""
+        if self.fill_model is not None:
+            self._market_context[market.ticker] = (
+                market.mid_price, market.volume_24h, market.spread,
+            )
+
+    def _track_quote(self, pos: MarketPosition) -> None:
+        """Remember each new leg's features until its outcome is known."""
+        context = self._market_context.pop(pos.ticker, None)
+        if self.fill_model is None or context is None:
+            return
+        mid, volume, spread = context
+        # Replaces the previous quote's legs: unresolved ones carry no label.
+        self._quote_features[pos.ticker] = {
+            pos.yes_order_id: (abs(pos.yes_price - mid), volume, spread),
+            pos.no_order_id: (abs(pos.no_price - (1.0 - mid)), volume, spread),
+        }
+
+    def _observe_quote(self, pos: MarketPosition, order_id: Optional[str], filled: bool) -> None:
+        """Label a leg with how long it rested, so the model learns an hourly rate."""
+        features = self._quote_features.get(pos.ticker, {}).pop(order_id, None)
+        if features is not None:
+            hours = (time.time() - pos.last_quote_time) / 3600
+            self.fill_model.observe(*features, filled=filled, hours=hours)
 
     # ------------------------------------------------------------------
     # State store helper
     # ------------------------------------------------------------------
 
-    def _save(self, pos: MarketPosition) -> None:
+    def _save(self, pos: MarketPosition, event: str) -> None:
+        """Persist a transition; `event` labels it in the store's journal."""
         if self._store is not None:
-            self._store.upsert(pos)
+            self._store.upsert(pos, event)
+
+    # ------------------------------------------------------------------
+    # Market data (WS caches first, REST fallback)
+    # ------------------------------------------------------------------
+
+    def get_order_book(self, ticker: str) -> Optional[OrderBook]:
+        """Cached WS order book if available, else REST (None on error)."""
+        inputs = self._pass.inputs
+        if inputs is not None and ticker in inputs.order_books:
+            return inputs.order_books[ticker]
+        if self.book_cache is not None:
+            book = self.book_cache.get(ticker)
+            if book is not None:
+                return book
+        try:
+            return self.client.get_order_book(ticker)
+        except Exception as exc:
+            logger.debug("get_order_book(%s): %s", ticker, exc)
+            return None
+
+    def _market_status(self, ticker: str) -> Optional[str]:
+        """Lower-cased market status from REST (None on error)."""
+        try:
+            raw = self.client.get_market(ticker)
+            return raw.get("status", "open").lower()
+        except Exception as exc:
+            logger.debug("get_market(%s): %s", ticker, exc)
+            return None
+
+    def _order_status(self, order_id: str) -> Optional[str]:
+        """Terminal status reported over WS, else GET the order (None on error)."""
+        status = self._order_events.get(order_id)
+        if status is not None:
+            return status
+        inputs = self._pass.inputs
+        if inputs is not None and order_id in inputs.order_status:
+            return inputs.order_status[order_id]
+        order = self.client.get_order_status(order_id)
+        return order.status if order is not None else None
+
+    def _local_open_orders(self) -> dict[str, Order]:
+        """Every tracked order not yet reported filled / cancelled over WS."""
+        orders: dict[str, Order] = {}
+        for pos in self.positions.values():
+            if pos.state in (PositionState.IDLE, PositionState.RESOLVED):
+                continue
+            hedge_side = "no" if pos.filled_side == "yes" else "yes"
+            for oid, side, price in (
+                (pos.yes_order_id, "yes", pos.yes_price),
+                (pos.no_order_id, "no", pos.no_price),
+                (pos.hedge_order_id, hedge_side, pos.hedge_price),
+            ):
+                if oid and oid not in self._order_events:
+                    orders[oid] = Order(
+                        order_id=oid, ticker=pos.ticker, side=side, action="buy",
+                        price=price, count=pos.contracts, status="resting",
+                    )
+        return orders
+
+    def _prune_order_events(self) -> None:
+        """Forget WS order state for orders no live position refers to."""
+        live: set[str] = set()
+        for pos in self.positions.values():
+            if pos.state not in (PositionState.IDLE, PositionState.RESOLVED):
+                live.update(
+                    oid for oid in (pos.yes_order_id, pos.no_order_id, pos.hedge_order_id) if oid
+                )
+        for table in (self._order_events, self._ws_fills):
+            for oid in [oid for oid in table if oid not in live]:
+                del table[oid]
+
+    def handle_ws_order_update(self, ticker: str, order_id: str, status: str) -> None:
+        """
+        Called by KalshiWebSocket on user-order events (event-driven mode).
+
+        A terminal status (filled / cancelled / expired) removes the order
+        from the local open-order view and advances its position immediately.
+        """
+        status = status.lower()
+        status = _ORDER_STATUS_ALIASES.get(status, status)
+        if status not in _TERMINAL_ORDER_STATUSES:
+            return
+        with self._lock:
+            self._order_events[order_id] = status
+            self._advance_on_event(ticker, order_id)
+
+    def _advance_on_event(self, ticker: str, order_id: str) -> None:
+        pos = self.positions.get(ticker)
+        if pos is None or pos.state not in (
+            PositionState.QUOTING, PositionState.ONE_SIDE_HEDGED
+        ):
+            return
+        order_book = self.book_cache.get(ticker) if self.book_cache is not None else None
+        try:
+            self._refresh_position(pos, self._local_open_orders(), order_book)
+        except Exception as exc:
+            logger.error(
+                "event refresh error for %s (order=%s): %s", ticker, order_id, exc,
+                exc_info=True,
+            )
 
     # ------------------------------------------------------------------
     # WebSocket fill handler
@@ -546,10 +1054,31 @@ class OrderManager:
         is placed within milliseconds of the fill, rather than waiting for
         the next 60-second REST poll.
 
-        Thread-safe: reads/writes self.positions under a short-lived
-        lookup — the dict is only mutated here and in the main loop,
-        which share the GIL.
+        In event-driven mode the fill is applied from the event itself: once
+        the WS-reported fills for an order reach the position's contract
+        count the order is treated as filled, with no REST calls.
+
+        Thread-safe: transitions run under the same lock as refresh_all.
         """
+        if self.event_driven:
+            with self._lock:
+                pos = self.positions.get(ticker)
+                if pos is None or order_id not in (
+                    pos.yes_order_id, pos.no_order_id, pos.hedge_order_id
+                ):
+                    logger.debug("WS fill for untracked order %s (%s)", order_id, ticker)
+                    return
+                filled = self._ws_fills.get(order_id, 0) + count
+                self._ws_fills[order_id] = filled
+                if filled < pos.contracts:
+                    logger.info(
+                        "WS partial fill %s order=%s %d/%d", ticker, order_id, filled, pos.contracts,
+                    )
+                    return
+                self._order_events[order_id] = "filled"
+                self._advance_on_event(ticker, order_id)
+            return
+
         pos = self.positions.get(ticker)
         if pos is None:
             logger.debug("WS fill for unknown position %s (order=%s)", ticker, order_id)
@@ -571,13 +1100,9 @@ class OrderManager:
         # Fetch the current open-order list and order book for a targeted refresh
         try:
             open_orders = {o.order_id: o for o in self.client.get_open_orders()}
-            order_book = None
-            if not self.cfg.dry_run:
-                try:
-                    order_book = self.client.get_order_book(ticker)
-                except Exception:
-                    pass
-            self._refresh_position(pos, open_orders, order_book=order_book)
+            order_book = None if self.cfg.dry_run else self.get_order_book(ticker)
+            with self._lock:
+                self._refresh_position(pos, open_orders, order_book=order_book)
         except Exception as exc:
             logger.error(
                 "handle_ws_fill refresh error for %s: %s", ticker, exc, exc_info=True
@@ -0,0 +1,219 @@
+"""
+Memoized synthetic scenario paths.
+
+A parameter sweep runs every scenario once per parameter combination, and
+each run used to rebuild the same PricePath (same seed + i*1000, same
+market kwargs, same black-swan shock) and regenerate identical snapshots.
+PathCache generates each market path once, keyed by
+
+    (scenario name, market index, seed, market kwargs, days)
+
+and hands out a read-only SnapshotView over frozen float64 columns, so a
+backtest run can never alter the path another run will see.  The cache is
+LRU-bounded in memory and can optionally persist paths as .npz files.
+
+BatchPaths fills the same slot for a block of Monte Carlo seeds: each
+market's paths for every seed in the block come from one NumPy
+generate_batch call instead of one pure-Python path per seed.
+
+Usage:
+    cache = PathCache(maxsize=256, cache_dir="~/.cache/kalshi_paths")
+    Backtester(cfg, path_cache=cache).run_scenario(scenario, seed=42)
+"""
+
+from __future__ import annotations
+
+import hashlib
+import os
+from collections import OrderedDict
+from typing import Iterator, Optional, Protocol, Sequence, overload
+
+import numpy as np
+
+from .synthetic_data import MarketSnapshot, PathBatch, Scenario
+
+# MarketSnapshot float fields, in SnapshotArrays column order
+COLUMNS = ("t", "yes_bid", "yes_ask", "mid", "spread", "volume_usd", "open_interest")
+
+
+# ---------------------------------------------------------------------------
+# Read-only snapshot view
+# ---------------------------------------------------------------------------
+
+class SnapshotView(Sequence[MarketSnapshot]):
+    """
+    One market path as immutable columns.
+
+    Indexing and iteration build fresh MarketSnapshot objects with plain
+    Python floats, so callers may mutate what they get without touching the
+    cached data; the columns themselves are non-writeable arrays.
+    """
+
+    __slots__ = ("ticker", "columns")
+
+    def __init__(self, ticker: str, columns: dict[str, np.ndarray]) -> None:
+        self.ticker = ticker
+        self.columns = columns
+        for col in columns.values():
+            col.flags.writeable = False
+
+    @classmethod
+    def from_snapshots(cls, snapshots: list[MarketSnapshot]) -> "SnapshotView":
+        ticker = snapshots[0].ticker if snapshots else "UNKNOWN"
+        return cls(ticker, {
+            name: np.array([getattr(s, name) for s in snapshots], dtype=np.float64)
+            for name in COLUMNS
+        })
+
+    def __len__(self) -> int:
+        return len(self.columns["t"])
+
+    def __iter__(self) -> Iterator[MarketSnapshot]:
+        ticker = self.ticker
+        for row in zip(*(self.columns[name].tolist() for name in COLUMNS)):
+            yield MarketSnapshot(ticker, *row)
+
+    @overload
+    def __getitem__(self, i: int) -> MarketSnapshot: ...
+    @overload
+    def __getitem__(self, i: slice) -> list[MarketSnapshot]: ...
+
+    def __getitem__(self, i):
+        if isinstance(i, slice):
+            return [self[j] for j in range(*i.indices(len(self)))]
+        return MarketSnapshot(self.ticker, *(float(self.columns[name][i]) for name in COLUMNS))
+
+
+def batch_view(batch: PathBatch, i: int) -> SnapshotView:
+    """Path `i` of a generate_batch() result as a view, without copying."""
+    return SnapshotView(batch.ticker, {
+        name: batch.t if name == "t" else getattr(batch, name)[i] for name in COLUMNS
+    })
+
+
+# ---------------------------------------------------------------------------
+# Cache
+# ---------------------------------------------------------------------------
+
+class PathSource(Protocol):
+    """Where run_scenario takes market paths from (PathCache, BatchPaths)."""
+
+    def get(self, scenario: Scenario, i: int, seed: int) -> SnapshotView: ...
+
+
+def path_key(scenario: Scenario, i: int, seed: int) -> tuple:
+    """Cache key of market `i` of `scenario` simulated with `seed`."""
+    kwargs = tuple(sorted(scenario.markets[i].items()))
+    return (scenario.name, i, seed, kwargs, float(scenario.days))
+
+
+class PathCache:
+    """
+    LRU cache of scenario market paths.
+
+    maxsize bounds the number of paths held in memory (one market path of a
+    30-day hourly scenario is ~40 KB).  With cache_dir set, generated paths
+    are also written there and later processes load them instead of
+    regenerating.
+    """
+
+    def __init__(self, maxsize: int = 256, cache_dir: Optional[str] = None) -> None:
+        if maxsize < 1:
+            raise ValueError("maxsize must be at least 1")
+        self.maxsize = maxsize
+        self.cache_dir = os.path.expanduser(cache_dir) if cache_dir else None
+        if self.cache_dir:
+            os.makedirs(self.cache_dir, exist_ok=True)
+        self._paths: OrderedDict[tuple, SnapshotView] = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def __len__(self) -> int:
+        return len(self._paths)
+
+    def get(self, scenario: Scenario, i: int, seed: int) -> SnapshotView:
+        """Market `i` of `scenario` for `seed`, generated at most once."""
+        key = path_key(scenario, i, seed)
+        view = self._paths.get(key)
+        if view is not None:
+            self._paths.move_to_end(key)
+            self.hits += 1
+            return view
+
+        self.misses += 1
+        view = self._load(key)
+        if view is None:
+            view = SnapshotView.from_snapshots(scenario.market_snapshots(i, seed))
+            self._store(key, view)
+        self._paths[key] = view
+        if len(self._paths) > self.maxsize:
+            self._paths.popitem(last=False)
+        return view
+
+    def clear(self) -> None:
+        """Drop the in-memory paths (files in cache_dir are kept)."""
+        self._paths.clear()
+
+    # ------------------------------------------------------------------
+    # On-disk persistence
+    # ------------------------------------------------------------------
+
+    def _file(self, key: tuple) -> str:
+        digest = hashlib.sha1(repr(key).encode()).hexdigest()[:20]
+        return os.path.join(self.cache_dir, f"{key[0]}-{digest}.npz")
+
+    def _load(self, key: tuple) -> Optional[SnapshotView]:
+        if not self.cache_dir:
+            return None
+        path = self._file(key)
+        if not os.path.exists(path):
+            return None
+        with np.load(path) as data:
+            if str(data["key"]) != repr(key):   # digest collision
+                return None
+            return SnapshotView(str(data["ticker"]), {name: data[name] for name in COLUMNS})
+
+    def _store(self, key: tuple, view: SnapshotView) -> None:
+        if not self.cache_dir:
+            return
+        path = self._file(key)
+        tmp = f"{path}.{os.getpid()}.tmp.npz"
+        np.savez(tmp, key=repr(key), ticker=view.ticker, **view.columns)
+        os.replace(tmp, path)
+
+
+class BatchPaths:
+    """
+    Market paths for a fixed block of seeds, generated a market at a time.
+
+    The first get() for a scenario market draws that market for every seed
+    in the block with Scenario.market_batch; later seeds read their row.
+    Each path has its own random stream, so a seed's path does not depend
+    on the block it is in — but it is not the path market_snapshots would
+    draw for that seed (NumPy vs the scalar generator).
+    """
+
+    def __init__(self, seeds: Sequence[int]) -> None:
+        self.seeds = list(seeds)
+        self._row = {seed: k for k, seed in enumerate(self.seeds)}
+        self._batches: dict[tuple, PathBatch] = {}
+
+    def get(self, scenario: Scenario, i: int, seed: int) -> SnapshotView:
+        key = path_key(scenario, i, 0)
+        batch = self._batches.get(key)
+        if batch is None:
+            batch = self._batches[key] = scenario.market_batch(i, self.seeds)
+        return batch_view(batch, self._row[seed])
+
+
+# One cache per process and cache_dir, for process-pool workers: every task
+# a worker evaluates reuses the paths generated by its earlier tasks.
+_PROCESS_CACHES: dict[Optional[str], PathCache] = {}
+
+
+def process_cache(cache_dir: Optional[str] = None) -> PathCache:
+    """This process's shared PathCache for `cache_dir`."""
+    cache = _PROCESS_CACHES.get(cache_dir)
+    if cache is None:
+        cache = _PROCESS_CACHES[cache_dir] = PathCache(cache_dir=cache_dir)
+    return cache
@@ -20,12 +20,16 @@ from __future__ import annotations
 import logging
 import math
 from dataclasses import dataclass
+from typing import TYPE_CHECKING
 
 from .client import MarketInfo, OrderBook
 from .config import BotConfig
 from .quote_adjuster import adjust_for_order_flow, extract_depth_from_order_book
 from .vol_estimator import effective_vol
 
+if TYPE_CHECKING:
+    from .vol_estimator import VolTracker
+
 logger = logging.getLogger(__name__)
 
 
@@ -72,6 +76,7 @@ def size_position(
     data_db: str | None = None,
     vol_override: float | None = None,
     order_book: OrderBook | None = None,
+    vol_tracker: "VolTracker | None" = None,
 ) -> SizingResult:
     """
     Compute order prices and contract counts for a Kalshi market.
@@ -85,7 +90,8 @@ def size_position(
 
     Volatility priority for depth sizing:
       a) vol_override  — caller-supplied (e.g. from backtester rolling window)
-      b) Realized vol from data_db  (historical snapshots, if db path given)
+      b) Realized vol from data_db  (historical snapshots, if db path given;
+                                     read incrementally through vol_tracker)
       c) Current market spread / 4  (spread is a market-implied vol proxy)
       d) config.scoring.default_v   (static fallback)
     """
@@ -113,6 +119,7 @@ def size_position(
             market.spread,
             sc.default_v,
             data_db=data_db,
+            tracker=vol_tracker,
         )
         v = max(v, sc.default_v)
 
@@ -0,0 +1,437 @@
+"""
+Retention for market_data.db: partitioned archives, downsampling and cold
+storage for closed markets.
+
+The hot database keeps only the last `raw_days` of raw snapshots (what the
+live bot's vol lookups read, so at least 7) plus all rollup bars.
+apply_retention() moves everything older out:
+
+  1. Closed markets  – every row of a ticker whose last status is closed /
+                       settled / finalized, or that the collector hasn't
+                       seen for raw_days (the markets endpoint only lists
+                       open markets), goes to one gzip'd JSON-lines file
+                       per ticker under <archive_dir>/closed/.
+  2. Partitions      – remaining rows older than raw_days move into one
+                       SQLite file per day or ISO week
+                       (<archive_dir>/snapshots-YYYY-MM-DD.db).
+  3. Downsampling    – partitions that end more than downsample_days ago
+                       keep only the last row per ticker per
+                       downsample_seconds, and bars_1m older than that is
+                       dropped (bars_1h is kept).
+
+Every move copies first and deletes second, with INSERT OR IGNORE on a
+(ticker, ts) unique index, so an interrupted run is safe to repeat.  The
+hot database records what went where (archive_files / archive_tickers) and
+archived_rows() reads a ticker's rows back from every file holding it, so
+historical_replay.load_snapshots / list_tickers see one continuous history.
+
+Usage (from repo root; e.g. nightly from cron):
+    python -m kalshi_bot.retention --db market_data.db --archive-dir archive
+    python -m kalshi_bot.retention --db market_data.db --archive-dir archive \\
+        --raw-days 14 --period day --downsample-days 90
+"""
+
+from __future__ import annotations
+
+import argparse
+import gzip
+import json
+import logging
+import os
+import re
+import sqlite3
+import time
+from contextlib import closing
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta, timezone
+from typing import Optional, Sequence
+
+logger = logging.getLogger(__name__)
+
+SNAPSHOT_COLUMNS = (
+    "ts", "ticker", "yes_bid", "yes_ask", "volume_24h", "open_interest", "mid", "spread", "status",
+)
+CLOSED_STATUSES = ("closed", "settled", "finalized", "determined")
+
+# The live vol lookups read raw rows from the hot DB only; the longest of
+# them is vol_ratio's 7-day (168 h) baseline window.
+MIN_RAW_DAYS = 7
+
+_INDEX_SCHEMA = """
+CREATE TABLE IF NOT EXISTS archive_files (
+    path         TEXT PRIMARY KEY,
+    kind         TEXT NOT NULL,              -- 'partition' | 'closed'
+    period_end   REAL,
+    rows         INTEGER NOT NULL,
+    downsampled  INTEGER NOT NULL DEFAULT 0  -- seconds per kept row, 0 = raw
+);
+CREATE TABLE IF NOT EXISTS archive_tickers (
+    ticker    TEXT NOT NULL,
+    path      TEXT NOT NULL,
+    rows      INTEGER NOT NULL,
+    first_ts  REAL NOT NULL,
+    last_ts   REAL NOT NULL,
+    PRIMARY KEY (ticker, path)
+) WITHOUT ROWID;
+"""
+
+_PARTITION_SCHEMA = """
+CREATE TABLE IF NOT EXISTS market_snapshots (
+    id            INTEGER PRIMARY KEY AUTOINCREMENT,
+    ts            INTEGER NOT NULL,
+    ticker        TEXT    NOT NULL,
+    yes_bid       REAL,
+    yes_ask       REAL,
+    volume_24h    REAL,
+    open_interest REAL,
+    mid           REAL,
+    spread        REAL,
+    status        TEXT
+);
+CREATE UNIQUE INDEX IF NOT EXISTS idx_ticker_ts ON market_snapshots(ticker, ts);
+"""
+
+_COLS = ", ".join(SNAPSHOT_COLUMNS)
+_ARCHIVE_DIR_KEY = "archive_dir"
+
+
+@dataclass
+class RetentionPolicy:
+    archive_dir: str
+    raw_days: float = 14            # raw rows older than this leave the hot DB
+    period: str = "week"            # partition size: "day" | "week"
+    downsample_days: float = 90     # partitions older than this are thinned
+    downsample_seconds: int = 3600  # … to one row per ticker per this many seconds
+    closed_statuses: tuple[str, ...] = field(default=CLOSED_STATUSES)
+
+    def __post_init__(self) -> None:
+        if self.period not in ("day", "week"):
+            raise ValueError("period must be 'day' or 'week'")
+        if self.raw_days < MIN_RAW_DAYS or self.downsample_days < self.raw_days:
+            raise ValueError(f"need {MIN_RAW_DAYS} <= raw_days <= downsample_days")
+
+
+@dataclass
+class RetentionReport:
+    closed_tickers: int = 0
+    closed_rows: int = 0
+    partitioned_rows: int = 0
+    partitions: int = 0
+    downsampled_rows: int = 0     # rows removed by downsampling
+    minute_bars_dropped: int = 0
+
+
+# ---------------------------------------------------------------------------
+# Paths
+# ---------------------------------------------------------------------------
+
+def _period_start(ts: float, period: str) -> datetime:
+    day = datetime.fromtimestamp(ts, tz=timezone.utc).replace(hour=0, minute=0, second=0, microsecond=0)
+    return day - timedelta(days=day.weekday()) if period == "week" else day
+
+
+def _partition_name(start: datetime) -> str:
+    return f"snapshots-{start:%Y-%m-%d}.db"
+
+
+def _closed_name(ticker: str) -> str:
+    return os.path.join("closed", (re.sub(r"[^A-Za-z0-9._-]", "_", ticker) or "_") + ".jsonl.gz")
+
+
+def _archive_dir(conn: sqlite3.Connection) -> Optional[str]:
+    try:
+        row = conn.execute(
+            "SELECT value FROM collector_meta WHERE key = ?", (_ARCHIVE_DIR_KEY,),
+        ).fetchone()
+    except sqlite3.OperationalError:
+        return None
+    return None if row is None else row[0]
+
+
+# ---------------------------------------------------------------------------
+# Cold storage (closed markets)
+# ---------------------------------------------------------------------------
+
+def _read_closed(path: str) -> list[tuple]:
+    if not os.path.exists(path):
+        return []
+    with gzip.open(path, "rt") as fh:
+        return [tuple(json.loads(line)) for line in fh]
+
+
+def _write_closed(path: str, rows: list[tuple]) -> None:
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    tmp = path + ".tmp"
+    with gzip.open(tmp, "wt", compresslevel=9) as fh:
+        for row in rows:
+            fh.write(json.dumps(row, separators=(",", ":")) + "\n")
+    os.replace(tmp, path)
+
+
+# ---------------------------------------------------------------------------
+# Readers
+# ---------------------------------------------------------------------------
+
+def archived_rows(
+    conn: sqlite3.Connection,
+    ticker: str,
+    columns: Sequence[str] = SNAPSHOT_COLUMNS,
+) -> list[tuple]:
+    """
+    A ticker's archived rows (selected columns, ts order) from every
+    partition / cold file holding it.  Empty if the DB has no archive.
+    """
+    root = _archive_dir(conn)
+    if root is None:
+        return []
+    idx = [SNAPSHOT_COLUMNS.index(c) for c in columns]
+    rows: list[tuple] = []
+    for (rel,) in conn.execute("SELECT path FROM archive_tickers WHERE ticker = ?", (ticker,)):
+        path = os.path.join(root, rel)
+        if rel.endswith(".jsonl.gz"):
+            rows += [tuple(r[i] for i in idx) for r in _read_closed(path)]
+            continue
+        with closing(sqlite3.connect(f"file:{path}?mode=ro", uri=True)) as part:
+            rows += part.execute(
+                f"SELECT {', '.join(columns)} FROM market_snapshots WHERE ticker = ? ORDER BY ts",
+                (ticker,),
+            ).fetchall()
+    ts_at = columns.index("ts") if "ts" in columns else None
+    if ts_at is not None:
+        rows.sort(key=lambda r: r[ts_at])
+    return rows
+
+
+def archived_summary(conn: sqlite3.Connection) -> list[tuple[str, int, float, float]]:
+    """(ticker, rows, first_ts, last_ts) over all archive files."""
+    if _archive_dir(conn) is None:
+        return []
+    return conn.execute(
+        """SELECT ticker, SUM(rows), MIN(first_ts), MAX(last_ts)
+           FROM archive_tickers GROUP BY ticker"""
+    ).fetchall()
+
+
+def merge_rows(hot: list[tuple], archived: list[tuple]) -> list[tuple]:
+    """Merge two ts-ordered row lists (ts first), dropping repeated ts."""
+    if not archived:
+        return hot
+    out: list[tuple] = []
+    for row in sorted(archived + hot, key=lambda r: r[0]):
+        if not out or row[0] != out[-1][0]:
+            out.append(row)
+    return out
+
+
+# ---------------------------------------------------------------------------
+# Retention
+# ---------------------------------------------------------------------------
+
+def _index_file(
+    conn: sqlite3.Connection, rel: str, kind: str, period_end: Optional[float],
+    stats: list[tuple[str, int, float, float]], downsampled: int = 0,
+) -> None:
+    """Replace the index entries for one archive file with its current stats."""
+    conn.execute("DELETE FROM archive_tickers WHERE path = ?", (rel,))
+    conn.executemany(
+        "INSERT INTO archive_tickers (ticker, path, rows, first_ts, last_ts) VALUES (?, ?, ?, ?, ?)",
+        [(t, rel, n, a, b) for t, n, a, b in stats],
+    )
+    conn.execute(
+        """INSERT OR REPLACE INTO archive_files (path, kind, period_end, rows, downsampled)
+           VALUES (?, ?, ?, ?, ?)""",
+        (rel, kind, period_end, sum(s[1] for s in stats), downsampled),
+    )
+
+
+def _archive_closed(
+    conn: sqlite3.Connection, root: str, policy: RetentionPolicy, cutoff: float,
+    report: RetentionReport,
+) -> None:
+    marks = ", ".join("?" * len(policy.closed_statuses))
+    closed = [t for (t,) in conn.execute(
+        f"""SELECT s.ticker FROM market_snapshots s
+            JOIN (SELECT ticker, MAX(ts) AS last FROM market_snapshots GROUP BY ticker) l
+              ON s.ticker = l.ticker AND s.ts = l.last
+            WHERE s.status IN ({marks}) OR l.last < ?""",
+        (*policy.closed_statuses, cutoff),
+    )]
+    for ticker in sorted(set(closed)):
+        rows = conn.execute(
+            f"SELECT {_COLS} FROM market_snapshots WHERE ticker = ? ORDER BY ts", (ticker,),
+        ).fetchall()
+        rows = merge_rows(rows, archived_rows(conn, ticker))
+        rel = _closed_name(ticker)
+        _write_closed(os.path.join(root, rel), rows)
+        with conn:
+            for (old,) in conn.execute(
+                "SELECT path FROM archive_tickers WHERE ticker = ? AND path != ?", (ticker, rel),
+            ).fetchall():
+                _drop_ticker_from_partition(conn, root, old, ticker)
+            _index_file(conn, rel, "closed", None, [(ticker, len(rows), rows[0][0], rows[-1][0])])
+            conn.execute("DELETE FROM market_snapshots WHERE ticker = ?", (ticker,))
+        report.closed_tickers += 1
+        report.closed_rows += len(rows)
+
+
+def _drop_ticker_from_partition(conn: sqlite3.Connection, root: str, rel: str, ticker: str) -> None:
+    with closing(sqlite3.connect(os.path.join(root, rel))) as part, part:
+        part.execute("DELETE FROM market_snapshots WHERE ticker = ?", (ticker,))
+        stats = _partition_stats(part)
+    row = conn.execute(
+        "SELECT period_end, downsampled FROM archive_files WHERE path = ?", (rel,),
+    ).fetchone()
+    _index_file(conn, rel, "partition", row[0] if row else None, stats, row[1] if row else 0)
+
+
+def _partition_stats(part: sqlite3.Connection) -> list[tuple[str, int, float, float]]:
+    return part.execute(
+        "SELECT ticker, COUNT(*), MIN(ts), MAX(ts) FROM market_snapshots GROUP BY ticker"
+    ).fetchall()
+
+
+def _partition_old_rows(
+    conn: sqlite3.Connection, root: str, policy: RetentionPolicy, cutoff: float,
+    report: RetentionReport,
+) -> None:
+    row = conn.execute(
+        "SELECT MIN(ts) FROM market_snapshots WHERE ts < ?", (cutoff,),
+    ).fetchone()
+    if row[0] is None:
+        return
+    step = timedelta(days=7 if policy.period == "week" else 1)
+    start = _period_start(row[0], policy.period)
+    while start.timestamp() < cutoff:
+        lo, hi = start.timestamp(), min((start + step).timestamp(), cutoff)
+        rows = conn.execute(
+            f"SELECT {_COLS} FROM market_snapshots WHERE ts >= ? AND ts < ? ORDER BY ticker, ts",
+            (lo, hi),
+        ).fetchall()
+        if rows:
+            rel = _partition_name(start)
+            with closing(sqlite3.connect(os.path.join(root, rel))) as part, part:
+                part.executescript(_PARTITION_SCHEMA)
+                part.executemany(
+                    f"INSERT OR IGNORE INTO market_snapshots ({_COLS}) "
+                    f"VALUES ({', '.join('?' * len(SNAPSHOT_COLUMNS))})",
+                    rows,
+                )
+                stats = _partition_stats(part)
+            with conn:
+                _index_file(conn, rel, "partition", (start + step).timestamp(), stats)
+                conn.execute("DELETE FROM market_snapshots WHERE ts >= ? AND ts < ?", (lo, hi))
+            report.partitioned_rows += len(rows)
+            report.partitions += 1
+        start += step
+
+
+def _downsample(
+    conn: sqlite3.Connection, root: str, policy: RetentionPolicy, cutoff: float,
+    report: RetentionReport,
+) -> None:
+    seconds = policy.downsample_seconds
+    for rel, period_end in conn.execute(
+        """SELECT path, period_end FROM archive_files
+           WHERE kind = 'partition' AND period_end <= ? AND downsampled != ?""",
+        (cutoff, seconds),
+    ).fetchall():
+        with closing(sqlite3.connect(os.path.join(root, rel))) as part:
+            with part:
+                before = part.execute("SELECT COUNT(*) FROM market_snapshots").fetchone()[0]
+                part.execute(
+                    """DELETE FROM market_snapshots WHERE id NOT IN (
+                           SELECT id FROM (
+                               SELECT id, ROW_NUMBER() OVER (
+                                   PARTITION BY ticker, CAST(ts / ? AS INTEGER) ORDER BY ts DESC
+                               ) AS rn
+                               FROM market_snapshots
+                           ) WHERE rn = 1
+                       )""",
+                    (seconds,),
+                )
+                stats = _partition_stats(part)
+            part.execute("VACUUM")
+        with conn:
+            _index_file(conn, rel, "partition", period_end, stats, downsampled=seconds)
+        report.downsampled_rows += before - sum(s[1] for s in stats)
+
+    try:
+        with conn:
+            report.minute_bars_dropped = conn.execute(
+                "DELETE FROM bars_1m WHERE bucket < ?", (cutoff,),
+            ).rowcount
+    except sqlite3.OperationalError:   # no rollups in this database
+        pass
+
+
+def apply_retention(
+    db_path: str,
+    policy: RetentionPolicy,
+    now: Optional[float] = None,
+) -> RetentionReport:
+    """Run one retention pass over market_data.db (safe to repeat)."""
+    now = time.time() if now is None else now
+    root = os.path.abspath(policy.archive_dir)
+    os.makedirs(root, exist_ok=True)
+    report = RetentionReport()
+
+    conn = sqlite3.connect(db_path, timeout=30.0)
+    try:
+        with conn:
+            conn.executescript(_INDEX_SCHEMA)
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS collector_meta (key TEXT PRIMARY KEY, value TEXT NOT NULL)"
+            )
+            prev = _archive_dir(conn)
+            if prev is not None and os.path.abspath(prev) != root:
+                raise ValueError(f"{db_path} already archives to {prev}")
+            conn.execute(
+                "INSERT OR REPLACE INTO collector_meta (key, value) VALUES (?, ?)",
+                (_ARCHIVE_DIR_KEY, root),
+            )
+        raw_cutoff = now - policy.raw_days * 86_400
+        _archive_closed(conn, root, policy, raw_cutoff, report)
+        _partition_old_rows(conn, root, policy, raw_cutoff, report)
+        _downsample(conn, root, policy, now - policy.downsample_days * 86_400, report)
+    finally:
+        conn.close()
+
+    logger.info(
+        "Retention: %d closed tickers (%d rows) → cold storage, %d rows → %d partitions, "
+        "%d rows downsampled away, %d minute bars dropped",
+        report.closed_tickers, report.closed_rows, report.partitioned_rows, report.partitions,
+        report.downsampled_rows, report.minute_bars_dropped,
+    )
+    return report
+
+
+# ---------------------------------------------------------------------------
+# CLI
+# ---------------------------------------------------------------------------
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Archive and downsample market_data.db")
+    parser.add_argument("--db",               default="market_data.db")
+    parser.add_argument("--archive-dir",      required=True)
+    parser.add_argument("--raw-days",         type=float, default=14,
+                        help=f"Keep raw snapshots this many days in the hot DB "
+                             f"(default 14, at least {MIN_RAW_DAYS})")
+    parser.add_argument("--period",           choices=["day", "week"], default="week",
+                        help="Partition size for archived rows (default week)")
+    parser.add_argument("--downsample-days",  type=float, default=90,
+                        help="Thin partitions older than this many days (default 90)")
+    parser.add_argument("--downsample-seconds", type=int, default=3600,
+                        help="Rows kept per ticker per this many seconds when thinning")
+    parser.add_argument("--log-level",        default="INFO",
+                        choices=["DEBUG", "INFO", "WARNING"])
+    args = parser.parse_args()
+
+    logging.basicConfig(level=getattr(logging, args.log_level),
+                        format="%(asctime)s %(levelname)-8s %(message)s", datefmt="%H:%M:%S")
+    apply_retention(args.db, RetentionPolicy(
+        archive_dir=args.archive_dir,
+        raw_days=args.raw_days,
+        period=args.period,
+        downsample_days=args.downsample_days,
+        downsample_seconds=args.downsample_seconds,
+    ))
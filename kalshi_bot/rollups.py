@@ -0,0 +1,190 @@
+"""
+Minute / hour OHLC rollups of market_snapshots.
+
+The collector's SnapshotWriter folds every batch it inserts into one bar
+table per resolution, in the same transaction:
+
+    bars_1m / bars_1h (ticker, bucket, open, high, low, close,
+                       spread, volume_24h, open_interest, n, first_ts, last_ts)
+
+open/high/low/close are of mid; spread, volume_24h and open_interest are the
+bucket's last values; n counts the snapshots folded in.  Upserts merge by
+first_ts / last_ts, so batches may arrive in any order.
+
+Readers ask pick_resolution() for the coarsest bars that still give enough
+points over their window — a 7-day vol lookup reads ~168 hourly bars
+instead of ~10,000 polls.  Bars only cover snapshots written since the
+tables were created (collector_meta "rollups_since"); older windows fall
+back to raw rows until `data_collector --rebuild-rollups` backfills them.
+"""
+
+from __future__ import annotations
+
+import sqlite3
+from typing import Iterable, Optional, Sequence
+
+RESOLUTIONS = {"1m": 60, "1h": 3600}   # finest first
+SINCE_KEY = "rollups_since"
+
+_BAR_COLUMNS = (
+    "ticker, bucket, open, high, low, close, spread, volume_24h, open_interest, "
+    "n, first_ts, last_ts"
+)
+
+SCHEMA = "".join(
+    f"""
+CREATE TABLE IF NOT EXISTS bars_{res} (
+    ticker        TEXT    NOT NULL,
+    bucket        INTEGER NOT NULL,
+    open          REAL    NOT NULL,
+    high          REAL    NOT NULL,
+    low           REAL    NOT NULL,
+    close         REAL    NOT NULL,
+    spread        REAL,
+    volume_24h    REAL,
+    open_interest REAL,
+    n             INTEGER NOT NULL,
+    first_ts      REAL    NOT NULL,
+    last_ts       REAL    NOT NULL,
+    PRIMARY KEY (ticker, bucket)
+) WITHOUT ROWID;
+"""
+    for res in RESOLUTIONS
+)
+
+_UPSERT = """INSERT INTO bars_{res} ({cols}) VALUES ({marks})
+ON CONFLICT(ticker, bucket) DO UPDATE SET
+    open          = CASE WHEN excluded.first_ts < first_ts THEN excluded.open ELSE open END,
+    high          = MAX(high, excluded.high),
+    low           = MIN(low, excluded.low),
+    close         = CASE WHEN excluded.last_ts >= last_ts THEN excluded.close ELSE close END,
+    spread        = CASE WHEN excluded.last_ts >= last_ts THEN excluded.spread ELSE spread END,
+    volume_24h    = CASE WHEN excluded.last_ts >= last_ts
+                         THEN excluded.volume_24h ELSE volume_24h END,
+    open_interest = CASE WHEN excluded.last_ts >= last_ts
+                         THEN excluded.open_interest ELSE open_interest END,
+    n             = n + excluded.n,
+    first_ts      = MIN(first_ts, excluded.first_ts),
+    last_ts       = MAX(last_ts, excluded.last_ts)"""
+
+
+def aggregate(rows: Iterable[Sequence], seconds: int) -> list[tuple]:
+    """
+    Fold snapshot rows (ts, ticker, yes_bid, yes_ask, volume_24h,
+    open_interest, mid, spread, status) into bar tuples in _BAR_COLUMNS order.
+    Rows without a mid are skipped.
+    """
+    bars: dict[tuple[str, int], list] = {}
+    for ts, ticker, _, _, vol, oi, mid, spread, _ in rows:
+        if mid is None:
+            continue
+        key = (ticker, int(ts // seconds) * seconds)
+        bar = bars.get(key)
+        if bar is None:
+            bars[key] = [ticker, key[1], mid, mid, mid, mid, spread, vol, oi, 1, ts, ts]
+            continue
+        if ts < bar[10]:
+            bar[2], bar[10] = mid, ts
+        bar[3] = max(bar[3], mid)
+        bar[4] = min(bar[4], mid)
+        if ts >= bar[11]:
+            bar[5], bar[6], bar[7], bar[8], bar[11] = mid, spread, vol, oi, ts
+        bar[9] += 1
+    return [tuple(b) for b in bars.values()]
+
+
+def upsert(conn: sqlite3.Connection, rows: Sequence[Sequence]) -> None:
+    """Fold snapshot rows into every bar table (caller owns the transaction)."""
+    for res, seconds in RESOLUTIONS.items():
+        bars = aggregate(rows, seconds)
+        if bars:
+            conn.executemany(
+                _UPSERT.format(res=res, cols=_BAR_COLUMNS, marks=", ".join("?" * 12)), bars,
+            )
+
+
+def init(conn: sqlite3.Connection) -> None:
+    """
+    Create the bar tables.  On first creation, record the first bucket
+    boundary after any existing snapshots as rollups_since.
+    """
+    conn.executescript(SCHEMA)
+    if conn.execute(
+        "SELECT 1 FROM collector_meta WHERE key = ?", (SINCE_KEY,),
+    ).fetchone() is not None:
+        return
+    (last,) = conn.execute("SELECT MAX(ts) FROM market_snapshots").fetchone()
+    top = max(RESOLUTIONS.values())
+    since = 0 if last is None else (int(last // top) + 1) * top
+    conn.execute(
+        "INSERT INTO collector_meta (key, value) VALUES (?, ?)", (SINCE_KEY, str(since)),
+    )
+
+
+def rebuild(conn: sqlite3.Connection, chunk: int = 100_000) -> int:
+    """Recompute all bars from market_snapshots. Returns snapshots folded."""
+    n = 0
+    with conn:
+        for res in RESOLUTIONS:
+            conn.execute(f"DELETE FROM bars_{res}")
+        cursor = conn.execute(
+            "SELECT ts, ticker, yes_bid, yes_ask, volume_24h, open_interest, mid, spread, status "
+            "FROM market_snapshots ORDER BY ticker, ts"
+        )
+        while True:
+            rows = cursor.fetchmany(chunk)
+            if not rows:
+                break
+            upsert(conn, rows)
+            n += len(rows)
+        conn.execute(
+            "INSERT OR REPLACE INTO collector_meta (key, value) VALUES (?, '0')", (SINCE_KEY,),
+        )
+    return n
+
+
+def rollups_since(conn: sqlite3.Connection) -> Optional[float]:
+    """First ts covered by the bar tables, or None if there are none."""
+    try:
+        row = conn.execute(
+            "SELECT value FROM collector_meta WHERE key = ?", (SINCE_KEY,),
+        ).fetchone()
+    except sqlite3.OperationalError:
+        return None
+    return None if row is None else float(row[0])
+
+
+def pick_resolution(
+    conn: sqlite3.Connection,
+    start: float,
+    lookback_seconds: float,
+    min_bars: int = 24,
+) -> Optional[str]:
+    """
+    Coarsest resolution giving ≥ min_bars bars over a window starting at
+    `start`, or None (read raw rows) if none does or the bars don't reach
+    back that far.
+    """
+    since = rollups_since(conn)
+    if since is None or start < since:
+        return None
+    for res, seconds in sorted(RESOLUTIONS.items(), key=lambda kv: -kv[1]):
+        if lookback_seconds / seconds >= min_bars:
+            return res
+    return None
+
+
+def read_bars(
+    conn: sqlite3.Connection,
+    ticker: str,
+    res: str,
+    start: float = 0,
+    columns: str = "bucket, close",
+) -> list[tuple]:
+    """A ticker's bars with bucket ≥ start, oldest first."""
+    if res not in RESOLUTIONS:
+        raise ValueError(f"unknown rollup resolution {res!r}")
+    return conn.execute(
+        f"SELECT {columns} FROM bars_{res} WHERE ticker = ? AND bucket >= ? ORDER BY bucket",
+        (ticker, start),
+    ).fetchall()
@@ -0,0 +1,106 @@
+"""
+Forward-fill for change-only snapshot storage.
+
+With `data_collector --change-only` a market's row is written only when its
+quote (yes_bid / yes_ask / status) moves, plus a keyframe at least every
+keyframe_seconds.  The collector records its poll grid in collector_meta;
+readers that find it rebuild the regular series by repeating each stored
+row at every poll it stood for:
+
+    stored : t0 ─────────────── t0+4g ── t0+5g
+    read   : t0  t0+g  t0+2g  t0+3g  t0+4g  t0+5g
+
+A gap longer than keyframe_seconds (+ slack for a late poll) cannot be a
+quiet market — a keyframe would have been written — so it is collector
+downtime and stays unfilled, exactly as it would in a full-row database.
+Databases without collector_meta (or full-row data) read back unchanged.
+"""
+
+from __future__ import annotations
+
+import sqlite3
+from dataclasses import dataclass
+from typing import Iterable, Optional, Sequence
+
+GRID_KEY = "grid_seconds"
+KEYFRAME_KEY = "keyframe_seconds"
+
+
+@dataclass(frozen=True)
+class Grid:
+    seconds: float     # collector poll interval
+    keyframe: float    # max seconds between stored rows of a live market
+
+    @property
+    def max_gap(self) -> float:
+        """Longest gap between stored rows that is still a quiet market."""
+        return self.keyframe + 1.5 * self.seconds
+
+
+def read_grid(conn: sqlite3.Connection) -> Optional[Grid]:
+    """The change-only grid recorded by the collector, or None for full-row data."""
+    try:
+        meta = dict(conn.execute(
+            "SELECT key, value FROM collector_meta WHERE key IN (?, ?)",
+            (GRID_KEY, KEYFRAME_KEY),
+        ).fetchall())
+    except sqlite3.OperationalError:   # pre-change-only database
+        return None
+    if GRID_KEY not in meta or KEYFRAME_KEY not in meta:
+        return None
+    return Grid(float(meta[GRID_KEY]), float(meta[KEYFRAME_KEY]))
+
+
+def forward_fill(rows: Iterable[Sequence], grid: Optional[Grid]) -> list[tuple]:
+    """
+    Expand one ticker's ts-ordered rows (ts first) onto the poll grid.
+
+    Each row is repeated, with ts advanced by grid.seconds, until the next
+    stored row is within half a poll.  Returns rows unchanged when grid is
+    None.
+    """
+    rows = [tuple(r) for r in rows]
+    if grid is None or len(rows) < 2:
+        return rows
+    step, max_gap = grid.seconds, grid.max_gap
+    out: list[tuple] = []
+    for row, nxt in zip(rows, rows[1:]):
+        out.append(row)
+        ts, end = row[0], nxt[0]
+        if end - ts > max_gap:
+            continue
+        ts += step
+        while ts < end - step / 2:
+            out.append((ts, *row[1:]))
+            ts += step
+    out.append(rows[-1])
+    return out
+
+
+def fill_bars(rows: Iterable[Sequence], seconds: float, grid: Optional[Grid]) -> list[tuple]:
+    """
+    Expand one ticker's bucket-ordered rollup bars onto their own grid.
+
+    Rows are (bucket, ..., first_ts, last_ts); the two stored-row bounds
+    are dropped from the output.  A quiet change-only market leaves buckets
+    with no bar, so each bar is repeated every max(seconds, poll) until the
+    next one — but only when the stored rows on either side are within
+    grid.max_gap.  Bucket spacing alone can't tell a quiet hour from
+    downtime: both may leave a single empty bucket.  Full-row data (grid
+    None) is returned as is.
+    """
+    rows = [tuple(r) for r in rows]
+    if grid is None or len(rows) < 2:
+        return [r[:-2] for r in rows]
+    step = max(seconds, grid.seconds)
+    out: list[tuple] = []
+    for row, nxt in zip(rows, rows[1:]):
+        out.append(row[:-2])
+        if nxt[-2] - row[-1] > grid.max_gap:
+            continue
+        ts, end = row[0] + step, nxt[0]
+        while ts < end - step / 2:
+            out.append((ts, *row[1:-2]))
+            ts += step
+    out.append(rows[-1][:-2])
+    return out
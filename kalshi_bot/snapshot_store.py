@@ -0,0 +1,217 @@
+"""
+Columnar, memory-mapped snapshot store for historical replay.
+
+historical_replay.load_snapshots pulls every row for a ticker out of SQLite
+and builds one MarketSnapshot per row; over months of 60-second polls that
+object churn dominates replay time and memory.  compact() exports
+market_data.db once into one fixed-width .npy file per ticker plus a JSON
+index, and SnapshotStore memory-maps those files so a replay reads columns
+straight from the page cache.
+
+Layout
+──────
+    <store>/index.json        {"version": 1, "columns": [...], "tickers": {...}}
+    <store>/<ticker>.npy      float64 array of shape (7, n), one row per column
+
+The rows are (t, yes_bid, yes_ask, mid, spread, volume_usd, open_interest),
+the same order as SnapshotArrays, with t in days from the ticker's first
+snapshot and NULLs filled exactly as load_snapshots fills them.  Rows
+moved out by retention.py are read back from the archive, so the store
+holds the same history load_snapshots sees.  Each column
+is a contiguous row of the C-ordered array, so SnapshotStore.arrays() hands
+zero-copy views to VectorizedBacktester.
+
+Usage (from repo root):
+    python -m kalshi_bot.snapshot_store --db market_data.db --out market_data.store
+    python -m kalshi_bot.historical_replay --store market_data.store
+"""
+
+from __future__ import annotations
+
+import argparse
+import itertools
+import json
+import logging
+import os
+import re
+import sqlite3
+from dataclasses import dataclass
+
+import numpy as np
+
+from .retention import archived_rows, archived_summary, merge_rows
+from .snapshot_grid import forward_fill, read_grid
+from .synthetic_data import MarketSnapshot
+from .vector_backtester import SnapshotArrays
+
+logger = logging.getLogger(__name__)
+
+INDEX_FILE = "index.json"
+INDEX_VERSION = 1
+COLUMNS = ("t", "yes_bid", "yes_ask", "mid", "spread", "volume_usd", "open_interest")
+_ROW_COLUMNS = ("ts", "yes_bid", "yes_ask", "volume_24h", "open_interest", "mid", "spread")
+
+
+@dataclass
+class TickerEntry:
+    """Index record for one compacted ticker."""
+    file: str
+    count: int
+    first_ts: int
+    last_ts: int
+
+
+# ---------------------------------------------------------------------------
+# Compaction
+# ---------------------------------------------------------------------------
+
+def _file_name(ticker: str, taken: set[str]) -> str:
+    """Filesystem-safe, unique .npy name for a ticker."""
+    base = re.sub(r"[^A-Za-z0-9._-]", "_", ticker) or "_"
+    name, n = f"{base}.npy", 1
+    while name.lower() in taken:
+        name, n = f"{base}~{n}.npy", n + 1
+    taken.add(name.lower())
+    return name
+
+
+def _columns(rows: list[tuple]) -> tuple[np.ndarray, int, int]:
+    """Convert one ticker's (ts, yes_bid, ...) rows into the (7, n) layout."""
+    raw = np.array(
+        [tuple(np.nan if v is None else v for v in row) for row in rows],
+        dtype=np.float64,
+    ).reshape(-1, 7)
+    ts, yes_bid, yes_ask, vol, oi, mid, spread = raw.T
+    first_ts, last_ts = int(rows[0][0]), int(rows[-1][0])
+
+    yb = np.nan_to_num(yes_bid, nan=0.0)
+    ya = np.nan_to_num(yes_ask, nan=0.0)
+    out = np.empty((len(COLUMNS), len(rows)), dtype=np.float64)
+    out[0] = (ts - first_ts) / 86_400.0
+    out[1] = yb
+    out[2] = ya
+    out[3] = np.where(np.isnan(mid), (yb + ya) / 2, mid)
+    out[4] = np.where(np.isnan(spread), ya - yb, spread)
+    out[5] = np.nan_to_num(vol, nan=0.0)
+    out[6] = np.nan_to_num(oi, nan=0.0)
+    return out, first_ts, last_ts
+
+
+def compact(db_path: str, out_dir: str, min_snapshots: int = 1) -> dict[str, TickerEntry]:
+    """
+    Export market_snapshots into a columnar store under out_dir.
+
+    Rows are streamed from a single ticker/ts-ordered scan, so memory use is
+    bounded by the largest ticker rather than the whole table.  Archived
+    rows are merged in per ticker, and tickers held only in the archive
+    (closed markets) are exported after the hot ones.  The index is
+    written last (atomically), so a store is never left pointing at files
+    that are still being written.  Re-running replaces the previous export.
+    """
+    os.makedirs(out_dir, exist_ok=True)
+    entries: dict[str, TickerEntry] = {}
+    taken: set[str] = set()
+    seen: set[str] = set()
+
+    with sqlite3.connect(db_path) as conn:
+        grid = read_grid(conn)   # change-only data is forward-filled, as in load_snapshots
+        archived = {row[0] for row in archived_summary(conn)}
+        cursor = conn.execute(
+            f"""SELECT ticker, {', '.join(_ROW_COLUMNS)}
+                FROM market_snapshots
+                ORDER BY ticker, ts ASC"""
+        )
+        groups = itertools.chain(
+            ((ticker, [row[1:] for row in group])
+             for ticker, group in itertools.groupby(cursor, key=lambda row: row[0])),
+            ((ticker, []) for ticker in sorted(archived)),
+        )
+        for ticker, rows in groups:
+            if ticker in seen:
+                continue
+            seen.add(ticker)
+            if ticker in archived:
+                rows = merge_rows(rows, archived_rows(conn, ticker, _ROW_COLUMNS))
+            rows = forward_fill(rows, grid)
+            if len(rows) < min_snapshots:
+                continue
+            cols, first_ts, last_ts = _columns(rows)
+            name = _file_name(ticker, taken)
+            np.save(os.path.join(out_dir, name), cols)
+            entries[ticker] = TickerEntry(name, len(rows), first_ts, last_ts)
+
+    index = {
+        "version": INDEX_VERSION,
+        "columns": list(COLUMNS),
+        "tickers": {t: vars(e) for t, e in entries.items()},
+    }
+    tmp = os.path.join(out_dir, INDEX_FILE + ".tmp")
+    with open(tmp, "w") as fh:
+        json.dump(index, fh, indent=1)
+    os.replace(tmp, os.path.join(out_dir, INDEX_FILE))
+
+    logger.info("Compacted %d tickers from %s into %s", len(entries), db_path, out_dir)
+    return entries
+
+
+# ---------------------------------------------------------------------------
+# Reader
+# ---------------------------------------------------------------------------
+
+class SnapshotStore:
+    """Read-only view over a directory written by compact()."""
+
+    def __init__(self, path: str) -> None:
+        self.path = path
+        with open(os.path.join(path, INDEX_FILE)) as fh:
+            index = json.load(fh)
+        if index.get("version") != INDEX_VERSION or tuple(index.get("columns", ())) != COLUMNS:
+            raise ValueError(f"{path}: unsupported snapshot store layout")
+        self.entries = {t: TickerEntry(**e) for t, e in index["tickers"].items()}
+
+    def __contains__(self, ticker: str) -> bool:
+        return ticker in self.entries
+
+    def list_tickers(self, min_snapshots: int = 50) -> list[tuple[str, int, int, int]]:
+        """Same contract as historical_replay.list_tickers."""
+        rows = [
+            (t, e.count, e.first_ts, e.last_ts)
+            for t, e in self.entries.items()
+            if e.count >= min_snapshots
+        ]
+        rows.sort(key=lambda r: r[1], reverse=True)
+        return rows
+
+    def arrays(self, ticker: str) -> SnapshotArrays:
+        """Memory-mapped columns for a ticker (KeyError if not in the store)."""
+        entry = self.entries[ticker]
+        data = np.load(os.path.join(self.path, entry.file), mmap_mode="r")
+        # Plain ndarray views over the mapping: zero-copy, without np.memmap
+        # leaking into every derived array.
+        return SnapshotArrays(ticker, *data.view(np.ndarray))
+
+    def load_snapshots(self, ticker: str) -> list[MarketSnapshot]:
+        """MarketSnapshot list for the reference Backtester ([] if unknown)."""
+        if ticker not in self.entries:
+            return []
+        cols = self.arrays(ticker)
+        return [cols.snapshot(i) for i in range(len(cols))]
+
+
+# ---------------------------------------------------------------------------
+# CLI entry point
+# ---------------------------------------------------------------------------
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Compact market_data.db into a columnar store")
+    parser.add_argument("--db",            default="market_data.db")
+    parser.add_argument("--out",           default="market_data.store",
+                        help="Output directory for the .npy files and index")
+    parser.add_argument("--min-snapshots", type=int, default=1,
+                        help="Skip tickers with fewer rows (default 1)")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO, format="%(levelname)s %(message)s")
+    entries = compact(args.db, args.out, min_snapshots=args.min_snapshots)
+    rows = sum(e.count for e in entries.values())
+    print(f"Compacted {len(entries)} tickers / {rows:,} snapshots → {args.out}")
@@ -4,28 +4,59 @@ SQLite-backed persistence for live bot position state.
 Writes every state transition to disk so the bot can resume without
 losing track of open orders after a restart or crash.
 
+Writes are write-behind: upsert() / delete() only record the position's
+current row in a dirty map (latest per ticker wins) and return, so the
+trading path — including hedges placed from the WS fill thread — never
+waits on disk.  A background thread commits everything dirty in one
+transaction on a single WAL connection whenever the bot ends a tick
+(commit()), or every flush_interval seconds for transitions made between
+ticks.  flush() writes synchronously; close() flushes and stops.
+
+Every transition is also appended to the position_events journal (one row
+per upsert, labelled "quote", "hedge", "cut", "requote", …) in the same
+transaction, so how a position evolved can be queried or replayed offline.
+The positions table is the journal's snapshot: restart reads only it —
+O(live positions), no replay.  compact() (run by the writer every
+compact_interval when journal_days is set) folds events older than
+journal_days into position_base and deletes them, keeping the journal
+bounded; replay() starts from position_base.
+
 Usage:
     store = StateStore("bot_state.db")
     positions = store.load()          # on startup
-    store.upsert(pos)                 # after every state change
+    store.upsert(pos, "hedge")        # after every state change
     store.delete(ticker)              # optional cleanup
+    store.commit()                    # end of tick: write the batch
+    store.close()                     # shutdown: flush and stop
+
+    # Audit / offline replay
+    python -m kalshi_bot.state_store --db bot_state.db --ticker KXBTC-25DEC-T99000
+    events = history("bot_state.db", ticker)
+    positions = replay("bot_state.db", until=ts)
 """
 
 from __future__ import annotations
 
+import argparse
 import logging
 import sqlite3
+import threading
 import time
-from typing import TYPE_CHECKING
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from typing import TYPE_CHECKING, Optional, Sequence
 
 if TYPE_CHECKING:
     from .order_manager import MarketPosition, PositionState
 
 logger = logging.getLogger(__name__)
 
-_SCHEMA = """
-CREATE TABLE IF NOT EXISTS positions (
-    ticker          TEXT PRIMARY KEY,
+_FIELDS = """ticker, title, yes_price, no_price, contracts,
+    yes_order_id, no_order_id, hedge_order_id,
+    hedge_price, filled_side,
+    state, realised_pnl, original_mid, last_quote_time"""
+
+_POSITION_COLUMNS = """
     title           TEXT    NOT NULL DEFAULT '',
     yes_price       REAL    NOT NULL DEFAULT 0,
     no_price        REAL    NOT NULL DEFAULT 0,
@@ -38,57 +69,230 @@ CREATE TABLE IF NOT EXISTS positions (
     state           TEXT    NOT NULL,
     realised_pnl    REAL    NOT NULL DEFAULT 0,
     original_mid    REAL    NOT NULL DEFAULT 0,
-    last_quote_time REAL    NOT NULL DEFAULT 0
+    last_quote_time REAL    NOT NULL DEFAULT 0"""
+
+_SCHEMA = f"""
+CREATE TABLE IF NOT EXISTS positions (
+    ticker          TEXT PRIMARY KEY,{_POSITION_COLUMNS}
+);
+CREATE TABLE IF NOT EXISTS position_events (
+    seq             INTEGER PRIMARY KEY AUTOINCREMENT,
+    ts              REAL    NOT NULL,
+    event           TEXT    NOT NULL,
+    ticker          TEXT    NOT NULL,{_POSITION_COLUMNS}
+);
+CREATE INDEX IF NOT EXISTS idx_events_ticker ON position_events(ticker, seq);
+CREATE INDEX IF NOT EXISTS idx_events_ts ON position_events(ts);
+CREATE TABLE IF NOT EXISTS position_base (
+    ticker          TEXT PRIMARY KEY,
+    seq             INTEGER NOT NULL,
+    ts              REAL    NOT NULL,{_POSITION_COLUMNS}
 );
 """
 
+_UPSERT = f"""INSERT OR REPLACE INTO positions ({_FIELDS})
+   VALUES (?,?,?,?,?, ?,?,?, ?,?, ?,?,?,?)"""
+
+_APPEND = f"""INSERT INTO position_events (ts, event, {_FIELDS})
+   VALUES (?,?, ?,?,?,?,?, ?,?,?, ?,?, ?,?,?,?)"""
+
 # States we bother re-loading on restart (skip IDLE / RESOLVED — nothing to do)
 _LIVE_STATES = ("QUOTING", "YES_FILLED", "NO_FILLED", "ONE_SIDE_HEDGED", "BOTH_FILLED")
 
+# Journal label for a delete(); its row carries only the ticker.
+DELETED = "deleted"
+_DELETED_ROW = ("", 0.0, 0.0, 0, None, None, None, 0.0, "", "", 0.0, 0.0, 0.0)
+# Index of `state` in a (ts, _FIELDS...) position_base row
+_STATE_AT = 11
+
+
+@dataclass
+class PositionEvent:
+    seq: int
+    ts: float
+    event: str
+    ticker: str
+    position: Optional["MarketPosition"]   # None for a delete
+
+
+def _row(pos: "MarketPosition") -> tuple:
+    return (
+        pos.ticker, pos.title,
+        pos.yes_price, pos.no_price, pos.contracts,
+        pos.yes_order_id, pos.no_order_id, pos.hedge_order_id,
+        pos.hedge_price, pos.filled_side,
+        pos.state.name, pos.realised_pnl,
+        pos.original_mid, pos.last_quote_time,
+    )
+
+
+def _position(row: Sequence) -> Optional["MarketPosition"]:
+    """MarketPosition from a row in _FIELDS order (None if its state is unknown)."""
+    # Import here to avoid circular import at module level
+    from .order_manager import MarketPosition, PositionState
+
+    (
+        ticker, title, yes_price, no_price, contracts,
+        yes_order_id, no_order_id, hedge_order_id,
+        hedge_price, filled_side,
+        state_name, realised_pnl, original_mid, last_quote_time,
+    ) = row
+    try:
+        state = PositionState[state_name]
+    except KeyError:
+        logger.warning("Unknown state '%s' for %s – skipping.", state_name, ticker)
+        return None
+
+    return MarketPosition(
+        ticker=ticker,
+        title=title or "",
+        yes_price=yes_price or 0.0,
+        no_price=no_price or 0.0,
+        contracts=int(contracts or 0),
+        yes_order_id=yes_order_id,
+        no_order_id=no_order_id,
+        hedge_order_id=hedge_order_id,
+        hedge_price=hedge_price or 0.0,
+        filled_side=filled_side or "",
+        state=state,
+        realised_pnl=realised_pnl or 0.0,
+        original_mid=original_mid or 0.0,
+        last_quote_time=last_quote_time or time.time(),
+    )
+
 
 class StateStore:
     """Persist MarketPosition objects to a local SQLite database."""
 
-    def __init__(self, db_path: str) -> None:
+    def __init__(
+        self,
+        db_path: str,
+        flush_interval: float = 1.0,
+        journal_days: Optional[float] = 30.0,
+        compact_interval: float = 3600.0,
+    ) -> None:
         self.db_path = db_path
-        with sqlite3.connect(self.db_path) as conn:
-            conn.executescript(_SCHEMA)
+        self.flush_interval = flush_interval
+        self.journal_days = journal_days           # None = keep every event
+        self.compact_interval = compact_interval
+        self.rows_written = 0
+        self._conn = sqlite3.connect(db_path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        with self._conn:
+            self._conn.executescript(_SCHEMA)
+
+        # ticker -> row tuple to write, or None to delete
+        self._dirty: dict[str, Optional[tuple]] = {}
+        self._events: list[tuple] = []        # journal rows, in transition order
+        self._lock = threading.Lock()         # guards _dirty / _events
+        self._write_lock = threading.Lock()   # one batch on the connection at a time
+        self._wake = threading.Event()
+        self._stopped = False
+        self._last_compact = time.monotonic()
+        self._thread = threading.Thread(target=self._run, name="state-writer", daemon=True)
+        self._thread.start()
         logger.info("StateStore ready: %s", db_path)
 
     # ------------------------------------------------------------------
     # Write
     # ------------------------------------------------------------------
 
-    def upsert(self, pos: "MarketPosition") -> None:
-        """Insert or replace the position row. Call after every state change."""
-        try:
-            with sqlite3.connect(self.db_path) as conn:
-                conn.execute(
-                    """INSERT OR REPLACE INTO positions
-                       (ticker, title, yes_price, no_price, contracts,
-                        yes_order_id, no_order_id, hedge_order_id,
-                        hedge_price, filled_side,
-                        state, realised_pnl, original_mid, last_quote_time)
-                       VALUES (?,?,?,?,?, ?,?,?, ?,?, ?,?,?,?)""",
-                    (
-                        pos.ticker, pos.title,
-                        pos.yes_price, pos.no_price, pos.contracts,
-                        pos.yes_order_id, pos.no_order_id, pos.hedge_order_id,
-                        pos.hedge_price, pos.filled_side,
-                        pos.state.name, pos.realised_pnl,
-                        pos.original_mid, pos.last_quote_time,
-                    ),
-                )
-        except Exception as exc:
-            logger.error("StateStore.upsert(%s): %s", pos.ticker, exc)
+    def upsert(self, pos: "MarketPosition", event: str = "update") -> None:
+        """Queue the position's current row. Call after every state change."""
+        row = _row(pos)
+        with self._lock:
+            self._dirty[pos.ticker] = row
+            self._events.append((time.time(), event, *row))
 
     def delete(self, ticker: str) -> None:
-        """Remove a position row (e.g. after confirmed RESOLVED cleanup)."""
-        try:
-            with sqlite3.connect(self.db_path) as conn:
-                conn.execute("DELETE FROM positions WHERE ticker = ?", (ticker,))
-        except Exception as exc:
-            logger.error("StateStore.delete(%s): %s", ticker, exc)
+        """Queue removal of a position row (e.g. after confirmed RESOLVED cleanup)."""
+        with self._lock:
+            self._dirty[ticker] = None
+            self._events.append((time.time(), DELETED, ticker, *_DELETED_ROW))
+
+    def commit(self) -> None:
+        """Ask the writer thread to write everything dirty now (non-blocking)."""
+        self._wake.set()
+
+    def flush(self) -> None:
+        """Write everything dirty before returning."""
+        self._write_pending()
+
+    def close(self) -> None:
+        """Flush and stop the writer thread."""
+        if self._stopped:
+            return
+        self._stopped = True
+        self._wake.set()
+        self._thread.join()
+        self.flush()
+        self._conn.close()
+
+    def _run(self) -> None:
+        while not self._stopped:
+            self._wake.wait(self.flush_interval)
+            self._wake.clear()
+            self._write_pending()
+            if (self.journal_days is not None
+                    and time.monotonic() - self._last_compact >= self.compact_interval):
+                self._last_compact = time.monotonic()
+                self.compact(time.time() - self.journal_days * 86_400)
+
+    def _write_pending(self) -> None:
+        with self._write_lock:
+            with self._lock:
+                batch, self._dirty = self._dirty, {}
+                events, self._events = self._events, []
+            if not batch:
+                return
+            try:
+                with self._conn:   # one transaction for the whole batch
+                    self._conn.executemany(_APPEND, events)
+                    self._conn.executemany(
+                        _UPSERT, [row for row in batch.values() if row is not None],
+                    )
+                    self._conn.executemany(
+                        "DELETE FROM positions WHERE ticker = ?",
+                        [(ticker,) for ticker, row in batch.items() if row is None],
+                    )
+            except sqlite3.Error as exc:
+                logger.error("StateStore write (%d positions): %s", len(batch), exc)
+                with self._lock:   # retry next batch unless superseded meanwhile
+                    self._dirty = {**batch, **self._dirty}
+                    self._events = events + self._events
+                return
+            self.rows_written += len(batch)
+
+    def compact(self, before: float) -> int:
+        """
+        Fold journal events older than `before` into position_base (the
+        latest state per ticker as of the last folded event) and delete
+        them. Returns events removed.
+        """
+        with self._write_lock:
+            try:
+                with self._conn:
+                    (last,) = self._conn.execute(
+                        "SELECT MAX(seq) FROM position_events WHERE ts < ?", (before,),
+                    ).fetchone()
+                    if last is None:
+                        return 0
+                    self._conn.execute(
+                        f"""INSERT OR REPLACE INTO position_base (seq, ts, {_FIELDS})
+                            SELECT seq, ts, {_FIELDS} FROM position_events
+                            WHERE seq IN (SELECT MAX(seq) FROM position_events
+                                          WHERE seq <= ? GROUP BY ticker)""",
+                        (last,),
+                    )
+                    n = self._conn.execute(
+                        "DELETE FROM position_events WHERE seq <= ?", (last,),
+                    ).rowcount
+            except sqlite3.Error as exc:
+                logger.error("StateStore.compact: %s", exc)
+                return 0
+        logger.info("StateStore: compacted %d journal event(s) before %.0f", n, before)
+        return n
 
     # ------------------------------------------------------------------
     # Read
@@ -96,17 +300,12 @@ class StateStore:
 
     def load(self) -> "dict[str, MarketPosition]":
         """Re-hydrate all live positions from disk. Call once on startup."""
-        # Import here to avoid circular import at module level
-        from .order_manager import MarketPosition, PositionState
-
         positions: dict[str, MarketPosition] = {}
         try:
-            with sqlite3.connect(self.db_path) as conn:
-                rows = conn.execute(
-                    f"""SELECT ticker, title, yes_price, no_price, contracts,
-                               yes_order_id, no_order_id, hedge_order_id,
-                               hedge_price, filled_side,
-                               state, realised_pnl, original_mid, last_quote_time
+            self.flush()
+            with self._write_lock:
+                rows = self._conn.execute(
+                    f"""SELECT {_FIELDS}
                         FROM positions
                         WHERE state IN ({','.join('?'*len(_LIVE_STATES))})""",
                     _LIVE_STATES,
@@ -116,37 +315,91 @@ class StateStore:
             return {}
 
         for row in rows:
-            (
-                ticker, title, yes_price, no_price, contracts,
-                yes_order_id, no_order_id, hedge_order_id,
-                hedge_price, filled_side,
-                state_name, realised_pnl, original_mid, last_quote_time,
-            ) = row
-            try:
-                state = PositionState[state_name]
-            except KeyError:
-                logger.warning("Unknown state '%s' for %s – skipping.", state_name, ticker)
+            pos = _position(row)
+            if pos is None:
                 continue
-
-            pos = MarketPosition(
-                ticker=ticker,
-                title=title or "",
-                yes_price=yes_price or 0.0,
-                no_price=no_price or 0.0,
-                contracts=int(contracts or 0),
-                yes_order_id=yes_order_id,
-                no_order_id=no_order_id,
-                hedge_order_id=hedge_order_id,
-                hedge_price=hedge_price or 0.0,
-                filled_side=filled_side or "",
-                state=state,
-                realised_pnl=realised_pnl or 0.0,
-                original_mid=original_mid or 0.0,
-                last_quote_time=last_quote_time or time.time(),
-            )
-            positions[ticker] = pos
-            logger.info("Restored position %s [%s]", ticker, state_name)
+            positions[pos.ticker] = pos
+            logger.info("Restored position %s [%s]", pos.ticker, pos.state.name)
 
         if positions:
             logger.info("StateStore: restored %d live position(s).", len(positions))
         return positions
+
+
+# ---------------------------------------------------------------------------
+# Journal queries (offline; safe while the bot is running)
+# ---------------------------------------------------------------------------
+
+def history(
+    db_path: str,
+    ticker: Optional[str] = None,
+    since: float = 0.0,
+    until: Optional[float] = None,
+) -> list[PositionEvent]:
+    """Journal events (one ticker or all) with since ≤ ts ≤ until, in order."""
+    sql = f"SELECT seq, ts, event, {_FIELDS} FROM position_events WHERE ts >= ?"
+    args: list = [since]
+    if until is not None:
+        sql += " AND ts <= ?"
+        args.append(until)
+    if ticker is not None:
+        sql += " AND ticker = ?"
+        args.append(ticker)
+    with sqlite3.connect(f"file:{db_path}?mode=ro", uri=True) as conn:
+        rows = conn.execute(sql + " ORDER BY seq", args).fetchall()
+    return [
+        PositionEvent(seq, ts, event, rest[0], None if event == DELETED else _position(rest))
+        for seq, ts, event, *rest in rows
+    ]
+
+
+def replay(db_path: str, until: Optional[float] = None) -> "dict[str, MarketPosition]":
+    """
+    Every ticker's position as of `until` (default: now), rebuilt from
+    position_base plus the journal.  Raises ValueError if the journal has
+    been compacted past `until`.
+    """
+    with sqlite3.connect(f"file:{db_path}?mode=ro", uri=True) as conn:
+        base = conn.execute(f"SELECT ts, {_FIELDS} FROM position_base").fetchall()
+    if until is not None and any(row[0] > until for row in base):
+        raise ValueError("journal compacted past the requested time")
+
+    positions: dict[str, MarketPosition] = {}
+    for row in base:
+        if not row[_STATE_AT]:
+            continue   # folded delete(): the ticker has no position
+        pos = _position(row[1:])
+        if pos is not None:
+            positions[pos.ticker] = pos
+    for ev in history(db_path, until=until):
+        if ev.position is None:
+            positions.pop(ev.ticker, None)
+        else:
+            positions[ev.ticker] = ev.position
+    return positions
+
+
+# ---------------------------------------------------------------------------
+# CLI
+# ---------------------------------------------------------------------------
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Print the position event journal")
+    parser.add_argument("--db",     default="bot_state.db")
+    parser.add_argument("--ticker", default=None, help="One ticker only")
+    parser.add_argument("--hours",  type=float, default=None,
+                        help="Only events from the last N hours")
+    args = parser.parse_args()
+
+    since = time.time() - args.hours * 3600 if args.hours else 0.0
+    for ev in history(args.db, args.ticker, since=since):
+        stamp = datetime.fromtimestamp(ev.ts, tz=timezone.utc).strftime("%Y-%m-%d %H:%M:%S")
+        pos = ev.position
+        if pos is None:
+            print(f"  {ev.seq:>8}  {stamp}  {ev.event:<14} {ev.ticker}")
+            continue
+        print(
+            f"  {ev.seq:>8}  {stamp}  {ev.event:<14} {pos.ticker:<34} {pos.state.name:<16} "
+            f"yes={pos.yes_price:.2f} no={pos.no_price:.2f} x{pos.contracts} "
+            f"pnl=${pos.realised_pnl:+.4f}"
+        )
@@ -8,6 +8,10 @@ Generates realistic price paths and order-book snapshots using:
   - Stochastic spread: spread widens in volatile periods, narrows when calm
   - Fill simulation: an order fills when the market bid/ask crosses our limit
 
+PricePath.generate() steps one path in pure Python; generate_batch()
+simulates thousands of paths at once with NumPy, returning columnar
+(paths × steps) arrays for Monte Carlo runs over many seeds.
+
 Calibration targets (from Kalshi public stats, 2023-2024):
   - Median bid-ask spread for $10k+ OI markets:  ~4-8¢
   - Typical daily volatility (σ):                 3-8% of probability
@@ -19,7 +23,9 @@ from __future__ import annotations
 import math
 import random
 from dataclasses import dataclass, field
-from typing import Iterator
+from typing import Iterator, Optional, Sequence, Union
+
+import numpy as np
 
 
 # ---------------------------------------------------------------------------
@@ -39,6 +45,43 @@ class MarketSnapshot:
     open_interest: float
 
 
+# ---------------------------------------------------------------------------
+# Many paths of one market, as columns
+# ---------------------------------------------------------------------------
+
+@dataclass
+class PathBatch:
+    """
+    n_paths simulated paths of one market (PricePath.generate_batch).
+
+    t has shape (steps,); every other column is (n_paths, steps), row i
+    being path i in the same units as MarketSnapshot.
+    """
+    ticker: str
+    t: np.ndarray
+    yes_bid: np.ndarray
+    yes_ask: np.ndarray
+    mid: np.ndarray
+    spread: np.ndarray
+    volume_usd: np.ndarray
+    open_interest: np.ndarray
+
+    @property
+    def n_paths(self) -> int:
+        return self.mid.shape[0]
+
+    def snapshots(self, i: int) -> list[MarketSnapshot]:
+        """Path `i` as MarketSnapshot objects (for the scalar Backtester)."""
+        return [
+            MarketSnapshot(self.ticker, float(t), float(b), float(a), float(m), float(s),
+                           float(v), float(oi))
+            for t, b, a, m, s, v, oi in zip(
+                self.t, self.yes_bid[i], self.yes_ask[i], self.mid[i], self.spread[i],
+                self.volume_usd[i], self.open_interest[i],
+            )
+        ]
+
+
 # ---------------------------------------------------------------------------
 # Price-path generator
 # ---------------------------------------------------------------------------
@@ -164,6 +207,87 @@ class PricePath:
             snapshots.append(self.snapshot())
         return snapshots
 
+    def generate_batch(
+        self,
+        days: float,
+        n_paths: int,
+        seed: Union[int, Sequence[int], None] = None,
+    ) -> PathBatch:
+        """
+        Simulate `n_paths` independent paths of `days` from the current
+        state at once, with NumPy (this PricePath is not advanced).
+
+        Same processes, clamps and snapshot rounding as step() / snapshot(),
+        one time step at a time across all paths, drawn from
+        np.random.default_rng(seed) — statistically equivalent to
+        generate() over n_paths seeds, not draw-for-draw identical.
+
+        `seed` may also be a sequence of n_paths seeds: path i is then drawn
+        from its own default_rng(seed[i]), so it is the same whichever
+        batch it is generated in.
+        """
+        steps = int(days / self.dt)
+        dt = self.dt
+        sqrt_dt = math.sqrt(dt)
+        kappa_s = 4.0   # as in step()
+
+        streams: Optional[list[np.random.Generator]] = None
+        if isinstance(seed, Sequence):
+            if len(seed) != n_paths:
+                raise ValueError("need one seed per path")
+            streams = [np.random.default_rng(s) for s in seed]
+            draws = [(r.standard_normal(steps), r.standard_normal(steps)) for r in streams]
+            dW = np.array([d for d, _ in draws]).reshape(n_paths, steps).T
+            dW_s = np.array([d for _, d in draws]).reshape(n_paths, steps).T
+        else:
+            rng = np.random.default_rng(seed)
+            dW = rng.standard_normal((steps, n_paths))
+            dW_s = rng.standard_normal((steps, n_paths))
+        mids = np.empty((steps, n_paths))
+        spreads = np.empty((steps, n_paths))
+        mid = np.full(n_paths, float(self._mid))
+        log_s = np.full(n_paths, math.log(max(self._spread, 0.001)))
+        log_base = math.log(self.base_spread)
+
+        for k in range(steps):
+            diffusion = self.sigma * sqrt_dt * dW[k]
+            mid = mid + self.kappa * (self.mu - mid) * dt + diffusion
+            mid = np.where(mid < 0.01, 0.02 - mid, np.where(mid > 0.99, 1.98 - mid, mid))
+            mid = np.clip(mid, 0.01, 0.99)
+
+            log_s = log_s + kappa_s * (log_base - log_s) * dt + self.spread_vol * sqrt_dt * dW_s[k]
+            spread = np.clip(np.exp(log_s) + 0.5 * np.abs(diffusion), 0.01, 0.30)
+            spread = np.minimum(spread, np.maximum(2 * np.minimum(mid, 1.0 - mid) - 0.01, 0.01))
+            # step() carries the clamped spread forward
+            log_s = np.log(np.maximum(spread, 0.001))
+
+            mids[k] = mid
+            spreads[k] = spread
+
+        mids, spreads = mids.T, spreads.T   # (n_paths, steps)
+        half = spreads / 2
+        yes_bid = np.round(np.maximum(mids - half, 0.01), 2)
+        yes_ask = np.round(np.minimum(mids + half, 0.99), 2)
+        actual_spread = yes_ask - yes_bid
+        mean_volume = np.maximum(120_000 / np.maximum(actual_spread * 100, 0.5), 1)
+        if streams is None:
+            volume = rng.exponential(mean_volume)
+            open_interest = rng.uniform(1_000, 50_000, (n_paths, steps))
+        else:
+            volume = np.array([r.exponential(m) for r, m in zip(streams, mean_volume)])
+            open_interest = np.array([r.uniform(1_000, 50_000, steps) for r in streams])
+
+        return PathBatch(
+            ticker=self.ticker,
+            t=self._t + dt * np.arange(1, steps + 1),
+            yes_bid=np.ascontiguousarray(yes_bid),
+            yes_ask=np.ascontiguousarray(yes_ask),
+            mid=np.ascontiguousarray((yes_bid + yes_ask) / 2),
+            spread=np.ascontiguousarray(actual_spread),
+            volume_usd=volume.reshape(n_paths, steps),
+            open_interest=open_interest.reshape(n_paths, steps),
+        )
+
 
 # ---------------------------------------------------------------------------
 # Scenario definitions
@@ -176,6 +300,55 @@ class Scenario:
     days: float
     markets: list[dict]   # kwargs for PricePath(ticker=..., ...)
 
+    def shock_index(self, n_snapshots: int) -> Optional[int]:
+        """Index of the late price shock (black_swan only), else None."""
+        if self.name != "black_swan" or not n_snapshots:
+            return None
+        return int(n_snapshots * 0.75)
+
+    @staticmethod
+    def _shock_quote(i: int) -> tuple[float, float, float, float]:
+        """(yes_bid, yes_ask, mid, spread) of market `i` after the shock."""
+        shock_mid = 0.02 if i == 0 else 0.98
+        return (
+            round(max(shock_mid - 0.01, 0.01), 2),
+            round(min(shock_mid + 0.01, 0.99), 2),
+            shock_mid,
+            0.02,
+        )
+
+    def market_snapshots(self, i: int, seed: int) -> list[MarketSnapshot]:
+        """Snapshots of market `i` as Backtester.run_scenario simulates it."""
+        snapshots = PricePath(seed=seed + i * 1000, **self.markets[i]).generate(self.days)
+        shock_idx = self.shock_index(len(snapshots))
+        if shock_idx is not None:
+            yes_bid, yes_ask, mid, spread = self._shock_quote(i)
+            for snap in snapshots[shock_idx:]:
+                snap.yes_bid = yes_bid
+                snap.yes_ask = yes_ask
+                snap.mid = mid
+                snap.spread = spread
+        return snapshots
+
+    def market_batch(self, i: int, seeds: Sequence[int]) -> PathBatch:
+        """
+        Market `i` for every seed in one generate_batch call, with the same
+        per-seed offset and shock as market_snapshots.  Path k is drawn
+        from its own stream for seeds[k] — statistically equivalent to
+        market_snapshots(i, seeds[k]), not draw-for-draw identical.
+        """
+        batch = PricePath(**self.markets[i]).generate_batch(
+            self.days, len(seeds), seed=[s + i * 1000 for s in seeds],
+        )
+        shock_idx = self.shock_index(len(batch.t))
+        if shock_idx is not None:
+            yes_bid, yes_ask, mid, spread = self._shock_quote(i)
+            batch.yes_bid[:, shock_idx:] = yes_bid
+            batch.yes_ask[:, shock_idx:] = yes_ask
+            batch.mid[:, shock_idx:] = mid
+            batch.spread[:, shock_idx:] = spread
+        return batch
+
 
 # Pre-built stress scenarios
 SCENARIOS: list[Scenario] = [
@@ -0,0 +1,697 @@
+"""
+Array-backed backtest engine for the Kalshi market-making strategy.
+
+Backtester.run_market walks every MarketSnapshot in a Python loop, building a
+MarketInfo and calling size_position on every bar, re-checking every resting
+order on every bar and maintaining the vol window with list.pop(0).  For
+parameter sweeps (768 combos × 8 scenarios) that loop dominates run time.
+
+This engine takes a market as NumPy columns (t, yes_bid, yes_ask, mid,
+spread, volume, OI) and reproduces run_market's MarketResult:
+
+  1. Market-level pass: market filter, rolling realized vol and position
+     sizing are computed for every bar at once.  While a market is flat the
+     available budget is constant, so the sizing of a position opened on bar
+     k depends only on bar k.
+  2. Quote-window pass: for every bar a position could open on, the next few
+     bars (up to the stale-quote horizon) are laid out as a 2-D window and
+     the drift-cancel, price-cross, stale and fill-probability masks are
+     evaluated in one go.
+  3. The position state machine then jumps from event to event (open → fill
+     / drift cancel / stale cancel → hedge fill / hedge stop).  Each jump is
+     a handful of array operations on one window row, or a vectorised search
+     over the remaining bars for long-lived quotes and hedges.
+
+Random-number parity
+────────────────────
+The loop engine calls rng.random() only for orders that were not filled by a
+deterministic price cross, so the number of draws per bar is a function of
+the cross masks.  The uniforms are pre-drawn from the same random.Random
+stream and indexed with a cumulative draw count.
+
+Fill probabilities are evaluated with NumPy's exp/log1p, which can differ
+from the math module in the last ulp; a draw landing within an ulp of its
+fill probability is the only way the two engines can diverge.  Parity is
+checked by tests/test_vector_backtester.py.
+
+FillModel subclasses that override predict() are not picked up here — the
+logistic model is evaluated from FillModel.params directly.
+"""
+
+from __future__ import annotations
+
+import random
+from dataclasses import dataclass
+from typing import Optional, Union
+
+import numpy as np
+
+from .backtester import Backtester, MarketResult, PosState, SimOrder, SimPosition
+from .fill_model import FillModel
+from .path_cache import COLUMNS, SnapshotView
+from .synthetic_data import MarketSnapshot
+
+# Rolling mid-price window used for realized-vol sizing (matches run_market).
+_VOL_WINDOW = 24
+
+# Widest quote window worth precomputing.  Past this, positions open rarely
+# enough relative to the number of candidate bars that searching each quote
+# on demand is cheaper than laying out a window for every candidate.
+_MAX_QUOTE_WINDOW = 64
+
+# Chunk size for the 1-D event searches.
+_SEARCH_CHUNK = 64
+
+
+# ---------------------------------------------------------------------------
+# Columnar snapshots
+# ---------------------------------------------------------------------------
+
+@dataclass
+class SnapshotArrays:
+    """One market's snapshots as parallel float64 columns."""
+    ticker: str
+    t: np.ndarray
+    yes_bid: np.ndarray
+    yes_ask: np.ndarray
+    mid: np.ndarray
+    spread: np.ndarray
+    volume_usd: np.ndarray
+    open_interest: np.ndarray
+
+    @classmethod
+    def from_snapshots(cls, snapshots: list[MarketSnapshot]) -> "SnapshotArrays":
+        ticker = snapshots[0].ticker if snapshots else "UNKNOWN"
+        rows = np.array(
+            [
+                (s.t, s.yes_bid, s.yes_ask, s.mid, s.spread, s.volume_usd, s.open_interest)
+                for s in snapshots
+            ],
+            dtype=np.float64,
+        ).reshape(-1, 7)
+        cols = np.ascontiguousarray(rows.T)
+        return cls(ticker, *cols)
+
+    @classmethod
+    def from_view(cls, view: SnapshotView) -> "SnapshotArrays":
+        """A cached path's read-only columns, without copying."""
+        return cls(view.ticker, *(view.columns[name] for name in COLUMNS))
+
+    def __len__(self) -> int:
+        return len(self.t)
+
+    def snapshot(self, i: int) -> MarketSnapshot:
+        """Materialise row `i` as a MarketSnapshot."""
+        return MarketSnapshot(
+            ticker=self.ticker,
+            t=float(self.t[i]),
+            yes_bid=float(self.yes_bid[i]),
+            yes_ask=float(self.yes_ask[i]),
+            mid=float(self.mid[i]),
+            spread=float(self.spread[i]),
+            volume_usd=float(self.volume_usd[i]),
+            open_interest=float(self.open_interest[i]),
+        )
+
+
+# ---------------------------------------------------------------------------
+# Vectorised building blocks
+# ---------------------------------------------------------------------------
+
+def _round4(x: np.ndarray) -> np.ndarray:
+    """
+    Elementwise round(x, 4) with Python's semantics.
+
+    np.round scales by 10⁴ before rounding, which can land on the wrong side
+    of a tie; the few near-tie elements are re-rounded with the builtin.
+    """
+    r = np.round(x, 4)
+    scaled = x * 1e4
+    near_tie = np.abs(scaled - np.floor(scaled) - 0.5) < 1e-6
+    for i in np.flatnonzero(near_tie):
+        r.flat[i] = round(float(x.flat[i]), 4)
+    return r
+
+
+def _rolling_realized_vol(mid: np.ndarray) -> np.ndarray:
+    """
+    realized_vol() of the trailing _VOL_WINDOW mids at every bar (NaN where
+    realized_vol would return None).
+
+    Column k holds bar k's window of mid changes, zero-padded at the end for
+    the short windows at the start of the path.  Windows are summed one row
+    at a time so the accumulation order is the same as the builtin sum() in
+    vol_estimator.realized_vol (adding the 0.0 padding is exact).
+    """
+    n = len(mid)
+    m = _VOL_WINDOW - 1
+    changes = np.append(np.diff(mid), 0.0)
+    k = np.arange(n)
+    count = np.minimum(k, m)                    # changes in the window at bar k
+    in_window = np.arange(m)[:, None] < count   # (m, n): column k is bar k's window
+    src = np.minimum((k - count) + np.arange(m)[:, None], n - 1)
+    windows = np.where(in_window, changes[src], 0.0)
+
+    total = windows[0].copy()
+    for j in range(1, m):
+        total += windows[j]
+    mean = total / np.maximum(count, 1)
+    dev = windows - mean
+    sq = np.where(in_window, dev * dev, 0.0)
+    ss = sq[0].copy()
+    for j in range(1, m):
+        ss += sq[j]
+    std_per_step = np.sqrt(ss / np.maximum(count - 1, 1))
+    rv = std_per_step * np.sqrt(24.0)           # dt = 1h → 24 steps per day
+    rv[k + 1 < 4] = np.nan                      # realized_vol's min_obs
+    return rv
+
+
+def _uniform_stream(rng: random.Random, size: int, mt: np.random.RandomState) -> np.ndarray:
+    """
+    The next `size` values of rng.random(), generated in one call on `mt`.
+
+    random.Random and NumPy's legacy RandomState share the MT19937 generator
+    and the 53-bit double construction, so copying the state across yields
+    the identical stream.
+    """
+    state = rng.getstate()[1]
+    mt.set_state(("MT19937", np.array(state[:624], dtype=np.uint32), state[624]))
+    return mt.random_sample(size)
+
+
+def _fill_terms(model: FillModel, cols: SnapshotArrays) -> tuple[np.ndarray, np.ndarray]:
+    """Per-bar volume and spread terms of the fill model's linear predictor."""
+    p = model.params
+    log_vol = np.log1p(np.maximum(cols.volume_usd, 0.0))
+    return p.coef_log_vol * log_vol, p.coef_spread * cols.spread
+
+
+def _fill_probability(
+    model: FillModel,
+    depth: np.ndarray,
+    vol_term: np.ndarray,
+    spread_term: np.ndarray,
+) -> np.ndarray:
+    """
+    Vectorised FillModel.predict: P(fill within 1 hour), capped at 0.25.
+    The terms are summed in the same order as FillModel.predict.
+    """
+    p = model.params
+    z = p.intercept + p.coef_depth * depth + vol_term + spread_term
+    # Numerically stable sigmoid, same branches as fill_model._sigmoid
+    e = np.exp(-np.abs(z))
+    sig = np.where(z >= 0, 1.0, e) / (1.0 + e)
+    return np.minimum(sig, 0.25)
+
+
+def _first_true(mask: np.ndarray) -> int:
+    """Index of the first True in `mask`, or -1 if there is none."""
+    if not len(mask):
+        return -1
+    i = int(mask.argmax())
+    return i if mask[i] else -1
+
+
+@dataclass
+class _Sizing:
+    """Per-bar sizing columns (position_sizer.size_position, vectorised)."""
+    yes_price: np.ndarray
+    no_price: np.ndarray
+    contracts: np.ndarray
+    budget: np.ndarray
+    openable: np.ndarray     # indices of bars a position may open on
+
+
+@dataclass
+class _QuoteWindows:
+    """
+    Quoting-phase masks for positions opened on each openable bar.
+
+    Row r describes a position opened on bar `bars[r]`; column w is bar
+    bars[r] + 1 + w.
+    """
+    row_of: np.ndarray       # bar → row (-1 if not openable)
+    width: int
+    det_event: np.ndarray    # drift | cross | stale (no randomness needed)
+    drift: np.ndarray
+    yes_cross: np.ndarray
+    no_cross: np.ndarray
+    p_yes: np.ndarray
+    p_no: np.ndarray
+    yes_draws: np.ndarray    # 1 where the YES order draws a uniform
+    draws_before: np.ndarray # draws consumed by earlier columns of the row
+    draws_through: np.ndarray
+
+
+# ---------------------------------------------------------------------------
+# Engine
+# ---------------------------------------------------------------------------
+
+class VectorizedBacktester(Backtester):
+    """
+    Drop-in replacement for Backtester whose run_market operates on NumPy
+    columns.  run_scenario is inherited unchanged, so scenario results are
+    identical to the loop engine's.
+    """
+
+    _mt: Optional[np.random.RandomState] = None   # reused uniform generator
+
+    def run_market(
+        self,
+        snapshots: Union[list[MarketSnapshot], SnapshotView, SnapshotArrays],
+        seed_offset: int = 0,
+    ) -> MarketResult:
+        if isinstance(snapshots, SnapshotView):
+            snapshots = SnapshotArrays.from_view(snapshots)
+        elif not isinstance(snapshots, SnapshotArrays):
+            snapshots = SnapshotArrays.from_snapshots(snapshots)
+        return self.run_market_arrays(snapshots, seed_offset)
+
+    # ------------------------------------------------------------------
+    # Market-level passes
+    # ------------------------------------------------------------------
+
+    def _size_all(self, cols: SnapshotArrays, available: float) -> _Sizing:
+        """
+        Size a position on every bar, mirroring size_position() for the
+        vol_override / no-order-book path that run_market uses.
+        """
+        risk = self.cfg.risk
+        sc = self.cfg.scoring
+        f = self.cfg.market_filter
+        mid = cols.mid
+        levels = risk.order_levels
+
+        # 1. Kelly allocation
+        balance = 1.0 - np.abs(2 * mid - 1)
+        kelly = np.where((mid <= 0) | (mid >= 1), 0.0, balance * risk.kelly_multiplier)
+        alloc_fraction = np.minimum(kelly, risk.max_market_fraction)
+        budget_per_level = (available * alloc_fraction) / max(2 * levels, 1)
+
+        # 2. Depth from rolling realized vol, else spread / 4, else default_v
+        rv = _rolling_realized_vol(mid)
+        has_rv = ~np.isnan(rv) & (rv != 0)
+        spread_vol = cols.spread / 4.0
+        fallback = np.where(spread_vol > 0, spread_vol, sc.default_v)
+        v = np.maximum(np.where(has_rv, rv, fallback), sc.default_v)
+        depth = v * sc.order_depth_fraction
+
+        yes_price = _round4(np.maximum(mid - depth, 0.01))
+        no_price = _round4(np.maximum((1.0 - mid) - depth, 0.01))
+
+        # Safety: combined cost must be ≤ max_fill_cost
+        combined = yes_price + no_price
+        over = combined > risk.max_fill_cost
+        if over.any():
+            excess = (combined - risk.max_fill_cost + 0.001) / 2
+            yes_price = np.where(over, _round4(yes_price - excess), yes_price)
+            no_price = np.where(over, _round4(no_price - excess), no_price)
+
+        # 3. Contract count from the dearer side
+        ref_price = np.maximum(np.maximum(yes_price, no_price), 0.01)
+        contracts = np.maximum(
+            np.floor(budget_per_level / ref_price).astype(np.int64),
+            risk.min_order_contracts,
+        )
+        budget = (2 * levels * contracts) * ref_price
+
+        openable = (
+            (f.min_mid <= mid) & (mid <= f.max_mid)
+            & (cols.spread >= f.min_spread)
+            & (cols.open_interest <= f.max_open_interest)
+            & (yes_price + no_price <= risk.max_fill_cost)
+            & (contracts >= 1)
+        )
+        return _Sizing(yes_price, no_price, contracts, budget, np.flatnonzero(openable))
+
+    def _quote_windows(
+        self,
+        cols: SnapshotArrays,
+        sizing: _Sizing,
+        terms: tuple[np.ndarray, np.ndarray],
+    ) -> Optional[_QuoteWindows]:
+        """
+        Lay out the quoting phase of every potential position as a 2-D window,
+        or return None if the stale horizon is wider than _MAX_QUOTE_WINDOW.
+        """
+        risk = self.cfg.risk
+        n = len(cols)
+        bars = sizing.openable
+        row_of = np.full(n, -1, dtype=np.int64)
+        row_of[bars] = np.arange(len(bars))
+
+        # Width: enough columns to reach the stale cancel of the longest quote.
+        horizon = np.searchsorted(
+            cols.t, cols.t[bars] + risk.max_order_age / 3600 / 24, side="right",
+        ) - bars
+        width = int(max(horizon.max(initial=0) + 1, 1))
+        if width > _MAX_QUOTE_WINDOW:
+            return None
+
+        idx = bars[:, None] + 1 + np.arange(width)
+        valid = idx < n
+        idx = np.minimum(idx, n - 1)
+
+        yes_price = sizing.yes_price[bars][:, None]
+        no_price = sizing.no_price[bars][:, None]
+        yes_ask = cols.yes_ask[idx]
+        no_ask = 1.0 - cols.yes_bid[idx]
+        vol_term = terms[0][idx]
+        spread_term = terms[1][idx]
+
+        drift = np.abs(cols.mid[idx] - cols.mid[bars][:, None]) > risk.cancel_if_mid_drift
+        stale = (cols.t[idx] - cols.t[bars][:, None]) * 24 > risk.max_order_age / 3600
+        yes_cross = yes_ask <= yes_price
+        no_cross = no_ask <= no_price
+        p_yes = np.where(valid, _fill_probability(
+            self.fill_model, np.maximum(yes_ask - yes_price, 0.0), vol_term, spread_term,
+        ), 0.0)
+        p_no = np.where(valid, _fill_probability(
+            self.fill_model, np.maximum(no_ask - no_price, 0.0), vol_term, spread_term,
+        ), 0.0)
+
+        # A draw happens for each order not filled by a cross; drift bars end
+        # the quote before any draw, so they never contribute to later columns.
+        yes_draws = (~yes_cross).astype(np.int64)
+        per_bar = yes_draws + ~no_cross
+        draws_through = np.cumsum(per_bar, axis=1)
+        draws_before = draws_through - per_bar
+        draws_through = np.where(drift, draws_before, draws_through)
+
+        return _QuoteWindows(
+            row_of=row_of,
+            width=width,
+            det_event=(drift | yes_cross | no_cross | stale) & valid,
+            drift=drift,
+            yes_cross=yes_cross,
+            no_cross=no_cross,
+            p_yes=p_yes,
+            p_no=p_no,
+            yes_draws=yes_draws,
+            draws_before=draws_before,
+            draws_through=draws_through,
+        )
+
+    # ------------------------------------------------------------------
+    # Core: simulate one market
+    # ------------------------------------------------------------------
+
+    def run_market_arrays(self, cols: SnapshotArrays, seed_offset: int = 0) -> MarketResult:
+        ticker = cols.ticker
+        n = len(cols)
+        risk = self.cfg.risk
+
+        positions: list[SimPosition] = []
+        peak_budget = self.budget.available
+        max_dd = 0.0
+        gross_pnl = 0.0
+        yes_orders_placed = 0
+        yes_orders_filled = 0
+        no_orders_placed = 0
+        no_orders_filled = 0
+        hold_days: list[float] = []
+
+        # Budget is constant while this market is flat, so every open sees
+        # the same available budget.
+        available = self.budget.available
+        if n and available >= 5.0:
+            sizing = self._size_all(cols, available)
+            terms = _fill_terms(self.fill_model, cols)
+            windows = self._quote_windows(cols, sizing, terms)
+            openable = sizing.openable
+        else:
+            openable = np.empty(0, dtype=np.int64)
+
+        # Same stream as the loop engine; at most two draws per bar.  The
+        # padding covers window columns that look past the final event.
+        rng = random.Random(seed_offset * 7919 + 12345)
+        uniforms = np.ones(2 * n + 2 * _MAX_QUOTE_WINDOW + 2)
+        if self._mt is None:
+            self._mt = np.random.RandomState(0)
+        uniforms[:2 * n] = _uniform_stream(rng, 2 * n, self._mt)
+        drawn = 0
+
+        i = 0   # bar on which the next open attempt happens
+        while i < n:
+            # ── Open a new position ──────────────────────────────────────
+            nxt = int(np.searchsorted(openable, i))
+            if nxt >= len(openable):
+                break
+            k = int(openable[nxt])
+            yes_price = float(sizing.yes_price[k])
+            no_price = float(sizing.no_price[k])
+            contracts = int(sizing.contracts[k])
+            pos = SimPosition(
+                ticker=ticker,
+                yes_price=yes_price,
+                no_price=no_price,
+                contracts=contracts,
+                yes_order=SimOrder(self._next_id("Y"), ticker, "yes", yes_price, contracts),
+                no_order=SimOrder(self._next_id("N"), ticker, "no", no_price, contracts),
+                open_t=float(cols.t[k]),
+                open_mid=float(cols.mid[k]),
+            )
+            yes_orders_placed += 1
+            no_orders_placed += 1
+            self.budget.allocate(ticker, float(sizing.budget[k]))
+            positions.append(pos)
+
+            # Available budget only changes on open/close events and equals
+            # the starting peak while flat, so drawdown is tracked on opens.
+            avail = self.budget.available
+            if avail > peak_budget:
+                peak_budget = avail
+            dd = (peak_budget - avail) / max(peak_budget, 1e-9)
+            if dd > max_dd:
+                max_dd = dd
+
+            # ── QUOTING: drift cancel, fills or stale cancel ─────────────
+            if windows is not None:
+                event = self._window_event(windows, k, uniforms, drawn)
+                if event is None:
+                    event = self._quoting_tail(
+                        cols, terms, pos, k + 1 + windows.width,
+                        uniforms, drawn + int(windows.draws_through[windows.row_of[k], -1]),
+                    )
+            else:
+                event = self._quoting_tail(cols, terms, pos, k + 1, uniforms, drawn)
+            if event is None:
+                break
+            j, kind, yes_f, no_f, drawn = event
+            snap_t = float(cols.t[j])
+
+            if kind in ("drift", "stale"):
+                self.budget.release(ticker)
+                hold_days.append(snap_t - pos.open_t)
+                pos.state = PosState.RESOLVED
+                i = j
+                continue
+
+            if yes_f:
+                pos.yes_order.filled = True
+                yes_orders_filled += 1
+            if no_f:
+                pos.no_order.filled = True
+                no_orders_filled += 1
+
+            if yes_f != no_f:
+                if yes_f:
+                    pos.state = PosState.YES_FILLED
+                    # snap.yes_ask ≈ no_ask, as in run_market
+                    hedge_price = min(risk.max_fill_cost - pos.yes_price, float(cols.yes_ask[j]))
+                    hedge_side = "no"
+                else:
+                    pos.state = PosState.NO_FILLED
+                    hedge_price = min(risk.max_fill_cost - pos.no_price, 1.0 - float(cols.yes_bid[j]))
+                    hedge_side = "yes"
+                if hedge_price <= 0:
+                    break   # unhedgeable one-sided fill: held to resolution
+                pos.hedge_order = SimOrder(
+                    order_id=self._next_id("H"),
+                    ticker=ticker,
+                    side=hedge_side,
+                    price=round(min(hedge_price, 0.99), 4),
+                    contracts=pos.contracts,
+                )
+                pos.state = PosState.ONE_SIDE_HEDGED
+
+                # ── ONE_SIDE_HEDGED: hedge fill or directional stop ──────
+                event = self._hedge_event(cols, terms, pos, j + 1, uniforms, drawn)
+                if event is None:
+                    break
+                j, kind, drawn = event
+                snap_t = float(cols.t[j])
+
+                if kind == "stop":
+                    # Cut the losing leg at current mark-to-market (fee on filled side)
+                    if pos.yes_order.filled:
+                        fee = risk.fee_rate * pos.yes_price * pos.contracts
+                        mtm_pnl = (float(cols.yes_bid[j]) - pos.yes_price) * pos.contracts - fee
+                    else:
+                        fee = risk.fee_rate * pos.no_price * pos.contracts
+                        mtm_pnl = ((1.0 - float(cols.yes_ask[j])) - pos.no_price) * pos.contracts - fee
+                    gross_pnl += mtm_pnl
+                    pos.realised_pnl = mtm_pnl
+                    hold_days.append(snap_t - pos.open_t)
+                    self.budget.release(ticker)
+                    pos.close_t = snap_t
+                    pos.state = PosState.RESOLVED
+                    i = j
+                    continue
+
+                pos.hedge_order.filled = True
+                if pos.hedge_order.side == "yes":
+                    yes_orders_filled += 1
+                else:
+                    no_orders_filled += 1
+            pos.state = PosState.BOTH_FILLED
+
+            # ── BOTH_FILLED → lock in the pair and redeploy ──────────────
+            fee = risk.fee_rate * (pos.yes_price + pos.no_price) * pos.contracts
+            locked_pnl = (1.0 - pos.yes_price - pos.no_price) * pos.contracts - fee
+            gross_pnl += locked_pnl
+            pos.realised_pnl = locked_pnl
+            hold_days.append(snap_t - pos.open_t)
+            self.budget.release(ticker)
+            pos.close_t = snap_t
+            pos.state = PosState.RESOLVED
+            i = j
+
+        return self._finish_market(
+            ticker, n, cols.snapshot(n - 1) if n else None,
+            positions, gross_pnl, max_dd, hold_days,
+            yes_orders_placed, yes_orders_filled, no_orders_placed, no_orders_filled,
+        )
+
+    # ------------------------------------------------------------------
+    # Event searches
+    # ------------------------------------------------------------------
+
+    @staticmethod
+    def _window_event(
+        windows: _QuoteWindows,
+        k: int,
+        uniforms: np.ndarray,
+        drawn: int,
+    ) -> Optional[tuple[int, str, bool, bool, int]]:
+        """
+        Resolve the quoting phase of a position opened on bar `k` from its
+        precomputed window row.
+
+        Returns (bar, kind, yes_filled, no_filled, draws_consumed) where kind
+        is "drift", "fill" or "stale", or None if the window holds no event.
+        """
+        r = windows.row_of[k]
+        u_yes = uniforms[drawn + windows.draws_before[r]]
+        u_no = uniforms[drawn + windows.draws_before[r] + windows.yes_draws[r]]
+        stoch_yes = u_yes < windows.p_yes[r]
+        stoch_no = u_no < windows.p_no[r]
+        w = _first_true(windows.det_event[r] | stoch_yes | stoch_no)
+        if w < 0:
+            return None
+
+        bar = k + 1 + w
+        consumed = drawn + int(windows.draws_through[r, w])
+        if windows.drift[r, w]:
+            return bar, "drift", False, False, consumed
+        yes_f = bool(windows.yes_cross[r, w] or stoch_yes[w])
+        no_f = bool(windows.no_cross[r, w] or stoch_no[w])
+        return bar, "fill" if yes_f or no_f else "stale", yes_f, no_f, consumed
+
+    def _quoting_tail(
+        self,
+        cols: SnapshotArrays,
+        terms: tuple[np.ndarray, np.ndarray],
+        pos: SimPosition,
+        start: int,
+        uniforms: np.ndarray,
+        drawn: int,
+    ) -> Optional[tuple[int, str, bool, bool, int]]:
+        """
+        1-D continuation of the quoting-phase search for quotes that outlive
+        their window.  Same return value as _window_event; None if the
+        position is still quoting at the end of the path.
+        """
+        risk = self.cfg.risk
+        n = len(cols)
+        lo = start
+        while lo < n:
+            sl = slice(lo, min(lo + _SEARCH_CHUNK, n))
+            yes_ask = cols.yes_ask[sl]
+            no_ask = 1.0 - cols.yes_bid[sl]
+            drift = np.abs(cols.mid[sl] - pos.open_mid) > risk.cancel_if_mid_drift
+            stale = (cols.t[sl] - pos.open_t) * 24 > risk.max_order_age / 3600
+            yes_cross = yes_ask <= pos.yes_price
+            no_cross = no_ask <= pos.no_price
+
+            yes_draws = (~yes_cross).astype(np.int64)
+            per_bar = yes_draws + ~no_cross
+            before = drawn + np.cumsum(per_bar) - per_bar
+            u_yes = uniforms[np.minimum(before, len(uniforms) - 1)]
+            u_no = uniforms[np.minimum(before + yes_draws, len(uniforms) - 1)]
+            p_yes = _fill_probability(
+                self.fill_model, np.maximum(yes_ask - pos.yes_price, 0.0),
+                terms[0][sl], terms[1][sl],
+            )
+            p_no = _fill_probability(
+                self.fill_model, np.maximum(no_ask - pos.no_price, 0.0),
+                terms[0][sl], terms[1][sl],
+            )
+            yes_f = yes_cross | (u_yes < p_yes)
+            no_f = no_cross | (u_no < p_no)
+
+            w = _first_true(drift | yes_f | no_f | stale)
+            if w >= 0:
+                bar = lo + w
+                if drift[w]:
+                    return bar, "drift", False, False, int(before[w])
+                consumed = int(before[w] + per_bar[w])
+                kind = "fill" if yes_f[w] or no_f[w] else "stale"
+                return bar, kind, bool(yes_f[w]), bool(no_f[w]), consumed
+            drawn = int(before[-1] + per_bar[-1])
+            lo = sl.stop
+        return None
+
+    def _hedge_event(
+        self,
+        cols: SnapshotArrays,
+        terms: tuple[np.ndarray, np.ndarray],
+        pos: SimPosition,
+        start: int,
+        uniforms: np.ndarray,
+        drawn: int,
+    ) -> Optional[tuple[int, str, int]]:
+        """
+        Find the bar that ends the ONE_SIDE_HEDGED phase of `pos`.
+
+        Returns (bar, kind, draws_consumed) where kind is "fill" or "stop",
+        or None if the hedge is still open at the end of the path.
+        """
+        n = len(cols)
+        h = pos.hedge_order
+        lo = start
+        while lo < n:
+            sl = slice(lo, min(lo + _SEARCH_CHUNK, n))
+            if h.side == "yes":
+                ask = cols.yes_ask[sl]
+            else:
+                ask = 1.0 - cols.yes_bid[sl]
+            cross = ask <= h.price
+            per_bar = (~cross).astype(np.int64)
+            before = drawn + np.cumsum(per_bar) - per_bar
+            u = uniforms[np.minimum(before, len(uniforms) - 1)]
+            p = _fill_probability(
+                self.fill_model, np.maximum(ask - h.price, 0.0),
+                terms[0][sl], terms[1][sl],
+            )
+            filled = cross | (u < p)
+            # gap = how far the current market ask is above our hedge limit
+            stopped = ~filled & ((ask - h.price) > self.cfg.risk.hedge_stop_gap)
+
+            w = _first_true(filled | stopped)
+            if w >= 0:
+                return lo + w, "fill" if filled[w] else "stop", int(before[w] + per_bar[w])
+            drawn = int(before[-1] + per_bar[-1])
+            lo = sl.stop
+        return None
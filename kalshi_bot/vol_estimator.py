@@ -15,17 +15,32 @@ This is the discrete analogue of the quadratic variation estimator used in
 stochastic calculus, applied to the binary probability process rather than
 log-prices (since probabilities are already on [0,1]).
 
-Two entry points:
-  1. realized_vol(mids, dt_hours)       — pure-Python, used by backtester
-  2. realized_vol_from_db(ticker, ...)  — SQLite-backed, used by live bot
+Entry points:
+  1. realized_vol(mids, dt_hours)       — pure-Python, one-shot
+  2. realized_vol_from_db(ticker, ...)  — SQLite-backed, one-shot; reads
+                                          hourly / minute rollup bars when
+                                          they cover the window
+  3. RollingVol                         — incremental: O(1) amortized per
+                                          new mid, several horizons at once
+                                          (used by the backtester)
+  4. VolTracker                         — per-ticker RollingVol fed from
+                                          market_data.db in batched reads,
+                                          TTL-cached (used by live bot)
 """
 
 from __future__ import annotations
 
+import itertools
 import math
 import sqlite3
+import threading
 import time
-from typing import Optional
+from collections import deque
+from dataclasses import dataclass
+from typing import Iterable, Mapping, Optional
+
+from .rollups import RESOLUTIONS, pick_resolution, read_bars
+from .snapshot_grid import Grid, fill_bars, forward_fill, read_grid
 
 
 # ---------------------------------------------------------------------------
@@ -56,7 +71,7 @@ def realized_vol(
     changes = [mids[i + 1] - mids[i] for i in range(len(mids) - 1)]
     n = len(changes)
     mean = sum(changes) / n
-    variance = sum((c - mean) ** 2 for c in changes) / max(n - 1, 1)
+    variance = sum((c - mean) * (c - mean) for c in changes) / max(n - 1, 1)
     std_per_step = math.sqrt(variance)
 
     # Scale to daily units: σ_daily = σ_step × √(steps_per_day)
@@ -64,6 +79,188 @@ def realized_vol(
     return std_per_step * math.sqrt(steps_per_day)
 
 
+# ---------------------------------------------------------------------------
+# Incremental estimator
+# ---------------------------------------------------------------------------
+
+@dataclass(frozen=True)
+class Horizon:
+    """A sliding window: the last `obs` mids, or the mids within `hours` of now."""
+    obs: Optional[int] = None
+    hours: Optional[float] = None
+
+    def __post_init__(self) -> None:
+        if (self.obs is None) == (self.hours is None):
+            raise ValueError("Horizon needs exactly one of obs / hours")
+        if self.obs is not None and self.obs < 2:
+            raise ValueError("Horizon.obs must be at least 2")
+
+
+class _Window:
+    """
+    Running mean / M2 (Welford) of the mid changes inside one horizon.
+
+    Each change is stored with the timestamp of its earlier mid: a change
+    is in a time window exactly when both its mids are.  Removal runs
+    Welford's update backwards; the sums are recomputed exactly once per
+    window-length of evictions, which bounds rounding drift and keeps the
+    amortized cost O(1).
+    """
+
+    __slots__ = ("horizon", "changes", "n", "mean", "m2", "_evictions")
+
+    def __init__(self, horizon: Horizon) -> None:
+        self.horizon = horizon
+        self.changes: deque[tuple[float, float]] = deque()   # (ts of earlier mid, Δmid)
+        self.n = 0
+        self.mean = 0.0
+        self.m2 = 0.0
+        self._evictions = 0
+
+    def push(self, ts_prev: float, change: float) -> None:
+        self.changes.append((ts_prev, change))
+        self.n += 1
+        d = change - self.mean
+        self.mean += d / self.n
+        self.m2 += d * (change - self.mean)
+
+    def _pop(self) -> None:
+        _, x = self.changes.popleft()
+        self.n -= 1
+        if self.n == 0:
+            self.mean = self.m2 = 0.0
+        else:
+            d = x - self.mean
+            self.mean -= d / self.n
+            self.m2 -= d * (x - self.mean)
+        self._evictions += 1
+        if self._evictions >= self.n:
+            self._recompute()
+
+    def _recompute(self) -> None:
+        self._evictions = 0
+        if not self.n:
+            return
+        self.mean = sum(c for _, c in self.changes) / self.n
+        self.m2 = sum((c - self.mean) * (c - self.mean) for _, c in self.changes)
+
+    def evict(self, now: Optional[float]) -> None:
+        if self.horizon.obs is not None:
+            while self.n > self.horizon.obs - 1:
+                self._pop()
+        elif now is not None:
+            cutoff = now - self.horizon.hours * 3600.0
+            while self.changes and self.changes[0][0] < cutoff:
+                self._pop()
+
+    @property
+    def std(self) -> float:
+        """Sample std of the changes (same n−1 convention as realized_vol)."""
+        return math.sqrt(max(self.m2, 0.0) / max(self.n - 1, 1))
+
+
+class RollingVol:
+    """
+    Realized volatility of one mid-price series over several sliding
+    windows, updated in O(1) amortized time per observation.
+
+    Each horizon gives the same value realized_vol() would compute over the
+    mids inside it: `obs` horizons keep the last N mids (fixed dt_hours);
+    `hours` horizons keep mids timestamped within that many hours of the
+    newest mid (or of `now`), with dt estimated from the timestamps like
+    realized_vol_from_db.
+
+        rv = RollingVol({"6h": Horizon(hours=6), "7d": Horizon(hours=168)})
+        rv.update(mid, ts)           # per snapshot
+        rv.ratio("6h", "7d")         # spike detector
+    """
+
+    def __init__(
+        self,
+        horizons: Mapping[str, Horizon],
+        dt_hours: Optional[float] = None,
+        min_obs: int = 4,
+    ) -> None:
+        if not horizons:
+            raise ValueError("RollingVol needs at least one horizon")
+        self._windows = {name: _Window(h) for name, h in horizons.items()}
+        self._timed = any(h.hours is not None for h in horizons.values())
+        self._default = next(iter(horizons))
+        self.dt_hours = dt_hours
+        self.min_obs = min_obs
+        self.last_mid: Optional[float] = None
+        self.last_ts: Optional[float] = None
+
+    @classmethod
+    def bars(cls, obs: int, dt_hours: float = 1.0, min_obs: int = 4) -> "RollingVol":
+        """Single window over the last `obs` mids at a fixed cadence."""
+        return cls({"bars": Horizon(obs=obs)}, dt_hours=dt_hours, min_obs=min_obs)
+
+    def update(self, mid: float, ts: Optional[float] = None) -> None:
+        """Add the next mid (ts in epoch seconds; required for `hours` horizons)."""
+        if ts is None and self._timed:
+            raise ValueError("time-based horizons need a timestamp per update")
+        if ts is not None and self.last_ts is not None and ts < self.last_ts:
+            return   # out of order – already past it
+        if self.last_mid is not None:
+            change = mid - self.last_mid
+            for w in self._windows.values():
+                w.push(self.last_ts, change)
+                w.evict(ts)
+        self.last_mid, self.last_ts = mid, ts
+
+    def count(self, name: Optional[str] = None, now: Optional[float] = None) -> int:
+        """Mids inside a horizon."""
+        w = self._window(name, now)
+        if self.last_mid is None:
+            return 0
+        if w.horizon.hours is not None and self.last_ts is not None:
+            ref = now if now is not None else self.last_ts
+            if self.last_ts < ref - w.horizon.hours * 3600.0:
+                return 0
+        return w.n + 1
+
+    def vol(
+        self,
+        name: Optional[str] = None,
+        min_obs: Optional[int] = None,
+        now: Optional[float] = None,
+    ) -> Optional[float]:
+        """σ_daily over a horizon, or None with fewer than min_obs mids."""
+        w = self._window(name, now)
+        if self.count(name, now) < (self.min_obs if min_obs is None else min_obs):
+            return None
+
+        if self.dt_hours is not None:
+            dt_hours = self.dt_hours
+        elif w.n and self.last_ts is not None:
+            dt_hours = (self.last_ts - w.changes[0][0]) / w.n / 3600.0
+        else:
+            dt_hours = 1.0
+        steps_per_day = 24.0 / max(dt_hours, 1.0 / 60.0)
+        return w.std * math.sqrt(steps_per_day)
+
+    def ratio(
+        self,
+        short: str,
+        long: str,
+        min_obs: Optional[int] = None,
+        now: Optional[float] = None,
+    ) -> Optional[float]:
+        """vol(short) / vol(long), or None if either is unavailable."""
+        short_rv = self.vol(short, min_obs, now)
+        long_rv = self.vol(long, min_obs, now)
+        if short_rv is None or long_rv is None or long_rv < 1e-9:
+            return None
+        return short_rv / long_rv
+
+    def _window(self, name: Optional[str], now: Optional[float]) -> _Window:
+        w = self._windows[name if name is not None else self._default]
+        if now is not None:
+            w.evict(now)
+        return w
+
+
 # ---------------------------------------------------------------------------
 # Database-backed lookup (used by live bot)
 # ---------------------------------------------------------------------------
@@ -73,25 +270,48 @@ def realized_vol_from_db(
     db_path: str,
     lookback_hours: int = 24,
     min_obs: int = 6,
+    resolution: Optional[str] = "auto",
 ) -> Optional[float]:
     """
     Query recent snapshots from market_data.db and compute realized volatility.
 
     Returns None if the database is unavailable or there is insufficient history.
     Falls back gracefully — callers should use config.scoring.default_v when None.
+    Change-only data is forward-filled onto the poll grid first (quiet polls
+    count as zero moves); the row in force at the cutoff seeds the window.
+
+    resolution="auto" reads the coarsest rollup bars (closes) that still give
+    ≥ 24 points over the window, if the collector has them; None reads raw
+    snapshots; "1m" / "1h" force a bar table.
     """
     cutoff = int(time.time()) - lookback_hours * 3600
     try:
         with sqlite3.connect(db_path, timeout=5.0) as conn:
-            rows = conn.execute(
-                """SELECT ts, mid
-                   FROM market_snapshots
-                   WHERE ticker = ? AND ts >= ?
-                   ORDER BY ts ASC""",
-                (ticker, cutoff),
-            ).fetchall()
+            grid = read_grid(conn)
+            if resolution == "auto":
+                resolution = pick_resolution(conn, cutoff, lookback_hours * 3600)
+            if resolution is None:
+                rows = conn.execute(
+                    """SELECT ts, mid
+                       FROM market_snapshots
+                       WHERE ticker = ? AND ts >= ?
+                       ORDER BY ts ASC""",
+                    (ticker, cutoff - (grid.max_gap if grid else 0)),
+                ).fetchall()
+            else:
+                # Quiet buckets of change-only data have no bar: fill_bars
+                # repeats the one before, reading back far enough to seed it.
+                seconds = RESOLUTIONS[resolution]
+                rows = read_bars(
+                    conn, ticker, resolution, cutoff - (grid.max_gap + seconds if grid else 0),
+                    columns="bucket, close, first_ts, last_ts",
+                )
     except Exception:
         return None
+    if resolution is None and grid is not None:
+        rows = [r for r in forward_fill(rows, grid) if r[0] >= cutoff]
+    elif resolution is not None:
+        rows = [r for r in fill_bars(rows, seconds, grid) if r[0] >= cutoff]
 
     if len(rows) < min_obs:
         return None
@@ -116,6 +336,7 @@ def vol_ratio(
     short_hours: int = 6,
     long_hours: int = 168,   # 7 days
     min_obs: int = 4,
+    resolution: Optional[str] = "auto",
 ) -> Optional[float]:
     """
     Return short_rv / long_rv for a ticker, or None if insufficient data.
@@ -125,15 +346,207 @@ def vol_ratio(
 
     short_hours : lookback for current vol estimate (6h default)
     long_hours  : lookback for baseline vol estimate (7 days = 168h default)
+    resolution  : as for realized_vol_from_db; "auto" is resolved once, to
+                  the coarsest bars giving ≥ 24 points over the shorter
+                  window and reaching back over the longer one, and both
+                  windows read that resolution so the ratio compares like
+                  with like
     """
-    short_rv = realized_vol_from_db(ticker, db_path, lookback_hours=short_hours, min_obs=min_obs)
-    long_rv  = realized_vol_from_db(ticker, db_path, lookback_hours=long_hours,  min_obs=min_obs)
+    if resolution == "auto":
+        try:
+            with sqlite3.connect(db_path, timeout=5.0) as conn:
+                resolution = pick_resolution(
+                    conn,
+                    int(time.time()) - max(short_hours, long_hours) * 3600,
+                    min(short_hours, long_hours) * 3600,
+                )
+        except Exception:
+            return None
+    short_rv = realized_vol_from_db(
+        ticker, db_path, lookback_hours=short_hours, min_obs=min_obs, resolution=resolution,
+    )
+    long_rv = realized_vol_from_db(
+        ticker, db_path, lookback_hours=long_hours, min_obs=min_obs, resolution=resolution,
+    )
 
     if short_rv is None or long_rv is None or long_rv < 1e-9:
         return None
     return short_rv / long_rv
 
 
+# ---------------------------------------------------------------------------
+# Incremental database-backed lookups
+# ---------------------------------------------------------------------------
+
+class VolTracker:
+    """
+    Per-ticker RollingVol fed incrementally from market_data.db.
+
+    realized_vol() / vol_ratio() return what realized_vol_from_db() and
+    vol_ratio() would from raw rows (resolution=None), but the first
+    lookup for a ticker reads its longest horizon once and every later
+    lookup reads only the snapshots newer than the last one seen — no
+    full-window query per candidate per tick.
+
+    Reads go through one persistent read-only connection.  A ticker synced
+    less than `ttl` seconds ago is served from memory (the collector writes
+    at most once per interval, so set ttl to its --interval), and
+    vol_ratios() / refresh() sync a whole candidate list in one query, each
+    ticker bounded by its own last row.
+    Change-only data is forward-filled as it is read, as in
+    realized_vol_from_db().
+    """
+
+    # Two variables per ticker: stay under SQLITE_MAX_VARIABLE_NUMBER (999)
+    # on older builds.
+    _CHUNK = 250
+
+    def __init__(
+        self,
+        db_path: str,
+        horizon_hours: tuple[int, ...] = (6, 24, 168),
+        ttl: float = 60.0,
+    ) -> None:
+        self.db_path = db_path
+        self.ttl = ttl
+        self._horizons = {str(h): Horizon(hours=h) for h in horizon_hours}
+        self._longest = max(horizon_hours)
+        self._vols: dict[str, RollingVol] = {}
+        self._synced: dict[str, float] = {}   # ticker -> monotonic time of last sync
+        self._conn: Optional[sqlite3.Connection] = None
+        self._grid: Optional[Grid] = None
+        self._lock = threading.Lock()
+
+    def _connect(self) -> sqlite3.Connection:
+        if self._conn is None:
+            conn = sqlite3.connect(
+                f"file:{self.db_path}?mode=ro", uri=True,
+                timeout=5.0, check_same_thread=False,
+            )
+            self._grid = read_grid(conn)
+            self._conn = conn
+        return self._conn
+
+    def close(self) -> None:
+        with self._lock:
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
+
+    def refresh(self, tickers: Iterable[str], force: bool = False) -> None:
+        """Sync every ticker older than ttl (or all, if force) in one query."""
+        mono = time.monotonic()
+        with self._lock:
+            stale = sorted({
+                t for t in tickers
+                if force or mono - self._synced.get(t, -math.inf) >= self.ttl
+            })
+            if not stale:
+                return
+            rows: list[tuple[str, int, float]] = []
+            try:
+                conn = self._connect()
+                # With change-only data, the row in force at the window start
+                # may be up to one keyframe gap older.
+                floor = int(time.time()) - self._longest * 3600
+                floor -= int(self._grid.max_gap) if self._grid else 0
+                # Each ticker reads from its own bound: a new one from the
+                # window start, a seeded one only past its last row.
+                bounds = [
+                    (t, max(self._vols[t].last_ts or floor, floor) if t in self._vols else floor)
+                    for t in stale
+                ]
+                for i in range(0, len(bounds), self._CHUNK):
+                    chunk = bounds[i:i + self._CHUNK]
+                    values = ", ".join(["(?, ?)"] * len(chunk))
+                    rows += conn.execute(
+                        f"WITH bounds(ticker, since) AS (VALUES {values}) "
+                        "SELECT s.ticker, s.ts, s.mid FROM bounds b "
+                        "JOIN market_snapshots s ON s.ticker = b.ticker AND s.ts >= b.since "
+                        "ORDER BY s.ticker, s.ts ASC",
+                        [v for bound in chunk for v in bound],
+                    ).fetchall()
+            except sqlite3.Error:
+                if self._conn is not None:
+                    self._conn.close()
+                    self._conn = None
+                return   # keep serving what we have; retry next call
+
+            fresh = {t: RollingVol(self._horizons) for t in stale if t not in self._vols}
+            for ticker, group in itertools.groupby(rows, key=lambda row: row[0]):
+                rv = fresh[ticker] if ticker in fresh else self._vols[ticker]
+                new = [
+                    (ts, mid) for _, ts, mid in group
+                    if mid is not None and (rv.last_ts is None or ts > rv.last_ts)
+                ]
+                if self._grid is not None and new:
+                    if rv.last_ts is not None:
+                        new = forward_fill([(rv.last_ts, rv.last_mid)] + new, self._grid)[1:]
+                    else:
+                        new = forward_fill(new, self._grid)
+                for ts, mid in new:
+                    rv.update(mid, ts)
+            self._vols.update(fresh)
+            for t in stale:
+                self._synced[t] = mono
+
+    def retain(self, tickers: Iterable[str]) -> None:
+        """Forget every ticker not in `tickers` (markets no longer scanned)."""
+        keep = set(tickers)
+        with self._lock:
+            for table in (self._vols, self._synced):
+                for ticker in [t for t in table if t not in keep]:
+                    del table[ticker]
+
+    def _sync(self, ticker: str) -> Optional[RollingVol]:
+        self.refresh((ticker,))
+        return self._vols.get(ticker)
+
+    def _horizon(self, hours: int) -> str:
+        name = str(hours)
+        if name not in self._horizons:
+            raise ValueError(f"VolTracker does not track a {hours}h horizon")
+        return name
+
+    def realized_vol(
+        self, ticker: str, lookback_hours: int = 24, min_obs: int = 6,
+    ) -> Optional[float]:
+        """Incremental realized_vol_from_db()."""
+        name = self._horizon(lookback_hours)
+        rv = self._sync(ticker)
+        if rv is None:
+            return None
+        return rv.vol(name, min_obs=min_obs, now=int(time.time()))
+
+    def vol_ratio(
+        self,
+        ticker: str,
+        short_hours: int = 6,
+        long_hours: int = 168,
+        min_obs: int = 4,
+    ) -> Optional[float]:
+        """Incremental vol_ratio()."""
+        return self.vol_ratios((ticker,), short_hours, long_hours, min_obs)[ticker]
+
+    def vol_ratios(
+        self,
+        tickers: Iterable[str],
+        short_hours: int = 6,
+        long_hours: int = 168,
+        min_obs: int = 4,
+    ) -> dict[str, Optional[float]]:
+        """vol_ratio() for every ticker, syncing the stale ones in one query."""
+        short, long = self._horizon(short_hours), self._horizon(long_hours)
+        tickers = list(tickers)
+        self.refresh(tickers)
+        now = int(time.time())
+        out: dict[str, Optional[float]] = {}
+        for ticker in tickers:
+            rv = self._vols.get(ticker)
+            out[ticker] = None if rv is None else rv.ratio(short, long, min_obs=min_obs, now=now)
+        return out
+
+
 # ---------------------------------------------------------------------------
 # Effective volatility: realized (if available) else config default
 # ---------------------------------------------------------------------------
@@ -144,22 +557,26 @@ def effective_vol(
     default_v: float,
     data_db: Optional[str] = None,
     lookback_hours: int = 24,
+    tracker: Optional[VolTracker] = None,
 ) -> tuple[float, str]:
     """
     Return the volatility estimate to use for depth sizing, plus a source label.
 
     Priority:
-      1. Realized vol from DB   (source="realized")
+      1. Realized vol from DB   (source="realized"; via `tracker` if given)
       2. Current market spread  (source="spread")    — spread is a vol proxy
       3. config.scoring.default_v (source="default")
 
     The spread is included as a fallback because a wide spread implies market
     makers are pricing in uncertainty (adverse selection risk).
     """
-    if data_db:
+    rv = None
+    if tracker is not None:
+        rv = tracker.realized_vol(ticker, lookback_hours=lookback_hours)
+    elif data_db:
         rv = realized_vol_from_db(ticker, data_db, lookback_hours=lookback_hours)
-        if rv is not None and rv > 0:
-            return rv, "realized"
+    if rv is not None and rv > 0:
+        return rv, "realized"
 
     # Spread as vol proxy: at 1-hour cadence, a 6¢ spread ≈ 1.5¢/hr move expectation
     spread_vol = market_spread / 4.0  # rough: spread ≈ 4× hourly σ
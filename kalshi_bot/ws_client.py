@@ -12,6 +12,17 @@ Kalshi WS API v2:
   Fill event : {"type": "fill", "msg": {"market_ticker": "...", "order_id": "...",
                                          "side": "yes"|"no", "count": N,
                                          "yes_price": 48, "no_price": 52}}
+  Order event: {"type": "user_order", "msg": {"ticker": "...", "order_id": "...",
+                                              "status": "resting"|"canceled"|"executed", ...}}
+               (channel "user_orders", subscribed only when on_order_update is given)
+  Order book : "orderbook_snapshot" / "orderbook_delta" messages for the tickers
+               last passed to track_tickers(), applied to an OrderBookCache
+               (see book_cache.py; sequence gaps trigger a resubscribe)
+  Ticker     : {"type": "ticker", "msg": {"market_ticker": "...", "yes_bid": 45,
+                                           "yes_ask": 48, "price": 46, "volume": N,
+                                           "open_interest": N, "ts": 1700000000}}
+               (channel "ticker", all markets; subscribed only when on_ticker
+               is given — used by the streaming data collector)
 
 Architecture:
   - Runs in a background daemon thread (non-blocking for the main bot loop)
@@ -37,14 +48,21 @@ import json
 import logging
 import threading
 import time
-from typing import Callable, Optional
+from typing import TYPE_CHECKING, Callable, Optional
 
 from .config import BotConfig
 
+if TYPE_CHECKING:
+    from .book_cache import OrderBookCache
+
 logger = logging.getLogger(__name__)
 
 # Type alias: callback(ticker, order_id, side, count)
 FillCallback = Callable[[str, str, str, int], None]
+# Type alias: callback(ticker, order_id, status)
+OrderUpdateCallback = Callable[[str, str, str], None]
+# Type alias: callback(ticker message body)
+TickerCallback = Callable[[dict], None]
 
 _WS_PATH = "/trade-api/ws/v2"  # used for signing and building URL
 
@@ -54,11 +72,25 @@ class KalshiWebSocket:
     Persistent WebSocket connection to the Kalshi real-time feed.
 
     Provides fill notifications to the OrderManager without polling.
+    Pass on_fill=None for a market-data-only connection.
     """
 
-    def __init__(self, config: BotConfig, on_fill: FillCallback) -> None:
+    def __init__(
+        self,
+        config: BotConfig,
+        on_fill: Optional[FillCallback],
+        on_order_update: Optional[OrderUpdateCallback] = None,
+        book_cache: Optional["OrderBookCache"] = None,
+        on_ticker: Optional[TickerCallback] = None,
+    ) -> None:
         self.cfg = config
         self._on_fill = on_fill
+        self._on_order_update = on_order_update
+        self._on_ticker = on_ticker
+        self.book_cache = book_cache
+        self._book_tickers: set[str] = set()   # tickers with an order-book subscription
+        self._cmd_id = 1
+        self._send_lock = threading.Lock()
         self._ws = None
         self._thread: Optional[threading.Thread] = None
         self._running = False
@@ -145,14 +177,19 @@ class KalshiWebSocket:
     def _on_open(self, ws) -> None:
         self._connected.set()
         logger.info("WebSocket connected to %s", self._ws_url())
-        # Subscribe to fill events for all of our orders
-        sub = json.dumps({
-            "id": 1,
-            "cmd": "subscribe",
-            "params": {"channels": ["fill"]},
-        })
-        ws.send(sub)
-        logger.debug("Subscribed to fill channel.")
+        # Subscribe to fill (and optionally order-update / ticker) events
+        channels = []
+        if self._on_fill is not None:
+            channels.append("fill")
+        if self._on_order_update is not None:
+            channels.append("user_orders")
+        if self._on_ticker is not None:
+            channels.append("ticker")
+        if channels:
+            self._send(ws, "subscribe", {"channels": channels})
+            logger.debug("Subscribed to channels: %s", channels)
+        if self.book_cache is not None and self._book_tickers:
+            self._subscribe_books(ws, sorted(self._book_tickers))
 
     def _on_message(self, ws, raw: str) -> None:
         try:
@@ -163,8 +200,14 @@ class KalshiWebSocket:
 
         msg_type = data.get("type", "")
 
-        if msg_type == "fill":
+        if msg_type == "ticker":
+            self._handle_ticker(data.get("msg", {}))
+        elif msg_type == "fill":
             self._handle_fill(data.get("msg", {}))
+        elif msg_type == "user_order":
+            self._handle_order_update(data.get("msg", {}))
+        elif msg_type in ("orderbook_snapshot", "orderbook_delta"):
+            self._handle_book(ws, data)
         elif msg_type == "subscribed":
             logger.info("WS subscription confirmed: channels=%s", data.get("msg"))
         elif msg_type == "error":
@@ -177,6 +220,8 @@ class KalshiWebSocket:
 
     def _on_close(self, ws, code, reason) -> None:
         self._connected.clear()
+        if self.book_cache is not None:
+            self.book_cache.clear()   # deltas missed while down – rebuild from snapshots
         logger.info("WebSocket closed (code=%s reason=%s).", code, reason)
 
     # ------------------------------------------------------------------
@@ -197,6 +242,8 @@ class KalshiWebSocket:
           action         : "buy" | "sell"
           is_taker       : bool
         """
+        if self._on_fill is None:
+            return
         ticker   = msg.get("market_ticker", "")
         order_id = msg.get("order_id", "")
         side     = msg.get("side", "")
@@ -215,6 +262,101 @@ class KalshiWebSocket:
         except Exception as exc:
             logger.error("on_fill callback error: %s", exc, exc_info=True)
 
+    def _handle_order_update(self, msg: dict) -> None:
+        """Parse a user_order event and invoke the on_order_update callback."""
+        if self._on_order_update is None:
+            return
+        ticker   = msg.get("ticker") or msg.get("market_ticker", "")
+        order_id = msg.get("order_id", "")
+        status   = msg.get("status", "")
+        if not ticker or not order_id or not status:
+            logger.debug("Incomplete order event: %s", msg)
+            return
+
+        logger.debug("WS order: %s | order=%s status=%s", ticker, order_id, status)
+        try:
+            self._on_order_update(ticker, order_id, status)
+        except Exception as exc:
+            logger.error("on_order_update callback error: %s", exc, exc_info=True)
+
+    def _handle_ticker(self, msg: dict) -> None:
+        """Pass a ticker-channel update to the on_ticker callback."""
+        if self._on_ticker is None:
+            return
+        if not msg.get("market_ticker"):
+            logger.debug("Incomplete ticker event: %s", msg)
+            return
+        try:
+            self._on_ticker(msg)
+        except Exception as exc:
+            logger.error("on_ticker callback error: %s", exc, exc_info=True)
+
+    # ------------------------------------------------------------------
+    # Order books
+    # ------------------------------------------------------------------
+
+    def track_tickers(self, tickers) -> None:
+        """
+        Maintain order books for exactly these tickers.  Newly added ones are
+        subscribed immediately when connected (otherwise on open); dropped
+        ones are removed from their subscriptions and from the cache.
+        """
+        if self.book_cache is None:
+            return
+        wanted = set(tickers)
+        added = sorted(wanted - self._book_tickers)
+        removed = sorted(self._book_tickers - wanted)
+        if not added and not removed:
+            return
+        self._book_tickers = wanted
+        dropped = self.book_cache.drop_tickers(removed)
+        if self._ws is None or not self.connected:
+            return
+        for sid, sid_tickers in sorted(dropped.items()):
+            self._send(self._ws, "update_subscription", {
+                "sids": [sid], "market_tickers": sid_tickers, "action": "delete_markets",
+            })
+        if removed:
+            logger.debug("Stopped tracking order books: %s", removed)
+        if added:
+            self._subscribe_books(self._ws, added)
+
+    def _subscribe_books(self, ws, tickers: list[str]) -> None:
+        self._send(ws, "subscribe", {"channels": ["orderbook_delta"], "market_tickers": tickers})
+        logger.debug("Subscribed to order books: %s", tickers)
+
+    def _handle_book(self, ws, data: dict) -> None:
+        if self.book_cache is None:
+            return
+        msg = data.get("msg", {})
+        ticker = msg.get("market_ticker", "")
+        sid = data.get("sid")
+        seq = data.get("seq")
+        if not ticker or sid is None or seq is None:
+            logger.debug("Incomplete order-book message: %s", data)
+            return
+        if ticker not in self._book_tickers:
+            return   # no longer tracked (its removal may not have reached the server yet)
+
+        if data.get("type") == "orderbook_snapshot":
+            self.book_cache.apply_snapshot(ticker, sid, seq, msg.get("yes", []), msg.get("no", []))
+            return
+
+        stale = self.book_cache.apply_delta(
+            ticker, sid, seq, msg.get("side", ""), msg.get("price", 0), msg.get("delta", 0),
+        )
+        if stale:
+            # Fresh snapshots arrive with the new subscription
+            self._send(ws, "unsubscribe", {"sids": [sid]})
+            stale = [t for t in stale if t in self._book_tickers]
+            if stale:
+                self._subscribe_books(ws, stale)
+
+    def _send(self, ws, cmd: str, params: dict) -> None:
+        with self._send_lock:
+            self._cmd_id += 1
+            ws.send(json.dumps({"id": self._cmd_id, "cmd": cmd, "params": params}))
+
     # ------------------------------------------------------------------
     # Auth
     # ------------------------------------------------------------------
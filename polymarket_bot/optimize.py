@@ -3,12 +3,16 @@ Parameter optimiser for the LP/hedge strategy.
 
 Runs a grid search over key hyperparameters using cached market data,
 ranks configurations by risk-adjusted return, and prints a full report.
+With --bayes, a TPE surrogate model instead searches continuous ranges
+(SEARCH_SPACE), proposing small batches of configs to backtest in parallel.
 
 Usage
 -----
 python -m polymarket_bot.optimize          # use cached data (fast)
 python -m polymarket_bot.optimize --fetch  # re-fetch fresh market data
 python -m polymarket_bot.optimize --markets 20 --fetch
+python -m polymarket_bot.optimize --halving --eta 3   # prune dominated configs early
+python -m polymarket_bot.optimize --bayes --trials 48 --batch 4 --workers 4
 """
 
 from __future__ import annotations
@@ -16,8 +20,10 @@ from __future__ import annotations
 import argparse
 import json
 import logging
+import math
 import sys
 import os
+from concurrent.futures import ProcessPoolExecutor
 from dataclasses import dataclass
 from itertools import product
 from typing import Optional
@@ -26,6 +32,7 @@ sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
 from polymarket_bot.backtest import BacktestConfig, BacktestEngine, PortfolioResult, run_backtest
 from polymarket_bot.data_fetcher import discover_backtest_markets, MarketHistory
+from polymarket_bot.tpe import Param, TPESampler
 
 
 # ---------------------------------------------------------------------------
@@ -44,6 +51,15 @@ PARAM_GRID = {
     "num_ladder_levels": [1, 2, 3],
 }
 
+# Continuous ranges for the model-based search (run_bayes_opt); they
+# bracket PARAM_GRID, rounded to steps no coarser than the grid's
+SEARCH_SPACE = {
+    "order_depth_fraction": Param(0.30, 0.95, step=0.01),
+    "requote_interval_min": Param(5, 60, step=1, log=True),
+    "max_fill_cost":        Param(0.98, 1.04, step=0.005),
+    "num_ladder_levels":    Param(1, 3, step=1),
+}
+
 # Fixed params throughout sweep
 FIXED = dict(
     default_v=0.05,
@@ -97,6 +113,41 @@ class SweepPoint:
 # Core sweep
 # ---------------------------------------------------------------------------
 
+def _sweep_point(params: dict, portfolio: PortfolioResult) -> SweepPoint:
+    """Aggregate one config's portfolio result into a SweepPoint."""
+    n_markets = len(portfolio.market_results)
+    total_h = sum(r.span_hours for r in portfolio.market_results)
+    total_periods = sum(r.num_periods for r in portfolio.market_results)
+    total_fills = sum(
+        r.yes_fills + r.no_fills for r in portfolio.market_results
+    )
+    s1 = sum(r.periods_neither_filled for r in portfolio.market_results)
+    s2 = sum(r.periods_one_filled     for r in portfolio.market_results)
+    s3 = sum(r.periods_both_filled    for r in portfolio.market_results)
+
+    fill_rate   = total_fills / max(total_periods, 1)
+    ann_yield   = portfolio.net_pnl / n_markets * (8760 / max(total_h / n_markets, 1))
+    # Sharpe proxy: annualised yield per unit fill exposure
+    sharpe = ann_yield / max(fill_rate * 100, 0.01)
+
+    return SweepPoint(
+        order_depth_fraction=params["order_depth_fraction"],
+        requote_interval_min=params["requote_interval_min"],
+        max_fill_cost=params["max_fill_cost"],
+        num_ladder_levels=params.get("num_ladder_levels", 1),
+        net_pnl=portfolio.net_pnl,
+        reward_income=portfolio.total_reward_income,
+        fill_pnl=portfolio.total_fill_pnl,
+        total_fills=total_fills,
+        fill_rate=fill_rate,
+        ann_yield_pct=ann_yield,
+        sharpe_proxy=sharpe,
+        scenario_1_pct=s1 / max(total_periods, 1),
+        scenario_2_pct=s2 / max(total_periods, 1),
+        scenario_3_pct=s3 / max(total_periods, 1),
+    )
+
+
 def run_sweep(
     markets: list[MarketHistory],
     param_grid: dict = None,
@@ -117,38 +168,7 @@ def run_sweep(
         params = dict(zip(keys, combo))
         cfg = BacktestConfig(**{**FIXED, **params})
         portfolio = run_backtest(markets, cfg)
-
-        # Aggregate stats
-        total_h = sum(r.span_hours for r in portfolio.market_results)
-        total_periods = sum(r.num_periods for r in portfolio.market_results)
-        total_fills = sum(
-            r.yes_fills + r.no_fills for r in portfolio.market_results
-        )
-        s1 = sum(r.periods_neither_filled for r in portfolio.market_results)
-        s2 = sum(r.periods_one_filled     for r in portfolio.market_results)
-        s3 = sum(r.periods_both_filled    for r in portfolio.market_results)
-
-        fill_rate   = total_fills / max(total_periods, 1)
-        ann_yield   = portfolio.net_pnl / len(markets) * (8760 / max(total_h / len(markets), 1))
-        # Sharpe proxy: annualised yield per unit fill exposure
-        sharpe = ann_yield / max(fill_rate * 100, 0.01)
-
-        pt = SweepPoint(
-            order_depth_fraction=params["order_depth_fraction"],
-            requote_interval_min=params["requote_interval_min"],
-            max_fill_cost=params["max_fill_cost"],
-            num_ladder_levels=params.get("num_ladder_levels", 1),
-            net_pnl=portfolio.net_pnl,
-            reward_income=portfolio.total_reward_income,
-            fill_pnl=portfolio.total_fill_pnl,
-            total_fills=total_fills,
-            fill_rate=fill_rate,
-            ann_yield_pct=ann_yield,
-            sharpe_proxy=sharpe,
-            scenario_1_pct=s1 / max(total_periods, 1),
-            scenario_2_pct=s2 / max(total_periods, 1),
-            scenario_3_pct=s3 / max(total_periods, 1),
-        )
+        pt = _sweep_point(params, portfolio)
         results.append(pt)
 
         log.debug(
@@ -156,8 +176,131 @@ def run_sweep(
             params["order_depth_fraction"],
             params["requote_interval_min"],
             params["max_fill_cost"],
-            portfolio.net_pnl, total_fills, ann_yield,
+            portfolio.net_pnl, pt.total_fills, pt.ann_yield_pct,
+        )
+
+    return results
+
+
+def _halving_rungs(n_markets: int, eta: int) -> list[int]:
+    """Cumulative market counts per rung, e.g. 12 markets, eta=3 → [1, 2, 4, 12]."""
+    if eta < 2:
+        raise ValueError("eta must be at least 2")
+    rungs = [n_markets]
+    while rungs[-1] > 1:
+        rungs.append(math.ceil(rungs[-1] / eta))
+    return sorted(set(rungs))
+
+
+def run_halving_sweep(
+    markets: list[MarketHistory],
+    param_grid: dict = None,
+    eta: int = 3,
+    metric: str = "ann_yield_pct",
+) -> list[SweepPoint]:
+    """
+    Successive-halving grid search over growing prefixes of `markets`.
+
+    Every config is backtested on the first rung's markets; only the top
+    1/eta by `metric` (a SweepPoint field) are backtested on the markets the
+    next rung adds, until the survivors have seen every market.  Per-market
+    results are kept between rungs, so no market is run twice for a config.
+    Returns the SweepPoints of the final survivors (all markets), ready for
+    print_report.
+    """
+    if eta < 2:
+        raise ValueError("eta must be at least 2")
+    grid = param_grid or PARAM_GRID
+    keys = list(grid.keys())
+    combos = [dict(zip(keys, combo)) for combo in product(*grid.values())]
+    configs = [BacktestConfig(**{**FIXED, **params}) for params in combos]
+    rungs = _halving_rungs(len(markets), eta)
+
+    log = logging.getLogger(__name__)
+    market_results: dict[int, list] = {idx: [] for idx in range(len(combos))}
+    alive = list(range(len(combos)))
+    done = 0
+    points: dict[int, SweepPoint] = {}
+    for rung, n_markets in enumerate(rungs, 1):
+        for idx in alive:
+            engine = BacktestEngine(configs[idx])
+            market_results[idx].extend(engine.run(mh) for mh in markets[done:n_markets])
+            points[idx] = _sweep_point(
+                combos[idx], PortfolioResult(market_results[idx], configs[idx]),
+            )
+        done = n_markets
+        alive.sort(key=lambda idx: -getattr(points[idx], metric))
+        log.info(
+            "Rung %d/%d: %d combinations × %d markets, best %s=%.4f",
+            rung, len(rungs), len(alive), n_markets, metric, getattr(points[alive[0]], metric),
         )
+        if n_markets < len(markets):
+            alive = alive[:max(1, math.ceil(len(alive) / eta))]
+
+    return [points[idx] for idx in sorted(alive)]
+
+
+# Markets for _evaluate_params in pool workers (set once per worker process)
+_WORKER_MARKETS: list[MarketHistory] = []
+
+
+def _init_worker(markets: list[MarketHistory]) -> None:
+    global _WORKER_MARKETS
+    _WORKER_MARKETS = markets
+
+
+def _evaluate_params(params: dict) -> SweepPoint:
+    cfg = BacktestConfig(**{**FIXED, **params})
+    return _sweep_point(params, run_backtest(_WORKER_MARKETS, cfg))
+
+
+def run_bayes_opt(
+    markets: list[MarketHistory],
+    space: dict[str, Param] = None,
+    n_trials: int = 48,
+    batch_size: int = 4,
+    n_startup: int = 12,
+    metric: str = "ann_yield_pct",
+    workers: int = 1,
+    seed: Optional[int] = 0,
+) -> list[SweepPoint]:
+    """
+    Sequential model-based search over continuous parameter ranges.
+
+    A TPE surrogate (polymarket_bot.tpe) proposes `batch_size` configs at a
+    time from `space` (default SEARCH_SPACE); each batch is backtested on
+    all `markets` — in parallel over `workers` processes — and its `metric`
+    (a SweepPoint field, maximised) is fed back before the next proposal.
+    The first `n_startup` configs are drawn at random.  Returns the
+    SweepPoint of every evaluated config, in evaluation order, ready for
+    print_report.
+    """
+    if n_trials < 1 or batch_size < 1:
+        raise ValueError("n_trials and batch_size must be at least 1")
+    space = space or SEARCH_SPACE
+    sampler = TPESampler(space, seed=seed, n_startup=n_startup)
+    log = logging.getLogger(__name__)
+    results: list[SweepPoint] = []
+
+    pool = (
+        ProcessPoolExecutor(max_workers=workers, initializer=_init_worker, initargs=(markets,))
+        if workers > 1 else None
+    )
+    if pool is None:
+        _init_worker(markets)
+    try:
+        while len(results) < n_trials:
+            batch = sampler.ask(min(batch_size, n_trials - len(results)))
+            points = list(pool.map(_evaluate_params, batch) if pool else map(_evaluate_params, batch))
+            for params, pt in zip(batch, points):
+                sampler.tell(params, getattr(pt, metric))
+            results.extend(points)
+            best_params, best_score = sampler.best
+            log.info("Trials %d/%d: best %s=%.4f at %s",
+                     len(results), n_trials, metric, best_score, best_params)
+    finally:
+        if pool:
+            pool.shutdown()
 
     return results
 
@@ -193,7 +336,9 @@ def sensitivity_table(results: list[SweepPoint], param: str) -> str:
 # Report
 # ---------------------------------------------------------------------------
 
-def print_report(results: list[SweepPoint], top_n: int = 10) -> None:
+def print_report(
+    results: list[SweepPoint], top_n: int = 10, sensitivity: bool = True,
+) -> None:
     print("\n" + "=" * 80)
     print("PARAMETER OPTIMISATION REPORT")
     print("=" * 80)
@@ -218,9 +363,11 @@ def print_report(results: list[SweepPoint], top_n: int = 10) -> None:
     for pt in by_sharpe[:top_n]:
         print(pt.row())
 
-    # Sensitivity tables
-    for param in PARAM_GRID.keys():
-        print(sensitivity_table(results, param))
+    # Sensitivity tables (grid sweeps only: continuous searches rarely
+    # repeat a value, so every group would hold a single config)
+    if sensitivity:
+        for param in PARAM_GRID.keys():
+            print(sensitivity_table(results, param))
 
     # Optimal recommendation
     best = by_ann[0]
@@ -249,6 +396,20 @@ def print_report(results: list[SweepPoint], top_n: int = 10) -> None:
 # CLI
 # ---------------------------------------------------------------------------
 
+def _positive_int(value: str) -> int:
+    ival = int(value)
+    if ival <= 0:
+        raise argparse.ArgumentTypeError(f"{value} must be positive")
+    return ival
+
+
+def _halving_eta(value: str) -> int:
+    ival = int(value)
+    if ival < 2:
+        raise argparse.ArgumentTypeError(f"{value} must be at least 2")
+    return ival
+
+
 def main() -> None:
     p = argparse.ArgumentParser(
         prog="optimize",
@@ -260,6 +421,21 @@ def main() -> None:
     p.add_argument("--fetch", action="store_true",
                    help="Bypass cache and fetch fresh market data")
     p.add_argument("--min-near50", type=float, default=0.03)
+    p.add_argument("--halving", action="store_true",
+                   help="Prune configs by successive halving over growing market subsets")
+    p.add_argument("--eta", type=_halving_eta, default=3,
+                   help="Successive-halving keep ratio: top 1/eta survive each rung")
+    p.add_argument("--bayes", action="store_true",
+                   help="Model-based (TPE) search over SEARCH_SPACE instead of the grid")
+    p.add_argument("--trials", type=_positive_int, default=48,
+                   help="Backtest evaluations for --bayes")
+    p.add_argument("--batch", type=_positive_int, default=4,
+                   help="Configs proposed (and evaluated in parallel) per --bayes step")
+    p.add_argument("--workers", type=int, default=1,
+                   help="Worker processes for --bayes (0 = one per CPU core)")
+    p.add_argument("--metric", default="ann_yield_pct",
+                   choices=["ann_yield_pct", "sharpe_proxy", "net_pnl"],
+                   help="SweepPoint field --bayes maximises")
     p.add_argument("--top", type=int, default=10,
                    help="Number of top configs to show")
     p.add_argument("--json-out", default=None,
@@ -286,15 +462,29 @@ def main() -> None:
         print("No markets found. Try --fetch.", file=sys.stderr)
         sys.exit(1)
 
-    total_combos = 1
-    for v in PARAM_GRID.values():
-        total_combos *= len(v)
-    grid_dims = " × ".join(str(len(v)) for v in PARAM_GRID.values())
-    print(f"Running {grid_dims} = {total_combos} combinations on {len(markets)} markets…",
-          flush=True)
-
-    results = run_sweep(markets)
-    print_report(results, top_n=args.top)
+    if args.bayes:
+        print(f"TPE search: {args.trials} trials in batches of {args.batch}, "
+              f"maximising {args.metric} on {len(markets)} markets…", flush=True)
+        results = run_bayes_opt(
+            markets, n_trials=args.trials, batch_size=args.batch, metric=args.metric,
+            workers=args.workers or os.cpu_count() or 1,
+        )
+        print_report(results, top_n=args.top, sensitivity=False)
+    else:
+        total_combos = 1
+        for v in PARAM_GRID.values():
+            total_combos *= len(v)
+        grid_dims = " × ".join(str(len(v)) for v in PARAM_GRID.values())
+        print(f"Running {grid_dims} = {total_combos} combinations on {len(markets)} markets…",
+              flush=True)
+        if args.halving:
+            rungs = "/".join(map(str, _halving_rungs(len(markets), args.eta)))
+            print(f"Successive halving (eta={args.eta}) over rungs of {rungs} markets…",
+                  flush=True)
+            results = run_halving_sweep(markets, eta=args.eta)
+        else:
+            results = run_sweep(markets)
+        print_report(results, top_n=args.top)
 
     if args.json_out:
         import dataclasses
@@ -0,0 +1,203 @@
+"""
+Tree-structured Parzen estimator (TPE) for sequential parameter search.
+
+Bergstra et al. (2011), "Algorithms for Hyper-Parameter Optimization":
+
+    Split the observed configs at the γ-quantile of their score into a good
+    set and a bad set, and model each with a Parzen (kernel) density:
+
+        l(x) = p(x | score in top γ)        g(x) = p(x | rest)
+
+    Expected improvement is monotone in l(x) / g(x), so each proposal is the
+    best of n_candidates draws from l by that ratio.
+
+Each parameter is searched independently (the "tree" has no conditional
+branches here) in a unit interval, optionally log-scaled, with adaptive
+truncated-Gaussian kernels plus a uniform prior component so no region
+gets zero density.  Proposals are decoded back to the parameter's range
+and rounded to its `step`.
+
+Batches: ask(n) proposes n distinct configs before any of them is scored
+("constant liar" — each proposal joins the bad set as a pending
+observation), so a batch can be evaluated in parallel and reported back
+with tell().
+
+Pure Python (random + statistics.NormalDist); no numpy required.
+"""
+
+from __future__ import annotations
+
+import math
+import random
+from dataclasses import dataclass
+from statistics import NormalDist
+from typing import Optional
+
+_STD_NORMAL = NormalDist()
+
+
+# ---------------------------------------------------------------------------
+# Search space
+# ---------------------------------------------------------------------------
+
+@dataclass(frozen=True)
+class Param:
+    """One searched parameter: [low, high], rounded to multiples of step."""
+    low: float
+    high: float
+    step: Optional[float] = None   # 1 → integer parameter; None → continuous
+    log: bool = False              # search log(x) uniformly (low must be > 0)
+
+    def __post_init__(self) -> None:
+        if not self.high > self.low:
+            raise ValueError("high must be greater than low")
+        if self.log and self.low <= 0:
+            raise ValueError("log-scaled params need low > 0")
+
+    def _lo_hi(self) -> tuple[float, float]:
+        if self.log:
+            return math.log(self.low), math.log(self.high)
+        return self.low, self.high
+
+    def encode(self, value: float) -> float:
+        """Map a parameter value to [0, 1]."""
+        lo, hi = self._lo_hi()
+        x = math.log(value) if self.log else value
+        return min(1.0, max(0.0, (x - lo) / (hi - lo)))
+
+    def decode(self, u: float):
+        """Map [0, 1] back to a (rounded) parameter value."""
+        lo, hi = self._lo_hi()
+        x = lo + min(1.0, max(0.0, u)) * (hi - lo)
+        value = math.exp(x) if self.log else x
+        if self.step is None:
+            return value
+        steps = round((value - self.low) / self.step)
+        value = min(self.high, max(self.low, self.low + steps * self.step))
+        if self.step == int(self.step) and self.low == int(self.low):
+            return int(round(value))
+        return round(value, 10)
+
+
+# ---------------------------------------------------------------------------
+# Parzen density on [0, 1]
+# ---------------------------------------------------------------------------
+
+class _Parzen:
+    """
+    Adaptive Parzen estimator on [0, 1] (as in hyperopt): one truncated
+    Gaussian per point, its width the larger gap to a neighbouring point
+    (the prior mean 0.5 counts as a neighbour), clipped to
+    [1 / min(100, n + 1), 1]; mixed with a uniform prior of weight 1/(n+1).
+    """
+
+    def __init__(self, points: list[float]) -> None:
+        n = len(points)
+        self.prior = 1.0 / (n + 1)
+        order = sorted(points + [0.5])
+        min_bw = 1.0 / min(100, n + 1)
+        self.kernels: list[tuple[float, float, float]] = []   # (centre, width, mass)
+        for p in points:
+            i = order.index(p)
+            gaps = [order[j + 1] - order[j] for j in (i - 1, i) if 0 <= j < len(order) - 1]
+            bw = min(1.0, max(min_bw, max(gaps, default=1.0)))
+            mass = _STD_NORMAL.cdf((1 - p) / bw) - _STD_NORMAL.cdf(-p / bw)
+            self.kernels.append((p, bw, mass))
+
+    def pdf(self, x: float) -> float:
+        if not self.kernels:
+            return 1.0
+        kernel = sum(
+            _STD_NORMAL.pdf((x - p) / bw) / (bw * mass) for p, bw, mass in self.kernels
+        ) / len(self.kernels)
+        return self.prior + (1 - self.prior) * kernel
+
+    def sample(self, rng: random.Random) -> float:
+        if not self.kernels or rng.random() < self.prior:
+            return rng.random()
+        centre, bw, _ = rng.choice(self.kernels)
+        for _ in range(20):
+            x = rng.gauss(centre, bw)
+            if 0.0 <= x <= 1.0:
+                return x
+        return centre
+
+
+# ---------------------------------------------------------------------------
+# Sampler
+# ---------------------------------------------------------------------------
+
+class TPESampler:
+    """
+    Ask/tell TPE optimiser (maximises the told score).
+
+    Usage:
+        sampler = TPESampler({"x": Param(0, 1), "n": Param(1, 5, step=1)}, seed=0)
+        for _ in range(10):
+            batch = sampler.ask(4)
+            for params in batch:
+                sampler.tell(params, objective(params))
+        sampler.best   # (params, score)
+    """
+
+    def __init__(
+        self,
+        space: dict[str, Param],
+        seed: Optional[int] = None,
+        n_startup: int = 10,
+        gamma: float = 0.15,
+        n_candidates: int = 24,
+    ) -> None:
+        if not 0 < gamma < 1:
+            raise ValueError("gamma must be between 0 and 1")
+        self.space = space
+        self.n_startup = n_startup
+        self.gamma = gamma
+        self.n_candidates = n_candidates
+        self.trials: list[tuple[dict, float]] = []
+        self._rng = random.Random(seed)
+
+    @property
+    def best(self) -> Optional[tuple[dict, float]]:
+        return max(self.trials, key=lambda t: t[1], default=None)
+
+    def tell(self, params: dict, score: float) -> None:
+        self.trials.append((dict(params), float(score)))
+
+    def _key(self, params: dict) -> tuple:
+        return tuple(params[name] for name in self.space)
+
+    def _random(self) -> dict:
+        return {name: p.decode(self._rng.random()) for name, p in self.space.items()}
+
+    def ask(self, n: int = 1) -> list[dict]:
+        """Propose `n` distinct configs not yet told."""
+        seen = {self._key(params) for params, _ in self.trials}
+        pending: list[dict] = []
+        for _ in range(n):
+            for _attempt in range(10):
+                if len(self.trials) + len(pending) < self.n_startup:
+                    params = self._random()
+                else:
+                    params = self._propose(pending)
+                if self._key(params) not in seen:
+                    break
+            seen.add(self._key(params))
+            pending.append(params)
+        return pending
+
+    def _propose(self, pending: list[dict]) -> dict:
+        ranked = sorted(self.trials, key=lambda t: -t[1])
+        n_good = max(1, math.ceil(self.gamma * len(ranked)))
+        good = [params for params, _ in ranked[:n_good]]
+        # Pending proposals count as bad (constant liar) to spread the batch
+        bad = [params for params, _ in ranked[n_good:]] + pending
+
+        params: dict = {}
+        for name, p in self.space.items():
+            l = _Parzen([p.encode(x[name]) for x in good])
+            g = _Parzen([p.encode(x[name]) for x in bad])
+            candidates = [l.sample(self._rng) for _ in range(self.n_candidates)]
+            u = max(candidates, key=lambda c: math.log(l.pdf(c)) - math.log(g.pdf(c)))
+            params[name] = p.decode(u)
+        return params
@@ -7,7 +7,9 @@ Runs the bot's strategy against synthetic historical data across 8 market
 scenarios and produces a detailed report of risk/return metrics.
 
 Usage:
-    python stress_test.py [--budget 1000] [--seed 42] [--verbose]
+    python stress_test.py [--budget 1000] [--seed 42] [--verbose] [--engine vector|loop]
+                          [--sweep [--halving [--eta 3]] | --seeds N] [--workers N]
+                          [--path-cache DIR | --batch-paths] [--fill-model PATH]
 
 No Kalshi credentials required (all data is synthetic).
 """
@@ -15,15 +17,27 @@ No Kalshi credentials required (all data is synthetic).
 from __future__ import annotations
 
 import argparse
+import itertools
 import logging
+import math
+import os
 import sys
 import time
+from concurrent.futures import ProcessPoolExecutor
+from functools import partial
 from textwrap import indent
 
 # ── Local imports ────────────────────────────────────────────────────────────
 from kalshi_bot.config import BotConfig, MarketFilter, RiskParams, ScoringParams
 from kalshi_bot.backtester import Backtester, ScenarioResult
+from kalshi_bot.fill_model import FillModel
+from kalshi_bot.monte_carlo import TOTAL, run_monte_carlo
+from kalshi_bot.path_cache import process_cache
 from kalshi_bot.synthetic_data import SCENARIOS
+from kalshi_bot.vector_backtester import VectorizedBacktester
+
+# Backtest engines selectable with --engine (identical results; "vector" is faster)
+ENGINES = {"loop": Backtester, "vector": VectorizedBacktester}
 
 
 # ── Report helpers ───────────────────────────────────────────────────────────
@@ -271,13 +285,14 @@ def _run_all(
     seed: int,
     label: str,
     verbose: bool = False,
+    engine: type[Backtester] = Backtester,
 ) -> tuple[list[ScenarioResult], float]:
     """Run all scenarios and return (results, elapsed)."""
     t0 = time.perf_counter()
     results: list[ScenarioResult] = []
     for i, scenario in enumerate(scenarios):
         print(f"  [{label}] {scenario.name:<25} … ", end="", flush=True)
-        bt = Backtester(config)
+        bt = engine(config)
         result = bt.run_scenario(scenario, seed=seed)
         results.append(result)
         pnl_s = f"{'+' if result.net_pnl >= 0 else ''}{result.net_pnl:.2f}"
@@ -285,56 +300,232 @@ def _run_all(
     return results, time.perf_counter() - t0
 
 
-def run_sweep(scenarios: list, budget: float, seed: int) -> tuple[dict, list[ScenarioResult]]:
+# Parameter grid for run_sweep (keys match the best_params dict).
+SWEEP_GRID: dict[str, list] = {
+    # Shallower depth → orders closer to mid → more fills in volatile markets
+    "depth": [0.15, 0.20, 0.30, 0.40],
+    "kelly": [0.20, 0.25, 0.30, 0.35],
+    "mf":    [0.10, 0.15, 0.20],
+    # Longer age → price has more time to reach our limit; shorter → faster cycling
+    "age":   [14_400, 43_200, 86_400],   # 4h, 12h, 24h in seconds
+    # Tighter stop → cut losses sooner; looser → let hedges ride longer
+    "stop":  [0.06, 0.10, 0.15, 1.0],    # 1.0 = disabled
+}
+
+
+def _sweep_score(results: list[ScenarioResult]) -> float:
+    """Risk-adjusted aggregate P&L: losses penalised 2×."""
+    total = 0.0
+    for r in results:
+        total += r.net_pnl if r.net_pnl >= 0 else r.net_pnl * 2
+    return total
+
+
+def _run_sweep_chunk(
+    chunk: list[tuple[int, dict]],
+    scenarios: list,
+    budget: float,
+    seed: int,
+    engine: type[Backtester],
+    cache_dir: str | None = None,
+) -> tuple[list[float], int, list[ScenarioResult]]:
     """
-    Grid-search over (depth_fraction, kelly, max_market_fraction, max_order_age).
+    Evaluate one work unit of the sweep (runs in a worker process).
+
+    Every combo is simulated with the same explicit `seed`, so results do
+    not depend on which worker runs the chunk.  Returns the score of each
+    combo in chunk order, plus the index and scenario results of the chunk's
+    best combo (first one wins ties, as in a serial scan).
+    """
+    paths = process_cache(cache_dir)
+    scores: list[float] = []
+    best_idx, best_score, best_results = -1, float("-inf"), []
+    for idx, params in chunk:
+        cfg = _make_config(
+            budget, params["depth"], params["kelly"], params["mf"],
+            params["age"], params["stop"],
+        )
+        run_results = [
+            engine(cfg, path_cache=paths).run_scenario(scenario, seed=seed)
+            for scenario in scenarios
+        ]
+        sc = _sweep_score(run_results)
+        scores.append(sc)
+        if sc > best_score:
+            best_idx, best_score, best_results = idx, sc, run_results
+    return scores, best_idx, best_results
+
+
+def run_sweep(
+    scenarios: list,
+    budget: float,
+    seed: int,
+    engine: type[Backtester] = Backtester,
+    workers: int = 1,
+    chunk_size: int | None = None,
+    grid: dict[str, list] | None = None,
+    cache_dir: str | None = None,
+) -> tuple[dict, list[ScenarioResult]]:
+    """
+    Grid-search over (depth_fraction, kelly, max_market_fraction, max_order_age,
+    hedge_stop_gap).
 
     Scoring metric: aggregate P&L weighted so that losses count 2× (risk-adjusted).
     This penalises parameter sets that profit on easy scenarios but blow up on shocks.
-    """
-    import itertools
 
-    # Shallower depth → orders closer to mid → more fills in volatile markets
-    depths = [0.15, 0.20, 0.30, 0.40]
-    kellys = [0.20, 0.25, 0.30, 0.35]
-    fracs  = [0.10, 0.15, 0.20]
-    # Longer age → price has more time to reach our limit; shorter → faster cycling
-    ages   = [14_400, 43_200, 86_400]   # 4h, 12h, 24h in seconds
-    # Tighter stop → cut losses sooner; looser → let hedges ride longer
-    stops  = [0.06, 0.10, 0.15, 1.0]   # 1.0 = disabled
+    With workers > 1 the grid is split into chunks of `chunk_size` combos
+    (default: ~4 chunks per worker) and fanned out over a process pool.
+    Chunks are collected in grid order, so the best params are identical to
+    a serial run.
 
-    def score(results: list[ScenarioResult]) -> float:
-        """Risk-adjusted aggregate P&L: losses penalised 2×."""
-        total = 0.0
-        for r in results:
-            total += r.net_pnl if r.net_pnl >= 0 else r.net_pnl * 2
-        return total
+    Scenario paths are generated once per process and shared read-only by
+    every combo; `cache_dir` also persists them across processes and runs.
+    """
+    grid = grid or SWEEP_GRID
+    keys = list(grid)
+    combos = [
+        (idx, dict(zip(keys, values)))
+        for idx, values in enumerate(itertools.product(*grid.values()))
+    ]
+    n_combos = len(combos)
+    workers = max(1, workers)
+    if chunk_size is None:
+        chunk_size = max(1, math.ceil(n_combos / (workers * 4)))
+    chunks = [combos[i:i + chunk_size] for i in range(0, n_combos, chunk_size)]
+    run_chunk = partial(
+        _run_sweep_chunk, scenarios=scenarios, budget=budget, seed=seed, engine=engine,
+        cache_dir=cache_dir,
+    )
 
     best_score = float("-inf")
     best_params: dict = {}
     best_results: list[ScenarioResult] = []
-    n_combos = len(depths) * len(kellys) * len(fracs) * len(ages) * len(stops)
 
-    print(f"\n  Sweeping {n_combos} parameter combinations (risk-adjusted scoring) …")
-    done = 0
-    for depth, kelly, mf, age, stop in itertools.product(depths, kellys, fracs, ages, stops):
-        cfg = _make_config(budget, depth, kelly, mf, age, stop)
-        run_results = []
-        for scenario in scenarios:
-            bt = Backtester(cfg)
-            run_results.append(bt.run_scenario(scenario, seed=seed))
-        sc = score(run_results)
-        done += 1
-        if sc > best_score:
-            best_score = sc
-            best_params = {"depth": depth, "kelly": kelly, "mf": mf, "age": age, "stop": stop}
-            best_results = run_results
-        if done % 48 == 0:
-            print(f"    {done}/{n_combos} … best score {best_score:+.2f}", flush=True)
+    print(
+        f"\n  Sweeping {n_combos} parameter combinations (risk-adjusted scoring, "
+        f"{workers} worker{'s' if workers > 1 else ''}) …"
+    )
+    pool = ProcessPoolExecutor(max_workers=workers) if workers > 1 else None
+    try:
+        outcomes = pool.map(run_chunk, chunks) if pool else map(run_chunk, chunks)
+        done = 0
+        for chunk, (scores, chunk_best_idx, chunk_best_results) in zip(chunks, outcomes):
+            if max(scores) > best_score:
+                best_score = max(scores)
+                best_params = dict(combos[chunk_best_idx][1])
+                best_results = chunk_best_results
+            prev, done = done, done + len(chunk)
+            if done // 48 > prev // 48:
+                print(f"    {done}/{n_combos} … best score {best_score:+.2f}", flush=True)
+    finally:
+        if pool:
+            pool.shutdown()
 
     return best_params, best_results
 
 
+def _halving_rungs(n_units: int, eta: int) -> list[int]:
+    """Cumulative scenario counts per rung, e.g. 8 scenarios, eta=3 → [1, 3, 8]."""
+    if eta < 2:
+        raise ValueError("eta must be at least 2")
+    rungs = [n_units]
+    while rungs[-1] > 1:
+        rungs.append(math.ceil(rungs[-1] / eta))
+    return sorted(set(rungs))
+
+
+def _run_halving_chunk(
+    chunk: list[tuple[dict, int]],
+    scenarios: list,
+    budget: float,
+    seed: int,
+    engine: type[Backtester],
+    cache_dir: str | None = None,
+) -> list[ScenarioResult]:
+    """Run one (params, scenario index) unit each (runs in a worker process)."""
+    paths = process_cache(cache_dir)
+    out: list[ScenarioResult] = []
+    for params, j in chunk:
+        cfg = _make_config(
+            budget, params["depth"], params["kelly"], params["mf"],
+            params["age"], params["stop"],
+        )
+        out.append(engine(cfg, path_cache=paths).run_scenario(scenarios[j], seed=seed))
+    return out
+
+
+def run_halving_sweep(
+    scenarios: list,
+    budget: float,
+    seed: int,
+    engine: type[Backtester] = Backtester,
+    workers: int = 1,
+    chunk_size: int | None = None,
+    grid: dict[str, list] | None = None,
+    eta: int = 3,
+    cache_dir: str | None = None,
+) -> tuple[dict, list[ScenarioResult]]:
+    """
+    Successive-halving version of run_sweep: same grid, score and return.
+
+    Every combo is first scored on a prefix of `scenarios`; only the top
+    1/eta (by _sweep_score so far, earlier combo first on ties) go on to the
+    next, longer prefix, until the survivors have run every scenario.  Each
+    rung only simulates the scenarios a combo has not run yet, so with 8
+    scenarios and eta=3 a combo that is pruned after the first rung costs
+    1/8 of a full evaluation.  The best params are the highest full-run score
+    among the final survivors — the grid optimum unless it was pruned early.
+    """
+    if eta < 2:
+        raise ValueError("eta must be at least 2")
+    grid = grid or SWEEP_GRID
+    keys = list(grid)
+    combos = [dict(zip(keys, values)) for values in itertools.product(*grid.values())]
+    rungs = _halving_rungs(len(scenarios), eta)
+    workers = max(1, workers)
+    run_chunk = partial(
+        _run_halving_chunk, scenarios=scenarios, budget=budget, seed=seed, engine=engine,
+        cache_dir=cache_dir,
+    )
+
+    results: dict[int, list[ScenarioResult]] = {idx: [] for idx in range(len(combos))}
+    alive = list(range(len(combos)))
+    done = 0
+    print(
+        f"\n  Successive halving over {len(combos)} parameter combinations "
+        f"(eta={eta}, rungs of {'/'.join(map(str, rungs))} scenarios, "
+        f"{workers} worker{'s' if workers > 1 else ''}) …"
+    )
+    pool = ProcessPoolExecutor(max_workers=workers) if workers > 1 else None
+    try:
+        for rung, n_scen in enumerate(rungs, 1):
+            units = [(idx, j) for idx in alive for j in range(done, n_scen)]
+            size = chunk_size or max(1, math.ceil(len(units) / (workers * 4)))
+            chunks = [units[i:i + size] for i in range(0, len(units), size)]
+            work = [[(combos[idx], j) for idx, j in chunk] for chunk in chunks]
+            outcomes = pool.map(run_chunk, work) if pool else map(run_chunk, work)
+            for chunk, chunk_results in zip(chunks, outcomes):
+                for (idx, _), result in zip(chunk, chunk_results):
+                    results[idx].append(result)
+            done = n_scen
+
+            scores = {idx: _sweep_score(results[idx]) for idx in alive}
+            alive.sort(key=lambda idx: (-scores[idx], idx))
+            print(
+                f"    rung {rung}/{len(rungs)}: {len(scores)} combos × {n_scen} scenarios "
+                f"… best score {scores[alive[0]]:+.2f}",
+                flush=True,
+            )
+            if n_scen < len(scenarios):
+                alive = alive[:max(1, math.ceil(len(alive) / eta))]
+    finally:
+        if pool:
+            pool.shutdown()
+
+    best = alive[0]
+    return dict(combos[best]), results[best]
+
+
 def format_comparison(
     baseline: list[ScenarioResult],
     optimized: list[ScenarioResult],
@@ -390,6 +581,13 @@ def format_comparison(
     return "\n".join(lines)
 
 
+def _halving_eta(value: str) -> int:
+    ival = int(value)
+    if ival < 2:
+        raise argparse.ArgumentTypeError(f"{value} must be at least 2")
+    return ival
+
+
 def main() -> None:
     parser = argparse.ArgumentParser(description="Kalshi bot stress test")
     parser.add_argument("--budget",   type=float, default=1000.0)
@@ -407,6 +605,21 @@ def main() -> None:
                         help="Replay real data from a collector SQLite database")
     parser.add_argument("--fee-rate", type=float, default=0.07,
                         help="Kalshi fee rate per fill (default 0.07 = 7%%)")
+    parser.add_argument("--engine",   choices=sorted(ENGINES), default="vector",
+                        help="Backtest engine: NumPy 'vector' (default) or reference 'loop'")
+    parser.add_argument("--halving",  action="store_true",
+                        help="With --sweep: prune combos by successive halving over scenarios")
+    parser.add_argument("--eta",      type=_halving_eta, default=3,
+                        help="Successive-halving keep ratio: top 1/eta survive each rung")
+    parser.add_argument("--workers",  type=int,   default=1,
+                        help="Worker processes for --sweep / --seeds (0 = one per CPU core)")
+    parser.add_argument("--path-cache", type=str, default=None, metavar="DIR",
+                        help="Persist scenario paths here and reuse them across runs")
+    parser.add_argument("--batch-paths", action="store_true",
+                        help="With --seeds: generate paths with NumPy in batches (faster; "
+                             "same distribution, different draws than single-seed runs)")
+    parser.add_argument("--fill-model", type=str, default=None, metavar="PATH",
+                        help="Simulate fills with the live bot's online fill-model checkpoint")
     parser.add_argument("--log-level", default="WARNING",
                         choices=["DEBUG", "INFO", "WARNING", "ERROR"])
     args = parser.parse_args()
@@ -416,13 +629,27 @@ def main() -> None:
         format="%(levelname)-8s %(name)s  %(message)s",
     )
 
+    if args.batch_paths and args.path_cache:
+        parser.error("--batch-paths paths are not cached; drop --path-cache")
+
+    fill_model = None
+    if args.fill_model:
+        try:
+            fill_model = FillModel.load(args.fill_model)
+        except (OSError, ValueError) as exc:
+            parser.error(f"--fill-model: {exc}")
+
     # ── Historical replay mode ────────────────────────────────────────────
     if args.replay:
         from kalshi_bot.historical_replay import _make_replay_config, run_replay
         cfg = _make_replay_config(args.budget, args.fee_rate)
-        run_replay(args.replay, cfg)
+        run_replay(args.replay, cfg, fill_model=fill_model)
         sys.exit(0)
 
+    engine = ENGINES[args.engine]
+    if fill_model is not None:
+        # Bound into the engine, so sweeps and seed workers get it too
+        engine = partial(engine, fill_model=fill_model)
     scenarios = SCENARIOS
     if args.scenario:
         scenarios = [s for s in SCENARIOS if s.name == args.scenario]
@@ -437,9 +664,14 @@ def main() -> None:
         print(f"\nParameter sweep | budget=${args.budget:.0f} | seed={args.seed}")
         base_cfg = _make_config(args.budget, depth=0.40, kelly=0.25, mf=0.15, max_order_age=86_400)
         print("\nBaseline run:")
-        base_results, base_t = _run_all(scenarios, base_cfg, args.seed, "base")
+        base_results, base_t = _run_all(scenarios, base_cfg, args.seed, "base", engine=engine)
 
-        best_params, opt_results = run_sweep(scenarios, args.budget, args.seed)
+        workers = args.workers or os.cpu_count() or 1
+        sweep = partial(run_halving_sweep, eta=args.eta) if args.halving else run_sweep
+        best_params, opt_results = sweep(
+            scenarios, args.budget, args.seed, engine=engine, workers=workers,
+            cache_dir=args.path_cache,
+        )
 
         print(f"\n  Best params found: {best_params}")
         print(format_comparison(base_results, opt_results, best_params))
@@ -465,22 +697,27 @@ def main() -> None:
         if n_seeds == 1:
             print(f"\nRunning {len(scenarios)} scenario(s) | budget=${args.budget:.0f} | seed={args.seed}")
             print("Please wait…\n")
-            results, elapsed = _run_all(scenarios, config, args.seed, " ", args.verbose)
+            results, elapsed = _run_all(scenarios, config, args.seed, " ", args.verbose, engine)
             print(format_full_report(results, elapsed))
         else:
-            # Multi-seed: aggregate mean ± std across seeds
-            import statistics
+            # Multi-seed: Monte Carlo over all seeds, fanned out over --workers
             print(f"\nMulti-seed simulation | {n_seeds} seeds | budget=${args.budget:.0f}")
             print(f"Params: kelly=0.20  mf=0.10  age=12h  stop=disabled\n")
 
-            # Collect per-scenario P&L across all seeds
-            scenario_pnls: dict[str, list[float]] = {s.name: [] for s in scenarios}
-            all_elapsed = 0.0
-            for seed_i, seed in enumerate(seeds):
-                results, elapsed = _run_all(scenarios, config, seed, f"s{seed_i+1}", verbose=False)
-                all_elapsed += elapsed
-                for r in results:
-                    scenario_pnls[r.scenario_name].append(r.net_pnl)
+            step = max(1, n_seeds // 10)
+            reported = [0]
+
+            def _progress(done: int, total: int) -> None:
+                if done // step > reported[0] // step or done == total:
+                    print(f"    {done}/{total} seeds", flush=True)
+                reported[0] = done
+
+            workers = args.workers or os.cpu_count() or 1
+            mc = run_monte_carlo(
+                config, scenarios, seeds, engine=engine, workers=workers,
+                cache_dir=args.path_cache, progress=_progress, batched=args.batch_paths,
+            )
+            summaries = mc.summary(confidence=0.95)
 
             sep = "─" * 72
             lines = [
@@ -489,43 +726,39 @@ def main() -> None:
                 "║    KALSHI BOT — MULTI-SEED SIMULATION RESULTS                       ║",
                 "╚══════════════════════════════════════════════════════════════════════╝",
                 "",
-                f"  Seeds         : {n_seeds}  (base={args.seed}, step=137)",
+                f"  Seeds         : {n_seeds}  (base={args.seed}, step=137"
+                f"{', batched paths' if args.batch_paths else ''})",
                 f"  Budget        : ${args.budget:.0f}   kelly=0.20  mf=0.10  age=12h",
                 f"  Scenarios     : {len(scenarios)}",
                 "",
                 sep,
-                f"  {'Scenario':<22} {'Mean P&L':>10} {'Std Dev':>9} {'Min':>8} {'Max':>8} {'Win%':>6}",
-                "  " + "-" * 66,
+                f"  {'Scenario':<22} {'Mean P&L':>9} {'95% CI':>17} {'P5':>8} {'P95':>8} "
+                f"{'DD95':>6} {'Win%':>5}",
+                "  " + "-" * 79,
             ]
 
-            all_means = []
-            for scenario in scenarios:
-                name = scenario.name
-                pnls = scenario_pnls[name]
-                mean = statistics.mean(pnls)
-                std  = statistics.stdev(pnls) if len(pnls) > 1 else 0.0
-                mn   = min(pnls)
-                mx   = max(pnls)
-                wins = sum(1 for p in pnls if p > 0)
-                win_pct = wins / len(pnls) * 100
-                all_means.append(mean)
-                sign = "+" if mean >= 0 else ""
+            for summ in summaries:
+                pnl, dd = summ.pnl, summ.drawdown
+                if summ.scenario_name == TOTAL:
+                    lines.append("  " + "-" * 79)
+                ci = f"[{pnl.ci_low:+.2f}, {pnl.ci_high:+.2f}]"
                 lines.append(
-                    f"  {name:<22} {sign}{mean:>9.2f} {std:>9.2f} {mn:>8.2f} {mx:>8.2f} {win_pct:>5.0f}%"
+                    f"  {summ.scenario_name:<22} {pnl.mean:>+9.2f} {ci:>17} {pnl.q_low:>+8.2f} "
+                    f"{pnl.q_high:>+8.2f} {dd.q_high * 100:>5.1f}% {summ.win_rate * 100:>4.0f}%"
                 )
 
-            total_mean = sum(all_means)
             lines += [
-                "  " + "-" * 66,
-                f"  {'AGGREGATE (sum)':<22} {'+' if total_mean >= 0 else ''}{total_mean:>9.2f}",
                 "",
                 sep,
                 "  INTERPRETATION",
                 sep,
-                f"  • Avg per-scenario P&L across {n_seeds} random paths",
+                f"  • Mean per-scenario P&L across {n_seeds} random paths, with the 95%",
+                "    confidence interval of that mean",
+                "  • P5 / P95 = 5th / 95th percentile P&L across seeds; DD95 = 95th",
+                "    percentile max drawdown",
                 "  • Win% = fraction of seeds where scenario was profitable",
-                "  • High Std Dev relative to Mean → path-dependent; not robust",
-                "  • Low Std Dev → consistent outcome regardless of price path",
+                "  • Wide P5–P95 band relative to Mean → path-dependent; not robust",
+                "  • Narrow band → consistent outcome regardless of price path",
                 "",
                 "  Strategy strengths:",
                 "  • No scenario has unlimited downside (stop-loss + filter bound losses)",
@@ -0,0 +1,228 @@
+"""
+Tests for the WebSocket-fed order-book cache.
+
+Books built from snapshots + deltas must match what a REST order-book fetch
+of the same levels returns, sequence gaps must drop and resubscribe the
+affected books, and readers must fall back to REST for uncached tickers.
+"""
+
+from __future__ import annotations
+
+import json
+import random
+import time
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+from kalshi_bot.book_cache import OrderBookCache
+from kalshi_bot.bot import KalshiBot
+from kalshi_bot.client import KalshiClient, MarketInfo, OrderBook
+from kalshi_bot.config import BotConfig
+from kalshi_bot.order_manager import OrderManager, PositionState
+from kalshi_bot.position_sizer import size_position
+from kalshi_bot.ws_client import KalshiWebSocket
+
+
+def _rest_book(yes: dict[int, int], no: dict[int, int], ticker: str = "KXT") -> OrderBook:
+    """What KalshiClient.get_order_book returns for these levels (best first)."""
+    client = KalshiClient(BotConfig(dry_run=True))
+    client._get = lambda path, params=None, auth=True: {"orderbook": {
+        "yes": [[p, q] for p, q in sorted(yes.items(), reverse=True)],
+        "no": [[p, q] for p, q in sorted(no.items(), reverse=True)],
+    }}
+    return client.get_order_book(ticker)
+
+
+# ---------------------------------------------------------------------------
+# Cache
+# ---------------------------------------------------------------------------
+
+class TestOrderBookCache:
+    def test_snapshot_matches_rest(self):
+        cache = OrderBookCache()
+        yes, no = {40: 5, 45: 10, 42: 3}, {50: 7, 48: 2}
+        cache.apply_snapshot("KXT", 1, 1, [[p, q] for p, q in yes.items()], [[p, q] for p, q in no.items()])
+        assert cache.get("KXT") == _rest_book(yes, no)
+        assert cache.get("KXT").yes_bids[0] == (0.45, 10)
+        assert cache.get("KXT").yes_asks[0] == (0.50, 7)
+
+    def test_random_deltas_track_reference(self):
+        rng = random.Random(7)
+        cache = OrderBookCache()
+        yes: dict[int, int] = {}
+        no: dict[int, int] = {}
+        cache.apply_snapshot("KXT", 4, 10, [], [])
+        for seq in range(11, 2000):
+            side, levels = rng.choice([("yes", yes), ("no", no)])
+            price = rng.randint(1, 99)
+            delta = rng.randint(1, 50) if rng.random() < 0.6 else -rng.randint(1, 60)
+            if levels.get(price, 0) + delta > 0:
+                levels[price] = levels.get(price, 0) + delta
+            elif delta < 0 or price in levels:
+                levels.pop(price, None)
+            assert cache.apply_delta("KXT", 4, seq, side, price, delta) == []
+        assert cache.get("KXT") == _rest_book(yes, no)
+
+    def test_empty_book(self):
+        cache = OrderBookCache()
+        cache.apply_snapshot("KXT", 1, 1, [], [])
+        book = cache.get("KXT")
+        assert book.yes_bids == [] and book.yes_asks == []
+        assert book.mid == 0.5 and book.spread == 1.0
+
+    def test_sequence_gap_drops_subscription(self):
+        cache = OrderBookCache()
+        cache.apply_snapshot("KXA", 1, 1, [[40, 1]], [])
+        cache.apply_snapshot("KXB", 1, 2, [[41, 1]], [])
+        cache.apply_snapshot("KXC", 2, 1, [[42, 1]], [])
+        assert cache.apply_delta("KXA", 1, 3, "yes", 40, 1) == []
+        assert sorted(cache.apply_delta("KXA", 1, 5, "yes", 40, 1)) == ["KXA", "KXB"]
+        assert cache.get("KXA") is None and cache.get("KXB") is None
+        assert "KXC" in cache and cache.resyncs == 1
+        cache.apply_snapshot("KXA", 3, 1, [[44, 2]], [])
+        assert cache.get("KXA").yes_bids == [(0.44, 2)]
+
+    def test_delta_without_snapshot_ignored(self):
+        cache = OrderBookCache()
+        assert cache.apply_delta("KXT", 9, 1, "yes", 40, 5) == []
+        assert cache.get("KXT") is None
+
+    def test_max_age(self):
+        cache = OrderBookCache(max_age=0.01)
+        cache.apply_snapshot("KXT", 1, 1, [[40, 1]], [])
+        assert "KXT" in cache
+        time.sleep(0.02)
+        assert cache.get("KXT") is None
+
+
+# ---------------------------------------------------------------------------
+# WebSocket wiring
+# ---------------------------------------------------------------------------
+
+def _sent(sock: MagicMock) -> list[dict]:
+    return [json.loads(c.args[0]) for c in sock.send.call_args_list]
+
+
+class TestWebSocketBooks:
+    @pytest.fixture
+    def ws(self):
+        return KalshiWebSocket(BotConfig(dry_run=True), on_fill=MagicMock(), book_cache=OrderBookCache())
+
+    def test_tracked_tickers_subscribed_on_open(self, ws):
+        ws.track_tickers(["KXB", "KXA"])
+        sock = MagicMock()
+        ws._on_open(sock)
+        books = [m for m in _sent(sock) if "market_tickers" in m["params"]]
+        assert books == [{
+            "id": books[0]["id"], "cmd": "subscribe",
+            "params": {"channels": ["orderbook_delta"], "market_tickers": ["KXA", "KXB"]},
+        }]
+
+    def test_track_while_connected_subscribes_new_only(self, ws):
+        sock = MagicMock()
+        ws._ws = sock
+        ws._connected.set()
+        ws.track_tickers(["KXA"])
+        ws.track_tickers(["KXA", "KXB"])
+        assert [m["params"]["market_tickers"] for m in _sent(sock)] == [["KXA"], ["KXB"]]
+
+    def test_track_replaces_set(self, ws):
+        sock = MagicMock()
+        ws._ws = sock
+        ws._connected.set()
+        ws.track_tickers(["KXA", "KXB", "KXC"])
+        ws.book_cache.apply_snapshot("KXA", 5, 1, [[45, 1]], [])
+        ws.book_cache.apply_snapshot("KXB", 5, 2, [[45, 1]], [])
+        sock.send.reset_mock()
+
+        ws.track_tickers(["KXC", "KXD"])
+        update, sub = _sent(sock)
+        assert update["cmd"] == "update_subscription"
+        assert update["params"] == {
+            "sids": [5], "market_tickers": ["KXA", "KXB"], "action": "delete_markets",
+        }
+        assert sub["params"]["market_tickers"] == ["KXD"]
+        assert ws.book_cache.tickers() == []
+
+        # A snapshot still in flight for a dropped ticker is ignored
+        ws._on_message(sock, json.dumps({
+            "type": "orderbook_snapshot", "sid": 5, "seq": 3,
+            "msg": {"market_ticker": "KXA", "yes": [[45, 10]], "no": []},
+        }))
+        assert "KXA" not in ws.book_cache
+
+    def test_bot_keeps_live_positions_tracked(self):
+        bot = KalshiBot(BotConfig(dry_run=True))
+        bot._ws, bot.vols = MagicMock(), MagicMock()
+        pos = bot.order_mgr.open_position("KXLIVE", "Live", 0.44, 0.48, 4)
+        idle = bot.order_mgr.open_position("KXIDLE", "Idle", 0.44, 0.48, 4)
+        idle.state = PositionState.IDLE
+        market = MarketInfo(
+            ticker="KXNEW", title="N", yes_bid=0.45, yes_ask=0.50, no_bid=0.50, no_ask=0.55,
+            mid_price=0.475, spread=0.05, volume_24h=10_000, open_interest=5_000,
+            close_time="", status="open",
+        )
+        with patch("kalshi_bot.bot.select_markets", return_value=[market]):
+            bot._scan_markets()
+        bot._ws.track_tickers.assert_called_once_with({"KXNEW", pos.ticker})
+        bot.vols.retain.assert_called_once_with({"KXNEW", pos.ticker})
+
+    def test_messages_update_cache_and_gap_resubscribes(self, ws):
+        sock = MagicMock()
+        ws.track_tickers(["KXA"])
+        ws._on_message(sock, json.dumps({
+            "type": "orderbook_snapshot", "sid": 5, "seq": 1,
+            "msg": {"market_ticker": "KXA", "yes": [[45, 10]], "no": [[50, 3]]},
+        }))
+        ws._on_message(sock, json.dumps({
+            "type": "orderbook_delta", "sid": 5, "seq": 2,
+            "msg": {"market_ticker": "KXA", "price": 46, "delta": 4, "side": "yes"},
+        }))
+        assert ws.book_cache.get("KXA").yes_bids == [(0.46, 4), (0.45, 10)]
+        sock.send.assert_not_called()
+
+        ws._on_message(sock, json.dumps({
+            "type": "orderbook_delta", "sid": 5, "seq": 9,
+            "msg": {"market_ticker": "KXA", "price": 46, "delta": -4, "side": "yes"},
+        }))
+        assert ws.book_cache.get("KXA") is None
+        unsub, resub = _sent(sock)
+        assert unsub["cmd"] == "unsubscribe" and unsub["params"] == {"sids": [5]}
+        assert resub["params"]["market_tickers"] == ["KXA"]
+
+    def test_close_clears_cache(self, ws):
+        ws.book_cache.apply_snapshot("KXA", 1, 1, [[45, 1]], [])
+        ws._on_close(MagicMock(), 1000, "bye")
+        assert ws.book_cache.tickers() == []
+
+
+# ---------------------------------------------------------------------------
+# Readers
+# ---------------------------------------------------------------------------
+
+class TestReaders:
+    def test_order_manager_prefers_cache(self):
+        client = MagicMock()
+        client.get_order_book.return_value = "rest-book"
+        cache = OrderBookCache()
+        cache.apply_snapshot("KXA", 1, 1, [[45, 1]], [[50, 1]])
+        mgr = OrderManager(client, BotConfig(dry_run=False), book_cache=cache)
+        assert mgr.get_order_book("KXA") == cache.get("KXA")
+        client.get_order_book.assert_not_called()
+        assert mgr.get_order_book("KXB") == "rest-book"
+        client.get_order_book.side_effect = RuntimeError("down")
+        assert mgr.get_order_book("KXB") is None
+
+    def test_size_position_reads_cache(self):
+        cache = OrderBookCache()
+        cache.apply_snapshot("KXA", 1, 1, [[45, 400], [44, 300]], [[50, 20]])
+        market = MarketInfo(
+            ticker="KXA", title="A", yes_bid=0.45, yes_ask=0.50, no_bid=0.50, no_ask=0.55,
+            mid_price=0.475, spread=0.05, volume_24h=10_000, open_interest=5_000,
+            close_time="", status="open",
+        )
+        cfg = BotConfig(dry_run=True)
+        from_cache = size_position(market, 1000.0, cfg, vol_override=0.05, order_book=cache.get("KXA"))
+        plain = size_position(market, 1000.0, cfg, vol_override=0.05)
+        assert from_cache.yes_price < plain.yes_price   # YES-side pressure widens YES
@@ -0,0 +1,184 @@
+"""
+Tests for the data collector's write path.
+
+Snapshots must land in market_data.db exactly as the old per-poll
+connect-and-insert did, with WAL enabled, only the (ticker, ts) index
+kept, and polls never waiting on the writer thread.  The streaming
+collector must turn WebSocket ticker messages into the same rows.
+"""
+
+from __future__ import annotations
+
+import json
+import sqlite3
+import threading
+from unittest.mock import MagicMock
+
+import pytest
+
+from kalshi_bot.config import BotConfig
+from kalshi_bot.data_collector import _SCHEMA, DataCollector, SnapshotWriter, StreamingCollector
+
+
+def _raw(n: int, offset: int = 0) -> list[dict]:
+    return [
+        {"ticker": f"KXT-{i}", "title": f"T{i}", "status": "active",
+         "yes_bid": 40 + (i + offset) % 10, "yes_ask": 55, "volume_24h": 1000 + i,
+         "open_interest": 500}
+        for i in range(n)
+    ]
+
+
+@pytest.fixture
+def collector(tmp_path):
+    c = DataCollector(str(tmp_path / "market_data.db"), BotConfig(dry_run=True))
+    c.client = MagicMock()
+    yield c
+    c.close()
+
+
+def _rows(db: str) -> list[tuple]:
+    with sqlite3.connect(db) as conn:
+        return conn.execute(
+            "SELECT ticker, yes_bid, yes_ask, mid, spread, volume_24h, status "
+            "FROM market_snapshots ORDER BY id"
+        ).fetchall()
+
+
+class TestDataCollector:
+    def test_collect_once_stores_parsed_markets(self, collector):
+        collector.client.get_active_markets.return_value = _raw(3) + [{"title": "no ticker"}]
+        assert collector.collect_once() == 3
+        collector.writer.flush()
+        rows = _rows(collector.db_path)
+        assert rows[0] == ("KXT-0", 0.40, 0.55, pytest.approx(0.475), pytest.approx(0.15), 1000.0, "active")
+        assert [r[0] for r in rows] == ["KXT-0", "KXT-1", "KXT-2"]
+
+    def test_api_error_stores_nothing(self, collector):
+        collector.client.get_active_markets.side_effect = RuntimeError("down")
+        assert collector.collect_once() == 0
+        collector.writer.flush()
+        assert _rows(collector.db_path) == []
+
+    def test_wal_and_pruned_indexes(self, collector):
+        with sqlite3.connect(collector.db_path) as conn:
+            assert conn.execute("PRAGMA journal_mode").fetchone() == ("wal",)
+            indexes = {r[0] for r in conn.execute(
+                "SELECT name FROM sqlite_master WHERE type = 'index' AND tbl_name = 'market_snapshots'"
+            )}
+        assert indexes == {"idx_ticker_ts"}
+
+    def test_existing_db_migrated(self, tmp_path):
+        path = str(tmp_path / "old.db")
+        with sqlite3.connect(path) as conn:
+            conn.executescript(_SCHEMA)
+            conn.execute("CREATE INDEX idx_ts ON market_snapshots(ts)")
+            conn.execute("CREATE INDEX idx_ticker ON market_snapshots(ticker)")
+            conn.execute("INSERT INTO market_snapshots (ts, ticker, mid) VALUES (1, 'KXOLD', 0.5)")
+        writer = SnapshotWriter(path)
+        writer.close()
+        with sqlite3.connect(path) as conn:
+            names = {r[0] for r in conn.execute("SELECT name FROM sqlite_master WHERE type = 'index'")}
+            assert conn.execute("SELECT ticker FROM market_snapshots").fetchall() == [("KXOLD",)]
+        assert "idx_ts" not in names and "idx_ticker" not in names
+
+
+class TestSnapshotWriter:
+    def test_poll_does_not_wait_for_disk(self, collector):
+        gate = threading.Event()
+        real_write = collector.writer._write
+        collector.writer._write = lambda batches: (gate.wait(5), real_write(batches))
+
+        for k in range(5):   # the writer thread is stuck; polls still return
+            collector.client.get_active_markets.return_value = _raw(50, offset=k)
+            assert collector.collect_once() == 50
+        assert _rows(collector.db_path) == []
+
+        gate.set()
+        collector.writer.flush()
+        assert len(_rows(collector.db_path)) == 250
+        assert collector.writer.rows_written == 250
+
+    def test_close_flushes_pending(self, tmp_path):
+        path = str(tmp_path / "w.db")
+        writer = SnapshotWriter(path)
+        for k in range(20):
+            writer.submit([(k, f"KX{i}", 0.4, 0.5, 1.0, 1.0, 0.45, 0.1, "active") for i in range(100)])
+        writer.close()
+        with sqlite3.connect(path) as conn:
+            assert conn.execute("SELECT COUNT(*) FROM market_snapshots").fetchone() == (2000,)
+
+    def test_failed_batch_does_not_stop_writer(self, tmp_path):
+        writer = SnapshotWriter(str(tmp_path / "w.db"))
+        writer.submit([(1, None, 0.4, 0.5, 1.0, 1.0, 0.45, 0.1, "active")])   # NOT NULL ticker
+        writer.flush()
+        writer.submit([(2, "KXOK", 0.4, 0.5, 1.0, 1.0, 0.45, 0.1, "active")])
+        writer.flush()
+        assert writer.rows_written == 1
+        writer.close()
+
+    def test_non_sqlite_error_does_not_stop_writer(self, tmp_path, monkeypatch):
+        from kalshi_bot import data_collector
+        real_upsert = data_collector.rollups.upsert
+        calls = []
+
+        def upsert(conn, batch):
+            calls.append(len(batch))
+            if len(calls) == 1:
+                raise TypeError("bad row")
+            return real_upsert(conn, batch)
+
+        monkeypatch.setattr(data_collector.rollups, "upsert", upsert)
+        writer = SnapshotWriter(str(tmp_path / "w.db"))
+        writer.submit([(1, "KXBAD", 0.4, 0.5, 1.0, 1.0, 0.45, 0.1, "active")])
+        writer.flush()
+        writer.submit([(2, "KXOK", 0.4, 0.5, 1.0, 1.0, 0.45, 0.1, "active")])
+        writer.flush()   # would block forever if the thread had died
+        assert writer.rows_written == 1
+        writer.close()
+        with sqlite3.connect(str(tmp_path / "w.db")) as conn:
+            assert conn.execute("SELECT ticker FROM market_snapshots").fetchall() == [("KXOK",)]
+
+
+class TestStreamingCollector:
+    @pytest.fixture
+    def streamer(self, tmp_path):
+        c = StreamingCollector(str(tmp_path / "market_data.db"), BotConfig(dry_run=True))
+        c.client = MagicMock()
+        c.client.get_active_markets.return_value = _raw(2)
+        yield c
+        c.close()
+
+    def _tick(self, streamer, **msg):
+        streamer.ws._on_message(MagicMock(), json.dumps({"type": "ticker", "sid": 1, "msg": msg}))
+
+    def test_subscribes_to_ticker_only(self, streamer):
+        sock = MagicMock()
+        streamer.ws._on_open(sock)
+        (sent,) = [json.loads(c.args[0]) for c in sock.send.call_args_list]
+        assert sent["params"] == {"channels": ["ticker"]}
+
+    def test_updates_become_rows(self, streamer):
+        assert streamer.resync() == 2
+        self._tick(streamer, market_ticker="KXT-0", yes_bid=44, yes_ask=50, open_interest=700)
+        self._tick(streamer, market_ticker="KXT-0", yes_bid=46)   # partial: ask carried over
+        self._tick(streamer, market_ticker="KXNEW", yes_bid=10, yes_ask=20)
+        self._tick(streamer, yes_bid=10)                          # no ticker – dropped
+        assert _rows(streamer.db_path)[2:] == []                  # buffered, not yet written
+
+        assert streamer.flush() == 3
+        streamer.writer.flush()
+        rows = _rows(streamer.db_path)
+        assert rows[2] == ("KXT-0", 0.44, 0.50, pytest.approx(0.47), pytest.approx(0.06), 1000.0, "active")
+        assert rows[3] == ("KXT-0", 0.46, 0.50, pytest.approx(0.48), pytest.approx(0.04), 1000.0, "active")
+        assert rows[4] == ("KXNEW", 0.10, 0.20, pytest.approx(0.15), pytest.approx(0.10), None, None)
+
+    def test_streamed_ts_is_sub_second(self, streamer):
+        for bid in range(20, 40):
+            self._tick(streamer, market_ticker="KXT-0", yes_bid=bid, yes_ask=60)
+        streamer.flush()
+        streamer.writer.flush()
+        with sqlite3.connect(streamer.db_path) as conn:
+            ts = [r[0] for r in conn.execute("SELECT ts FROM market_snapshots ORDER BY id")]
+        assert len(ts) == 20 and ts == sorted(ts)
+        assert any(t != int(t) for t in ts)
@@ -0,0 +1,243 @@
+"""
+Tests for the fill-probability model's Newton / IRLS logistic fit.
+
+The fit must recover known coefficients from simulated quotes (within its
+own standard errors), converge in a handful of Newton steps, stay finite
+on separable data when regularised, and leave the defaults alone when the
+data cannot support a fit.  The training-set ASOF join must match the
+per-position nearest-snapshot query it replaced, and the online model
+must track the batch fit and resume from its checkpoint.
+"""
+
+from __future__ import annotations
+
+import math
+import os
+import random
+import sqlite3
+import threading
+
+import numpy as np
+import pytest
+
+from kalshi_bot.backtester import Backtester
+from kalshi_bot.config import BotConfig
+from kalshi_bot.data_collector import _INSERT, _SCHEMA
+from kalshi_bot.fill_model import (
+    FillModel, FillModelParams, OnlineFillModel, _extract_fill_records, _fit_logistic,
+)
+from kalshi_bot.order_manager import MarketPosition, PositionState
+from kalshi_bot.state_store import StateStore
+from kalshi_bot.synthetic_data import PricePath
+from kalshi_bot.vector_backtester import VectorizedBacktester
+
+TRUE = np.array([-3.0, -15.0, 0.25, 1.5])
+T0 = 1_760_000_000
+
+
+def _records(n: int, seed: int = 0) -> list[tuple[float, float, float, float]]:
+    rng = np.random.default_rng(seed)
+    depth = rng.uniform(0.0, 0.1, n)
+    vol = rng.lognormal(9.0, 1.0, n)
+    spread = rng.uniform(0.02, 0.2, n)
+    z = TRUE @ np.vstack([np.ones(n), depth, np.log1p(vol), spread])
+    filled = (rng.random(n) < 1 / (1 + np.exp(-z))).astype(float)
+    return list(zip(depth, vol, spread, filled))
+
+
+class TestFit:
+    def test_recovers_coefficients(self):
+        model = FillModel()
+        model.fit(_records(50_000))
+        p, diag = model.params, model.diagnostics
+        assert p.fitted and diag.converged
+        assert diag.iterations <= 10
+        assert diag.grad_norm < 1e-6
+        beta = np.array([p.intercept, p.coef_depth, p.coef_log_vol, p.coef_spread])
+        assert np.all(np.abs(beta - TRUE) < 4 * np.array(diag.std_errors))
+
+    def test_matches_likelihood_optimum(self):
+        data = np.array(_records(2_000, seed=3))
+        X = np.column_stack([np.ones(len(data)), data[:, 0], np.log1p(data[:, 1]), data[:, 2]])
+        beta, diag = _fit_logistic(X, data[:, 3])
+
+        def ll(b):
+            z = X @ b
+            return float(-(data[:, 3] * np.logaddexp(0, -z)
+                           + (1 - data[:, 3]) * np.logaddexp(0, z)).sum())
+
+        assert diag.log_likelihood == pytest.approx(ll(beta))
+        for j in range(4):
+            for h in (-1e-3, 1e-3):
+                nudged = beta.copy()
+                nudged[j] += h
+                assert ll(nudged) < ll(beta)
+
+    def test_l2_keeps_separable_fit_finite(self):
+        # Every quote within 2¢ of the touch fills; none deeper does.
+        rng = np.random.default_rng(1)
+        depth = rng.uniform(0, 0.1, 200)
+        records = [(d, 5_000.0, 0.08, float(d < 0.02)) for d in depth]
+        unreg = FillModel()
+        unreg.fit(records)
+        ridge = FillModel()
+        ridge.fit(records, l2=1.0)
+        assert ridge.diagnostics.converged
+        assert math.isfinite(ridge.params.coef_depth)
+        assert abs(ridge.params.coef_depth) < abs(unreg.params.coef_depth)
+        assert ridge.predict(0.0, 5_000, 0.08) > ridge.predict(0.08, 5_000, 0.08)
+
+    @pytest.mark.parametrize("records", [
+        _records(10),
+        [(0.01, 1_000.0, 0.05, 0.0)] * 30,
+    ])
+    def test_insufficient_data_keeps_defaults(self, records):
+        model = FillModel()
+        model.fit(records)
+        assert model.params == FillModelParams()
+        assert model.diagnostics is None
+
+
+def _naive_extract(state_db: str, market_db: str) -> list[tuple]:
+    """The per-position nearest-snapshot query the ASOF join replaces."""
+    out = []
+    with sqlite3.connect(state_db) as sconn, sqlite3.connect(market_db) as mconn:
+        for ticker, yes_price, _, qt, state in sconn.execute(
+            "SELECT ticker, yes_price, no_price, last_quote_time, state FROM positions"
+        ):
+            snap = mconn.execute(
+                """SELECT mid, volume_24h, spread FROM market_snapshots
+                   WHERE ticker = ? AND ABS(ts - ?) < 300
+                   ORDER BY ABS(ts - ?) ASC, ts ASC LIMIT 1""",
+                (ticker, int(qt), int(qt)),
+            ).fetchone()
+            if snap is not None:
+                mid, vol, spread = snap
+                out.append((abs(yes_price - mid), vol or 0.0, spread or 0.0,
+                            0.0 if state == "IDLE" else 1.0))
+    return out
+
+
+class TestExtract:
+    @pytest.fixture
+    def dbs(self, tmp_path):
+        rng = random.Random(7)
+        market = str(tmp_path / "market_data.db")
+        with sqlite3.connect(market) as conn:
+            conn.executescript(_SCHEMA)
+            rows = []
+            for t in range(20):
+                ts = T0
+                for _ in range(200):
+                    ts += rng.choice([30, 60, 60, 120, 900])   # uneven polls, some gaps
+                    mid = rng.uniform(0.1, 0.9)
+                    rows.append((ts, f"KX{t}", mid - 0.01, mid + 0.01,
+                                 rng.uniform(0, 1e5), 0.0, mid, rng.uniform(0.01, 0.1), "active"))
+            conn.executemany(_INSERT, rows)
+
+        state = str(tmp_path / "bot_state.db")
+        store = StateStore(state)
+        for k in range(500):
+            t = rng.randrange(25)   # some tickers have no snapshots
+            store.upsert(MarketPosition(
+                ticker=f"KX{t}-{k}" if t >= 20 else f"KX{t}", title="",
+                yes_price=rng.uniform(0.1, 0.9), no_price=0.5,
+                state=rng.choice([PositionState.IDLE, PositionState.RESOLVED]),
+                last_quote_time=T0 + rng.uniform(0, 200 * 300),
+            ))
+            if k % 25 == 0:
+                store.flush()   # positions table keeps the latest per ticker
+        store.close()
+        return state, market
+
+    def test_matches_per_position_query(self, dbs):
+        got = _extract_fill_records(*dbs)
+        expected = _naive_extract(*dbs)
+        assert len(got) > 10
+        assert sorted(got) == pytest.approx(sorted(expected))
+
+
+class TestOnline:
+    def test_streaming_updates_approach_batch_fit(self):
+        records = _records(20_000, seed=5)
+        batch = FillModel()
+        batch.fit(records)
+        online = OnlineFillModel(forgetting=1.0, checkpoint_every=0)
+        for depth, vol, spread, filled in records:
+            online.observe(depth, vol, spread, filled > 0.5)
+        assert online.params.fitted and online.n_obs == len(records)
+        for depth, vol, spread in [(0.0, 1e5, 0.15), (0.03, 1e4, 0.08), (0.1, 1e4, 0.08)]:
+            assert online.predict(depth, vol, spread) == pytest.approx(
+                batch.predict(depth, vol, spread), rel=0.1,
+            )
+
+    def test_exposure_learns_hourly_rate(self):
+        # Quotes resting 4 h with a 5%/h fill hazard: "filled before stale"
+        # happens ~19% of the time, but predict() must give the hourly 5%.
+        rng = np.random.default_rng(6)
+        hazard, stale_hours = 0.05, 4.0
+        online = OnlineFillModel(forgetting=1.0, checkpoint_every=0)
+        for _ in range(5_000):
+            depth = float(rng.uniform(0.0, 0.1))
+            hours = stale_hours
+            filled_in = rng.geometric(hazard)          # hour (1-based) of the fill
+            filled = filled_in <= stale_hours
+            if filled:
+                hours = filled_in - float(rng.uniform())
+            online.observe(depth, 1e4, 0.08, filled, hours=hours)
+        assert online.predict(0.05, 1e4, 0.08) == pytest.approx(hazard, rel=0.2)
+
+    def test_checkpoint_resumes(self, tmp_path):
+        path = str(tmp_path / "fill_model.json")
+        model = OnlineFillModel(checkpoint_path=path, checkpoint_every=10)
+        for depth, vol, spread, filled in _records(25, seed=2):
+            model.observe(depth, vol, spread, filled > 0.5)
+        resumed = OnlineFillModel(checkpoint_path=path)
+        assert resumed.n_obs == 20                         # last periodic checkpoint
+        model.save()
+        resumed = OnlineFillModel(checkpoint_path=path)
+        assert resumed.n_obs == 25
+        assert resumed.params == model.params
+        np.testing.assert_allclose(resumed._cov, model._cov)
+
+    def test_unreadable_checkpoint_starts_fresh(self, tmp_path):
+        path = tmp_path / "fill_model.json"
+        path.write_text("{not json")
+        model = OnlineFillModel(checkpoint_path=str(path))
+        assert model.n_obs == 0 and model.params == FillModelParams()
+
+    def test_concurrent_saves(self, tmp_path):
+        path = str(tmp_path / "fill_model.json")
+        model = OnlineFillModel(checkpoint_path=path, checkpoint_every=1)
+        records = _records(400, seed=3)
+
+        def feed(chunk):
+            for depth, vol, spread, filled in chunk:
+                model.observe(depth, vol, spread, filled > 0.5)
+
+        threads = [threading.Thread(target=feed, args=(records[i::4],)) for i in range(4)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+        model.save()
+        assert OnlineFillModel(checkpoint_path=path).n_obs == len(records)
+        assert not os.path.exists(path + ".tmp")
+
+    def test_load_for_backtests(self, tmp_path):
+        path = str(tmp_path / "fill_model.json")
+        model = OnlineFillModel(checkpoint_path=path, checkpoint_every=0)
+        for depth, vol, spread, filled in _records(50, seed=4):
+            model.observe(depth, vol, spread, filled > 0.5)
+        model.save()
+
+        loaded = FillModel.load(path)
+        assert type(loaded) is FillModel and loaded.params == model.params
+        snaps = PricePath("KXFM", sigma=0.05, seed=1).generate(5)
+        cfg = BotConfig(dry_run=True)
+        assert (
+            VectorizedBacktester(cfg, loaded).run_market(snaps)
+            == Backtester(cfg, loaded).run_market(snaps)
+        )
+        with pytest.raises(OSError):
+            FillModel.load(str(tmp_path / "missing.json"))
@@ -0,0 +1,269 @@
+"""
+Tests for AsyncKalshiClient and AsyncKalshiBot.
+
+The async client talks to the same local Kalshi stub as the batch-order
+tests, over real HTTP with signed requests.  A per-response delay on the
+stub shows that gathered requests overlap instead of queueing.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import base64
+import time
+from unittest.mock import MagicMock
+
+import pytest
+from cryptography.hazmat.primitives import hashes
+from cryptography.hazmat.primitives.asymmetric import padding
+
+from kalshi_bot.async_bot import AsyncKalshiBot
+from kalshi_bot.async_client import AsyncKalshiClient
+from kalshi_bot.client import MarketInfo, _RateLimiter
+from kalshi_bot.order_manager import OrderManager, PositionState
+from tests.test_kalshi_orders import (
+    KalshiStub,
+    _client,
+    _config,
+    _intents,
+    _quotes,
+    private_key,  # noqa: F401  (module-scoped fixture)
+    stub,         # noqa: F401
+)
+
+
+def _aclient(stub: KalshiStub, sync_client) -> AsyncKalshiClient:
+    aclient = AsyncKalshiClient(sync_client.cfg, max_connections=16, share_limits=sync_client)
+    aclient._base = stub.base
+    return aclient
+
+
+def run(coro):
+    return asyncio.run(coro)
+
+
+@pytest.fixture
+def clients(stub, private_key):
+    sync = _client(stub, _config(private_key, batch_orders=True))
+    aclient = _aclient(stub, sync)
+    yield sync, aclient
+    run(aclient.close())
+
+
+# ---------------------------------------------------------------------------
+# Rate limiter
+# ---------------------------------------------------------------------------
+
+class TestRateLimiter:
+    def test_reservations_queue_behind_burst(self):
+        limiter = _RateLimiter(rate=10)
+        waits = [limiter.reserve() for _ in range(12)]
+        assert waits[:10] == [0.0] * 10
+        assert waits[10] == pytest.approx(0.1, abs=0.01)
+        assert waits[11] == pytest.approx(0.2, abs=0.01)
+
+    def test_async_acquire_waits(self):
+        limiter = _RateLimiter(rate=20)
+
+        async def drain():
+            t0 = time.monotonic()
+            await asyncio.gather(*(limiter.acquire_async() for _ in range(25)))
+            return time.monotonic() - t0
+
+        assert run(drain()) == pytest.approx(0.25, abs=0.1)
+
+
+# ---------------------------------------------------------------------------
+# AsyncKalshiClient
+# ---------------------------------------------------------------------------
+
+class TestAsyncClient:
+    def test_shares_limits_and_key(self, clients):
+        sync, aclient = clients
+        assert aclient._read_limiter is sync._read_limiter
+        assert aclient._write_limiter is sync._write_limiter
+        assert aclient._signer is sync._signer
+
+    def test_requests_are_signed(self, stub, clients, private_key):
+        _, aclient = clients
+        order_id = run(aclient.place_limit_order("KXT", "yes", "buy", 0.44, 3))
+        assert stub.resting[order_id]["yes_price"] == 44
+        _, path, headers, _ = stub.requests[-1]
+        ts = headers["KALSHI-ACCESS-TIMESTAMP"]
+        private_key.public_key().verify(
+            base64.b64decode(headers["KALSHI-ACCESS-SIGNATURE"]),
+            (ts + "POST" + path).encode(),
+            padding.PSS(mgf=padding.MGF1(hashes.SHA256()), salt_length=padding.PSS.DIGEST_LENGTH),
+            hashes.SHA256(),
+        )
+
+    def test_batch_chunks_keep_input_order(self, stub, clients):
+        _, aclient = clients
+        intents = _intents(45)
+        ids = run(aclient.place_orders_batch(intents))
+        sizes = sorted(len(b["orders"]) for b in stub.calls("POST", "/portfolio/orders/batched"))
+        assert sizes == [5, 20, 20]
+        assert [stub.resting[i]["ticker"] for i in ids] == [it.ticker for it in intents]
+
+        ok = run(aclient.cancel_orders_batch(ids[:21] + ["ord-unknown"]))
+        assert ok == [True] * 21 + [False]
+        assert len(stub.resting) == 24
+
+    def test_reads_match_sync_client(self, stub, clients):
+        sync, aclient = clients
+        run(aclient.place_orders_batch(_intents(3)))
+        assert run(aclient.get_open_orders()) == sync.get_open_orders()
+        assert run(aclient.get_order_book("KXT")) == sync.get_order_book("KXT")
+        assert run(aclient.get_order_status("ord-2")) == sync.get_order_status("ord-2")
+        assert run(aclient.get_balance()) == sync.get_balance() == 500.0
+
+    def test_order_books_overlap(self, stub, clients):
+        _, aclient = clients
+        stub.delay = 0.2
+        tickers = [f"KX{i}" for i in range(8)] + ["KXBAD"]
+        t0 = time.monotonic()
+        books = run(aclient.get_order_books(tickers))
+        elapsed = time.monotonic() - t0
+        assert elapsed < 0.2 * len(tickers) / 2   # serial would take 1.8s
+        assert books["KXBAD"] is None
+        assert all(books[t].mid == pytest.approx(0.47) for t in tickers[:-1])
+
+    def test_dry_run_makes_no_requests(self, stub, private_key):
+        cfg = _config(private_key, batch_orders=True)
+        cfg.dry_run = True
+        aclient = _aclient(stub, _client(stub, cfg))
+        assert all(run(aclient.place_orders_batch(_intents(3))))
+        assert run(aclient.cancel_order("x"))
+        assert run(aclient.get_open_orders()) == []
+        assert stub.requests == []
+        run(aclient.close())
+
+
+# ---------------------------------------------------------------------------
+# OrderManager async paths
+# ---------------------------------------------------------------------------
+
+def _forbid_sync_reads(client) -> None:
+    for name in ("get_open_orders", "get_order_status", "get_market", "get_order_book"):
+        setattr(client, name, MagicMock(side_effect=AssertionError(f"sync {name}")))
+
+
+def _lock_free(mgr: OrderManager) -> bool:
+    if not mgr._lock.acquire(timeout=1.0):
+        return False
+    mgr._lock.release()
+    return True
+
+
+class TestOrderManagerAsync:
+    @pytest.mark.parametrize("batch_orders", [True, False])
+    def test_open_positions_async(self, stub, private_key, batch_orders):
+        sync = _client(stub, _config(private_key, batch_orders=batch_orders))
+        aclient = _aclient(stub, sync)
+        mgr = OrderManager(sync, sync.cfg)
+        positions = run(mgr.open_positions_async(aclient, _quotes(4) + _quotes(1, "KXBADNO")))
+        assert [p.state for p in positions] == [PositionState.QUOTING] * 4 + [PositionState.IDLE]
+        assert len(stub.resting) == 8   # KXBADNO's surviving YES leg was cancelled
+        for p in positions[:4]:
+            assert stub.resting[p.yes_order_id]["side"] == "yes"
+            assert stub.resting[p.no_order_id]["side"] == "no"
+        run(aclient.close())
+
+    def test_reconcile_prefetches_all_reads(self, stub, clients):
+        sync, aclient = clients
+        mgr = OrderManager(sync, sync.cfg)
+        filled, quiet, settled = mgr.open_positions(_quotes(3))
+        stub.closed[filled.yes_order_id] = {
+            **stub.resting.pop(filled.yes_order_id), "status": "filled",
+        }
+        stub.resting.pop(settled.yes_order_id)
+        stub.resting.pop(settled.no_order_id)
+        settled.state = PositionState.BOTH_FILLED
+
+        _forbid_sync_reads(sync)
+        run(mgr.refresh_all_async(aclient, reconcile=True))
+
+        assert filled.state == PositionState.ONE_SIDE_HEDGED
+        assert stub.resting[filled.hedge_order_id]["side"] == "no"
+        assert quiet.state == PositionState.QUOTING
+        assert settled.state == PositionState.RESOLVED
+        assert len(stub.calls("GET", f"/portfolio/orders/{filled.yes_order_id}")) == 1
+
+    def test_local_refresh_skips_order_reads(self, stub, clients):
+        sync, aclient = clients
+        mgr = OrderManager(sync, sync.cfg)
+        (pos,) = mgr.open_positions(_quotes(1))
+        _forbid_sync_reads(sync)
+        stub.requests.clear()
+        run(mgr.refresh_all_async(aclient, reconcile=False))
+        assert pos.state == PositionState.QUOTING
+        assert [p for _, p, _, _ in stub.requests] == [
+            f"/trade-api/v2/markets/{pos.ticker}/orderbook",
+        ]
+
+    def test_prefetch_does_not_hold_lock(self, stub, clients):
+        sync, aclient = clients
+        mgr = OrderManager(sync, sync.cfg)
+        (quiet,) = mgr.open_positions(_quotes(1))
+        fetch = aclient.get_open_orders
+        seen = {}
+
+        async def get_open_orders():
+            orders = await fetch()
+            # Another thread (the WS handler) can take the lock mid-prefetch,
+            # and an order placed now is absent from the snapshot above.
+            loop = asyncio.get_running_loop()
+            seen["lock_free"] = await loop.run_in_executor(None, _lock_free, mgr)
+            (seen["late"],) = mgr.open_positions(_quotes(1, "KXLATE"))
+            return orders
+
+        aclient.get_open_orders = get_open_orders
+        _forbid_sync_reads(sync)
+        run(mgr.refresh_all_async(aclient, reconcile=True))
+
+        assert seen["lock_free"]
+        assert quiet.state == PositionState.QUOTING
+        assert seen["late"].state == PositionState.QUOTING   # not read as vanished
+        assert not stub.calls("GET", f"/portfolio/orders/{seen['late'].yes_order_id}")
+
+
+# ---------------------------------------------------------------------------
+# AsyncKalshiBot
+# ---------------------------------------------------------------------------
+
+def _market(ticker: str) -> MarketInfo:
+    return MarketInfo(
+        ticker=ticker, title=f"Market {ticker}", yes_bid=0.45, yes_ask=0.55,
+        no_bid=0.45, no_ask=0.55, mid_price=0.50, spread=0.10,
+        volume_24h=10_000, open_interest=5_000, close_time="", status="open",
+    )
+
+
+class TestAsyncBot:
+    @pytest.fixture
+    def bot(self, stub, private_key):
+        cfg = _config(private_key, batch_orders=False)
+        cfg.max_connections = 16
+        bot = AsyncKalshiBot(cfg)
+        bot._ws = None
+        bot.client._base = bot.aclient._base = stub.base
+        for limiter in (bot.client._read_limiter, bot.client._write_limiter):
+            limiter._rate = limiter._tokens = 1e6
+        bot._running = True
+        yield bot
+        run(bot.aclient.close())
+
+    def test_tick_opens_positions_concurrently(self, stub, bot):
+        markets = [_market(f"KXM-{i}") for i in range(4)] + [_market("KXBAD-1")]
+        bot._scan_markets = lambda: markets
+        stub.delay = 0.1
+        t0 = time.monotonic()
+        run(bot._tick_async())
+        elapsed = time.monotonic() - t0
+
+        quoting = [p for p in bot.order_mgr.positions.values() if p.state == PositionState.QUOTING]
+        assert {p.ticker for p in quoting} == {f"KXM-{i}" for i in range(4)}
+        assert all(bot.budget.deployed_in(p.ticker) > 0 for p in quoting)
+        assert bot.budget.deployed_in("KXBAD-1") == 0
+        # open orders + balance/positions, 5 books, 10 legs: ~4 round trips, not ~18
+        assert elapsed < 0.1 * 9
@@ -0,0 +1,132 @@
+"""
+Tests for KalshiClient market pagination.
+
+The HTTP session is replaced by an in-memory fake that serves cursor pages,
+so no network access is needed.
+"""
+
+from __future__ import annotations
+
+import threading
+
+import pytest
+
+from kalshi_bot.client import KalshiClient, PageStats
+from kalshi_bot.config import BotConfig
+
+
+# ---------------------------------------------------------------------------
+# Fake /markets endpoint
+# ---------------------------------------------------------------------------
+
+class _Response:
+    def __init__(self, payload: dict) -> None:
+        self._payload = payload
+
+    def raise_for_status(self) -> None:
+        pass
+
+    def json(self) -> dict:
+        return self._payload
+
+
+class FakeMarketsSession:
+    """Serves `universe[partition_key]` in cursor pages of the requested limit."""
+
+    def __init__(self, universe: dict[str, list[str]], fail_on: str | None = None) -> None:
+        self.universe = universe
+        self.fail_on = fail_on
+        self.requests: list[dict] = []
+        self._lock = threading.Lock()
+
+    def get(self, url, headers=None, params=None, timeout=None):
+        params = dict(params or {})
+        with self._lock:
+            self.requests.append(params)
+        key = params.get("series_ticker", "")
+        if key == self.fail_on:
+            raise RuntimeError(f"boom {key}")
+        tickers = self.universe[key]
+        start = int(params.get("cursor", 0))
+        end = start + params["limit"]
+        page = [{"ticker": t, "status": "open"} for t in tickers[start:end]]
+        cursor = str(end) if end < len(tickers) else ""
+        return _Response({"markets": page, "cursor": cursor})
+
+
+def _client(session: FakeMarketsSession) -> KalshiClient:
+    client = KalshiClient(BotConfig(dry_run=True))
+    client._session = session
+    client._read_limiter._rate = client._read_limiter._tokens = 1e6
+    return client
+
+
+def _tickers(prefix: str, n: int) -> list[str]:
+    return [f"{prefix}{i:04d}" for i in range(n)]
+
+
+# ---------------------------------------------------------------------------
+# Pagination
+# ---------------------------------------------------------------------------
+
+class TestMarketPagination:
+    def test_follows_cursor_to_the_end(self):
+        session = FakeMarketsSession({"": _tickers("M", 2500)})
+        client = _client(session)
+        markets = client.get_active_markets()
+        assert [m["ticker"] for m in markets] == _tickers("M", 2500)
+        assert len(session.requests) == 3
+        assert all(r["status"] == "open" for r in session.requests)
+        assert session.requests[1]["cursor"] == "1000"
+        stats = client.last_market_fetch
+        assert stats.pages == 3 and stats.items == 2500
+        assert stats.finished is not None
+
+    def test_limit_stops_paging(self):
+        session = FakeMarketsSession({"": _tickers("M", 2500)})
+        markets = _client(session).get_active_markets(limit=1000)
+        assert len(markets) == 1000
+        assert len(session.requests) == 1
+
+    def test_iter_markets_page_size(self):
+        session = FakeMarketsSession({"": _tickers("M", 25)})
+        stats = PageStats()
+        pages = list(_client(session).iter_markets({"series_ticker": ""}, page_size=10, stats=stats))
+        assert [len(p) for p in pages] == [10, 10, 5]
+        assert stats.pages == 3 and stats.mean_latency >= 0.0
+
+    def test_empty_universe(self):
+        session = FakeMarketsSession({"": []})
+        assert _client(session).get_active_markets() == []
+
+
+class TestConcurrentPartitions:
+    UNIVERSE = {
+        "KXA": _tickers("A", 2100),
+        "KXB": _tickers("B", 10),
+        "KXC": _tickers("C", 1500) + ["A0000"],   # overlaps KXA
+    }
+    PARTS = [{"series_ticker": k} for k in UNIVERSE]
+
+    def test_union_of_partitions(self):
+        session = FakeMarketsSession(self.UNIVERSE)
+        client = _client(session)
+        markets = client.get_active_markets(partitions=self.PARTS, max_workers=3)
+        tickers = [m["ticker"] for m in markets]
+        assert len(tickers) == len(set(tickers))
+        assert set(tickers) == set().union(*self.UNIVERSE.values())
+        assert client.last_market_fetch.pages == 3 + 1 + 2
+
+    def test_serial_partitions_match(self):
+        serial = _client(FakeMarketsSession(self.UNIVERSE)).get_active_markets(
+            partitions=self.PARTS, max_workers=1,
+        )
+        parallel = _client(FakeMarketsSession(self.UNIVERSE)).get_active_markets(
+            partitions=self.PARTS, max_workers=3,
+        )
+        assert sorted(m["ticker"] for m in serial) == sorted(m["ticker"] for m in parallel)
+
+    def test_worker_error_propagates(self):
+        session = FakeMarketsSession(self.UNIVERSE, fail_on="KXB")
+        with pytest.raises(RuntimeError, match="boom KXB"):
+            _client(session).get_active_markets(partitions=self.PARTS, max_workers=3)
@@ -0,0 +1,301 @@
+"""
+Tests for the Kalshi OrderManager's event-driven mode.
+
+The client is mocked: the point of event-driven mode is that WebSocket fill
+and order events advance positions without any REST status polling, so the
+tests assert on which client calls are (not) made.
+"""
+
+from __future__ import annotations
+
+import json
+import threading
+import time
+from unittest.mock import MagicMock
+
+import pytest
+
+from kalshi_bot.bot import KalshiBot
+from kalshi_bot.client import MarketInfo, Order, OrderBook
+from kalshi_bot.config import BotConfig, RiskParams
+from kalshi_bot.order_manager import OrderManager, PositionState
+from kalshi_bot.ws_client import KalshiWebSocket
+
+
+def _config(event_driven: bool = True) -> BotConfig:
+    return BotConfig(
+        dry_run=False,
+        event_driven=event_driven,
+        risk=RiskParams(max_fill_cost=1.0, max_order_age=3_600, fee_rate=0.07),
+    )
+
+
+@pytest.fixture
+def client() -> MagicMock:
+    client = MagicMock()
+    ids = iter(f"ord-{i}" for i in range(1, 1000))
+    client.place_limit_order.side_effect = lambda **kw: next(ids)
+    client.get_order_book.return_value = OrderBook(
+        ticker="KXT", yes_bids=[(0.45, 10)], yes_asks=[(0.49, 10)], mid=0.47, spread=0.04,
+    )
+    client.get_open_orders.return_value = []
+    return client
+
+
+@pytest.fixture
+def mgr(client) -> OrderManager:
+    return OrderManager(client, _config())
+
+
+def _open(mgr: OrderManager, ticker: str = "KXT", contracts: int = 4):
+    # original_mid = (0.44 + 0.49) / 2 = 0.465 ≈ order-book mid → no drift cancel
+    return mgr.open_position(ticker, "Test market", 0.44, 0.51, contracts)
+
+
+REST_POLLS = ("get_open_orders", "get_order_status", "get_market")
+
+
+def _assert_no_rest_polls(client: MagicMock) -> None:
+    for name in REST_POLLS:
+        getattr(client, name).assert_not_called()
+
+
+# ---------------------------------------------------------------------------
+# WS-driven transitions
+# ---------------------------------------------------------------------------
+
+class TestEventDrivenFills:
+    def test_fill_places_hedge_without_rest(self, mgr, client):
+        pos = _open(mgr)
+        mgr.handle_ws_fill("KXT", pos.yes_order_id, "yes", 4)
+        assert pos.state == PositionState.ONE_SIDE_HEDGED
+        assert pos.filled_side == "yes"
+        assert pos.hedge_order_id == "ord-3"
+        hedge_call = client.place_limit_order.call_args_list[-1].kwargs
+        assert hedge_call["side"] == "no" and hedge_call["price"] == pytest.approx(0.56)
+        _assert_no_rest_polls(client)
+
+    def test_partial_fills_accumulate(self, mgr, client):
+        pos = _open(mgr)
+        mgr.handle_ws_fill("KXT", pos.no_order_id, "no", 1)
+        mgr.handle_ws_fill("KXT", pos.no_order_id, "no", 2)
+        assert pos.state == PositionState.QUOTING
+        mgr.handle_ws_fill("KXT", pos.no_order_id, "no", 1)
+        assert pos.state == PositionState.ONE_SIDE_HEDGED
+        assert pos.filled_side == "no"
+
+    def test_hedge_fill_books_spread(self, mgr, client):
+        pos = _open(mgr)
+        mgr.handle_ws_fill("KXT", pos.yes_order_id, "yes", 4)
+        mgr.handle_ws_fill("KXT", pos.hedge_order_id, "no", 4)
+        assert pos.state == PositionState.BOTH_FILLED
+        fee = 0.07 * (0.44 + 0.56) * 4
+        assert pos.realised_pnl == pytest.approx((1.0 - 0.44 - 0.56) * 4 - fee)
+        _assert_no_rest_polls(client)
+
+    def test_untracked_fill_ignored(self, mgr, client):
+        pos = _open(mgr)
+        mgr.handle_ws_fill("KXT", "someone-else", "yes", 4)
+        mgr.handle_ws_fill("KXOTHER", pos.yes_order_id, "yes", 4)
+        assert pos.state == PositionState.QUOTING
+
+    def test_cancel_event_goes_idle(self, mgr, client):
+        pos = _open(mgr)
+        mgr.handle_ws_order_update("KXT", pos.no_order_id, "canceled")
+        assert pos.state == PositionState.IDLE
+        client.cancel_order.assert_called_once_with(pos.yes_order_id)
+        _assert_no_rest_polls(client)
+
+    def test_executed_order_event_counts_as_fill(self, mgr, client):
+        pos = _open(mgr)
+        mgr.handle_ws_order_update("KXT", pos.yes_order_id, "executed")
+        assert pos.state == PositionState.ONE_SIDE_HEDGED
+
+    def test_resting_update_is_noop(self, mgr, client):
+        pos = _open(mgr)
+        mgr.handle_ws_order_update("KXT", pos.yes_order_id, "resting")
+        assert pos.state == PositionState.QUOTING
+
+    def test_legacy_mode_refreshes_over_rest(self, client):
+        mgr = OrderManager(client, _config(event_driven=False))
+        pos = _open(mgr)
+        client.get_order_status.return_value = Order(
+            pos.yes_order_id, "KXT", "yes", "buy", 0.44, 4, "filled",
+        )
+        client.get_open_orders.return_value = [
+            Order(pos.no_order_id, "KXT", "no", "buy", 0.51, 4, "resting"),
+        ]
+        mgr.handle_ws_fill("KXT", pos.yes_order_id, "yes", 4)
+        client.get_open_orders.assert_called_once()
+        assert pos.state == PositionState.ONE_SIDE_HEDGED
+
+
+# ---------------------------------------------------------------------------
+# Local refresh vs reconciliation sweep
+# ---------------------------------------------------------------------------
+
+def _try_lock(mgr: OrderManager, seen: dict) -> None:
+    seen["lock_free"] = mgr._lock.acquire(timeout=1.0)
+    if seen["lock_free"]:
+        mgr._lock.release()
+
+
+class TestRefreshModes:
+    def test_local_refresh_makes_no_status_calls(self, mgr, client):
+        pos = _open(mgr)
+        mgr.refresh_all(reconcile=False)
+        assert pos.state == PositionState.QUOTING
+        _assert_no_rest_polls(client)
+
+    def test_local_refresh_requotes_stale_orders(self, mgr, client):
+        pos = _open(mgr)
+        pos.last_quote_time = time.time() - 7_200
+        mgr.refresh_all(reconcile=False)
+        assert pos.state == PositionState.IDLE
+        cancelled = {c.args[0] for c in client.cancel_order.call_args_list}
+        assert cancelled == {pos.yes_order_id, pos.no_order_id}
+        _assert_no_rest_polls(client)
+
+    def test_local_refresh_applies_missed_event(self, mgr, client):
+        pos = _open(mgr)
+        mgr._order_events[pos.yes_order_id] = "filled"   # recorded, not yet applied
+        mgr.refresh_all(reconcile=False)
+        assert pos.state == PositionState.ONE_SIDE_HEDGED
+        _assert_no_rest_polls(client)
+
+    def test_reconcile_uses_rest_and_ws_status(self, mgr, client):
+        pos = _open(mgr)
+        mgr.handle_ws_order_update("KXT", "stale-order", "canceled")
+        client.get_open_orders.return_value = [
+            Order(pos.no_order_id, "KXT", "no", "buy", 0.51, 4, "resting"),
+        ]
+        client.get_order_status.return_value = Order(
+            pos.yes_order_id, "KXT", "yes", "buy", 0.44, 4, "filled",
+        )
+        mgr.refresh_all(reconcile=True)
+        client.get_open_orders.assert_called_once()
+        client.get_order_status.assert_called_once_with(pos.yes_order_id)
+        assert pos.state == PositionState.ONE_SIDE_HEDGED
+        assert "stale-order" not in mgr._order_events
+
+
+    def test_reconcile_reads_without_lock(self, mgr, client):
+        pos = _open(mgr)
+        seen = {}
+
+        def get_open_orders():
+            # A WS fill arriving mid-sweep must not wait for the REST reads
+            probe = threading.Thread(target=_try_lock, args=(mgr, seen))
+            probe.start()
+            probe.join()
+            return [Order(oid, "KXT", side, "buy", 0.5, 4, "resting")
+                    for oid, side in ((pos.yes_order_id, "yes"), (pos.no_order_id, "no"))]
+
+        client.get_open_orders.side_effect = get_open_orders
+        mgr.refresh_all(reconcile=True)
+        assert seen["lock_free"]
+        assert pos.state == PositionState.QUOTING
+
+    def test_ws_cancel_during_batched_pass_is_sent(self, client):
+        cfg = _config()
+        cfg.batch_orders = True
+        mgr = OrderManager(client, cfg)
+        pos = _open(mgr)
+        mgr._pass.pending_cancels = []      # main loop mid-pass, queueing its cancels
+        ws = threading.Thread(
+            target=mgr.handle_ws_order_update, args=("KXT", pos.no_order_id, "canceled"),
+        )
+        ws.start()
+        ws.join()
+        client.cancel_order.assert_called_once_with(pos.yes_order_id)
+        assert mgr._pass.pending_cancels == []
+        assert pos.state == PositionState.IDLE
+
+
+# ---------------------------------------------------------------------------
+# Wiring: WebSocket client and bot
+# ---------------------------------------------------------------------------
+
+class TestWiring:
+    def test_ws_dispatches_order_updates(self):
+        updates = []
+        ws = KalshiWebSocket(
+            _config(), on_fill=MagicMock(),
+            on_order_update=lambda *a: updates.append(a),
+        )
+        sock = MagicMock()
+        ws._on_open(sock)
+        assert json.loads(sock.send.call_args.args[0])["params"]["channels"] == [
+            "fill", "user_orders",
+        ]
+        ws._on_message(sock, json.dumps({
+            "type": "user_order",
+            "msg": {"ticker": "KXT", "order_id": "ord-1", "status": "canceled"},
+        }))
+        assert updates == [("KXT", "ord-1", "canceled")]
+
+    def test_ws_without_order_callback_only_subscribes_fills(self):
+        ws = KalshiWebSocket(_config(), on_fill=MagicMock())
+        sock = MagicMock()
+        ws._on_open(sock)
+        assert json.loads(sock.send.call_args.args[0])["params"]["channels"] == ["fill"]
+
+    def test_bot_reconciles_when_due_or_ws_down(self):
+        bot = KalshiBot(BotConfig(dry_run=True, event_driven=True, reconcile_interval=600))
+        assert bot._reconcile_due()                       # no WS (dry run)
+        bot._ws = MagicMock(connected=True)
+        bot._last_reconcile = time.time()
+        assert not bot._reconcile_due()
+        bot._last_reconcile = time.time() - 601
+        assert bot._reconcile_due()
+        bot._last_reconcile = time.time()
+        bot._ws.connected = False
+        assert bot._reconcile_due()
+
+
+# ---------------------------------------------------------------------------
+# Online fill model labels
+# ---------------------------------------------------------------------------
+
+class TestOnlineFillLabels:
+    @pytest.fixture
+    def learning(self, client):
+        model = MagicMock()
+        mgr = OrderManager(client, _config(), fill_model=model)
+        mgr.note_market(MarketInfo(
+            ticker="KXT", title="Test market", yes_bid=0.45, yes_ask=0.49, no_bid=0.51,
+            no_ask=0.55, mid_price=0.47, spread=0.04, volume_24h=8_000.0,
+            open_interest=0.0, close_time="", status="open",
+        ))
+        return mgr, model
+
+    def test_ws_fill_labels_leg_filled(self, learning):
+        mgr, model = learning
+        pos = _open(mgr)
+        mgr.handle_ws_fill("KXT", pos.yes_order_id, "yes", 4)
+        model.observe.assert_called_once_with(
+            pytest.approx(0.03), 8_000.0, 0.04, filled=True, hours=pytest.approx(0.0, abs=0.01),
+        )
+
+    def test_stale_cancel_labels_both_legs_unfilled(self, learning):
+        mgr, model = learning
+        pos = _open(mgr)
+        pos.last_quote_time = time.time() - 7_200
+        mgr.refresh_all(reconcile=False)
+        depths = sorted(c.args[0] for c in model.observe.call_args_list)
+        assert depths == pytest.approx([0.02, 0.03])
+        assert all(c.kwargs["filled"] is False for c in model.observe.call_args_list)
+        # Exposure is reported so the model learns a per-hour rate
+        assert all(c.kwargs["hours"] == pytest.approx(2.0, abs=0.01)
+                   for c in model.observe.call_args_list)
+
+    def test_hedge_fill_not_labelled(self, learning):
+        mgr, model = learning
+        pos = _open(mgr)
+        mgr.handle_ws_fill("KXT", pos.no_order_id, "no", 4)
+        mgr.handle_ws_fill("KXT", pos.hedge_order_id, "yes", 4)
+        assert model.observe.call_count == 1   # hedges are not quotes
+
+    def test_no_model_no_context(self, mgr):
+        _open(mgr)
+        assert mgr._quote_features == {}
@@ -0,0 +1,340 @@
+"""
+Tests for batched order placement / cancellation.
+
+KalshiClient talks to a local stub of the Kalshi order endpoints over real
+HTTP (signed requests included), so the batch request shapes, chunking and
+per-order error handling are exercised end to end.
+"""
+
+from __future__ import annotations
+
+import base64
+import itertools
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import urlparse
+
+import pytest
+from cryptography.hazmat.primitives import hashes, serialization
+from cryptography.hazmat.primitives.asymmetric import padding, rsa
+
+from kalshi_bot.client import KalshiClient, OrderIntent
+from kalshi_bot.config import BotConfig, RiskParams
+from kalshi_bot.order_manager import OrderManager, PositionState, QuoteRequest
+
+
+API_PREFIX = "/trade-api/v2"
+
+
+# ---------------------------------------------------------------------------
+# Stub Kalshi order API
+# ---------------------------------------------------------------------------
+
+class KalshiStub:
+    """
+    In-process HTTP server implementing the order endpoints the client uses.
+
+    Orders for tickers containing "BAD" are rejected ("BADNO" rejects only
+    the NO leg); set fail_status to make every write request fail with that
+    HTTP status, and delay to hold every response for that many seconds.
+    Orders moved from `resting` to `closed` report their closed status.
+    """
+
+    def __init__(self) -> None:
+        self.requests: list[tuple[str, str, dict, object]] = []
+        self.resting: dict[str, dict] = {}
+        self.closed: dict[str, dict] = {}
+        self.fail_status: int | None = None
+        self.delay = 0.0
+        self._ids = itertools.count(1)
+        self._lock = threading.Lock()
+        stub = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def log_message(self, *args):
+                pass
+
+            def _body(self):
+                n = int(self.headers.get("Content-Length") or 0)
+                return json.loads(self.rfile.read(n)) if n else None
+
+            def _reply(self, status: int, payload: dict) -> None:
+                data = json.dumps(payload).encode()
+                self.send_response(status)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(data)))
+                self.end_headers()
+                self.wfile.write(data)
+
+            def _handle(self, method: str) -> None:
+                body = self._body()
+                path = urlparse(self.path).path
+                with stub._lock:
+                    stub.requests.append((method, path, dict(self.headers), body))
+                    status, payload = stub.route(method, path[len(API_PREFIX):], body)
+                if stub.delay:
+                    time.sleep(stub.delay)
+                self._reply(status, payload)
+
+            def do_GET(self):
+                self._handle("GET")
+
+            def do_POST(self):
+                self._handle("POST")
+
+            def do_DELETE(self):
+                self._handle("DELETE")
+
+        self.server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        self.base = f"http://127.0.0.1:{self.server.server_address[1]}{API_PREFIX}"
+        self._thread = threading.Thread(
+            target=self.server.serve_forever, kwargs={"poll_interval": 0.01}, daemon=True,
+        )
+
+    def __enter__(self) -> "KalshiStub":
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.server.shutdown()
+        self.server.server_close()
+
+    # ── routing ────────────────────────────────────────────────────────────
+
+    def _create(self, body: dict) -> dict:
+        ticker = body["ticker"]
+        if "BAD" in ticker and ("BADNO" not in ticker or body["side"] == "no"):
+            return {"order": None, "error": {"code": "invalid_order", "message": "rejected"}}
+        order_id = f"ord-{next(self._ids)}"
+        self.resting[order_id] = {**body, "order_id": order_id, "status": "resting"}
+        return {"order": self.resting[order_id], "error": None}
+
+    def route(self, method: str, path: str, body) -> tuple[int, dict]:
+        if method in ("POST", "DELETE") and self.fail_status:
+            return self.fail_status, {"error": "forced failure"}
+        if method == "POST" and path == "/portfolio/orders/batched":
+            return 201, {"orders": [self._create(o) for o in body["orders"]]}
+        if method == "POST" and path == "/portfolio/orders":
+            result = self._create(body)
+            return (201, result) if result["order"] else (400, result)
+        if method == "DELETE" and path == "/portfolio/orders/batched":
+            out = []
+            for order_id in body["ids"]:
+                order = self.resting.pop(order_id, None)
+                out.append({
+                    "order_id": order_id,
+                    "order": order,
+                    "error": None if order else {"code": "not_found"},
+                })
+            return 200, {"orders": out}
+        if method == "DELETE" and path.startswith("/portfolio/orders/"):
+            order = self.resting.pop(path.rsplit("/", 1)[1], None)
+            return (200, {"order": order}) if order else (404, {"error": "not_found"})
+        if method == "GET" and path == "/portfolio/orders":
+            return 200, {"orders": list(self.resting.values())}
+        if method == "GET" and path.startswith("/portfolio/orders/"):
+            order_id = path.rsplit("/", 1)[1]
+            order = self.resting.get(order_id) or self.closed.get(order_id)
+            return (200, {"order": order}) if order else (404, {"error": "not_found"})
+        if method == "GET" and path.endswith("/orderbook"):
+            if "BAD" in path:
+                return 404, {"error": "no book"}
+            return 200, {"orderbook": {"yes": [[45, 10]], "no": [[51, 10]]}}
+        if method == "GET" and path.startswith("/markets/"):
+            return 200, {"market": {"ticker": path.rsplit("/", 1)[1], "status": "settled"}}
+        if method == "GET" and path == "/portfolio/balance":
+            return 200, {"balance": 50_000}
+        if method == "GET" and path == "/portfolio/positions":
+            return 200, {"market_positions": []}
+        return 404, {"error": f"no route {method} {path}"}
+
+    def calls(self, method: str, path: str) -> list:
+        return [b for m, p, _, b in self.requests if m == method and p == API_PREFIX + path]
+
+
+# ---------------------------------------------------------------------------
+# Fixtures
+# ---------------------------------------------------------------------------
+
+@pytest.fixture(scope="module")
+def private_key():
+    return rsa.generate_private_key(public_exponent=65537, key_size=2048)
+
+
+@pytest.fixture
+def stub():
+    with KalshiStub() as s:
+        yield s
+
+
+def _config(private_key, batch_orders: bool) -> BotConfig:
+    pem = private_key.private_bytes(
+        serialization.Encoding.PEM,
+        serialization.PrivateFormat.PKCS8,
+        serialization.NoEncryption(),
+    ).decode()
+    return BotConfig(
+        api_key_id="test-key",
+        private_key_pem=pem,
+        dry_run=False,
+        batch_orders=batch_orders,
+        risk=RiskParams(max_fill_cost=1.0, max_order_age=3_600),
+    )
+
+
+def _client(stub: KalshiStub, config: BotConfig) -> KalshiClient:
+    client = KalshiClient(config)
+    client._base = stub.base
+    for limiter in (client._read_limiter, client._write_limiter):
+        limiter._rate = limiter._tokens = 1e6
+    return client
+
+
+@pytest.fixture
+def client(stub, private_key):
+    return _client(stub, _config(private_key, batch_orders=True))
+
+
+def _intents(n: int, prefix: str = "KXT") -> list[OrderIntent]:
+    return [
+        OrderIntent(f"{prefix}-{i}", "yes" if i % 2 == 0 else "no", "buy", 0.44, 3)
+        for i in range(n)
+    ]
+
+
+# ---------------------------------------------------------------------------
+# KalshiClient batch endpoints
+# ---------------------------------------------------------------------------
+
+class TestClientBatch:
+    def test_place_chunks_and_preserves_order(self, stub, client):
+        ids = client.place_orders_batch(_intents(45))
+        batches = stub.calls("POST", "/portfolio/orders/batched")
+        assert [len(b["orders"]) for b in batches] == [20, 20, 5]
+        assert ids == [f"ord-{i}" for i in range(1, 46)]
+        sent = [o for b in batches for o in b["orders"]]
+        assert [o["ticker"] for o in sent] == [f"KXT-{i}" for i in range(45)]
+        assert sent[0]["yes_price"] == 44 and sent[1]["yes_price"] == 56
+
+    def test_requests_are_signed(self, stub, client, private_key):
+        client.place_orders_batch(_intents(2))
+        _, path, headers, _ = stub.requests[-1]
+        ts = headers["KALSHI-ACCESS-TIMESTAMP"]
+        signature = base64.b64decode(headers["KALSHI-ACCESS-SIGNATURE"])
+        private_key.public_key().verify(
+            signature,
+            (ts + "POST" + path).encode(),
+            padding.PSS(mgf=padding.MGF1(hashes.SHA256()), salt_length=padding.PSS.DIGEST_LENGTH),
+            hashes.SHA256(),
+        )
+        assert headers["KALSHI-ACCESS-KEY"] == "test-key"
+
+    def test_rejected_orders_are_none(self, stub, client):
+        intents = _intents(3)
+        intents[1].ticker = "KXBAD-1"
+        ids = client.place_orders_batch(intents)
+        assert ids[0] and ids[2] and ids[1] is None
+
+    def test_http_failure_fails_whole_chunk(self, stub, client):
+        stub.fail_status = 400
+        assert client.place_orders_batch(_intents(3)) == [None, None, None]
+        assert client.cancel_orders_batch(["a", "b"]) == [False, False]
+
+    def test_cancel_reports_per_order(self, stub, client):
+        ids = client.place_orders_batch(_intents(25))
+        ok = client.cancel_orders_batch(ids + ["ord-unknown"])
+        assert ok == [True] * 25 + [False]
+        assert [len(b["ids"]) for b in stub.calls("DELETE", "/portfolio/orders/batched")] == [20, 6]
+        assert stub.resting == {}
+
+    def test_dry_run_makes_no_requests(self, stub, private_key):
+        cfg = _config(private_key, batch_orders=True)
+        cfg.dry_run = True
+        dry = _client(stub, cfg)
+        assert all(dry.place_orders_batch(_intents(3)))
+        assert dry.cancel_orders_batch(["x"]) == [True]
+        assert stub.requests == []
+
+
+# ---------------------------------------------------------------------------
+# OrderManager batch mode
+# ---------------------------------------------------------------------------
+
+def _quotes(n: int, prefix: str = "KXM") -> list[QuoteRequest]:
+    return [QuoteRequest(f"{prefix}-{i}", f"Market {i}", 0.44, 0.51, 2) for i in range(n)]
+
+
+class TestOrderManagerBatch:
+    def test_open_positions_single_round_trip_per_chunk(self, stub, client):
+        mgr = OrderManager(client, client.cfg)
+        positions = mgr.open_positions(_quotes(10))
+        assert [len(b["orders"]) for b in stub.calls("POST", "/portfolio/orders/batched")] == [20]
+        assert stub.calls("POST", "/portfolio/orders") == []
+        assert all(p.state == PositionState.QUOTING for p in positions)
+        for p in positions:
+            assert stub.resting[p.yes_order_id]["side"] == "yes"
+            assert stub.resting[p.no_order_id]["side"] == "no"
+            assert stub.resting[p.yes_order_id]["ticker"] == p.ticker
+
+    def test_pairs_never_split_across_chunks(self, stub, client):
+        mgr = OrderManager(client, client.cfg)
+        mgr.open_positions(_quotes(15))
+        for batch in stub.calls("POST", "/portfolio/orders/batched"):
+            tickers = [o["ticker"] for o in batch["orders"]]
+            assert tickers[0::2] == tickers[1::2]
+
+    def test_rejected_leg_cancels_survivor(self, stub, client):
+        mgr = OrderManager(client, client.cfg)
+        quotes = _quotes(3) + [
+            QuoteRequest("KXBAD-8", "Bad", 0.44, 0.51, 2),
+            QuoteRequest("KXBADNO-9", "Half bad", 0.44, 0.51, 2),
+        ]
+        positions = mgr.open_positions(quotes)
+        assert [p.state for p in positions] == (
+            [PositionState.QUOTING] * 3 + [PositionState.IDLE] * 2
+        )
+        (cancel,) = stub.calls("DELETE", "/portfolio/orders/batched")
+        assert len(cancel["ids"]) == 1   # the surviving YES leg of KXBADNO-9
+        assert len(stub.resting) == 6
+        assert all(o["ticker"].startswith("KXM") for o in stub.resting.values())
+
+    def test_skipped_requests_are_not_submitted(self, stub, client):
+        mgr = OrderManager(client, client.cfg)
+        mgr.open_positions(_quotes(1))
+        positions = mgr.open_positions(_quotes(2) + [QuoteRequest("KXW", "Wide", 0.60, 0.60, 2)])
+        assert [p.state for p in positions] == [
+            PositionState.QUOTING, PositionState.QUOTING, PositionState.IDLE,
+        ]
+        assert [len(b["orders"]) for b in stub.calls("POST", "/portfolio/orders/batched")] == [2, 2]
+
+    def test_refresh_batches_stale_cancels(self, stub, client):
+        mgr = OrderManager(client, client.cfg)
+        positions = mgr.open_positions(_quotes(6))
+        for p in positions:
+            p.last_quote_time = time.time() - 7_200
+        mgr.refresh_all()
+        cancels = stub.calls("DELETE", "/portfolio/orders/batched")
+        assert [len(b["ids"]) for b in cancels] == [12]
+        assert all(p.state == PositionState.IDLE for p in positions)
+        assert stub.resting == {}
+
+    def test_close_position_uses_batch_cancel(self, stub, client):
+        mgr = OrderManager(client, client.cfg)
+        (pos,) = mgr.open_positions(_quotes(1))
+        mgr.close_position(pos.ticker)
+        assert [b["ids"] for b in stub.calls("DELETE", "/portfolio/orders/batched")] == [
+            [pos.yes_order_id, pos.no_order_id],
+        ]
+        assert pos.state == PositionState.RESOLVED
+
+    def test_unbatched_mode_uses_single_endpoints(self, stub, private_key):
+        client = _client(stub, _config(private_key, batch_orders=False))
+        mgr = OrderManager(client, client.cfg)
+        pos = mgr.open_position("KXS", "Single", 0.44, 0.51, 2)
+        mgr.close_position(pos.ticker)
+        assert len(stub.calls("POST", "/portfolio/orders")) == 2
+        assert stub.calls("POST", "/portfolio/orders/batched") == []
+        assert stub.calls("DELETE", "/portfolio/orders/batched") == []
+        assert stub.resting == {}
@@ -0,0 +1,117 @@
+"""
+Tests for the multi-seed Monte Carlo runner.
+
+Every (seed, scenario) cell must equal a direct run_scenario call, the
+result must not depend on the worker count or chunking (batched paths
+included), and the summary statistics must match NumPy computed by hand.
+"""
+
+from __future__ import annotations
+
+import math
+
+import numpy as np
+import pytest
+
+from kalshi_bot.backtester import Backtester
+from kalshi_bot.config import BotConfig
+from kalshi_bot.monte_carlo import (
+    METRICS,
+    TOTAL,
+    MetricSummary,
+    MonteCarloResult,
+    run_monte_carlo,
+)
+from kalshi_bot.synthetic_data import SCENARIOS
+from kalshi_bot.vector_backtester import VectorizedBacktester
+
+SCENARIOS_SUBSET = [s for s in SCENARIOS if s.name in ("calm_50_50", "black_swan")]
+SEEDS = [42 + i * 137 for i in range(6)]
+CFG = BotConfig(dry_run=True)
+
+
+@pytest.fixture(scope="module")
+def serial() -> MonteCarloResult:
+    return run_monte_carlo(CFG, SCENARIOS_SUBSET, SEEDS, engine=VectorizedBacktester)
+
+
+class TestRunMonteCarlo:
+    def test_cells_match_run_scenario(self, serial):
+        assert serial.values.shape == (len(SEEDS), len(SCENARIOS_SUBSET), len(METRICS))
+        assert serial.scenario_names == ["calm_50_50", "black_swan"]
+        for i, seed in enumerate(SEEDS):
+            for j, scenario in enumerate(SCENARIOS_SUBSET):
+                r = Backtester(CFG).run_scenario(scenario, seed=seed)
+                assert serial.metric("net_pnl")[i, j] == r.net_pnl
+                assert serial.metric("max_drawdown")[i, j] == r.max_portfolio_drawdown
+                assert serial.metric("positions_opened")[i, j] == sum(
+                    m.positions_opened for m in r.markets
+                )
+
+    @pytest.mark.parametrize("workers,chunk_size", [(1, 4), (2, None), (3, 1)])
+    def test_independent_of_workers(self, serial, workers, chunk_size):
+        progress = []
+        result = run_monte_carlo(
+            CFG, SCENARIOS_SUBSET, SEEDS, engine=VectorizedBacktester,
+            workers=workers, chunk_size=chunk_size,
+            progress=lambda done, total: progress.append((done, total)),
+        )
+        np.testing.assert_array_equal(result.values, serial.values)
+        np.testing.assert_array_equal(result.seeds, SEEDS)
+        assert progress[-1] == (len(SEEDS), len(SEEDS))
+
+    def test_path_cache_dir(self, serial, tmp_path):
+        result = run_monte_carlo(
+            CFG, SCENARIOS_SUBSET, SEEDS[:2], engine=VectorizedBacktester,
+            cache_dir=str(tmp_path),
+        )
+        np.testing.assert_array_equal(result.values, serial.values[:2])
+        assert list(tmp_path.glob("black_swan-*.npz"))
+
+    def test_batched_paths_independent_of_chunking(self, serial):
+        kw = dict(engine=VectorizedBacktester, batched=True)
+        batched = run_monte_carlo(CFG, SCENARIOS_SUBSET, SEEDS, **kw)
+        again = run_monte_carlo(CFG, SCENARIOS_SUBSET, SEEDS, workers=2, chunk_size=4, **kw)
+        np.testing.assert_array_equal(again.values, batched.values)
+        # Different draws from the same processes, not the run_scenario paths
+        assert not np.array_equal(batched.values, serial.values)
+        assert batched.metric("positions_opened").min() > 0
+
+    def test_rejects_no_seeds(self):
+        with pytest.raises(ValueError):
+            run_monte_carlo(CFG, SCENARIOS_SUBSET, [])
+        with pytest.raises(ValueError):
+            run_monte_carlo(CFG, SCENARIOS_SUBSET, SEEDS, batched=True, cache_dir="paths")
+
+
+class TestSummary:
+    def test_summary_statistics(self, serial):
+        summaries = serial.summary(confidence=0.90)
+        assert [s.scenario_name for s in summaries] == ["calm_50_50", "black_swan", TOTAL]
+
+        pnl = serial.metric("net_pnl")[:, 1]
+        swan = summaries[1]
+        assert swan.n_seeds == len(SEEDS)
+        assert swan.pnl.mean == pytest.approx(pnl.mean())
+        half = 1.6448536 * pnl.std(ddof=1) / math.sqrt(len(pnl))
+        assert (swan.pnl.ci_low, swan.pnl.ci_high) == pytest.approx(
+            (pnl.mean() - half, pnl.mean() + half)
+        )
+        assert (swan.pnl.q_low, swan.pnl.median, swan.pnl.q_high) == pytest.approx(
+            tuple(np.quantile(pnl, [0.05, 0.5, 0.95]))
+        )
+        assert swan.win_rate == pytest.approx((pnl > 0).mean())
+
+        total = summaries[-1]
+        assert total.pnl.mean == pytest.approx(serial.metric("net_pnl").sum(axis=1).mean())
+        assert total.drawdown.mean == pytest.approx(
+            serial.metric("max_drawdown").max(axis=1).mean()
+        )
+
+    def test_single_seed_has_point_interval(self):
+        m = MetricSummary.of(np.array([3.0]), 0.95)
+        assert (m.mean, m.ci_low, m.ci_high, m.median) == (3.0, 3.0, 3.0, 3.0)
+
+    def test_rejects_bad_confidence(self, serial):
+        with pytest.raises(ValueError):
+            serial.summary(confidence=1.0)
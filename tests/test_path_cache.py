@@ -0,0 +1,90 @@
+"""
+Tests for the memoized scenario path cache.
+
+A cached path must be exactly what Backtester.run_scenario would generate,
+be produced once per key, survive in an LRU bound and on disk, and be
+impossible to mutate through the view handed to a backtest run.
+"""
+
+from __future__ import annotations
+
+import numpy as np
+import pytest
+
+from kalshi_bot.backtester import Backtester
+from kalshi_bot.config import BotConfig
+from kalshi_bot.path_cache import PathCache, SnapshotView
+from kalshi_bot.synthetic_data import SCENARIOS
+from kalshi_bot.vector_backtester import VectorizedBacktester
+
+BLACK_SWAN = next(s for s in SCENARIOS if s.name == "black_swan")
+
+
+class TestPathCache:
+    def test_view_matches_generated_path(self):
+        cache = PathCache()
+        view = cache.get(BLACK_SWAN, 1, seed=42)
+        expected = BLACK_SWAN.market_snapshots(1, 42)
+        assert len(view) == len(expected)
+        assert list(view) == expected
+        assert view[-1] == expected[-1]
+        assert view[5:8] == expected[5:8]
+        assert view[-1].mid == 0.98   # black-swan shock is baked in
+
+    def test_generates_once_per_key(self):
+        cache = PathCache()
+        first = cache.get(BLACK_SWAN, 0, seed=42)
+        assert cache.get(BLACK_SWAN, 0, seed=42) is first
+        assert cache.get(BLACK_SWAN, 0, seed=43) is not first
+        assert cache.get(BLACK_SWAN, 1, seed=42) is not first
+        assert (cache.hits, cache.misses) == (1, 3)
+
+    def test_lru_bound(self):
+        cache = PathCache(maxsize=2)
+        a = cache.get(BLACK_SWAN, 0, seed=1)
+        cache.get(BLACK_SWAN, 0, seed=2)
+        assert cache.get(BLACK_SWAN, 0, seed=1) is a   # refreshes seed=1
+        cache.get(BLACK_SWAN, 0, seed=3)               # evicts seed=2
+        assert len(cache) == 2
+        assert cache.get(BLACK_SWAN, 0, seed=1) is a
+        misses = cache.misses
+        cache.get(BLACK_SWAN, 0, seed=2)
+        assert cache.misses == misses + 1
+
+    def test_view_is_read_only(self):
+        view = PathCache().get(BLACK_SWAN, 0, seed=42)
+        snap = view[0]
+        snap.mid = 0.99
+        assert view[0].mid != 0.99
+        with pytest.raises(ValueError):
+            view.columns["mid"][0] = 0.99
+
+    def test_persists_to_disk(self, tmp_path):
+        first = PathCache(cache_dir=str(tmp_path)).get(BLACK_SWAN, 1, seed=42)
+        assert len(list(tmp_path.glob("black_swan-*.npz"))) == 1
+
+        cache = PathCache(cache_dir=str(tmp_path))
+        second = cache.get(BLACK_SWAN, 1, seed=42)
+        assert second.ticker == "SWAN-B"
+        for name, col in first.columns.items():
+            np.testing.assert_array_equal(second.columns[name], col)
+        with pytest.raises(ValueError):
+            second.columns["t"][0] = 0.0
+
+
+class TestCachedScenarios:
+    @pytest.mark.parametrize("engine", [Backtester, VectorizedBacktester])
+    def test_same_results_with_and_without_cache(self, engine):
+        cfg = BotConfig(dry_run=True)
+        cache = PathCache()
+        for scenario in SCENARIOS:
+            expected = engine(cfg).run_scenario(scenario, seed=7)
+            cached = engine(cfg, path_cache=cache).run_scenario(scenario, seed=7)
+            again = engine(cfg, path_cache=cache).run_scenario(scenario, seed=7)
+            assert cached == expected
+            assert again == expected
+        assert cache.hits == cache.misses == sum(len(s.markets) for s in SCENARIOS)
+
+    def test_from_snapshots_round_trip(self):
+        snaps = SCENARIOS[0].market_snapshots(0, 3)
+        assert list(SnapshotView.from_snapshots(snaps)) == snaps
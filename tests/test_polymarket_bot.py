@@ -447,3 +447,137 @@ class TestFullCycle:
         assert pos.state == PositionState.BOTH_FILLED
         # Net PnL should be positive
         assert 1.0 - (pos.yes_price + pos.no_price) > 0
+
+
+# ---------------------------------------------------------------------------
+# Optimiser: successive halving
+# ---------------------------------------------------------------------------
+
+def _history(i: int, n_ticks: int = 240) -> "MarketHistory":
+    import math
+    from polymarket_bot.data_fetcher import MarketHistory, PriceTick
+    ticks = [
+        PriceTick(1_700_000_000 + k * 300, 0.5 + 0.08 * math.sin(k / (5 + i)) + 0.01 * (k % 3))
+        for k in range(n_ticks)
+    ]
+    return MarketHistory(f"cond-{i}", f"Market {i}?", "yes", "no", "2024-01-01", "2024-01-02",
+                         ticks, resolved_yes=bool(i % 2))
+
+
+class TestHalvingSweep:
+    GRID = {
+        "order_depth_fraction": [0.60, 0.80, 0.90],
+        "requote_interval_min": [10, 30],
+        "max_fill_cost": [1.00],
+        "num_ladder_levels": [1, 2],
+    }
+
+    def test_rungs(self):
+        from polymarket_bot.optimize import _halving_rungs
+        assert _halving_rungs(12, 3) == [1, 2, 4, 12]
+        assert _halving_rungs(1, 3) == [1]
+        for eta in (0, 1):
+            with pytest.raises(ValueError):
+                _halving_rungs(12, eta)
+
+    def test_survivors_match_full_sweep(self):
+        from polymarket_bot.optimize import run_halving_sweep, run_sweep
+        markets = [_history(i) for i in range(4)]
+        full = {pt.key(): pt for pt in run_sweep(markets, self.GRID)}
+        survivors = run_halving_sweep(markets, self.GRID, eta=2)
+        # 12 configs on 1 market → 6 on 2 → 3 on all 4
+        assert len(survivors) == 3
+        for pt in survivors:
+            assert pt == full[pt.key()]
+
+    def test_single_market_is_exhaustive(self):
+        from polymarket_bot.optimize import run_halving_sweep, run_sweep
+        markets = [_history(0)]
+        assert run_halving_sweep(markets, self.GRID) == run_sweep(markets, self.GRID)
+
+
+# ---------------------------------------------------------------------------
+# Optimiser: TPE model-based search
+# ---------------------------------------------------------------------------
+
+class TestTPESampler:
+    @staticmethod
+    def _space():
+        from polymarket_bot.tpe import Param
+        return {
+            "d": Param(0.30, 0.95, step=0.01),
+            "r": Param(5, 60, step=1, log=True),
+            "c": Param(0.98, 1.04, step=0.005),
+            "l": Param(1, 3, step=1),
+        }
+
+    @staticmethod
+    def _objective(p: dict) -> float:
+        import math
+        return (-((p["d"] - 0.72) / 0.3) ** 2 - math.log(p["r"] / 17) ** 2
+                - ((p["c"] - 1.01) / 0.03) ** 2 - 0.3 * (p["l"] - 2) ** 2)
+
+    def _best(self, seed: int, n_startup: int, n_batches: int = 15) -> float:
+        from polymarket_bot.tpe import TPESampler
+        sampler = TPESampler(self._space(), seed=seed, n_startup=n_startup)
+        for _ in range(n_batches):
+            for params in sampler.ask(4):
+                sampler.tell(params, self._objective(params))
+        return sampler.best[1]
+
+    def test_param_decode_respects_range_and_step(self):
+        from polymarket_bot.tpe import Param
+        reqt = Param(5, 60, step=1, log=True)
+        assert [reqt.decode(u) for u in (0.0, 1.0, -1.0, 2.0)] == [5, 60, 5, 60]
+        assert isinstance(reqt.decode(0.5), int)
+        cost = Param(0.98, 1.04, step=0.005)
+        assert cost.decode(cost.encode(1.0149)) == pytest.approx(1.015)
+        with pytest.raises(ValueError):
+            Param(0, 1, log=True)
+
+    def test_batch_is_distinct_and_in_range(self):
+        from polymarket_bot.tpe import TPESampler
+        sampler = TPESampler(self._space(), seed=3, n_startup=4)
+        for _ in range(5):
+            batch = sampler.ask(4)
+            for params in batch:
+                sampler.tell(params, self._objective(params))
+        keys = [tuple(p.values()) for p, _ in sampler.trials]
+        assert len(set(keys)) == len(keys) == 20
+        for params, _ in sampler.trials:
+            assert 0.30 <= params["d"] <= 0.95 and 5 <= params["r"] <= 60
+            assert params["l"] in (1, 2, 3)
+
+    def test_beats_random_search(self):
+        tpe = [self._best(seed, n_startup=10) for seed in range(24)]
+        rand = [self._best(seed, n_startup=10_000) for seed in range(24)]
+        assert sum(tpe) / len(tpe) > sum(rand) / len(rand)
+
+
+class TestBayesOpt:
+    def test_evaluates_trials_and_matches_grid_points(self):
+        from polymarket_bot.backtest import BacktestConfig, run_backtest
+        from polymarket_bot.optimize import FIXED, _sweep_point, run_bayes_opt
+        markets = [_history(i) for i in range(3)]
+        results = run_bayes_opt(markets, n_trials=10, batch_size=3, n_startup=4, seed=1)
+        assert len(results) == 10
+        assert len({pt.key() for pt in results}) == 10
+        pt = results[-1]
+        params = dict(zip(
+            ("order_depth_fraction", "requote_interval_min", "max_fill_cost",
+             "num_ladder_levels"), pt.key(),
+        ))
+        expected = _sweep_point(params, run_backtest(markets, BacktestConfig(**{**FIXED, **params})))
+        assert pt == expected
+
+    def test_parallel_matches_serial(self):
+        from polymarket_bot.optimize import run_bayes_opt
+        markets = [_history(i) for i in range(2)]
+        kw = dict(n_trials=8, batch_size=4, n_startup=4, seed=5, metric="sharpe_proxy")
+        assert run_bayes_opt(markets, workers=2, **kw) == run_bayes_opt(markets, **kw)
+
+    @pytest.mark.parametrize("kw", [dict(batch_size=0), dict(n_trials=0), dict(n_trials=-5)])
+    def test_rejects_empty_search(self, kw):
+        from polymarket_bot.optimize import run_bayes_opt
+        with pytest.raises(ValueError):
+            run_bayes_opt([_history(0)], **kw)
@@ -0,0 +1,126 @@
+"""
+Tests for retention: partitioned archives, downsampling and cold storage.
+
+load_snapshots / list_tickers must read the same history before and after
+rows leave the hot database, downsampled partitions must shrink to one row
+per ticker per bucket, closed markets must round-trip through cold storage,
+and repeating a pass must change nothing.
+"""
+
+from __future__ import annotations
+
+import os
+import sqlite3
+
+import pytest
+
+from kalshi_bot.data_collector import SnapshotWriter
+from kalshi_bot.historical_replay import list_tickers, load_snapshots
+from kalshi_bot.retention import RetentionPolicy, apply_retention, archived_summary
+
+DAY = 86_400
+NOW = 1_760_000_000 // DAY * DAY
+STEP = 1800          # one poll per half hour
+DAYS = 40
+
+
+def _rows(ticker: str, start: float, end: float, status: str = "active") -> list[tuple]:
+    out = []
+    for k, ts in enumerate(range(int(start), int(end), STEP)):
+        mid = 0.3 + (k % 50) / 100
+        out.append((ts, ticker, mid - 0.01, mid + 0.01, 1000.0 + k, 500.0, mid, 0.02, status))
+    return out
+
+
+@pytest.fixture
+def db(tmp_path):
+    path = str(tmp_path / "market_data.db")
+    writer = SnapshotWriter(path)
+    writer.submit(_rows("KXOPEN", NOW - DAYS * DAY, NOW))
+    writer.submit(_rows("KXSHORT", NOW - 3 * DAY, NOW))
+    # Settled 10 days ago: last row carries the closed status.
+    closed = _rows("KXDONE", NOW - 30 * DAY, NOW - 10 * DAY)
+    closed[-1] = closed[-1][:-1] + ("settled",)
+    writer.submit(closed)
+    # Delisted without a closing status: not seen for 20 days.
+    writer.submit(_rows("KXGONE", NOW - 35 * DAY, NOW - 20 * DAY))
+    writer.close()
+    return path
+
+
+def _hot(db: str, ticker: str) -> int:
+    with sqlite3.connect(db) as conn:
+        return conn.execute(
+            "SELECT COUNT(*) FROM market_snapshots WHERE ticker = ?", (ticker,),
+        ).fetchone()[0]
+
+
+def _policy(tmp_path, **kw) -> RetentionPolicy:
+    return RetentionPolicy(archive_dir=str(tmp_path / "archive"), **kw)
+
+
+class TestRetention:
+    def test_reads_unchanged_after_partitioning(self, db, tmp_path):
+        before = {t: load_snapshots(db, t) for t in ("KXOPEN", "KXSHORT", "KXDONE", "KXGONE")}
+        listed = sorted(list_tickers(db, 1))
+        report = apply_retention(db, _policy(tmp_path, period="day", downsample_days=365), NOW)
+
+        assert report.partitions == DAYS - 14
+        assert report.closed_tickers == 2
+        assert _hot(db, "KXOPEN") == 14 * DAY // STEP
+        assert _hot(db, "KXDONE") == _hot(db, "KXGONE") == 0
+        for ticker, snaps in before.items():
+            assert load_snapshots(db, ticker) == snaps
+        assert sorted(list_tickers(db, 1)) == listed
+
+    def test_closed_markets_go_to_cold_storage(self, db, tmp_path):
+        policy = _policy(tmp_path)
+        apply_retention(db, policy, NOW)
+        closed = os.path.join(policy.archive_dir, "closed")
+        assert sorted(os.listdir(closed)) == ["KXDONE.jsonl.gz", "KXGONE.jsonl.gz"]
+        with sqlite3.connect(db) as conn:
+            summary = {t: n for t, n, _, _ in archived_summary(conn)}
+        assert summary["KXDONE"] == 20 * DAY // STEP
+
+    def test_downsamples_old_partitions(self, db, tmp_path):
+        full = load_snapshots(db, "KXOPEN")
+        report = apply_retention(db, _policy(tmp_path, downsample_days=21), NOW)
+        assert report.downsampled_rows > 0
+
+        snaps = load_snapshots(db, "KXOPEN")
+        assert len(snaps) == len(full) - report.downsampled_rows
+        # t is re-based on the first kept row, so compare by poll index
+        # (volume_usd = 1000 + index).
+        recent = 14 * DAY // STEP
+        key = lambda s: (s.volume_usd, s.yes_bid, s.yes_ask, s.mid)
+        assert [key(s) for s in snaps[-recent:]] == [key(s) for s in full[-recent:]]
+        # Rows older than 28 days sit in partitions that ended ≥ 21 days ago:
+        # one row per hour remains, the last (:30) poll of each.
+        old = [int(s.volume_usd) - 1000 for s in full[:(DAYS - 28) * DAY // STEP]]
+        kept = [int(s.volume_usd) - 1000 for s in snaps if s.volume_usd - 1000 < len(old)]
+        assert kept == [k for k in old if k % 2 == 1]
+
+    def test_repeat_is_noop(self, db, tmp_path):
+        policy = _policy(tmp_path, downsample_days=21)
+        apply_retention(db, policy, NOW)
+        snaps = {t: load_snapshots(db, t) for t in ("KXOPEN", "KXDONE")}
+        listed = sorted(list_tickers(db, 1))
+        again = apply_retention(db, policy, NOW)
+        assert (again.closed_tickers, again.partitioned_rows, again.downsampled_rows) == (0, 0, 0)
+        assert {t: load_snapshots(db, t) for t in snaps} == snaps
+        assert sorted(list_tickers(db, 1)) == listed
+
+    def test_later_pass_extends_partitions(self, db, tmp_path):
+        before = load_snapshots(db, "KXOPEN")
+        policy = _policy(tmp_path, downsample_days=365)
+        apply_retention(db, policy, NOW - 3 * DAY)
+        apply_retention(db, policy, NOW)
+        assert load_snapshots(db, "KXOPEN") == before
+
+    def test_rejects_bad_policy(self, tmp_path):
+        with pytest.raises(ValueError):
+            _policy(tmp_path, period="month")
+        with pytest.raises(ValueError):
+            _policy(tmp_path, raw_days=30, downsample_days=7)
+        with pytest.raises(ValueError):   # shorter than the live vol lookback
+            _policy(tmp_path, raw_days=3)
@@ -0,0 +1,171 @@
+"""
+Tests for the minute / hour OHLC rollups.
+
+Bars folded in incrementally by the collector's writer — in any batch order
+— must equal bars aggregated from all rows at once, readers must pick the
+coarsest resolution that covers their window, and bar-based lookups must
+agree with the same computation over raw rows.
+"""
+
+from __future__ import annotations
+
+import random
+import sqlite3
+import time
+
+import pytest
+
+from kalshi_bot import rollups
+from kalshi_bot.data_collector import SnapshotWriter, open_writer_db
+from kalshi_bot.historical_replay import load_snapshots
+from kalshi_bot.vol_estimator import realized_vol, realized_vol_from_db, vol_ratio
+
+T0 = 1_760_000_000
+
+
+def _rows(n: int, step: float, t0: float = T0, seed: int = 4) -> list[tuple]:
+    rng = random.Random(seed)
+    rows, mid = [], 0.5
+    for k in range(n):
+        mid = min(0.95, max(0.05, mid + rng.gauss(0, 0.01)))
+        spread = rng.choice([0.02, 0.03, 0.04])
+        for ticker in ("KXA", "KXB"):
+            m = mid if ticker == "KXA" else 1 - mid
+            rows.append((t0 + k * step, ticker, m - spread / 2, m + spread / 2,
+                         1000.0 + k, 500.0 + k, m, spread, "active"))
+    return rows
+
+
+def _bars(db: str, res: str) -> list[tuple]:
+    with sqlite3.connect(db) as conn:
+        return conn.execute(f"SELECT * FROM bars_{res} ORDER BY ticker, bucket").fetchall()
+
+
+def _expected(rows: list[tuple], seconds: int) -> list[tuple]:
+    """Naive OHLC per (ticker, bucket)."""
+    groups: dict[tuple, list] = {}
+    for r in rows:
+        groups.setdefault((r[1], int(r[0] // seconds) * seconds), []).append(r)
+    out = []
+    for (ticker, bucket), rs in sorted(groups.items()):
+        rs.sort(key=lambda r: r[0])
+        mids = [r[6] for r in rs]
+        last = rs[-1]
+        out.append((ticker, bucket, mids[0], max(mids), min(mids), mids[-1],
+                    last[7], last[4], last[5], len(rs), rs[0][0], last[0]))
+    return out
+
+
+class TestRollups:
+    def test_incremental_matches_batch(self, tmp_path):
+        rows = _rows(500, 17.0)
+        batches = [rows[i:i + 37] for i in range(0, len(rows), 37)]
+        random.Random(1).shuffle(batches)   # out-of-order delivery
+        db = str(tmp_path / "m.db")
+        writer = SnapshotWriter(db)
+        for batch in batches:
+            writer.submit(batch)
+        writer.close()
+        for res, seconds in rollups.RESOLUTIONS.items():
+            assert _bars(db, res) == pytest.approx(_expected(rows, seconds))
+
+    def test_rebuild_matches_incremental(self, tmp_path):
+        db = str(tmp_path / "m.db")
+        writer = SnapshotWriter(db)
+        writer.submit(_rows(300, 45.0))
+        writer.close()
+        before = {res: _bars(db, res) for res in rollups.RESOLUTIONS}
+        conn = open_writer_db(db)
+        assert rollups.rebuild(conn) == 600
+        conn.close()
+        assert {res: _bars(db, res) for res in rollups.RESOLUTIONS} == before
+
+    def test_since_covers_only_new_rows(self, tmp_path):
+        db = str(tmp_path / "old.db")
+        with sqlite3.connect(db) as conn:
+            conn.execute("CREATE TABLE market_snapshots (id INTEGER PRIMARY KEY, ts INTEGER, "
+                         "ticker TEXT, yes_bid REAL, yes_ask REAL, volume_24h REAL, "
+                         "open_interest REAL, mid REAL, spread REAL, status TEXT)")
+            conn.execute("INSERT INTO market_snapshots (ts, ticker, mid) VALUES (?, 'KXA', 0.5)",
+                         (T0 + 100,))
+        conn = open_writer_db(db)
+        since = rollups.rollups_since(conn)
+        assert since == (T0 // 3600 + 1) * 3600
+        assert rollups.pick_resolution(conn, since - 1, 168 * 3600) is None
+        assert rollups.pick_resolution(conn, since, 168 * 3600) == "1h"
+        assert rollups.pick_resolution(conn, since, 6 * 3600) == "1m"
+        assert rollups.pick_resolution(conn, since, 600) is None
+        conn.close()
+
+    def test_no_rollups_reads_raw(self, tmp_path):
+        from kalshi_bot.data_collector import _SCHEMA
+        db = str(tmp_path / "plain.db")
+        with sqlite3.connect(db) as conn:
+            conn.executescript(_SCHEMA)
+            assert rollups.pick_resolution(conn, T0, 168 * 3600) is None
+
+
+class TestReaders:
+    @pytest.fixture
+    def db(self, tmp_path):
+        """Eight days of minute polls ending now."""
+        now = int(time.time()) // 60 * 60
+        path = str(tmp_path / "m.db")
+        writer = SnapshotWriter(path)
+        writer.submit(_rows(8 * 1440, 60.0, t0=now - (8 * 1440 - 1) * 60))
+        writer.close()
+        return path
+
+    def test_auto_uses_hourly_closes_for_long_windows(self, db):
+        with sqlite3.connect(db) as conn:
+            cutoff = int(time.time()) - 168 * 3600
+            closes = [c for _, c in rollups.read_bars(conn, "KXA", "1h", cutoff)]
+        assert len(closes) in (168, 169)
+        got = realized_vol_from_db("KXA", db, lookback_hours=168, min_obs=4)
+        assert got == pytest.approx(realized_vol(closes, dt_hours=1.0, min_obs=4), rel=1e-9)
+        assert got != pytest.approx(
+            realized_vol_from_db("KXA", db, lookback_hours=168, min_obs=4, resolution=None),
+            rel=1e-6,
+        )
+
+    def test_minute_bars_equal_minute_polls(self, db):
+        for hours in (6, 24):
+            assert realized_vol_from_db("KXB", db, lookback_hours=hours, min_obs=4,
+                                        resolution="1m") == pytest.approx(
+                realized_vol_from_db("KXB", db, lookback_hours=hours, min_obs=4, resolution=None),
+                rel=1e-9,
+            )
+        assert vol_ratio("KXA", db) is not None
+
+    def test_vol_ratio_uses_one_resolution(self, db, monkeypatch):
+        # Hourly bars would leave the 6 h leg ~6 points; both legs read the
+        # finest resolution the short window needs (minute bars).
+        points = []
+
+        def counting_vol(mids, *args, **kwargs):
+            points.append(len(mids))
+            return realized_vol(mids, *args, **kwargs)
+
+        monkeypatch.setattr("kalshi_bot.vol_estimator.realized_vol", counting_vol)
+        ratio = vol_ratio("KXA", db)
+        assert points[0] >= 24
+        monkeypatch.undo()
+        assert ratio == pytest.approx(vol_ratio("KXA", db, resolution="1m"))
+        assert vol_ratio("KXA", db) != pytest.approx(
+            realized_vol_from_db("KXA", db, lookback_hours=6, min_obs=4)
+            / realized_vol_from_db("KXA", db, lookback_hours=168, min_obs=4),
+            rel=1e-6,
+        )
+
+    def test_replay_hourly_bars(self, db):
+        raw = load_snapshots(db, "KXA")
+        hourly = load_snapshots(db, "KXA", resolution="1h")
+        assert len(raw) == 8 * 1440
+        assert len(hourly) in (192, 193)
+        last = hourly[-1]
+        assert last.mid == pytest.approx(raw[-1].mid)
+        assert last.yes_bid == pytest.approx(raw[-1].yes_bid)
+        assert last.yes_ask == pytest.approx(raw[-1].yes_ask)
+        assert last.volume_usd == raw[-1].volume_usd
+        with pytest.raises(ValueError):
+            load_snapshots(db, "KXA", resolution="5m")
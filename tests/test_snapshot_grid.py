@@ -0,0 +1,190 @@
+"""
+Tests for change-only snapshot storage.
+
+A market recorded by a change-only collector must read back — through
+load_snapshots, list_tickers, the compacted store and the vol lookups —
+exactly as the same polls recorded as full rows, collector downtime
+included, while storing far fewer rows.
+"""
+
+from __future__ import annotations
+
+import random
+import sqlite3
+import time
+from unittest.mock import MagicMock
+
+import pytest
+
+from kalshi_bot.config import BotConfig
+from kalshi_bot.data_collector import DataCollector
+from kalshi_bot.historical_replay import list_tickers, load_snapshots
+from kalshi_bot.snapshot_grid import Grid, fill_bars, forward_fill
+from kalshi_bot.snapshot_store import SnapshotStore, compact
+from kalshi_bot.vol_estimator import VolTracker, realized_vol_from_db, vol_ratio
+
+GRID = 300          # poll interval (s)
+KEYFRAME = 3600
+POLLS = 900         # ~3 days
+DOWN = range(400, 430)   # polls missed while the collector was down
+
+
+def _quotes(seed: int, p_move: float) -> list[tuple[int, int]]:
+    """(yes_bid, yes_ask) in cents per poll; moves on ~p_move of polls."""
+    rng = random.Random(seed)
+    bid, out = 45, []
+    for _ in range(POLLS):
+        if rng.random() < p_move:
+            bid = min(90, max(5, bid + rng.choice([-2, -1, 1, 2])))
+        out.append((bid, bid + rng.choice([3, 3, 3, 4]) if rng.random() < p_move else bid + 3))
+    return out
+
+
+MARKETS = {"KXQUIET": _quotes(1, 0.05), "KXBUSY": _quotes(2, 0.6)}
+
+
+def _record(path: str, change_only: bool, t0: int) -> None:
+    """Drive DataCollector.collect_once over the scripted polls, with one restart."""
+    def collector() -> DataCollector:
+        c = DataCollector(path, BotConfig(dry_run=True), change_only=change_only,
+                          keyframe_interval=KEYFRAME)
+        c.client = MagicMock()
+        if change_only:
+            c.writer.set_meta(grid_seconds=GRID, keyframe_seconds=KEYFRAME)
+        return c
+
+    c = collector()
+    for k in range(POLLS):
+        if k in DOWN:
+            if k == DOWN.start:
+                c.close()
+            continue
+        if k == DOWN.stop:
+            c = collector()
+        c.client.get_active_markets.return_value = [
+            {"ticker": t, "status": "active", "yes_bid": q[k][0], "yes_ask": q[k][1],
+             "volume_24h": 1000, "open_interest": 500}
+            for t, q in MARKETS.items()
+        ]
+        c.collect_once(t0 + k * GRID)
+    c.close()
+
+
+@pytest.fixture(scope="module")
+def dbs(tmp_path_factory):
+    tmp = tmp_path_factory.mktemp("grid")
+    # Half a poll off the clock grid, so a lookup window's edge never sits
+    # on a row while the two databases are read a moment apart.
+    t0 = int(time.time()) - (POLLS - 1) * GRID - GRID // 2
+    full, changes = str(tmp / "full.db"), str(tmp / "changes.db")
+    _record(full, False, t0)
+    _record(changes, True, t0)
+    return full, changes
+
+
+def _count(db: str, ticker: str) -> int:
+    with sqlite3.connect(db) as conn:
+        return conn.execute(
+            "SELECT COUNT(*) FROM market_snapshots WHERE ticker = ?", (ticker,),
+        ).fetchone()[0]
+
+
+class TestForwardFill:
+    def test_fills_quiet_gaps_only(self):
+        grid = Grid(60, 300)
+        rows = [(0, "a"), (180, "b"), (240, "c"), (2000, "d"), (2061, "e")]
+        assert forward_fill(rows, grid) == [
+            (0, "a"), (60, "a"), (120, "a"), (180, "b"), (240, "c"), (2000, "d"), (2061, "e"),
+        ]
+
+    def test_no_grid_is_identity(self):
+        rows = [(0, 1.0), (600, 2.0)]
+        assert forward_fill(rows, None) == rows
+
+    def test_bars_fill_quiet_hours_not_downtime(self):
+        grid = Grid(300, 3600)
+        # (bucket, close, first_ts, last_ts): 3600 is empty in both gaps, but
+        # only the first pair of stored rows is close enough to be quiet
+        quiet = [(0, 0.4, 100, 3500), (7200, 0.5, 7500, 7500)]
+        down = [(0, 0.4, 100, 300), (7200, 0.5, 7500, 7500)]
+        assert fill_bars(quiet, 3600, grid) == [(0, 0.4), (3600, 0.4), (7200, 0.5)]
+        assert fill_bars(down, 3600, grid) == [(0, 0.4), (7200, 0.5)]
+        assert fill_bars(down, 3600, None) == [(0, 0.4), (7200, 0.5)]
+
+
+class TestChangeOnly:
+    def test_stores_fewer_rows(self, dbs):
+        full, changes = dbs
+        assert _count(full, "KXQUIET") == POLLS - len(DOWN)
+        assert _count(changes, "KXQUIET") * 5 < _count(full, "KXQUIET")
+        assert _count(changes, "KXBUSY") < _count(full, "KXBUSY")
+
+    def test_load_snapshots_match(self, dbs):
+        full, changes = dbs
+        for ticker in MARKETS:
+            assert load_snapshots(changes, ticker) == load_snapshots(full, ticker)
+
+    def test_list_tickers_match(self, dbs):
+        full, changes = dbs
+        assert sorted(list_tickers(changes, 10)) == sorted(list_tickers(full, 10))
+
+    def test_compacted_store_matches(self, dbs, tmp_path):
+        full, changes = dbs
+        compact(changes, str(tmp_path / "store"))
+        store = SnapshotStore(str(tmp_path / "store"))
+        for ticker in MARKETS:
+            assert store.load_snapshots(ticker) == load_snapshots(full, ticker)
+
+    @pytest.mark.parametrize("resolution", [None, "auto", "1m", "1h"])
+    def test_vol_lookups_match(self, dbs, resolution):
+        full, changes = dbs
+        for ticker in MARKETS:
+            for hours in (6, 24, 168):
+                expected = realized_vol_from_db(
+                    ticker, full, lookback_hours=hours, min_obs=4, resolution=resolution,
+                )
+                assert expected is not None
+                assert realized_vol_from_db(
+                    ticker, changes, lookback_hours=hours, min_obs=4, resolution=resolution,
+                ) == pytest.approx(expected, rel=1e-9)
+            assert vol_ratio(ticker, changes, long_hours=24, resolution=resolution) == \
+                pytest.approx(vol_ratio(ticker, full, long_hours=24, resolution=resolution), rel=1e-9)
+
+    def test_tracker_matches_raw_lookups(self, dbs):
+        full, changes = dbs
+        tracker = VolTracker(changes, ttl=0)
+        for ticker in MARKETS:
+            for hours in (6, 24, 168):
+                assert tracker.realized_vol(ticker, lookback_hours=hours, min_obs=4) == \
+                    pytest.approx(realized_vol_from_db(
+                        ticker, full, lookback_hours=hours, min_obs=4, resolution=None,
+                    ), rel=1e-9)
+
+    def test_keyframes_bound_row_gaps(self, dbs):
+        _, changes = dbs
+        with sqlite3.connect(changes) as conn:
+            ts = [r[0] for r in conn.execute(
+                "SELECT ts FROM market_snapshots WHERE ticker = 'KXQUIET' ORDER BY ts"
+            )]
+        gaps = [b - a for a, b in zip(ts, ts[1:])]
+        assert max(g for g in gaps if g < len(DOWN) * GRID) <= KEYFRAME
+
+    def test_tracker_fills_across_incremental_reads(self, dbs, tmp_path):
+        full, changes = dbs
+        part = str(tmp_path / "part.db")
+        with sqlite3.connect(changes) as src:
+            src.execute("VACUUM INTO ?", (part,))
+        with sqlite3.connect(part) as conn:
+            cut = conn.execute("SELECT ts FROM market_snapshots ORDER BY ts").fetchall()[-40][0]
+            late = conn.execute("SELECT * FROM market_snapshots WHERE ts > ?", (cut,)).fetchall()
+            conn.execute("DELETE FROM market_snapshots WHERE ts > ?", (cut,))
+
+        tracker = VolTracker(part, ttl=0)
+        assert tracker.realized_vol("KXQUIET", lookback_hours=24, min_obs=4) is not None
+        with sqlite3.connect(part) as conn:
+            conn.executemany(f"INSERT INTO market_snapshots VALUES ({', '.join('?' * 10)})", late)
+        for ticker in MARKETS:
+            assert tracker.realized_vol(ticker, lookback_hours=24, min_obs=4) == pytest.approx(
+                realized_vol_from_db(ticker, full, lookback_hours=24, min_obs=4, resolution=None),
+                rel=1e-9,
+            )
@@ -0,0 +1,153 @@
+"""
+Tests for the columnar snapshot store used by historical replay.
+
+A compacted store must hand back exactly what load_snapshots builds from
+SQLite — same columns, same NULL handling, same replay results — while
+serving columns from memory-mapped files.
+"""
+
+from __future__ import annotations
+
+import sqlite3
+
+import numpy as np
+import pytest
+
+from kalshi_bot.backtester import Backtester
+from kalshi_bot.data_collector import _SCHEMA, SnapshotWriter
+from kalshi_bot.historical_replay import (
+    _make_replay_config,
+    list_tickers,
+    load_snapshots,
+)
+from kalshi_bot.retention import RetentionPolicy, apply_retention
+from kalshi_bot.snapshot_store import INDEX_FILE, SnapshotStore, compact
+from kalshi_bot.synthetic_data import PricePath
+from kalshi_bot.vector_backtester import SnapshotArrays, VectorizedBacktester
+from tests.test_retention import DAY, NOW, _rows
+
+
+T0 = 1_760_000_000
+
+
+def _insert_path(conn: sqlite3.Connection, ticker: str, days: int, seed: int) -> None:
+    snaps = PricePath(ticker, sigma=0.06, base_spread=0.08, seed=seed).generate(days)
+    conn.executemany(
+        """INSERT INTO market_snapshots
+           (ts, ticker, yes_bid, yes_ask, volume_24h, open_interest, mid, spread, status)
+           VALUES (?, ?, ?, ?, ?, ?, ?, ?, 'active')""",
+        [
+            (T0 + i * 3600, ticker, s.yes_bid, s.yes_ask, s.volume_usd,
+             s.open_interest, s.mid, s.spread)
+            for i, s in enumerate(snaps)
+        ],
+    )
+
+
+@pytest.fixture
+def db(tmp_path):
+    path = str(tmp_path / "market_data.db")
+    with sqlite3.connect(path) as conn:
+        conn.executescript(_SCHEMA)
+        _insert_path(conn, "KXA-25DEC-T1", days=6, seed=1)
+        _insert_path(conn, "KXB/ODD:NAME", days=3, seed=2)
+        # Sparse ticker with NULL columns (filled the same way as load_snapshots)
+        conn.executemany(
+            """INSERT INTO market_snapshots (ts, ticker, yes_bid, yes_ask, mid, spread)
+               VALUES (?, 'KXNULL', ?, ?, ?, ?)""",
+            [(T0 + 60, None, 0.55, None, None), (T0, 0.40, 0.50, 0.45, 0.10),
+             (T0 + 120, 0.42, None, None, 0.08)],
+        )
+    return path
+
+
+@pytest.fixture
+def store(db, tmp_path):
+    out = str(tmp_path / "store")
+    compact(db, out)
+    return SnapshotStore(out)
+
+
+# ---------------------------------------------------------------------------
+# Compaction / reading
+# ---------------------------------------------------------------------------
+
+class TestSnapshotStore:
+    def test_list_tickers_matches_sqlite(self, db, store):
+        for min_snaps in (1, 50):
+            assert sorted(store.list_tickers(min_snaps)) == sorted(list_tickers(db, min_snaps))
+
+    def test_snapshots_match_sqlite(self, db, store):
+        for ticker, *_ in list_tickers(db, 1):
+            assert store.load_snapshots(ticker) == load_snapshots(db, ticker)
+
+    def test_arrays_are_memory_mapped(self, store):
+        cols = store.arrays("KXA-25DEC-T1")
+        for name in ("t", "mid", "open_interest"):
+            col = getattr(cols, name)
+            assert type(col) is np.ndarray
+            assert col.flags.c_contiguous
+            assert not col.flags.owndata
+            assert not col.flags.writeable
+
+    def test_min_snapshots_and_unknown_ticker(self, db, tmp_path):
+        out = str(tmp_path / "small")
+        entries = compact(db, out, min_snapshots=10)
+        assert "KXNULL" not in entries
+        reader = SnapshotStore(out)
+        assert "KXNULL" not in reader
+        assert reader.load_snapshots("KXNULL") == []
+        with pytest.raises(KeyError):
+            reader.arrays("KXNULL")
+
+    def test_recompaction_replaces_store(self, db, store, tmp_path):
+        with sqlite3.connect(db) as conn:
+            _insert_path(conn, "KXNEW", days=2, seed=3)
+        compact(db, store.path)
+        assert "KXNEW" in SnapshotStore(store.path)
+
+    def test_compact_after_retention(self, tmp_path):
+        path = str(tmp_path / "retained.db")
+        writer = SnapshotWriter(path)
+        writer.submit(_rows("KXOPEN", NOW - 30 * DAY, NOW))
+        closed = _rows("KXDONE", NOW - 25 * DAY, NOW - 10 * DAY)
+        closed[-1] = closed[-1][:-1] + ("settled",)
+        writer.submit(closed)
+        writer.close()
+        before = {t: load_snapshots(path, t) for t in ("KXOPEN", "KXDONE")}
+
+        report = apply_retention(path, RetentionPolicy(archive_dir=str(tmp_path / "archive")), NOW)
+        assert report.partitioned_rows and report.closed_tickers == 1
+        out = str(tmp_path / "retained.store")
+        compact(path, out)
+
+        reader = SnapshotStore(out)
+        assert sorted(reader.list_tickers(1)) == sorted(list_tickers(path, 1))
+        for ticker, snaps in before.items():
+            assert reader.load_snapshots(ticker) == snaps
+
+    def test_rejects_unknown_layout(self, store):
+        index = f"{store.path}/{INDEX_FILE}"
+        with open(index, "w") as fh:
+            fh.write('{"version": 99, "columns": [], "tickers": {}}')
+        with pytest.raises(ValueError):
+            SnapshotStore(store.path)
+
+
+# ---------------------------------------------------------------------------
+# Replay
+# ---------------------------------------------------------------------------
+
+class TestReplayFromStore:
+    def test_vector_replay_matches_sqlite_replay(self, db, store):
+        cfg = _make_replay_config(1000.0, 0.07)
+        for ticker, *_ in list_tickers(db, 1):
+            expected = Backtester(cfg).run_market(load_snapshots(db, ticker))
+            actual = VectorizedBacktester(cfg).run_market(store.arrays(ticker))
+            assert actual == expected, ticker
+
+    def test_arrays_round_trip(self, store):
+        cols = store.arrays("KXB/ODD:NAME")
+        rebuilt = SnapshotArrays.from_snapshots(store.load_snapshots("KXB/ODD:NAME"))
+        for name in ("t", "yes_bid", "yes_ask", "mid", "spread", "volume_usd", "open_interest"):
+            assert np.array_equal(getattr(cols, name), getattr(rebuilt, name))
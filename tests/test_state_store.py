@@ -0,0 +1,158 @@
+"""
+Tests for the write-behind StateStore.
+
+upsert() / delete() must only mark positions dirty; commit() / flush() /
+close() must write the latest row per ticker in one batch, and a restart
+must restore exactly the live positions that were written.  Every
+transition must land in the event journal, and replaying the journal —
+before or after compaction — must agree with the snapshot.
+"""
+
+from __future__ import annotations
+
+import logging
+import sqlite3
+import time
+
+import pytest
+
+from kalshi_bot.order_manager import MarketPosition, PositionState
+from kalshi_bot.state_store import DELETED, StateStore, history, replay
+
+
+def _pos(ticker: str, state: PositionState = PositionState.QUOTING, **kw) -> MarketPosition:
+    return MarketPosition(ticker=ticker, title=f"{ticker} title", yes_price=0.45,
+                          no_price=0.5, contracts=3, state=state, **kw)
+
+
+def _on_disk(db: str) -> dict[str, str]:
+    with sqlite3.connect(db) as conn:
+        return dict(conn.execute("SELECT ticker, state FROM positions").fetchall())
+
+
+@pytest.fixture
+def db(tmp_path) -> str:
+    return str(tmp_path / "bot_state.db")
+
+
+class TestStateStore:
+    def test_upsert_is_write_behind(self, db):
+        store = StateStore(db, flush_interval=60)
+        store.upsert(_pos("KXA"))
+        assert _on_disk(db) == {}
+        store.flush()
+        assert _on_disk(db) == {"KXA": "QUOTING"}
+        store.close()
+
+    def test_coalesces_transitions_per_ticker(self, db):
+        store = StateStore(db, flush_interval=60)
+        pos = _pos("KXA")
+        for state in (PositionState.YES_FILLED, PositionState.ONE_SIDE_HEDGED,
+                      PositionState.BOTH_FILLED):
+            pos.state = state
+            store.upsert(pos)
+        store.upsert(_pos("KXB"))
+        store.delete("KXB")
+        store.flush()
+        assert store.rows_written == 2
+        assert _on_disk(db) == {"KXA": "BOTH_FILLED"}
+        store.close()
+
+    def test_row_is_captured_at_upsert(self, db):
+        store = StateStore(db, flush_interval=60)
+        pos = _pos("KXA")
+        store.upsert(pos)
+        pos.state = PositionState.RESOLVED   # mutated after marking, not re-saved
+        store.close()
+        assert _on_disk(db) == {"KXA": "QUOTING"}
+
+    def test_commit_wakes_writer(self, db):
+        store = StateStore(db, flush_interval=60)
+        store.upsert(_pos("KXA"))
+        store.commit()
+        deadline = time.time() + 5
+        while not _on_disk(db) and time.time() < deadline:
+            time.sleep(0.01)
+        assert _on_disk(db) == {"KXA": "QUOTING"}
+        store.close()
+
+    def test_close_flushes_and_restart_restores(self, db):
+        store = StateStore(db, flush_interval=60)
+        store.upsert(_pos("KXA", yes_order_id="y1", no_order_id="n1"))
+        store.upsert(_pos("KXB", state=PositionState.RESOLVED))
+        store.close()
+        store.close()   # idempotent
+
+        store = StateStore(db)
+        restored = store.load()
+        store.close()
+        assert list(restored) == ["KXA"]
+        pos = restored["KXA"]
+        assert (pos.yes_order_id, pos.no_order_id, pos.contracts) == ("y1", "n1", 3)
+
+
+class TestJournal:
+    def _lifecycle(self, db: str) -> StateStore:
+        store = StateStore(db, flush_interval=60)
+        pos = _pos("KXA")
+        store.upsert(pos, "quote")
+        pos.state, pos.filled_side = PositionState.YES_FILLED, "yes"
+        store.upsert(pos, "fill")
+        pos.state, pos.hedge_order_id = PositionState.ONE_SIDE_HEDGED, "h1"
+        store.upsert(pos, "hedge")
+        store.flush()
+        pos.state, pos.realised_pnl = PositionState.RESOLVED, -0.12
+        store.upsert(pos, "cut")
+        store.upsert(_pos("KXB"), "quote")
+        store.delete("KXB")
+        store.flush()
+        return store
+
+    def test_every_transition_is_journaled(self, db):
+        self._lifecycle(db).close()
+        events = history(db, "KXA")
+        assert [e.event for e in events] == ["quote", "fill", "hedge", "cut"]
+        assert [e.position.state for e in events] == [
+            PositionState.QUOTING, PositionState.YES_FILLED,
+            PositionState.ONE_SIDE_HEDGED, PositionState.RESOLVED,
+        ]
+        assert events[-1].position.realised_pnl == pytest.approx(-0.12)
+        assert [(e.event, e.position is None) for e in history(db, "KXB")] == [
+            ("quote", False), (DELETED, True),
+        ]
+
+    def test_replay_matches_snapshot(self, db):
+        self._lifecycle(db).close()
+        replayed = replay(db)
+        assert list(replayed) == ["KXA"]
+        with sqlite3.connect(db) as conn:
+            (state, pnl), = conn.execute("SELECT state, realised_pnl FROM positions").fetchall()
+        assert (replayed["KXA"].state.name, replayed["KXA"].realised_pnl) == (state, pnl)
+
+        hedge_ts = history(db, "KXA")[2].ts
+        assert replay(db, until=hedge_ts)["KXA"].state == PositionState.ONE_SIDE_HEDGED
+
+    def test_compaction_keeps_replay_and_restart(self, db):
+        store = self._lifecycle(db)
+        events = history(db)
+        cut_ts = events[3].ts
+        assert store.compact(before=cut_ts) == 3
+        assert [e.event for e in history(db)] == [e.event for e in events[3:]]
+        assert replay(db)["KXA"].state == PositionState.RESOLVED
+        with pytest.raises(ValueError):
+            replay(db, until=events[0].ts)
+        store.upsert(_pos("KXC"), "quote")
+        store.close()
+
+        store = StateStore(db)
+        assert list(store.load()) == ["KXC"]
+        store.close()
+
+    def test_compacted_delete_replays_quietly(self, db, caplog):
+        store = self._lifecycle(db)
+        store.compact(before=time.time() + 1)   # folds KXB's delete into the base
+        store.close()
+        assert history(db) == []
+        with caplog.at_level(logging.WARNING, logger="kalshi_bot.state_store"):
+            assert list(replay(db)) == ["KXA"]
+        assert not caplog.records
@@ -0,0 +1,115 @@
+"""
+Tests for the stress_test parameter sweep.
+
+The process-pool sweep must pick exactly the same parameters (and return the
+same scenario results) as a serial scan of the grid, whatever the chunking.
+The successive-halving sweep must only run survivors on later scenarios and
+return full-run results for its winner.
+"""
+
+from __future__ import annotations
+
+import pytest
+
+from kalshi_bot.backtester import Backtester
+from kalshi_bot.synthetic_data import SCENARIOS
+from kalshi_bot.vector_backtester import VectorizedBacktester
+from stress_test import _halving_rungs, _make_config, _sweep_score, run_halving_sweep, run_sweep
+
+
+SMALL_GRID = {
+    "depth": [0.20, 0.40],
+    "kelly": [0.25],
+    "mf":    [0.10, 0.15],
+    "age":   [14_400, 43_200],
+    "stop":  [0.10, 1.0],
+}
+SCENARIOS_SUBSET = SCENARIOS[:3]
+
+
+# ---------------------------------------------------------------------------
+# Sweep
+# ---------------------------------------------------------------------------
+
+@pytest.fixture(scope="module")
+def serial():
+    return run_sweep(SCENARIOS_SUBSET, 1000.0, 42, grid=SMALL_GRID)
+
+
+class TestRunSweep:
+    @pytest.mark.parametrize("workers,chunk_size", [(1, 3), (2, None), (2, 1)])
+    def test_matches_serial(self, serial, workers, chunk_size):
+        result = run_sweep(
+            SCENARIOS_SUBSET, 1000.0, 42,
+            workers=workers, chunk_size=chunk_size, grid=SMALL_GRID,
+        )
+        assert result == serial
+
+    def test_best_params_come_from_grid(self, serial):
+        best_params, best_results = serial
+        assert set(best_params) == set(SMALL_GRID)
+        for key, value in best_params.items():
+            assert value in SMALL_GRID[key]
+        assert len(best_results) == len(SCENARIOS_SUBSET)
+
+    def test_score_penalises_losses(self, serial):
+        _, best_results = serial
+        raw = sum(r.net_pnl for r in best_results)
+        assert _sweep_score(best_results) <= raw
+
+
+# ---------------------------------------------------------------------------
+# Successive halving
+# ---------------------------------------------------------------------------
+
+class _CountingBacktester(VectorizedBacktester):
+    runs = 0
+
+    def run_scenario(self, scenario, seed=42):
+        type(self).runs += 1
+        return super().run_scenario(scenario, seed=seed)
+
+
+class TestHalvingSweep:
+    def test_rungs(self):
+        assert _halving_rungs(8, 3) == [1, 3, 8]
+        assert _halving_rungs(8, 2) == [1, 2, 4, 8]
+        assert _halving_rungs(3, 3) == [1, 3]
+        assert _halving_rungs(1, 3) == [1]
+        for eta in (0, 1):
+            with pytest.raises(ValueError):
+                _halving_rungs(12, eta)
+
+    def test_prunes_and_returns_full_results(self):
+        _CountingBacktester.runs = 0
+        best_params, best_results = run_halving_sweep(
+            SCENARIOS_SUBSET, 1000.0, 42, engine=_CountingBacktester, grid=SMALL_GRID, eta=2,
+        )
+        # 16 combos: 16 × 1 scenario, then 8 × 1 more, then 4 × 1 more
+        assert _CountingBacktester.runs == 16 + 8 + 4
+        assert set(best_params) == set(SMALL_GRID)
+
+        cfg = _make_config(
+            1000.0, best_params["depth"], best_params["kelly"], best_params["mf"],
+            best_params["age"], best_params["stop"],
+        )
+        assert best_results == [
+            Backtester(cfg).run_scenario(scenario, seed=42) for scenario in SCENARIOS_SUBSET
+        ]
+
+    def test_independent_of_workers(self):
+        serial = run_halving_sweep(SCENARIOS_SUBSET, 1000.0, 42, grid=SMALL_GRID)
+        pooled = run_halving_sweep(
+            SCENARIOS_SUBSET, 1000.0, 42, workers=2, chunk_size=3, grid=SMALL_GRID,
+        )
+        assert pooled == serial
+
+    def test_single_scenario_is_exhaustive(self):
+        one = SCENARIOS_SUBSET[:1]
+        assert run_halving_sweep(one, 1000.0, 42, grid=SMALL_GRID) == run_sweep(
+            one, 1000.0, 42, grid=SMALL_GRID,
+        )
+
+    def test_rejects_small_eta(self):
+        with pytest.raises(ValueError):
+            run_halving_sweep(SCENARIOS_SUBSET, 1000.0, 42, grid=SMALL_GRID, eta=1)
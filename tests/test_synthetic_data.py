@@ -0,0 +1,102 @@
+"""
+Tests for the batched NumPy path generator.
+
+PricePath.generate_batch() must honour the same clamps and cent rounding
+as the scalar generate(), be reproducible per seed, match its
+distribution across many seeds, and feed straight into the vectorised
+backtester as one path's columns.  With per-path seeds a path must not
+depend on the batch it is drawn in.
+"""
+
+from __future__ import annotations
+
+import numpy as np
+import pytest
+
+from kalshi_bot.backtester import Backtester
+from kalshi_bot.config import BotConfig
+from kalshi_bot.path_cache import batch_view
+from kalshi_bot.synthetic_data import SCENARIOS, PricePath
+from kalshi_bot.vector_backtester import SnapshotArrays, VectorizedBacktester
+
+
+def _path(seed: int | None = None) -> PricePath:
+    return PricePath("SYN", initial_mid=0.5, mu=0.5, sigma=0.08, base_spread=0.08, seed=seed)
+
+
+class TestGenerateBatch:
+    def test_shapes_and_bounds(self):
+        batch = _path().generate_batch(days=10, n_paths=200, seed=1)
+        assert batch.n_paths == 200
+        assert batch.t.shape == (240,)
+        assert batch.t[0] == pytest.approx(1 / 24)
+        for col in (batch.yes_bid, batch.yes_ask, batch.mid, batch.spread,
+                    batch.volume_usd, batch.open_interest):
+            assert col.shape == (200, 240)
+            assert col.flags.c_contiguous
+        assert batch.yes_bid.min() >= 0.01 and batch.yes_ask.max() <= 0.99
+        assert np.all(batch.yes_ask >= batch.yes_bid)
+        np.testing.assert_allclose(batch.yes_bid * 100, np.round(batch.yes_bid * 100), atol=1e-9)
+        np.testing.assert_allclose(batch.mid, (batch.yes_bid + batch.yes_ask) / 2)
+        assert batch.volume_usd.min() >= 0
+        assert 1_000 <= batch.open_interest.min() and batch.open_interest.max() <= 50_000
+
+    def test_seed_is_reproducible(self):
+        a = _path().generate_batch(days=3, n_paths=50, seed=7)
+        b = _path().generate_batch(days=3, n_paths=50, seed=7)
+        c = _path().generate_batch(days=3, n_paths=50, seed=8)
+        np.testing.assert_array_equal(a.mid, b.mid)
+        np.testing.assert_array_equal(a.volume_usd, b.volume_usd)
+        assert not np.array_equal(a.mid, c.mid)
+
+    def test_per_path_seeds_independent_of_batch(self):
+        full = _path().generate_batch(days=3, n_paths=4, seed=[10, 11, 12, 13])
+        part = _path().generate_batch(days=3, n_paths=2, seed=[12, 10])
+        for name in ("yes_bid", "yes_ask", "mid", "spread", "volume_usd", "open_interest"):
+            col, sub = getattr(full, name), getattr(part, name)
+            np.testing.assert_array_equal(sub[0], col[2])
+            np.testing.assert_array_equal(sub[1], col[0])
+        with pytest.raises(ValueError):
+            _path().generate_batch(days=3, n_paths=3, seed=[1, 2])
+
+    def test_market_batch_applies_shock(self):
+        swan = next(s for s in SCENARIOS if s.name == "black_swan")
+        batch = swan.market_batch(1, [42, 43])
+        shock = swan.shock_index(len(batch.t))
+        expected = swan.market_snapshots(1, 42)[-1]
+        assert np.all(batch.mid[:, shock:] == expected.mid)
+        assert np.all(batch.yes_bid[:, shock:] == expected.yes_bid)
+        assert np.all(batch.spread[:, shock:] == expected.spread)
+        assert batch.mid[0, shock - 1] != expected.mid
+
+    def test_does_not_advance_path(self):
+        path = _path(seed=3)
+        path.generate_batch(days=2, n_paths=10, seed=3)
+        assert path.t == 0.0
+        assert path.generate(1)[0] == _path(seed=3).generate(1)[0]
+
+    def test_matches_scalar_distribution(self):
+        n, days = 400, 5
+        batch = _path().generate_batch(days=days, n_paths=n, seed=11)
+        scalar = [_path(seed=s).generate(days) for s in range(n)]
+        s_mid = np.array([[s.mid for s in snaps] for snaps in scalar])
+        s_spread = np.array([[s.spread for s in snaps] for snaps in scalar])
+        s_vol = np.array([[s.volume_usd for s in snaps] for snaps in scalar])
+
+        # Terminal mid dispersion and pooled spread / volume levels agree
+        assert batch.mid[:, -1].std() == pytest.approx(s_mid[:, -1].std(), rel=0.15)
+        assert batch.mid[:, -1].mean() == pytest.approx(s_mid[:, -1].mean(), abs=0.015)
+        assert batch.spread.mean() == pytest.approx(s_spread.mean(), rel=0.05)
+        assert batch.spread.std() == pytest.approx(s_spread.std(), rel=0.15)
+        assert batch.volume_usd.mean() == pytest.approx(s_vol.mean(), rel=0.05)
+
+    def test_feeds_backtesters(self):
+        batch = _path().generate_batch(days=10, n_paths=3, seed=5)
+        cfg = BotConfig(dry_run=True)
+        cols = SnapshotArrays.from_view(batch_view(batch, 2))
+        assert len(cols) == 240
+        assert cols.snapshot(17) == batch.snapshots(2)[17]
+        expected = Backtester(cfg).run_market(batch.snapshots(2), seed_offset=1)
+        actual = VectorizedBacktester(cfg).run_market(cols, seed_offset=1)
+        assert actual.total_pnl == pytest.approx(expected.total_pnl)
+        assert actual.positions_opened == expected.positions_opened
@@ -0,0 +1,145 @@
+"""
+Parity tests for the array-backed Kalshi backtest engine.
+
+VectorizedBacktester must reproduce Backtester.run_market exactly: same
+positions, fills, P&L, drawdown and hold times for every scenario.
+"""
+
+from __future__ import annotations
+
+import random
+
+import numpy as np
+import pytest
+
+from kalshi_bot.backtester import Backtester
+from kalshi_bot.config import BotConfig, MarketFilter, RiskParams, ScoringParams
+from kalshi_bot.fill_model import FillModel, FillModelParams
+from kalshi_bot.synthetic_data import SCENARIOS, PricePath
+from kalshi_bot.vector_backtester import (
+    SnapshotArrays,
+    VectorizedBacktester,
+    _rolling_realized_vol,
+    _round4,
+    _uniform_stream,
+)
+from kalshi_bot.vol_estimator import RollingVol, realized_vol
+
+
+# ---------------------------------------------------------------------------
+# Helpers
+# ---------------------------------------------------------------------------
+
+def _cfg(
+    depth: float = 0.40,
+    kelly: float = 0.25,
+    mf: float = 0.15,
+    max_order_age: int = 14_400,
+    hedge_stop_gap: float = 1.0,
+    default_v: float = 0.09,
+) -> BotConfig:
+    """Same shape as stress_test._make_config."""
+    return BotConfig(
+        dry_run=True,
+        risk=RiskParams(
+            total_budget=1000.0,
+            kelly_multiplier=kelly,
+            max_market_fraction=mf,
+            max_fill_cost=0.93,
+            order_levels=3,
+            min_order_contracts=1,
+            max_order_age=max_order_age,
+            hedge_stop_gap=hedge_stop_gap,
+            cancel_if_mid_drift=0.07,
+            fee_rate=0.07,
+        ),
+        market_filter=MarketFilter(
+            min_mid=0.40, max_mid=0.60, min_spread=0.07, min_days_to_expiry=0,
+        ),
+        scoring=ScoringParams(order_depth_fraction=depth, default_v=default_v),
+    )
+
+
+CONFIGS = [
+    _cfg(),
+    _cfg(depth=0.15, kelly=0.35, mf=0.20, max_order_age=86_400),
+    _cfg(depth=0.20, max_order_age=43_200, hedge_stop_gap=0.06),
+    _cfg(depth=0.30, hedge_stop_gap=0.10, default_v=0.01),   # realized vol drives depth
+]
+
+# Aggressive fills exercise the hedge / stop-loss path far more often.
+EAGER_FILLS = FillModel(FillModelParams(intercept=-2.0, coef_depth=-5.0))
+
+
+# ---------------------------------------------------------------------------
+# Building blocks
+# ---------------------------------------------------------------------------
+
+class TestBuildingBlocks:
+    def test_rolling_vol_matches_realized_vol(self):
+        rng = random.Random(3)
+        mids = [round(rng.uniform(0.3, 0.7) * 200) / 200 for _ in range(200)]
+        rv = _rolling_realized_vol(np.array(mids))
+        # The loop engine's incremental estimator must agree as well
+        incremental = RollingVol.bars(24, dt_hours=1.0)
+        for k in range(len(mids)):
+            incremental.update(mids[k])
+            expected = realized_vol(mids[max(0, k - 23):k + 1], dt_hours=1.0)
+            if expected is None:
+                assert np.isnan(rv[k])
+                assert incremental.vol() is None
+            else:
+                assert rv[k] == expected
+                assert incremental.vol() == pytest.approx(expected, rel=1e-9)
+
+    def test_round4_matches_builtin_round(self):
+        rng = random.Random(5)
+        values = [rng.uniform(0, 1) for _ in range(5000)] + [0.46795, 0.12345, 0.00005]
+        assert _round4(np.array(values)).tolist() == [round(v, 4) for v in values]
+
+    def test_uniform_stream_matches_random(self):
+        rng = random.Random(12345)
+        stream = _uniform_stream(rng, 500, np.random.RandomState(0))
+        assert stream.tolist() == [rng.random() for _ in range(500)]
+
+    def test_snapshot_arrays_round_trip(self):
+        snaps = PricePath("RT", seed=1).generate(2)
+        cols = SnapshotArrays.from_snapshots(snaps)
+        assert len(cols) == len(snaps)
+        assert cols.ticker == "RT"
+        assert [cols.snapshot(i) for i in range(len(cols))] == snaps
+
+
+# ---------------------------------------------------------------------------
+# Engine parity
+# ---------------------------------------------------------------------------
+
+class TestParity:
+    @pytest.mark.parametrize("cfg", CONFIGS)
+    @pytest.mark.parametrize("seed", [42, 7])
+    def test_scenarios_identical(self, cfg, seed):
+        for scenario in SCENARIOS:
+            expected = Backtester(cfg).run_scenario(scenario, seed=seed)
+            actual = VectorizedBacktester(cfg).run_scenario(scenario, seed=seed)
+            assert actual == expected, scenario.name
+
+    @pytest.mark.parametrize("cfg", CONFIGS)
+    def test_hedge_heavy_identical(self, cfg):
+        for scenario in SCENARIOS:
+            expected = Backtester(cfg, EAGER_FILLS).run_scenario(scenario, seed=11)
+            actual = VectorizedBacktester(cfg, EAGER_FILLS).run_scenario(scenario, seed=11)
+            assert actual == expected, scenario.name
+
+    def test_accepts_columns_directly(self):
+        snaps = PricePath("COL", sigma=0.08, base_spread=0.10, seed=9).generate(20)
+        expected = Backtester(_cfg()).run_market(snaps, seed_offset=2)
+        actual = VectorizedBacktester(_cfg()).run_market(
+            SnapshotArrays.from_snapshots(snaps), seed_offset=2,
+        )
+        assert actual == expected
+
+    def test_empty_market(self):
+        expected = Backtester(_cfg()).run_market([])
+        actual = VectorizedBacktester(_cfg()).run_market([])
+        assert actual == expected
+        assert actual.positions_opened == 0
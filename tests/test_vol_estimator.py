@@ -0,0 +1,228 @@
+"""
+Tests for the incremental realized-vol estimators.
+
+RollingVol and VolTracker must agree with the one-shot realized_vol /
+realized_vol_from_db / vol_ratio functions they replace on the hot paths.
+"""
+
+from __future__ import annotations
+
+import random
+import sqlite3
+import time
+from types import SimpleNamespace
+
+import pytest
+
+from kalshi_bot.data_collector import _SCHEMA
+from kalshi_bot.vol_estimator import (
+    Horizon,
+    RollingVol,
+    VolTracker,
+    realized_vol,
+    realized_vol_from_db,
+    vol_ratio,
+)
+
+
+def _walk(n: int, seed: int = 3, start: float = 0.5) -> list[float]:
+    rng = random.Random(seed)
+    mids, m = [], start
+    for _ in range(n):
+        m = min(0.99, max(0.01, m + rng.gauss(0, 0.01)))
+        mids.append(m)
+    return mids
+
+
+# ---------------------------------------------------------------------------
+# RollingVol
+# ---------------------------------------------------------------------------
+
+class TestRollingVol:
+    def test_bars_match_realized_vol(self):
+        mids = _walk(600)
+        rv = RollingVol.bars(24, dt_hours=1.0)
+        for k, mid in enumerate(mids):
+            rv.update(mid)
+            expected = realized_vol(mids[max(0, k - 23):k + 1], dt_hours=1.0)
+            if expected is None:
+                assert rv.vol() is None
+            else:
+                assert rv.vol() == pytest.approx(expected, rel=1e-9)
+
+    def test_no_drift_over_long_runs(self):
+        mids = _walk(50_000, seed=11)
+        rv = RollingVol.bars(10)
+        for mid in mids:
+            rv.update(mid)
+        assert rv.vol() == pytest.approx(realized_vol(mids[-10:]), rel=1e-9)
+
+    def test_time_horizons_with_irregular_spacing(self):
+        rng = random.Random(5)
+        mids = _walk(400, seed=5)
+        ts, t = [], 0.0
+        for _ in mids:
+            t += rng.choice([600, 1800, 3600, 5400])
+            ts.append(t)
+        rv = RollingVol({"6h": Horizon(hours=6), "2d": Horizon(hours=48)})
+        for i, (mid, t) in enumerate(zip(mids, ts)):
+            rv.update(mid, t)
+            for name, hours in (("6h", 6), ("2d", 48)):
+                inside = [j for j in range(i + 1) if ts[j] >= t - hours * 3600]
+                window = [mids[j] for j in inside]
+                dt = (ts[inside[-1]] - ts[inside[0]]) / max(len(inside) - 1, 1) / 3600
+                expected = realized_vol(window, dt_hours=dt)
+                got = rv.vol(name)
+                assert (got is None) == (expected is None)
+                if expected is not None:
+                    assert got == pytest.approx(expected, rel=1e-9)
+
+    def test_now_ages_out_stale_mids(self):
+        rv = RollingVol({"1h": Horizon(hours=1)})
+        for i, mid in enumerate(_walk(10)):
+            rv.update(mid, i * 300.0)
+        assert rv.count("1h") == 10
+        assert rv.count("1h", now=2700.0 + 1800) == 7   # ts 900 … 2700
+        assert rv.vol("1h", now=2700.0 + 7200) is None
+
+    def test_ratio(self):
+        rv = RollingVol({"s": Horizon(obs=5), "l": Horizon(obs=50)}, dt_hours=1.0)
+        mids = _walk(45) + [0.5, 0.56, 0.47, 0.58, 0.45]   # a late spike
+        for mid in mids:
+            rv.update(mid)
+        assert rv.ratio("s", "l") == pytest.approx(
+            realized_vol(mids[-5:]) / realized_vol(mids[-50:]), rel=1e-9,
+        )
+        assert rv.ratio("s", "l") > 1.5
+
+    def test_validation(self):
+        with pytest.raises(ValueError):
+            Horizon()
+        with pytest.raises(ValueError):
+            Horizon(obs=5, hours=1)
+        with pytest.raises(ValueError):
+            RollingVol({"6h": Horizon(hours=6)}).update(0.5)
+
+    def test_out_of_order_update_ignored(self):
+        rv = RollingVol({"6h": Horizon(hours=6)})
+        rv.update(0.50, 1000)
+        rv.update(0.90, 500)
+        assert rv.last_mid == 0.50 and rv.count("6h") == 1
+
+
+# ---------------------------------------------------------------------------
+# VolTracker
+# ---------------------------------------------------------------------------
+
+@pytest.fixture
+def data_db(tmp_path):
+    path = str(tmp_path / "market_data.db")
+    with sqlite3.connect(path) as conn:
+        conn.executescript(_SCHEMA)
+    return path
+
+
+def _insert(db: str, ticker: str, rows: list[tuple[int, float]]) -> None:
+    with sqlite3.connect(db) as conn:
+        conn.executemany(
+            "INSERT INTO market_snapshots (ts, ticker, mid) VALUES (?, ?, ?)",
+            [(ts, ticker, mid) for ts, mid in rows],
+        )
+
+
+class TestVolTracker:
+    def test_matches_db_functions_as_rows_arrive(self, data_db):
+        now = int(time.time())
+        mids = _walk(240, seed=9)
+        history = [(now - (240 - i) * 3600, m) for i, m in enumerate(mids)]   # 10 days hourly
+        _insert(data_db, "KXA", history[:200])
+
+        tracker = VolTracker(data_db, ttl=0)
+        assert tracker.vol_ratio("KXA") == pytest.approx(vol_ratio("KXA", data_db), rel=1e-9)
+        assert tracker.realized_vol("KXA") == pytest.approx(
+            realized_vol_from_db("KXA", data_db), rel=1e-9,
+        )
+
+        _insert(data_db, "KXA", history[200:])
+        assert tracker.vol_ratio("KXA") == pytest.approx(vol_ratio("KXA", data_db), rel=1e-9)
+        assert tracker.realized_vol("KXA", lookback_hours=6, min_obs=4) == pytest.approx(
+            realized_vol_from_db("KXA", data_db, lookback_hours=6, min_obs=4), rel=1e-9,
+        )
+        assert tracker._vols["KXA"].last_ts == history[-1][0]
+
+    def test_unknown_ticker_and_missing_db(self, data_db, tmp_path):
+        assert VolTracker(data_db).vol_ratio("KXNONE") is None
+        assert VolTracker(str(tmp_path / "nope" / "x.db")).realized_vol("KXA") is None
+
+    def test_untracked_horizon_rejected(self, data_db):
+        with pytest.raises(ValueError):
+            VolTracker(data_db).realized_vol("KXA", lookback_hours=12)
+
+    def test_batched_sync_matches_per_ticker(self, data_db):
+        now = int(time.time())
+        tickers = [f"KX{i}" for i in range(30)]
+        for i, ticker in enumerate(tickers):
+            mids = _walk(200, seed=i)
+            _insert(data_db, ticker, [(now - (200 - k) * 3600, m) for k, m in enumerate(mids)])
+        tracker = VolTracker(data_db)
+        tracker._connect()
+        queries: list[str] = []
+        tracker._conn.set_trace_callback(queries.append)
+
+        ratios = tracker.vol_ratios(tickers + ["KXNONE"])
+        assert len(queries) == 1
+        for ticker in tickers:
+            assert ratios[ticker] == pytest.approx(vol_ratio(ticker, data_db), rel=1e-9)
+        assert ratios["KXNONE"] is None
+
+    def test_seeded_tickers_read_only_new_rows(self, data_db):
+        now = int(time.time())
+        _insert(data_db, "KXA", [(now - (200 - k) * 3600, m) for k, m in enumerate(_walk(200))])
+        tracker = VolTracker(data_db, ttl=0)
+        tracker.refresh(["KXA"])
+
+        # A new candidate in the same batch must not widen KXA's read
+        _insert(data_db, "KXA", [(now, 0.6)])
+        mids = _walk(200, seed=5)
+        _insert(data_db, "KXB", [(now - (200 - k) * 3600, m) for k, m in enumerate(mids)])
+        conn, read = tracker._conn, []
+
+        def execute(*args):
+            rows = conn.execute(*args).fetchall()
+            read.extend(rows)
+            return SimpleNamespace(fetchall=lambda: rows)
+
+        tracker._conn = SimpleNamespace(execute=execute, close=conn.close)
+        ratios = tracker.vol_ratios(["KXA", "KXB"])
+        assert [ts for t, ts, _ in read if t == "KXA"] == [now - 3600, now]
+        for ticker in ("KXA", "KXB"):
+            assert ratios[ticker] == pytest.approx(vol_ratio(ticker, data_db), rel=1e-9)
+
+    def test_retain_evicts_unscanned_tickers(self, data_db):
+        now = int(time.time())
+        for ticker in ("KXA", "KXB"):
+            _insert(data_db, ticker, [(now - (50 - k) * 3600, m) for k, m in enumerate(_walk(50))])
+        tracker = VolTracker(data_db)
+        before = tracker.vol_ratios(["KXA", "KXB", "KXNONE"])
+        tracker.retain(["KXB"])
+        assert set(tracker._vols) == set(tracker._synced) == {"KXB"}
+        assert tracker.vol_ratio("KXA") == before["KXA"]   # re-seeded on demand
+
+    def test_ttl_serves_from_memory(self, data_db):
+        now = int(time.time())
+        _insert(data_db, "KXA", [(now - (50 - k) * 3600, m) for k, m in enumerate(_walk(50))])
+        tracker = VolTracker(data_db, ttl=3600)
+        before = tracker.vol_ratio("KXA")
+        tracker._connect()
+        queries: list[str] = []
+        tracker._conn.set_trace_callback(queries.append)
+
+        _insert(data_db, "KXA", [(now, 0.95)])
+        assert tracker.vol_ratio("KXA") == before
+        assert tracker.realized_vol("KXA") is not None
+        assert queries == []
+
+        tracker.refresh(["KXA"], force=True)
+        assert tracker.vol_ratio("KXA") == pytest.approx(vol_ratio("KXA", data_db), rel=1e-9)
+        assert len(queries) == 1
+        tracker.close()